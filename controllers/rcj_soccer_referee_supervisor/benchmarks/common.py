@@ -0,0 +1,22 @@
+"""Helpers shared by the benchmarks."""
+from headless.supervisor import HeadlessSupervisor
+from referee.consts import DEFAULT_MATCH_TIME, REFEREE_RULES
+from referee.referee import RCJSoccerReferee
+
+
+def create_referee(
+    supervisor: HeadlessSupervisor, match_time: int = DEFAULT_MATCH_TIME
+) -> RCJSoccerReferee:
+    """Create the referee of a benchmarked match, with the rule parameters
+    of ``REFEREE_RULES`` as in Webots."""
+    return RCJSoccerReferee(
+        supervisor=supervisor,
+        match_time=match_time,
+        team_name_blue="Blues",
+        team_name_yellow="Yellows",
+        initial_score_blue=0,
+        initial_score_yellow=0,
+        match_id=1,
+        half_id=1,
+        **REFEREE_RULES,
+    )
@@ -0,0 +1,69 @@
+"""Benchmark the referee-to-robot packets: the binary codec against the
+JSON packets of older referees, on both the encoding (referee) and the
+decoding (robot) side.
+
+    python -m benchmarks.packet_codec --number 100000
+"""
+import argparse
+import json
+import timeit
+from typing import Callable, Dict
+
+from referee.packet_codec import (
+    decode_packet,
+    encode_binary_packet,
+    encode_json_packet,
+)
+
+STATE = (False, 421, 2, 1, "B")
+
+
+def bench(functions: Dict[str, Callable], number: int) -> Dict[str, float]:
+    """Time each of the functions.
+
+    Returns:
+        dict: Duration of a call in microseconds
+    """
+    return {
+        name: min(timeit.repeat(f, number=number, repeat=3)) / number * 1e6
+        for name, f in functions.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    binary = encode_binary_packet(*STATE)
+    text = encode_json_packet(STATE[0])
+    # What carrying the fields of the binary packet in JSON would cost
+    full_json = json.dumps(decode_packet(binary))
+    print(
+        f"Packet size (bytes): binary {len(binary)}, JSON {len(text)}, "
+        f"JSON with the same fields {len(full_json)}"
+    )
+
+    durations = bench(
+        {
+            "encode JSON (json.dumps)": lambda: json.dumps(
+                {"waiting_for_kickoff": STATE[0]}
+            ),
+            "encode JSON, cached": lambda: encode_json_packet(STATE[0]),
+            "encode binary (struct.pack)": lambda: (
+                encode_binary_packet.__wrapped__(*STATE)
+            ),
+            "encode binary, cached": lambda: encode_binary_packet(*STATE),
+            "decode JSON (json.loads)": lambda: json.loads(text),
+            "decode JSON with the same fields": lambda: json.loads(full_json),
+            "decode binary": lambda: decode_packet(binary),
+        },
+        args.number,
+    )
+    print("Per packet (us):")
+    for name, duration in durations.items():
+        print(f"  {name:<34} {duration:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark the pose store of the supervisor and the rule checks which read
+it, per referee tick, on top of the headless world.
+
+    python -m benchmarks.pose_store --ticks 20000 --repeat 5
+
+Also compares the scalar ``referee.utils`` predicates with their batched
+``*_mask`` variants for a growing number of objects.
+"""
+import argparse
+import random
+import timeit
+from typing import Callable, Dict
+
+import numpy as np
+
+from benchmarks.common import create_referee
+from headless.supervisor import HeadlessSupervisor
+from referee.consts import ROBOT_NAMES, TIME_STEP
+from referee.utils import is_outside, is_outside_mask
+
+OBJECT_COUNTS = (7, 70, 700, 7000)
+
+
+def bench_tick(ticks: int, seed: int) -> Dict[str, float]:
+    """Time the phases of the referee tick which read the pose store.
+
+    Returns:
+        dict: Mean duration of each phase in microseconds
+    """
+    supervisor = HeadlessSupervisor(seed=seed)
+    referee = create_referee(supervisor)
+    referee.kickoff()
+    rng = random.Random(seed)
+
+    phases: Dict[str, Callable] = {
+        "update_positions": supervisor.update_positions,
+        "check_goal": referee.check_goal,
+        "check_progress": referee.check_progress,
+        "check_robots_in_penalty_area": referee.check_robots_in_penalty_area,
+    }
+    totals = dict.fromkeys(phases, 0.0)
+    timer = timeit.default_timer
+    for _ in range(ticks):
+        for robot in ROBOT_NAMES:
+            supervisor.set_wheel_velocities(
+                robot, rng.uniform(-10, 10), rng.uniform(-10, 10)
+            )
+        supervisor.step(TIME_STEP)
+        for name, phase in phases.items():
+            start = timer()
+            phase()
+            totals[name] += timer() - start
+
+    return {name: total / ticks * 1e6 for name, total in totals.items()}
+
+
+def bench_predicates(count: int, number: int = 200) -> Dict[str, float]:
+    """Time ``is_outside`` over ``count`` objects, one call per object and
+    one batched call.
+
+    Returns:
+        dict: Duration of a pass over all the objects in microseconds
+    """
+    translations = np.random.default_rng(0).uniform(-0.9, 0.9, (count, 3))
+    xs, ys = translations[:, 0], translations[:, 1]
+
+    def scalar():
+        for x, y, _ in translations.tolist():
+            is_outside(x, y)
+
+    def batched():
+        is_outside_mask(xs, ys)
+
+    return {
+        name: min(timeit.repeat(f, number=number, repeat=3)) / number * 1e6
+        for name, f in (("scalar", scalar), ("mask", batched))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--ticks", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Runs of --ticks ticks, the best one of each phase is kept",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"Per tick, mean of {args.ticks} ticks, best of {args.repeat} "
+        "runs (us):"
+    )
+    runs = [bench_tick(args.ticks, args.seed) for _ in range(args.repeat)]
+    phases = {name: min(run[name] for run in runs) for name in runs[0]}
+    for name, duration in phases.items():
+        print(f"  {name:<30} {duration:8.2f}")
+    print(f"  {'total':<30} {sum(phases.values()):8.2f}")
+
+    print("is_outside over N objects (us): scalar / mask")
+    for count in OBJECT_COUNTS:
+        durations = bench_predicates(count)
+        print(
+            f"  N={count:<6} {durations['scalar']:10.2f} "
+            f"{durations['mask']:10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
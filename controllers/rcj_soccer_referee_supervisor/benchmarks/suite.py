@@ -0,0 +1,385 @@
+"""Benchmark the referee components on randomized trajectories and compare
+the results against a baseline.
+
+    python -m benchmarks.suite run --output baseline.json
+    python -m benchmarks.suite run --output current.json
+    python -m benchmarks.suite compare baseline.json current.json
+
+``compare`` exits with 1 if any benchmark got slower than the baseline by
+more than ``--threshold`` (10% by default). Both runs should use the same
+``--positions`` and be run on the same machine.
+"""
+import argparse
+import fnmatch
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks.common import create_referee
+from headless.supervisor import HeadlessSupervisor
+from referee.consts import (
+    FIELD_X_UPPER_LIMIT,
+    FIELD_Y_UPPER_LIMIT,
+    N_OBJECTS,
+    REFEREE_RULES,
+    ROBOT_NAMES,
+    TIME_STEP,
+)
+from referee.enums import NeutralSpotDistanceType, ProgressCheckMode
+from referee.event_handlers import DrawMessageHandler, JSONLoggerHandler
+from referee.eventer import Eventer
+from referee.events import Goal, Kickoff, LackOfProgress
+from referee.penalty_area_checker import PenaltyAreaChecker
+from referee.progress_checker import ProgressChecker
+from referee.utils import is_in_blue_goal, is_in_yellow_goal, is_outside
+
+DEFAULT_POSITIONS = 1_000_000
+DEFAULT_THRESHOLD = 0.1
+
+# A benchmark prepares its state and returns the function to time, along
+# with the number of operations one call of it does
+Benchmark = Callable[["Workload"], Tuple[Callable[[], None], int]]
+
+
+def random_trajectories(
+    rng: np.random.Generator, steps: int, objects: int
+) -> np.ndarray:
+    """Generate random walks of objects on the field, a step apart.
+
+    The objects wander at up to about 0.6 m/s, stop every now and then (so
+    that some of them make no progress) and may leave the field or enter
+    the goals and the penalty areas.
+
+    Returns:
+        np.ndarray: Positions (steps, objects, 3) in meters
+    """
+    dt = TIME_STEP / 1000
+    # Velocities change smoothly, each step moves them by a bit
+    accelerations = rng.normal(0, 0.05, (steps, objects, 2))
+    velocities = np.cumsum(accelerations, axis=0)
+    velocities = np.clip(velocities, -0.6, 0.6)
+    # Objects are stopped for about a third of the steps, in long stretches
+    moving = np.cumsum(rng.random((steps, objects)) < 0.002, axis=0) % 3
+    velocities *= (moving != 0)[..., None]
+
+    positions = np.zeros((steps, objects, 3))
+    positions[..., :2] = np.cumsum(velocities * dt, axis=0)
+    # Fold the walks back into a box slightly larger than the field
+    limits = np.array([FIELD_X_UPPER_LIMIT, FIELD_Y_UPPER_LIMIT]) + 0.1
+    positions[..., :2] = (
+        np.abs((positions[..., :2] + limits) % (4 * limits) - 2 * limits)
+        - limits
+    )
+    return positions
+
+
+class Workload:
+    """Shared inputs of the benchmarks.
+
+    Args:
+        positions (int): Number of positions each checker sees
+        seed (int): Seed of the trajectories
+        directory (Path): Where the benchmarks may write files
+    """
+
+    def __init__(self, positions: int, seed: int, directory: Path):
+        rng = np.random.default_rng(seed)
+        self.positions = positions
+        self.directory = directory
+        # One object seeing all the positions, as plain lists as the
+        # referee gets them
+        self.trajectory: List[List[float]] = random_trajectories(
+            rng, positions, 1
+        )[:, 0].tolist()
+        # Whole frames for the supervisor and the referee
+        self.frames = random_trajectories(rng, positions // 100, N_OBJECTS)
+
+
+class FakeSupervisor(HeadlessSupervisor):
+    """Supervisor whose poses follow pregenerated frames, one per step,
+    rather than the headless physics. The referee moving objects only lasts
+    until the next frame."""
+
+    def __init__(self, frames: np.ndarray):
+        super().__init__(seed=1)
+        self.frames = frames
+        self.frame = 0
+
+    def update_positions(self):
+        self.translations[:] = self.frames[self.frame % len(self.frames)]
+        self.translation_rows[:] = self.translations.tolist()
+        self.frame += 1
+        self._invalidate_neutral_spot_distances()
+
+
+def bench_progress_checker(mode: str) -> Benchmark:
+    def prepare(workload: Workload):
+        checker = ProgressChecker(
+            REFEREE_RULES["progress_check_steps"],
+            REFEREE_RULES["progress_check_threshold"],
+            mode,
+        )
+        trajectory = workload.trajectory
+
+        def run():
+            checker.reset()
+            for position in trajectory:
+                checker.track(position)
+                checker.is_progress()
+
+        return run, len(trajectory)
+
+    return prepare
+
+
+def bench_penalty_area_checker(workload: Workload):
+    checker = PenaltyAreaChecker(
+        REFEREE_RULES["penalty_area_allowed_time"],
+        REFEREE_RULES["penalty_area_reset_after"],
+    )
+    trajectory = workload.trajectory
+    dt = TIME_STEP / 1000
+
+    def run():
+        checker.reset()
+        for i, position in enumerate(trajectory):
+            checker.track(position, -i * dt)
+            checker.is_violating()
+
+    return run, len(trajectory)
+
+
+def bench_predicate(predicate: Callable[[float, float], bool]) -> Benchmark:
+    def prepare(workload: Workload):
+        trajectory = workload.trajectory
+
+        def run():
+            for x, y, _ in trajectory:
+                predicate(x, y)
+
+        return run, len(trajectory)
+
+    return prepare
+
+
+def bench_neutral_spots(workload: Workload):
+    supervisor = FakeSupervisor(workload.frames)
+    frames = len(workload.frames)
+    nearest = NeutralSpotDistanceType.NEAREST.value
+    furthest = NeutralSpotDistanceType.FURTHEST.value
+
+    def run():
+        for _ in range(frames):
+            supervisor.update_positions()
+            for robot in ROBOT_NAMES:
+                supervisor.get_unoccupied_neutral_spots_sorted(nearest, robot)
+            supervisor.get_unoccupied_neutral_spots_sorted(furthest, "ball")
+
+    return run, frames * (len(ROBOT_NAMES) + 1)
+
+
+def bench_eventer(handler: str) -> Benchmark:
+    def prepare(workload: Workload):
+        referee = create_referee(
+            FakeSupervisor(workload.frames), match_time=10**6
+        )
+        eventer = Eventer()
+        if handler == "json_logger":
+            eventer.subscribe(
+                JSONLoggerHandler(workload.directory / "reflog.jsonl")
+            )
+        else:
+            eventer.subscribe(DrawMessageHandler())
+        events = [
+            LackOfProgress(object_type="robot", robot_name="B1"),
+            LackOfProgress(object_type="ball"),
+            Kickoff(robot_name="Y1", team_name="Y"),
+            Goal(team_name="B", score_yellow=0, score_blue=1),
+        ]
+        count = workload.positions // 100
+
+        def run():
+            for i in range(count):
+                eventer.event(referee, events[i % len(events)])
+            # The asynchronous handler is done once the queue is drained
+            eventer.flush()
+
+        return run, count
+
+    return prepare
+
+
+def bench_tick(workload: Workload):
+    supervisor = FakeSupervisor(workload.frames)
+    referee = create_referee(supervisor, match_time=10**6)
+    referee.kickoff()
+    ticks = len(workload.frames)
+
+    def run():
+        for _ in range(ticks):
+            referee.tick()
+
+    return run, ticks
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "progress_checker.distance": bench_progress_checker(
+        ProgressCheckMode.DISTANCE.value
+    ),
+    "progress_checker.displacement": bench_progress_checker(
+        ProgressCheckMode.DISPLACEMENT.value
+    ),
+    "penalty_area_checker.track": bench_penalty_area_checker,
+    "utils.is_outside": bench_predicate(is_outside),
+    "utils.is_in_blue_goal": bench_predicate(is_in_blue_goal),
+    "utils.is_in_yellow_goal": bench_predicate(is_in_yellow_goal),
+    "supervisor.neutral_spots_sorted": bench_neutral_spots,
+    "eventer.draw_message": bench_eventer("draw_message"),
+    "eventer.json_logger": bench_eventer("json_logger"),
+    "referee.tick": bench_tick,
+}
+
+
+def run_benchmarks(
+    positions: int = DEFAULT_POSITIONS,
+    seed: int = 1,
+    repeat: int = 3,
+    pattern: str = "*",
+) -> dict:
+    """Run the benchmarks whose names match the pattern.
+
+    Returns:
+        dict: The machine and the settings of the run under "meta", and
+        the best time per operation of each benchmark in nanoseconds under
+        "results"
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        workload = Workload(positions, seed, Path(directory))
+        for name, benchmark in BENCHMARKS.items():
+            if not fnmatch.fnmatch(name, pattern):
+                continue
+            run, operations = benchmark(workload)
+            durations = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run()
+                durations.append(time.perf_counter() - start)
+            results[name] = {
+                "ns_per_op": min(durations) / operations * 1e9,
+                "operations": operations,
+            }
+
+    return {
+        "meta": {
+            "datetime": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "positions": positions,
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD
+) -> Dict[str, float]:
+    """Compare two runs.
+
+    Returns:
+        dict: Ratio of the current to the baseline time of each benchmark
+        run in both, for the ones slower by more than the threshold
+    """
+    regressions = {}
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        ratio = result["ns_per_op"] / baseline["results"][name]["ns_per_op"]
+        if ratio > 1 + threshold:
+            regressions[name] = ratio
+    return regressions
+
+
+def main_run(args: argparse.Namespace):
+    report = run_benchmarks(args.positions, args.seed, args.repeat, args.only)
+    for name, result in report["results"].items():
+        print(f"{name:<34} {result['ns_per_op']:12.1f} ns/op")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+def main_compare(args: argparse.Namespace) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    if baseline["meta"]["positions"] != current["meta"]["positions"]:
+        print("Warning: the runs did not use the same number of positions")
+
+    regressions = compare(baseline, current, args.threshold)
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<34} {result['ns_per_op']:12.1f} ns/op (new)")
+            continue
+        ratio = result["ns_per_op"] / before["ns_per_op"]
+        flag = "  REGRESSION" if name in regressions else ""
+        print(
+            f"{name:<34} {before['ns_per_op']:12.1f} -> "
+            f"{result['ns_per_op']:12.1f} ns/op {ratio:6.2f}x{flag}"
+        )
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks")
+    run.add_argument(
+        "--positions",
+        type=int,
+        default=DEFAULT_POSITIONS,
+        help="Positions each checker sees; the supervisor, eventer and "
+        "tick benchmarks do a hundredth of this",
+    )
+    run.add_argument("--seed", type=int, default=1)
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument(
+        "--only", default="*", help="Only run the benchmarks matching this"
+    )
+    run.add_argument("--output", type=Path, default=None)
+
+    comparison = commands.add_parser(
+        "compare", help="Flag the regressions of a run against a baseline"
+    )
+    comparison.add_argument("baseline", type=Path)
+    comparison.add_argument("current", type=Path)
+    comparison.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Slowdown flagged as a regression, as a fraction",
+    )
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        return main_compare(args)
+    main_run(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Play a match without Webots: the referee and the six robot controllers
+run in-process on top of the headless world.
+
+    python -m headless --seed 42
+
+Team names, match time and the output path are taken from the same
+``RCJ_SIM_*`` environment variables as the Webots referee.
+"""
+import argparse
+import os
+from pathlib import Path
+from typing import List
+
+from headless.runner import (
+    create_referee,
+    LockstepRunner,
+    TEAM_BLUE_DIR,
+    TEAM_YELLOW_DIR,
+)
+from headless.supervisor import HeadlessSupervisor
+from referee.consts import DEFAULT_MATCH_TIME
+from referee.enums import (
+    FsyncPolicy,
+    PacketFormat,
+    ProgressCheckMode,
+    ReflogCompression,
+)
+from referee.event_handlers import EventHandler, JSONLoggerHandler
+from referee.match import output_path, POSE_RECORDERS
+from referee.profiler import TickProfiler, write_collapsed_stacks
+from referee.referee import RCJSoccerReferee
+
+
+def create_recorders(
+    supervisor: HeadlessSupervisor,
+    referee: RCJSoccerReferee,
+    rec_formats: List[str],
+    prefix: Path,
+) -> list:
+    """Create and start the recorders of the formats."""
+    recorders = []
+    for rec_format in filter(None, rec_formats):
+        # Videos are recorded by Webots
+        if rec_format not in POSE_RECORDERS:
+            raise ValueError(f"Unexpected headless format {rec_format}")
+        recorder_class = POSE_RECORDERS[rec_format]
+        recorder = recorder_class(
+            supervisor,
+            str(prefix.with_suffix(f".{recorder_class.output_suffix}")),
+            match_time=referee.match_time,
+        )
+        recorder.start_recording()
+        if isinstance(recorder, EventHandler):
+            referee.add_event_subscriber(recorder)
+        recorders.append(recorder)
+    return recorders
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--team-blue-dir", type=Path, default=TEAM_BLUE_DIR)
+    parser.add_argument(
+        "--team-yellow-dir", type=Path, default=TEAM_YELLOW_DIR
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        help="Write a cProfile dump of the whole match to this file, and "
+        "its collapsed stacks next to it",
+    )
+    args = parser.parse_args()
+
+    match_time = int(os.environ.get("RCJ_SIM_MATCH_TIME", DEFAULT_MATCH_TIME))
+    team_blue = os.environ.get("RCJ_SIM_TEAM_BLUE_NAME", "The Blues")
+    team_yellow = os.environ.get("RCJ_SIM_TEAM_YELLOW_NAME", "The Yellows")
+    team_blue_id = os.environ.get("RCJ_SIM_TEAM_BLUE_ID", "The Blues")
+    team_yellow_id = os.environ.get("RCJ_SIM_TEAM_YELLOW_ID", "The Yellows")
+    match_id = os.environ.get("RCJ_SIM_MATCH_ID", "1")
+    half_id = int(os.environ.get("RCJ_SIM_HALF_ID", 1))
+    # Carried over from the first half
+    initial_score_blue = int(
+        os.environ.get("RCJ_SIM_TEAM_B_INITIAL_SCORE") or "0"
+    )
+    initial_score_yellow = int(
+        os.environ.get("RCJ_SIM_TEAM_Y_INITIAL_SCORE") or "0"
+    )
+    progress_check_mode = os.environ.get(
+        "RCJ_SIM_PROGRESS_CHECK_MODE", ProgressCheckMode.DISTANCE.value
+    )
+    packet_format = os.environ.get(
+        "RCJ_SIM_PACKET_FORMAT", PacketFormat.JSON.value
+    )
+    reflog_compression = os.environ.get(
+        "RCJ_SIM_REFLOG_COMPRESSION", ReflogCompression.NONE.value
+    )
+    reflog_fsync = os.environ.get(
+        "RCJ_SIM_REFLOG_FSYNC", FsyncPolicy.NONE.value
+    )
+    reflog_max_bytes = int(os.environ.get("RCJ_SIM_REFLOG_MAX_BYTES", 0))
+    rec_formats = os.environ.get("RCJ_SIM_REC_FORMATS", "").split(",")
+    tick_profile = "RCJ_SIM_TICK_PROFILE" in os.environ
+    # Named as by the Webots referee, so that another match written to the
+    # same directory does not append to the reflog of this one
+    prefix = output_path(
+        Path(os.environ.get("RCJ_SIM_OUTPUT_PATH", "reflog")),
+        team_blue_id,
+        team_yellow_id,
+        match_id,
+        half_id,
+    )
+    profile = args.profile
+    if profile is None and "RCJ_SIM_PROFILE" in os.environ:
+        profile = prefix.with_suffix(".prof")
+
+    supervisor = HeadlessSupervisor(seed=args.seed)
+    supervisor.set_hud_enabled("RCJ_SIM_NO_HUD" not in os.environ)
+    referee = create_referee(
+        supervisor,
+        match_time=match_time,
+        team_name_blue=team_blue,
+        team_name_yellow=team_yellow,
+        initial_score_blue=initial_score_blue,
+        initial_score_yellow=initial_score_yellow,
+        match_id=match_id,
+        half_id=half_id,
+        progress_check_mode=progress_check_mode,
+        packet_format=packet_format,
+    )
+    referee.add_event_subscriber(
+        JSONLoggerHandler(
+            prefix.with_suffix(".jsonl"),
+            compression=reflog_compression,
+            fsync=reflog_fsync,
+            max_bytes=reflog_max_bytes or None,
+        )
+    )
+
+    recorders = create_recorders(supervisor, referee, rec_formats, prefix)
+
+    runner = LockstepRunner(
+        supervisor,
+        referee,
+        team_blue_dir=args.team_blue_dir,
+        team_yellow_dir=args.team_yellow_dir,
+        profile=profile is not None,
+        recorders=recorders,
+    )
+    if tick_profile:
+        referee.profiler = TickProfiler()
+    runner.run()
+    referee.eventer.close()
+    for recorder in recorders:
+        recorder.stop_recording()
+    if profile:
+        stats = runner.profile_stats()
+        stats.dump_stats(str(profile))
+        write_collapsed_stacks(stats, profile.with_suffix(".collapsed"))
+    if tick_profile:
+        referee.profiler.write_summary(prefix.with_suffix(".profile.json"))
+
+    print(
+        f"{team_blue} {referee.score_blue}:{referee.score_yellow} "
+        f"{team_yellow}"
+    )
+
+
+if __name__ == "__main__":
+    main()
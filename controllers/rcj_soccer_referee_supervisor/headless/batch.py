@@ -0,0 +1,238 @@
+"""Play many headless matches at once, their state held in NumPy arrays
+with a leading match dimension.
+
+    python -m headless.batch --matches 10000 --batch-size 500 --workers 8
+
+Each batch steps the physics and applies the rules of the referee to all
+its matches with batched functions, the default teams being driven by a
+vectorized port of their controllers (see ``DefaultTeamPolicy``). The
+reflog of every match is written to the output directory, and its score to
+``results.jsonl``.
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import as_completed, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from headless.batch_physics import BatchPhysics
+from headless.batch_policy import DefaultTeamPolicy, observe
+from headless.batch_referee import BatchReferee
+from headless.consts import WHEEL_SLIP_NOISE
+from headless.runner import TEAM_BLUE_DIR, TEAM_YELLOW_DIR
+from referee.consts import (
+    DEFAULT_MATCH_TIME,
+    REFEREE_RULES,
+    ROBOT_NAMES,
+    TIME_STEP,
+)
+from referee.enums import ReflogCompression, Team
+
+# Matches of a batch, enough to amortize the NumPy calls of a step
+DEFAULT_BATCH_SIZE = 256
+
+TEAM_ROBOTS = {
+    team.value: [
+        i for i, robot in enumerate(ROBOT_NAMES) if robot[0] == team.value
+    ]
+    for team in Team
+}
+
+
+class BatchSimulator:
+    """Play a batch of independent matches in lockstep: every step, the
+    physics of all the matches advances, the referee ticks and then both
+    teams act on what their robots sense, as with ``LockstepRunner``.
+
+    Args:
+        match_ids (list): ID of each match of the batch
+        match_time (int): Length of the matches, in seconds
+        team_blue (DefaultTeamPolicy): Policy of the blue team
+        team_yellow (DefaultTeamPolicy): Policy of the yellow team
+        team_name_blue (str): Name of the blue team
+        team_name_yellow (str): Name of the yellow team
+        half_id (int): Half played by all the matches
+        seed (int, optional): Seed of the physics and of the referee
+        wheel_slip_noise (float): Relative standard deviation of the wheel
+            slip noise
+    """
+
+    def __init__(
+        self,
+        match_ids: List[int],
+        match_time: int,
+        team_blue: DefaultTeamPolicy,
+        team_yellow: DefaultTeamPolicy,
+        team_name_blue: str = "The Blues",
+        team_name_yellow: str = "The Yellows",
+        half_id: int = 1,
+        seed: Optional[int] = None,
+        wheel_slip_noise: float = WHEEL_SLIP_NOISE,
+    ):
+        self.team_blue = team_blue
+        self.team_yellow = team_yellow
+        physics_seed, referee_seed = np.random.SeedSequence(seed).spawn(2)
+        self.physics = BatchPhysics(
+            len(match_ids),
+            seed=physics_seed,
+            wheel_slip_noise=wheel_slip_noise,
+        )
+        self.referee = BatchReferee(
+            self.physics,
+            match_time=match_time,
+            match_ids=match_ids,
+            half_id=half_id,
+            team_name_blue=team_name_blue,
+            team_name_yellow=team_name_yellow,
+            seed=referee_seed,
+            **REFEREE_RULES,
+        )
+        self.steps = 0
+
+    def step(self) -> bool:
+        """Advance all the matches by one step.
+
+        Returns:
+            bool: False once the matches are over
+        """
+        self.physics.step(TIME_STEP / 1000.0)
+        if not self.referee.tick():
+            return False
+        # The controllers count the time from their first step
+        observations = observe(self.physics, self.steps * TIME_STEP / 1000.0)
+        self.steps += 1
+
+        left = self.physics.wheel_left.copy()
+        right = self.physics.wheel_right.copy()
+        for team, policy in (
+            (Team.BLUE.value, self.team_blue),
+            (Team.YELLOW.value, self.team_yellow),
+        ):
+            robots = TEAM_ROBOTS[team]
+            left[:, robots], right[:, robots] = policy.act(
+                observations, robots
+            )
+        self.physics.set_wheel_velocities(left, right)
+        return True
+
+    def run(self) -> int:
+        """Play the whole matches.
+
+        Returns:
+            int: Number of steps played
+        """
+        self.referee.kickoff(np.ones(self.referee.n_matches, dtype=bool))
+        steps = 0
+        while self.step():
+            steps += 1
+        return steps
+
+    def results(self) -> List[Dict]:
+        """Return the final score of each match."""
+        referee = self.referee
+        return [
+            {
+                "match_id": match_id,
+                "score_blue": int(referee.score_blue[i]),
+                "score_yellow": int(referee.score_yellow[i]),
+            }
+            for i, match_id in enumerate(referee.match_ids)
+        ]
+
+
+def play_batch(
+    match_ids: List[int],
+    seed: int,
+    match_time: int,
+    output: Path,
+    compression: str = ReflogCompression.NONE.value,
+) -> List[Dict]:
+    """Play a batch of matches between the default teams and write their
+    reflogs. Runs in the workers of the pool.
+
+    Returns:
+        list: Final score of each match
+    """
+    simulator = BatchSimulator(
+        match_ids,
+        match_time,
+        DefaultTeamPolicy.from_directory(TEAM_BLUE_DIR),
+        DefaultTeamPolicy.from_directory(TEAM_YELLOW_DIR),
+        seed=seed,
+    )
+    simulator.run()
+    simulator.referee.write_reflogs(output, compression=compression)
+    return simulator.results()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--matches", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--match-time", type=int, default=DEFAULT_MATCH_TIME)
+    parser.add_argument(
+        "--compression",
+        choices=ReflogCompression.all(),
+        default=ReflogCompression.NONE.value,
+    )
+    parser.add_argument("--output", type=Path, default=Path("batch"))
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO)
+    args.output.mkdir(parents=True, exist_ok=True)
+
+    size = args.batch_size
+    batches = [
+        list(range(first, min(first + size, args.matches + 1)))
+        for first in range(1, args.matches + 1, size)
+    ]
+    started = time.monotonic()
+    failed = 0
+    with open(args.output / "results.jsonl", "w") as f:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = {
+                pool.submit(
+                    play_batch,
+                    batch,
+                    args.seed + k,
+                    args.match_time,
+                    args.output,
+                    args.compression,
+                ): batch
+                for k, batch in enumerate(batches)
+            }
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    results = future.result()
+                except Exception:
+                    logging.exception(
+                        f"Batch of matches {batch[0]}-{batch[-1]} failed"
+                    )
+                    failed += len(batch)
+                    continue
+                for result in results:
+                    f.write(json.dumps(result) + "\n")
+    elapsed = time.monotonic() - started
+
+    played = args.matches - failed
+    print(
+        f"Played {played} matches in {elapsed:.1f}s "
+        f"({played / elapsed * 60:.0f} matches per minute)"
+    )
+    if failed:
+        raise SystemExit(f"{failed} matches could not be played")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from headless.consts import (
+    AXLE_LENGTH,
+    BALL_RADIUS,
+    BALL_RESTITUTION,
+    BALL_ROBOT_RESTITUTION,
+    BALL_ROLLING_FRICTION,
+    BALL_STOP_VELOCITY,
+    GOAL_BACK_WALL_Y,
+    GOAL_WALL_X,
+    MAX_WHEEL_VELOCITY,
+    ROBOT_RADIUS,
+    WALL_X,
+    WALL_Y,
+    WHEEL_RADIUS,
+    WHEEL_SLIP_NOISE,
+)
+from referee.consts import N_ROBOTS
+
+
+def confine_batch(
+    x: np.ndarray, y: np.ndarray, radius: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Batched variant of :func:`headless.physics.confine`.
+
+    Returns:
+        tuple: The corrected x and y and whether the objects hit a wall
+            along X and along Y
+    """
+    in_goal_x = (-GOAL_WALL_X + radius < x) & (x < GOAL_WALL_X - radius)
+    y_limit = np.where(in_goal_x, GOAL_BACK_WALL_Y - radius, WALL_Y - radius)
+    hit_y = (y < -y_limit) | (y > y_limit)
+    y = np.clip(y, -y_limit, y_limit)
+
+    in_field_y = (-WALL_Y + radius <= y) & (y <= WALL_Y - radius)
+    x_limit = np.where(in_field_y, WALL_X - radius, GOAL_WALL_X - radius)
+    hit_x = (x < -x_limit) | (x > x_limit)
+    x = np.clip(x, -x_limit, x_limit)
+
+    return x, y, hit_x, hit_y
+
+
+class BatchPhysics:
+    """The simplified 2D physics of :class:`SoccerPhysics`, for many
+    independent matches at once.
+
+    The robot state is kept in arrays of shape ``(n_matches, n_robots)``
+    and the ball state in arrays of shape ``(n_matches,)``, so that a step
+    of all the matches costs a fixed number of NumPy calls. Two shortcuts
+    are taken: overlapping robots are pushed apart all at once instead of
+    pair after pair, and the ball bounces off all the robots it touches at
+    once instead of one after the other. Both only make a difference when
+    three or more objects touch.
+
+    Args:
+        n_matches (int): Number of matches
+        n_robots (int, optional): Number of robots of each match
+        seed (int, optional): Seed of the wheel slip noise
+        wheel_slip_noise (float, optional): Relative standard deviation of
+            the wheel slip noise, 0 turns the noise off
+    """
+
+    def __init__(
+        self,
+        n_matches: int,
+        n_robots: int = N_ROBOTS,
+        seed: Optional[int] = None,
+        wheel_slip_noise: float = WHEEL_SLIP_NOISE,
+    ):
+        self.n_matches = n_matches
+        self.n_robots = n_robots
+        self.wheel_slip_noise = wheel_slip_noise
+        self.rng = np.random.default_rng(seed)
+        self.reset()
+
+    def reset(self):
+        """Put the robots and the balls back at the origin, at rest."""
+        shape = (self.n_matches, self.n_robots)
+        self.robot_x = np.zeros(shape)
+        self.robot_y = np.zeros(shape)
+        self.robot_heading = np.zeros(shape)
+        self.robot_vx = np.zeros(shape)
+        self.robot_vy = np.zeros(shape)
+        self.wheel_left = np.zeros(shape)
+        self.wheel_right = np.zeros(shape)
+
+        self.ball_x = np.zeros(self.n_matches)
+        self.ball_y = np.zeros(self.n_matches)
+        self.ball_vx = np.zeros(self.n_matches)
+        self.ball_vy = np.zeros(self.n_matches)
+
+    def set_wheel_velocities(self, left: np.ndarray, right: np.ndarray):
+        """Set the angular velocities (rad/s) of the wheels of all the
+        robots."""
+        self.wheel_left[:] = left
+        self.wheel_right[:] = right
+
+    def stop_robots(self, mask: np.ndarray):
+        self.robot_vx[mask] = 0.0
+        self.robot_vy[mask] = 0.0
+
+    def stop_balls(self, mask: np.ndarray):
+        self.ball_vx[mask] = 0.0
+        self.ball_vy[mask] = 0.0
+
+    def get_headings(self) -> np.ndarray:
+        """Return the headings of the robots normalized to [-pi, pi]."""
+        return np.remainder(self.robot_heading + np.pi, 2 * np.pi) - np.pi
+
+    def step(self, dt: float):
+        """Advance all the matches by ``dt`` seconds."""
+        self._drive_robots(dt)
+        self._separate_robots()
+        self.robot_x, self.robot_y, _, _ = confine_batch(
+            self.robot_x, self.robot_y, ROBOT_RADIUS
+        )
+        self._step_balls(dt)
+
+    def _drive_robots(self, dt: float):
+        # See SoccerPhysics._drive_robots
+        left = np.clip(
+            self.wheel_left, -MAX_WHEEL_VELOCITY, MAX_WHEEL_VELOCITY
+        )
+        right = np.clip(
+            self.wheel_right, -MAX_WHEEL_VELOCITY, MAX_WHEEL_VELOCITY
+        )
+        if self.wheel_slip_noise:
+            noise = self.wheel_slip_noise * 2 * np.sqrt(3)
+            shape = left.shape
+            left = left * (1 + noise * (self.rng.random(shape) - 0.5))
+            right = right * (1 + noise * (self.rng.random(shape) - 0.5))
+
+        speed = (left + right) * (WHEEL_RADIUS / 2)
+        omega = (left - right) * (WHEEL_RADIUS / AXLE_LENGTH)
+        mid_heading = self.robot_heading + omega * (dt / 2)
+
+        self.robot_vx = speed * np.cos(mid_heading)
+        self.robot_vy = speed * np.sin(mid_heading)
+        self.robot_x += self.robot_vx * dt
+        self.robot_y += self.robot_vy * dt
+        self.robot_heading += omega * dt
+
+    def _separate_robots(self):
+        """Push overlapping robots apart, each by half of the overlap."""
+        dx = self.robot_x[:, :, np.newaxis] - self.robot_x[:, np.newaxis, :]
+        dy = self.robot_y[:, :, np.newaxis] - self.robot_y[:, np.newaxis, :]
+        distance_sq = dx * dx + dy * dy
+        min_distance = 2 * ROBOT_RADIUS
+        overlap = (distance_sq > 0) & (distance_sq < min_distance**2)
+        if not overlap.any():
+            return
+        distance = np.sqrt(np.where(overlap, distance_sq, 1.0))
+        push = np.where(overlap, (min_distance - distance) / (2 * distance), 0)
+        self.robot_x += (dx * push).sum(axis=2)
+        self.robot_y += (dy * push).sum(axis=2)
+
+    def _step_balls(self, dt: float):
+        decay = np.exp(-BALL_ROLLING_FRICTION * dt)
+        vx = self.ball_vx * decay
+        vy = self.ball_vy * decay
+        still = vx * vx + vy * vy < BALL_STOP_VELOCITY**2
+        vx[still] = 0.0
+        vy[still] = 0.0
+        x = self.ball_x + vx * dt
+        y = self.ball_y + vy * dt
+
+        contact_distance = ROBOT_RADIUS + BALL_RADIUS
+        dx = x[:, np.newaxis] - self.robot_x
+        dy = y[:, np.newaxis] - self.robot_y
+        distance_sq = dx * dx + dy * dy
+        contact = (distance_sq > 0) & (distance_sq < contact_distance**2)
+        if contact.any():
+            distance = np.sqrt(np.where(contact, distance_sq, 1.0))
+            nx, ny = dx / distance, dy / distance
+            depth = np.where(contact, contact_distance - distance, 0.0)
+            x = x + (nx * depth).sum(axis=1)
+            y = y + (ny * depth).sum(axis=1)
+
+            approach = (vx[:, np.newaxis] - self.robot_vx) * nx + (
+                vy[:, np.newaxis] - self.robot_vy
+            ) * ny
+            impulse = np.where(
+                contact & (approach < 0),
+                -(1 + BALL_ROBOT_RESTITUTION) * approach,
+                0.0,
+            )
+            vx = vx + (impulse * nx).sum(axis=1)
+            vy = vy + (impulse * ny).sum(axis=1)
+
+        x, y, hit_x, hit_y = confine_batch(x, y, BALL_RADIUS)
+        vx[hit_x] *= -BALL_RESTITUTION
+        vy[hit_y] *= -BALL_RESTITUTION
+
+        self.ball_x, self.ball_y = x, y
+        self.ball_vx, self.ball_vy = vx, vy
@@ -0,0 +1,244 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from headless.batch_physics import BatchPhysics
+from headless.consts import (
+    BALL_EMITTER_RANGE,
+    ROBOT_RADIUS,
+    SONAR_MAX_RANGE,
+    SONAR_MAX_VALUE,
+    SONAR_OFFSET,
+    WALL_X,
+    WALL_Y,
+)
+from headless.runner import load_team_controllers, TEAM_BLUE_DIR
+
+# Wheel velocities of robot2.py backing off an obstacle in front of it
+ROBOT2_BACKOFF = (-6, -8)
+
+
+@dataclass
+class Observations:
+    """What the robots of all the matches sense in a step, as arrays of
+    shape ``(n_matches, n_robots)``: the same values as their devices in
+    the headless world.
+
+    Attributes:
+        time (float): Seconds since the start of the match
+        ball_visible: Whether the ball is within range of the ball receiver
+        ball_direction_x: Direction to the ball in the frame of the robot
+        ball_direction_y: Same, along the Y axis of the robot
+        ball_strength: Signal strength of the ball, 1 / distance^2
+        heading: Heading of the robot, as computed from the compass
+        x: GPS X coordinate
+        y: GPS Y coordinate
+        sonar_front: Value of the front distance sensor
+    """
+
+    time: float
+    ball_visible: np.ndarray
+    ball_direction_x: np.ndarray
+    ball_direction_y: np.ndarray
+    ball_strength: np.ndarray
+    heading: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    sonar_front: np.ndarray
+
+
+def sonar_batch(physics: BatchPhysics, headings: np.ndarray) -> np.ndarray:
+    """Batched variant of ``HeadlessDistanceSensor.getValue`` for the front
+    sensors of all the robots."""
+    dx, dy = np.cos(headings), np.sin(headings)
+    x = physics.robot_x + dx * SONAR_OFFSET
+    y = physics.robot_y + dy * SONAR_OFFSET
+
+    # Walls, see distance_to_walls
+    with np.errstate(divide="ignore", invalid="ignore"):
+        to_x = np.where(dx > 0, WALL_X - x, -WALL_X - x) / dx
+        to_y = np.where(dy > 0, WALL_Y - y, -WALL_Y - y) / dy
+    to_x[dx == 0] = np.inf
+    to_y[dy == 0] = np.inf
+    distance = np.maximum(np.minimum(to_x, to_y), 0.0)
+
+    # Other robots, see distance_to_disc
+    ox = physics.robot_x[:, np.newaxis, :] - x[:, :, np.newaxis]
+    oy = physics.robot_y[:, np.newaxis, :] - y[:, :, np.newaxis]
+    along = ox * dx[:, :, np.newaxis] + oy * dy[:, :, np.newaxis]
+    off_sq = ox * ox + oy * oy - along * along
+    hit = (along >= 0) & (off_sq <= ROBOT_RADIUS**2)
+    hit &= ~np.eye(physics.n_robots, dtype=bool)
+    to_robot = np.where(
+        hit,
+        np.maximum(
+            along - np.sqrt(np.maximum(ROBOT_RADIUS**2 - off_sq, 0)), 0
+        ),
+        np.inf,
+    )
+    distance = np.minimum(distance, to_robot.min(axis=2))
+
+    distance = np.minimum(distance, SONAR_MAX_RANGE)
+    return distance / SONAR_MAX_RANGE * SONAR_MAX_VALUE
+
+
+def observe(physics: BatchPhysics, time: float) -> Observations:
+    """Compute the observations of all the robots of all the matches."""
+    headings = physics.get_headings()
+    dx = physics.ball_x[:, np.newaxis] - physics.robot_x
+    dy = physics.ball_y[:, np.newaxis] - physics.robot_y
+    distance = np.hypot(dx, dy)
+    visible = (distance > 0) & (distance <= BALL_EMITTER_RANGE)
+    distance = np.where(distance > 0, distance, 1.0)
+    c, s = np.cos(headings), np.sin(headings)
+    return Observations(
+        time=time,
+        ball_visible=visible,
+        ball_direction_x=(dx * c + dy * s) / distance,
+        ball_direction_y=(dy * c - dx * s) / distance,
+        ball_strength=distance**-2,
+        heading=headings,
+        x=physics.robot_x,
+        y=physics.robot_y,
+        sonar_front=sonar_batch(physics, headings),
+    )
+
+
+def get_direction_batch(ball_direction_y: np.ndarray, deadband: float):
+    """Batched variant of ``utils.get_direction`` of the teams."""
+    return np.where(
+        np.abs(ball_direction_y) <= deadband, 0, np.sign(ball_direction_y)
+    )
+
+
+class DefaultTeamPolicy:
+    """Vectorized port of ``robot1.py``-``robot3.py`` of the default teams,
+    which drives the robots of one team in all the matches at once.
+
+    The robots run the same logic as the controllers with the same
+    parameters (the ``Params`` of the ``MyRobot<N>`` classes), from the
+    observations of the step. The team messages are left out, as the
+    controllers do not act on them.
+
+    Args:
+        params (dict): Parameters of each robot number
+    """
+
+    def __init__(self, params: Dict[int, Any]):
+        self.params = params
+
+    @classmethod
+    def from_directory(
+        cls,
+        directory: Path = TEAM_BLUE_DIR,
+        overrides: Optional[Dict[int, Dict]] = None,
+    ) -> "DefaultTeamPolicy":
+        """Create the policy with the ``Params`` of the controllers of a
+        team, whose defaults may be overridden by robot number (see
+        ``LockstepRunner``)."""
+        overrides = overrides or {}
+        controllers = load_team_controllers(directory)
+        return cls(
+            {
+                number: controller.Params(**overrides.get(number, {}))
+                for number, controller in controllers.items()
+            }
+        )
+
+    def act(
+        self, observations: Observations, robots: List[int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the left and right wheel velocities of the robots of the
+        team, as arrays of shape ``(n_matches, len(robots))``.
+
+        Args:
+            observations (Observations): Observations of all the robots
+            robots (list): Columns of the robots of the team, robot 1 first
+        """
+        controllers = (self._robot1, self._robot2, self._robot3)
+        wheels = [
+            controller(observations, robot, self.params[number])
+            for number, (controller, robot) in enumerate(
+                zip(controllers, robots), 1
+            )
+        ]
+        left, right = zip(*wheels)
+        return np.stack(left, axis=1), np.stack(right, axis=1)
+
+    def _robot1(self, obs: Observations, i: int, params) -> tuple:
+        direction = get_direction_batch(
+            obs.ball_direction_y[:, i], params.deadband
+        )
+        visible = obs.ball_visible[:, i]
+        ahead = direction == 0
+        left = np.where(
+            ahead, params.forward_speed, direction * params.turn_speed
+        )
+        right = np.where(
+            ahead, params.forward_speed, -direction * params.turn_speed
+        )
+        # Spin on the spot to find the ball
+        left = np.where(visible, left, -params.search_speed)
+        right = np.where(visible, right, params.search_speed)
+        return left, right
+
+    def _robot2(self, obs: Observations, i: int, params) -> tuple:
+        direction = get_direction_batch(
+            obs.ball_direction_y[:, i], params.deadband
+        )
+        if obs.time < params.kickoff_duration:
+            speed = params.kickoff_speed
+        else:
+            speed = params.max_speed
+        turn_speed = speed * params.turn_factor
+        ahead = direction == 0
+        left = np.where(ahead, speed, direction * turn_speed)
+        right = np.where(ahead, speed, -direction * turn_speed)
+
+        chase = obs.ball_strength[:, i] > params.chase_strength
+        left = np.where(chase, left, 0.0)
+        right = np.where(chase, right, 0.0)
+        sonar = obs.sonar_front[:, i]
+        blocked = (sonar > 0) & (sonar < params.blocked_distance)
+        left = np.where(blocked, ROBOT2_BACKOFF[0], left)
+        right = np.where(blocked, ROBOT2_BACKOFF[1], right)
+
+        visible = obs.ball_visible[:, i]
+        left = np.where(visible, left, -params.search_speed)
+        right = np.where(visible, right, params.search_speed)
+        return left, right
+
+    def _robot3(self, obs: Observations, i: int, params) -> tuple:
+        # The goalkeeper faces along +X (heading 0) and slides in front of
+        # its goal
+        heading_error = -obs.heading[:, i]
+        heading_error = (heading_error + np.pi) % (2 * np.pi) - np.pi
+        heading_error = np.where(
+            np.abs(heading_error) < params.heading_tolerance,
+            0.0,
+            heading_error,
+        )
+        correction = heading_error * params.heading_gain
+
+        angle = obs.ball_direction_x[:, i]
+        tracking = obs.ball_visible[:, i] & (
+            np.abs(angle) > params.ball_deadzone
+        )
+        max_speed = params.max_speed
+        base_speed = np.clip(
+            np.where(tracking, angle * params.tracking_gain, 0.0),
+            -max_speed,
+            max_speed,
+        )
+        x = obs.x[:, i]
+        at_post = ((x > params.limit_x) & (base_speed > 0)) | (
+            (x < -params.limit_x) & (base_speed < 0)
+        )
+        tilted = np.abs(heading_error) > params.max_tilt
+        base_speed = np.where(at_post | tilted, 0.0, base_speed)
+
+        left = np.clip(base_speed - correction, -max_speed, max_speed)
+        right = np.clip(base_speed + correction, -max_speed, max_speed)
+        return left, right
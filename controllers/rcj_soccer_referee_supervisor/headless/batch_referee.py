@@ -0,0 +1,450 @@
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from headless.batch_physics import BatchPhysics
+from headless.world import rotation_to_heading
+from referee.base_supervisor import NEUTRAL_SPOT_POSITIONS
+from referee.consts import (
+    BALL_INITIAL_TRANSLATION,
+    DISTANCE_AROUND_UNOCCUPIED_NEUTRAL_SPOT,
+    KICKOFF_TRANSLATION,
+    LACK_OF_PROGRESS_NUMBER_OF_NEUTRAL_SPOTS,
+    ROBOT_INITIAL_ROTATION,
+    ROBOT_INITIAL_TRANSLATION,
+    ROBOT_NAMES,
+    TIME_STEP,
+)
+from referee.enums import FsyncPolicy, ReflogCompression, Team
+from referee.event_handlers import JSONLoggerHandler
+from referee.events import (
+    Event,
+    Goal,
+    Kickoff,
+    LackOfProgress,
+    MatchFinish,
+    MatchStart,
+)
+from referee.penalty_area_checker import BatchPenaltyAreaChecker
+from referee.progress_checker import BatchProgressChecker
+from referee.utils import (
+    is_in_blue_goal_mask,
+    is_in_penalty_area_mask,
+    is_in_yellow_goal_mask,
+    is_outside_mask,
+)
+
+# Initial poses of the robots, in the order of ROBOT_NAMES
+INITIAL_X = np.array([ROBOT_INITIAL_TRANSLATION[r][0] for r in ROBOT_NAMES])
+INITIAL_Y = np.array([ROBOT_INITIAL_TRANSLATION[r][1] for r in ROBOT_NAMES])
+INITIAL_HEADING = np.array(
+    [rotation_to_heading(ROBOT_INITIAL_ROTATION[r]) for r in ROBOT_NAMES]
+)
+# Robots whose time in the penalty areas is limited: all but the
+# goalkeepers
+PENALTY_AREA_ROBOTS = [i for i, r in enumerate(ROBOT_NAMES) if r[1] != "3"]
+GOALKEEPERS = np.array([robot[1] == "3" for robot in ROBOT_NAMES])
+
+
+class BatchReferee:
+    """The rules of ``RCJSoccerReferee`` applied to many independent
+    matches at once, on top of :class:`BatchPhysics`.
+
+    Every tick, the goals, the robots and the ball outside the field or
+    lacking progress and the robots staying in a penalty area for too long
+    are checked in all the matches with batched functions, and the poses
+    they reset are written straight to the arrays of the physics. The
+    matches share their clock, but each one has its own score, kickoff
+    wait and checkers.
+
+    The events of each match are collected as it is played, in the same
+    order as ``RCJSoccerReferee`` fires them, and written to its own reflog
+    by ``write_reflogs``.
+
+    Args:
+        physics (BatchPhysics): The world of the matches
+        match_time (int): Length of the matches, in seconds
+        match_ids (list): ID of each match
+        half_id (int): Half played by all the matches
+        team_name_blue (str): Name of the blue team
+        team_name_yellow (str): Name of the yellow team
+        seed (int, optional): Seed of the kickoffs, the neutral spots and
+            the initial position noise
+
+    See ``RCJSoccerReferee`` for the rule parameters.
+    """
+
+    def __init__(
+        self,
+        physics: BatchPhysics,
+        match_time: int,
+        match_ids: List[int],
+        half_id: int,
+        progress_check_steps: int,
+        progress_check_threshold: float,
+        ball_progress_check_steps: int,
+        ball_progress_check_threshold: float,
+        team_name_blue: str,
+        team_name_yellow: str,
+        penalty_area_allowed_time: int,
+        penalty_area_reset_after: int,
+        post_goal_wait_time: int = 3,
+        initial_position_noise: float = 0.15,
+        seed: Optional[int] = None,
+    ):
+        n_matches = physics.n_matches
+        if len(match_ids) != n_matches:
+            raise ValueError("Expected an ID for each match")
+
+        self.physics = physics
+        self.match_time = match_time
+        self.time = match_time
+        self.match_ids = match_ids
+        self.half_id = half_id
+        self.team_name_blue = team_name_blue
+        self.team_name_yellow = team_name_yellow
+        self.post_goal_wait_time = post_goal_wait_time
+        self.initial_position_noise = initial_position_noise
+        self.rng = np.random.default_rng(seed)
+
+        self.score_blue = np.zeros(n_matches, dtype=np.int64)
+        self.score_yellow = np.zeros(n_matches, dtype=np.int64)
+        self.ball_reset_timer = np.zeros(n_matches)
+        self.ball_stop = np.full(n_matches, 2)
+        # Team kicking off once the wait after a goal is over
+        self.team_to_kickoff = np.full(n_matches, Team.BLUE.value)
+        # Robots whose physics is reset again at the start of the next tick
+        self.robots_to_reset_physics = np.zeros(
+            (n_matches, len(ROBOT_NAMES)), dtype=bool
+        )
+
+        self.progress_check = BatchProgressChecker(
+            n_matches,
+            len(ROBOT_NAMES),
+            progress_check_steps,
+            progress_check_threshold,
+        )
+        self.ball_progress_check = BatchProgressChecker(
+            n_matches,
+            1,
+            ball_progress_check_steps,
+            ball_progress_check_threshold,
+        )
+        self.penalty_area_check = BatchPenaltyAreaChecker(
+            n_matches,
+            len(PENALTY_AREA_ROBOTS),
+            penalty_area_allowed_time,
+            penalty_area_reset_after,
+        )
+
+        self.events: List[List[Event]] = [[] for _ in range(n_matches)]
+
+        everything = np.ones(n_matches, dtype=bool)
+        self.reset_positions(everything)
+
+    @property
+    def n_matches(self) -> int:
+        return self.physics.n_matches
+
+    def fire(self, match: int, event: Event):
+        event.stamp(self.match_time - self.time)
+        self.events[match].append(event)
+
+    def reset_checkers(self, robots: np.ndarray):
+        """Reset the checkers of the robots of a ``(n_matches, n_robots)``
+        mask."""
+        self.progress_check.reset(robots)
+        self.penalty_area_check.reset(robots[:, PENALTY_AREA_ROBOTS])
+
+    def reset_ball_position(self, matches: np.ndarray):
+        physics = self.physics
+        physics.ball_x[matches] = BALL_INITIAL_TRANSLATION[0]
+        physics.ball_y[matches] = BALL_INITIAL_TRANSLATION[1]
+        physics.stop_balls(matches)
+        self.ball_stop[matches] = 2
+        self.ball_progress_check.reset(matches[:, np.newaxis])
+
+    def set_robot_poses(self, robots: np.ndarray, x, y, heading):
+        """Move the robots of a mask, whose physics is reset."""
+        physics = self.physics
+        physics.robot_x = np.where(robots, x, physics.robot_x)
+        physics.robot_y = np.where(robots, y, physics.robot_y)
+        physics.robot_heading = np.where(
+            robots, heading, physics.robot_heading
+        )
+        physics.stop_robots(robots)
+        self.robots_to_reset_physics |= robots
+
+    def reset_robot_positions(self, robots: np.ndarray):
+        level = self.initial_position_noise
+        shape = robots.shape
+        x = INITIAL_X + (self.rng.random(shape) - 0.5) * level
+        y = INITIAL_Y + (self.rng.random(shape) - 0.5) * level
+        self.set_robot_poses(robots, x, y, INITIAL_HEADING)
+        self.reset_checkers(robots)
+
+    def reset_positions(self, matches: np.ndarray):
+        self.reset_ball_position(matches)
+        robots = np.repeat(matches[:, np.newaxis], len(ROBOT_NAMES), axis=1)
+        self.reset_robot_positions(robots)
+
+    def kickoff(self, matches: np.ndarray, teams: Optional[np.ndarray] = None):
+        """Move robot 1 of the team kicking off in each match of the mask to
+        its kickoff position.
+
+        Args:
+            matches (np.ndarray): Mask of the matches kicking off
+            teams (np.ndarray, optional): Team of each match, drawn at
+                random by default
+        """
+        draw = self.rng.random(self.n_matches) > 0.5
+        if teams is None:
+            teams = np.where(draw, Team.BLUE.value, Team.YELLOW.value)
+        for team in (Team.BLUE.value, Team.YELLOW.value):
+            robot = f"{team}1"
+            column = ROBOT_NAMES.index(robot)
+            x, y, _ = KICKOFF_TRANSLATION[team]
+            robots = np.zeros_like(self.robots_to_reset_physics)
+            robots[:, column] = matches & (teams == team)
+            heading = INITIAL_HEADING[column]
+            self.set_robot_poses(robots, x, y, heading)
+            for match in np.flatnonzero(robots[:, column]):
+                self.fire(match, Kickoff(robot_name=robot, team_name=team))
+
+    def _occupied_spots(self) -> np.ndarray:
+        """Return which neutral spots are occupied by a robot or the ball
+        in each match, as a ``(n_matches, n_spots)`` mask."""
+        physics = self.physics
+        xs = np.concatenate(
+            [physics.robot_x, physics.ball_x[:, np.newaxis]], axis=1
+        )
+        ys = np.concatenate(
+            [physics.robot_y, physics.ball_y[:, np.newaxis]], axis=1
+        )
+        distances_sq = self._spot_distances_sq(xs, ys)
+        limit_sq = DISTANCE_AROUND_UNOCCUPIED_NEUTRAL_SPOT**2
+        return (distances_sq < limit_sq).any(axis=1)
+
+    @staticmethod
+    def _spot_distances_sq(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Return the squared distances from objects of shape
+        ``(n_matches, n_objects)`` to every neutral spot."""
+        spot_x = NEUTRAL_SPOT_POSITIONS[:, 0]
+        spot_y = NEUTRAL_SPOT_POSITIONS[:, 1]
+        return (xs[:, :, np.newaxis] - spot_x) ** 2 + (
+            ys[:, :, np.newaxis] - spot_y
+        ) ** 2
+
+    def _sorted_free_spots(
+        self, distances_sq: np.ndarray, furthest: bool
+    ) -> tuple:
+        """Sort the neutral spots of each match by distance, the occupied
+        ones last, as ``get_unoccupied_neutral_spots_sorted`` does.
+
+        Returns:
+            tuple: The spots in order and the number of unoccupied ones, for
+                each match
+        """
+        occupied = self._occupied_spots()
+        keys = -distances_sq if furthest else distances_sq
+        order = np.argsort(
+            np.where(occupied, np.inf, keys), axis=1, kind="stable"
+        )
+        return order, (~occupied).sum(axis=1)
+
+    def tick(self) -> bool:
+        """Apply the rules to all the matches after a step.
+
+        Returns:
+            bool: False once the matches are over
+        """
+        everything = np.arange(self.n_matches)
+        # See BaseRCJSoccerSupervisor.check_reset_physics_counters
+        moved = self.robots_to_reset_physics
+        self.physics.stop_robots(moved)
+        self.physics.stop_balls(moved.any(axis=1))
+        self.robots_to_reset_physics = np.zeros_like(moved)
+
+        if self.time == self.match_time:
+            for match in everything:
+                self.fire(
+                    match,
+                    MatchStart(
+                        score_yellow=int(self.score_yellow[match]),
+                        score_blue=int(self.score_blue[match]),
+                        total_match_time=self.match_time,
+                        team_name_yellow=self.team_name_yellow,
+                        team_name_blue=self.team_name_blue,
+                        match_id=self.match_ids[match],
+                        halftime=self.half_id,
+                    ),
+                )
+        self.time -= TIME_STEP / 1000.0
+
+        if self.time < 0:
+            for match in everything:
+                self.fire(
+                    match,
+                    MatchFinish(
+                        total_match_time=self.match_time,
+                        score_yellow=int(self.score_yellow[match]),
+                        score_blue=int(self.score_blue[match]),
+                        team_name_yellow=self.team_name_yellow,
+                        team_name_blue=self.team_name_blue,
+                    ),
+                )
+            return False
+
+        playing = self.ball_reset_timer == 0
+        waiting = ~playing
+        if playing.any():
+            self.check_goal(playing)
+            self.check_progress(playing)
+            self.check_robots_in_penalty_area(playing)
+        if waiting.any():
+            self.ball_reset_timer[waiting] -= TIME_STEP / 1000.0
+            over = waiting & (self.ball_reset_timer <= 0)
+            if over.any():
+                self.reset_positions(over)
+                self.ball_reset_timer[over] = 0
+                self.kickoff(over, self.team_to_kickoff)
+
+        self.physics.stop_balls(self.ball_stop == 1)
+        self.ball_stop[self.ball_stop > 0] -= 1
+        return True
+
+    def check_goal(self, playing: np.ndarray):
+        x, y = self.physics.ball_x, self.physics.ball_y
+        in_blue = playing & is_in_blue_goal_mask(x, y)
+        in_yellow = playing & ~in_blue & is_in_yellow_goal_mask(x, y)
+        self.score_yellow += in_blue
+        self.score_blue += in_yellow
+
+        scored = in_blue | in_yellow
+        self.ball_reset_timer[scored] = self.post_goal_wait_time
+        self.team_to_kickoff[in_blue] = Team.BLUE.value
+        self.team_to_kickoff[in_yellow] = Team.YELLOW.value
+        for match in np.flatnonzero(scored):
+            team_name = (
+                self.team_name_yellow
+                if in_blue[match]
+                else self.team_name_blue
+            )
+            self.fire(
+                match,
+                Goal(
+                    team_name=team_name,
+                    score_yellow=int(self.score_yellow[match]),
+                    score_blue=int(self.score_blue[match]),
+                ),
+            )
+
+    def check_progress(self, playing: np.ndarray):
+        """Check that the robots, as well as the balls, have made enough
+        progress. Robots outside the field go back to their initial
+        position, as do the goalkeepers lacking progress."""
+        physics = self.physics
+        robots = playing[:, np.newaxis]
+        xs, ys = physics.robot_x, physics.robot_y
+        self.progress_check.track(xs, ys, robots)
+        outside = robots & is_outside_mask(xs, ys)
+        stuck = robots & ~outside & ~self.progress_check.is_progress()
+
+        for match, robot in zip(*np.nonzero(stuck)):
+            self.fire(match, LackOfProgress("robot", ROBOT_NAMES[robot]))
+        reset = outside | (stuck & GOALKEEPERS)
+        if reset.any():
+            self.reset_robot_positions(reset)
+        self.reset_checkers(stuck)
+
+        ball_x, ball_y = physics.ball_x, physics.ball_y
+        balls = playing[:, np.newaxis]
+        self.ball_progress_check.track(
+            ball_x[:, np.newaxis], ball_y[:, np.newaxis], balls
+        )
+        lost = playing & (
+            is_outside_mask(ball_x, ball_y)
+            | ~self.ball_progress_check.is_progress()[:, 0]
+        )
+        if not lost.any():
+            return
+        for match in np.flatnonzero(lost):
+            self.fire(match, LackOfProgress("ball"))
+
+        distances_sq = self._spot_distances_sq(
+            ball_x[:, np.newaxis], ball_y[:, np.newaxis]
+        )[:, 0]
+        order, n_free = self._sorted_free_spots(distances_sq, furthest=False)
+        # One of the nearest unoccupied spots, at random
+        choices = np.minimum(n_free, LACK_OF_PROGRESS_NUMBER_OF_NEUTRAL_SPOTS)
+        picks = (self.rng.random(self.n_matches) * choices).astype(int)
+        spots = order[np.arange(self.n_matches), picks]
+        moved = lost & (n_free > 0)
+        physics.ball_x[moved] = NEUTRAL_SPOT_POSITIONS[spots[moved], 0]
+        physics.ball_y[moved] = NEUTRAL_SPOT_POSITIONS[spots[moved], 1]
+        physics.stop_balls(moved)
+        self.ball_stop[moved] = 2
+        self.ball_progress_check.reset(lost[:, np.newaxis])
+
+    def check_robots_in_penalty_area(self, playing: np.ndarray):
+        """Move the robots staying in a penalty area for too long to the
+        furthest unoccupied neutral spot."""
+        physics = self.physics
+        columns = PENALTY_AREA_ROBOTS
+        inside = is_in_penalty_area_mask(
+            physics.robot_x[:, columns], physics.robot_y[:, columns]
+        )
+        self.penalty_area_check.update(
+            inside, self.time, playing[:, np.newaxis]
+        )
+        violating = playing[:, np.newaxis] & (
+            self.penalty_area_check.is_violating()
+        )
+        # One robot after the other, as each one occupies its new spot
+        for k in np.flatnonzero(violating.any(axis=0)):
+            robot = columns[k]
+            distances_sq = self._spot_distances_sq(
+                physics.robot_x[:, [robot]],
+                physics.robot_y[:, [robot]],
+            )[:, 0]
+            order, n_free = self._sorted_free_spots(
+                distances_sq, furthest=True
+            )
+            spots = order[:, 0]
+            robots = np.zeros_like(self.robots_to_reset_physics)
+            robots[:, robot] = violating[:, k] & (n_free > 0)
+            self.set_robot_poses(
+                robots,
+                NEUTRAL_SPOT_POSITIONS[spots, 0][:, np.newaxis],
+                NEUTRAL_SPOT_POSITIONS[spots, 1][:, np.newaxis],
+                INITIAL_HEADING,
+            )
+            self.reset_checkers(robots)
+
+    def write_reflogs(
+        self,
+        directory: Path,
+        prefix: str = "batch",
+        compression: str = ReflogCompression.NONE.value,
+        fsync: str = FsyncPolicy.NONE.value,
+    ) -> List[Path]:
+        """Write the events of each match to its reflog,
+        ``<prefix>-<match ID>.jsonl`` in ``directory``, in the format of
+        ``JSONLoggerHandler``.
+
+        Returns:
+            list: Paths of the reflogs
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for match_id, events in zip(self.match_ids, self.events):
+            handler = JSONLoggerHandler(
+                directory / f"{prefix}-{match_id}.jsonl", compression, fsync
+            )
+            for event in events:
+                handler.handle(self, event)
+            handler.close()
+            paths.extend(handler.writer.paths)
+        return paths
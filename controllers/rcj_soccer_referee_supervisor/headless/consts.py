@@ -0,0 +1,46 @@
+from referee.consts import (
+    FIELD_X_UPPER_LIMIT,
+    FIELD_Y_UPPER_LIMIT,
+    GOAL_BLUE_BACK_WALL_Y_LIMIT,
+    GOAL_X_UPPER_LIMIT,
+)
+from referee.enums import Team
+
+# Dimensions taken from worlds/soccer.wbt
+WHEEL_RADIUS = 0.02
+AXLE_LENGTH = 0.09
+# Default maxVelocity of a Webots RotationalMotor (rad/s)
+MAX_WHEEL_VELOCITY = 10.0
+ROBOT_SIZE = 0.075
+ROBOT_RADIUS = ROBOT_SIZE / 2
+BALL_RADIUS = 0.021
+WALL_THICKNESS = 0.01
+
+# Inner faces of the walls surrounding the field and the goals
+WALL_X = FIELD_X_UPPER_LIMIT - WALL_THICKNESS / 2
+WALL_Y = FIELD_Y_UPPER_LIMIT - WALL_THICKNESS / 2
+GOAL_WALL_X = GOAL_X_UPPER_LIMIT
+GOAL_BACK_WALL_Y = GOAL_BLUE_BACK_WALL_Y_LIMIT
+
+# Simplified ball dynamics
+BALL_ROLLING_FRICTION = 0.8  # exponential velocity decay per second
+BALL_STOP_VELOCITY = 0.005  # m/s, below this the ball is considered still
+BALL_RESTITUTION = 0.6  # ball vs. walls
+BALL_ROBOT_RESTITUTION = 0.4  # ball vs. robots
+
+# Relative standard deviation of the wheel slip noise
+WHEEL_SLIP_NOISE = 0.02
+
+SIMULATION_MODE_PAUSE = 0
+SIMULATION_MODE_REAL_TIME = 1
+SIMULATION_MODE_FAST = 2
+
+# Devices of the robots, see worlds/soccer.wbt
+SUPERVISOR_CHANNEL = 1
+TEAM_CHANNELS = {Team.BLUE.value: 2, Team.YELLOW.value: 3}
+BALL_CHANNEL = 4
+BALL_EMITTER_RANGE = 0.6
+BALL_PACKET = "x"
+SONAR_OFFSET = 0.0385
+SONAR_MAX_RANGE = 1.0
+SONAR_MAX_VALUE = 1000.0
@@ -0,0 +1,228 @@
+import math
+from collections import deque
+from typing import Any, Deque, List, Optional, Tuple, TYPE_CHECKING
+
+from headless.consts import (
+    ROBOT_RADIUS,
+    SONAR_MAX_RANGE,
+    SONAR_MAX_VALUE,
+    SONAR_OFFSET,
+    WALL_X,
+    WALL_Y,
+)
+
+if TYPE_CHECKING:
+    from headless.world import HeadlessWorld
+
+# A received packet: its data, the direction to the emitter in the frame of
+# the receiver and the signal strength
+Packet = Tuple[Any, List[float], float]
+
+
+class HeadlessDevice:
+    """Base of the stand-ins for the Webots devices of a robot.
+
+    Args:
+        world (HeadlessWorld): The world the device lives in
+        robot (int, optional): Index of the robot owning the device, None for
+            the devices of the supervisor
+    """
+
+    def __init__(self, world: "HeadlessWorld", robot: Optional[int] = None):
+        self.world = world
+        self.robot = robot
+        self.sampling_period = 0
+
+    def enable(self, sampling_period: int):
+        self.sampling_period = sampling_period
+
+    def disable(self):
+        self.sampling_period = 0
+
+    def getSamplingPeriod(self) -> int:
+        return self.sampling_period
+
+
+class HeadlessEmitter(HeadlessDevice):
+    """Stand-in for the Webots ``Emitter`` device. Packets sent during a
+    step are kept until the world delivers them at the next step, the same
+    way Webots does."""
+
+    def __init__(
+        self,
+        world: "HeadlessWorld",
+        robot: Optional[int] = None,
+        channel: int = 0,
+    ):
+        super().__init__(world, robot)
+        self.channel = channel
+        self.packets: List[Any] = []
+
+    def send(self, data: Any) -> int:
+        self.packets.append(data)
+        return 1
+
+    def setChannel(self, channel: int):
+        self.channel = channel
+
+    def getChannel(self) -> int:
+        return self.channel
+
+
+class HeadlessReceiver(HeadlessDevice):
+    """Stand-in for the Webots ``Receiver`` device."""
+
+    def __init__(
+        self,
+        world: "HeadlessWorld",
+        robot: Optional[int] = None,
+        channel: int = 0,
+    ):
+        super().__init__(world, robot)
+        self.channel = channel
+        self.queue: Deque[Packet] = deque()
+
+    def receive(self, data: Any, direction: List[float], strength: float):
+        if self.sampling_period:
+            self.queue.append((data, direction, strength))
+
+    def getQueueLength(self) -> int:
+        return len(self.queue)
+
+    def nextPacket(self):
+        self.queue.popleft()
+
+    def getBytes(self) -> bytes:
+        data = self.queue[0][0]
+        return data.encode() if isinstance(data, str) else bytes(data)
+
+    def getString(self) -> str:
+        data = self.queue[0][0]
+        return data if isinstance(data, str) else bytes(data).decode()
+
+    def getEmitterDirection(self) -> List[float]:
+        return self.queue[0][1]
+
+    def getSignalStrength(self) -> float:
+        return self.queue[0][2]
+
+    def setChannel(self, channel: int):
+        self.channel = channel
+
+    def getChannel(self) -> int:
+        return self.channel
+
+
+class HeadlessGPS(HeadlessDevice):
+    def getValues(self) -> List[float]:
+        return self.world.nodes_by_index[self.robot].get_translation()
+
+
+class HeadlessCompass(HeadlessDevice):
+    def getValues(self) -> List[float]:
+        # The direction of the north (+Y) in the frame of the robot
+        heading = self.world.physics.robot_heading[self.robot]
+        return [math.sin(heading), math.cos(heading), 0.0]
+
+
+class HeadlessDistanceSensor(HeadlessDevice):
+    """Stand-in for the sonars of the robots: casts a single ray from the
+    side of the robot and converts the distance to the nearest wall or robot
+    with the lookup table of soccer.wbt (0 - 1 m maps to 0 - 1000).
+
+    Args:
+        world (HeadlessWorld): The world the device lives in
+        robot (int): Index of the robot owning the sensor
+        angle (float): Direction of the sensor relative to the robot heading
+    """
+
+    def __init__(self, world: "HeadlessWorld", robot: int, angle: float):
+        super().__init__(world, robot)
+        self.angle = angle
+
+    def getValue(self) -> float:
+        physics = self.world.physics
+        i = self.robot
+        direction = physics.robot_heading[i] + self.angle
+        dx, dy = math.cos(direction), math.sin(direction)
+        x = physics.robot_x[i] + dx * SONAR_OFFSET
+        y = physics.robot_y[i] + dy * SONAR_OFFSET
+
+        distance = min(SONAR_MAX_RANGE, distance_to_walls(x, y, dx, dy))
+        for j in range(physics.n_robots):
+            if j != i:
+                distance = min(
+                    distance,
+                    distance_to_disc(
+                        x,
+                        y,
+                        dx,
+                        dy,
+                        physics.robot_x[j],
+                        physics.robot_y[j],
+                        ROBOT_RADIUS,
+                    ),
+                )
+        return distance / SONAR_MAX_RANGE * SONAR_MAX_VALUE
+
+
+class HeadlessMotor(HeadlessDevice):
+    """Stand-in for the wheel motors of the robots (velocity control only).
+
+    Args:
+        world (HeadlessWorld): The world the device lives in
+        robot (int): Index of the robot owning the motor
+        wheel (int): 0 for the left wheel, 1 for the right one
+    """
+
+    def __init__(self, world: "HeadlessWorld", robot: int, wheel: int):
+        super().__init__(world, robot)
+        self.wheel = wheel
+        self.velocity = 0.0
+        self.position = float("inf")
+
+    def setPosition(self, position: float):
+        self.position = position
+
+    def setVelocity(self, velocity: float):
+        self.velocity = velocity
+        wheels = self.world.physics.wheel_left, self.world.physics.wheel_right
+        wheels[self.wheel][self.robot] = velocity
+
+    def getVelocity(self) -> float:
+        return self.velocity
+
+
+def distance_to_walls(x: float, y: float, dx: float, dy: float) -> float:
+    """Distance along the ray to the walls around the field. The goals are
+    ignored."""
+    distance = math.inf
+    if dx > 0:
+        distance = min(distance, (WALL_X - x) / dx)
+    elif dx < 0:
+        distance = min(distance, (-WALL_X - x) / dx)
+    if dy > 0:
+        distance = min(distance, (WALL_Y - y) / dy)
+    elif dy < 0:
+        distance = min(distance, (-WALL_Y - y) / dy)
+    return max(distance, 0.0)
+
+
+def distance_to_disc(
+    x: float,
+    y: float,
+    dx: float,
+    dy: float,
+    cx: float,
+    cy: float,
+    radius: float,
+) -> float:
+    """Distance along the (unit) ray to a disc, infinity if it is missed."""
+    ox, oy = cx - x, cy - y
+    along = ox * dx + oy * dy
+    if along < 0:
+        return math.inf
+    off_sq = ox * ox + oy * oy - along * along
+    if off_sq > radius * radius:
+        return math.inf
+    return max(along - math.sqrt(radius * radius - off_sq), 0.0)
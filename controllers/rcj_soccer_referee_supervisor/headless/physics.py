@@ -0,0 +1,219 @@
+import math
+import random
+from typing import Optional, Tuple
+
+from headless.consts import (
+    AXLE_LENGTH,
+    BALL_RADIUS,
+    BALL_RESTITUTION,
+    BALL_ROBOT_RESTITUTION,
+    BALL_ROLLING_FRICTION,
+    BALL_STOP_VELOCITY,
+    GOAL_BACK_WALL_Y,
+    GOAL_WALL_X,
+    MAX_WHEEL_VELOCITY,
+    ROBOT_RADIUS,
+    WALL_X,
+    WALL_Y,
+    WHEEL_RADIUS,
+    WHEEL_SLIP_NOISE,
+)
+from referee.consts import N_ROBOTS
+
+
+def clamp(value: float, limit: float) -> float:
+    if value > limit:
+        return limit
+    if value < -limit:
+        return -limit
+    return value
+
+
+def confine(
+    x: float, y: float, radius: float
+) -> Tuple[float, float, bool, bool]:
+    """Keep a circular object inside the walls of the field and the goals.
+
+    Args:
+        x (float): X position
+        y (float): Y position
+        radius (float): Radius of the object
+
+    Returns:
+        tuple: The corrected x and y and whether the object hit a wall
+            along X and along Y
+    """
+    if -GOAL_WALL_X + radius < x < GOAL_WALL_X - radius:
+        y_limit = GOAL_BACK_WALL_Y - radius
+    else:
+        y_limit = WALL_Y - radius
+    hit_y = not -y_limit <= y <= y_limit
+    if hit_y:
+        y = clamp(y, y_limit)
+
+    if -WALL_Y + radius <= y <= WALL_Y - radius:
+        x_limit = WALL_X - radius
+    else:
+        x_limit = GOAL_WALL_X - radius
+    hit_x = not -x_limit <= x <= x_limit
+    if hit_x:
+        x = clamp(x, x_limit)
+
+    return x, y, hit_x, hit_y
+
+
+class SoccerPhysics:
+    """Simplified 2D physics of the soccer field.
+
+    Robots are modelled as differential-drive discs which cannot overlap,
+    the ball as a disc rolling with exponential friction which bounces off
+    the walls and the robots. Robots are considered infinitely heavy
+    compared to the ball.
+
+    The state is kept in plain Python lists: with six robots this is
+    considerably faster than NumPy, whose per-call overhead dominates on
+    arrays this small.
+
+    Args:
+        n_robots (int, optional): Number of robots on the field
+        seed (int, optional): Seed of the wheel slip noise
+        wheel_slip_noise (float, optional): Relative standard deviation of
+            the wheel slip noise, 0 turns the noise off
+    """
+
+    def __init__(
+        self,
+        n_robots: int = N_ROBOTS,
+        seed: Optional[int] = None,
+        wheel_slip_noise: float = WHEEL_SLIP_NOISE,
+    ):
+        self.n_robots = n_robots
+        self.wheel_slip_noise = wheel_slip_noise
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        """Put the robots and the ball back at the origin, at rest."""
+        n_robots = self.n_robots
+        self.robot_x = [0.0] * n_robots
+        self.robot_y = [0.0] * n_robots
+        self.robot_heading = [0.0] * n_robots
+        self.robot_vx = [0.0] * n_robots
+        self.robot_vy = [0.0] * n_robots
+        self.wheel_left = [0.0] * n_robots
+        self.wheel_right = [0.0] * n_robots
+
+        self.ball_x = 0.0
+        self.ball_y = 0.0
+        self.ball_vx = 0.0
+        self.ball_vy = 0.0
+
+    def set_wheel_velocities(self, robot: int, left: float, right: float):
+        """Set the angular velocities (rad/s) of the wheels of a robot."""
+        self.wheel_left[robot] = left
+        self.wheel_right[robot] = right
+
+    def stop_robot(self, robot: int):
+        self.robot_vx[robot] = 0.0
+        self.robot_vy[robot] = 0.0
+
+    def stop_ball(self):
+        self.ball_vx = 0.0
+        self.ball_vy = 0.0
+
+    def get_heading(self, robot: int) -> float:
+        """Return the heading of the robot normalized to [-pi, pi]."""
+        return math.remainder(self.robot_heading[robot], 2 * math.pi)
+
+    def step(self, dt: float):
+        """Advance the simulation by ``dt`` seconds."""
+        self._drive_robots(dt)
+        self._separate_robots()
+        xs, ys = self.robot_x, self.robot_y
+        for i in range(self.n_robots):
+            xs[i], ys[i], _, _ = confine(xs[i], ys[i], ROBOT_RADIUS)
+        self._step_ball(dt)
+
+    def _drive_robots(self, dt: float):
+        # The "left wheel motor" of the robots in soccer.wbt sits on the
+        # negative Y axis of the robot, hence a faster left wheel turns the
+        # robot counter-clockwise.
+        xs, ys, headings = self.robot_x, self.robot_y, self.robot_heading
+        vxs, vys = self.robot_vx, self.robot_vy
+        # Uniform noise scaled to the requested standard deviation, which is
+        # several times cheaper to draw than a Gaussian one
+        noise = self.wheel_slip_noise * 2 * math.sqrt(3)
+        rand = self.rng.random
+        for i in range(self.n_robots):
+            left = clamp(self.wheel_left[i], MAX_WHEEL_VELOCITY)
+            right = clamp(self.wheel_right[i], MAX_WHEEL_VELOCITY)
+            if noise:
+                left *= 1 + noise * (rand() - 0.5)
+                right *= 1 + noise * (rand() - 0.5)
+
+            speed = (left + right) * (WHEEL_RADIUS / 2)
+            omega = (left - right) * (WHEEL_RADIUS / AXLE_LENGTH)
+            mid_heading = headings[i] + omega * dt / 2
+
+            vxs[i] = vx = speed * math.cos(mid_heading)
+            vys[i] = vy = speed * math.sin(mid_heading)
+            xs[i] += vx * dt
+            ys[i] += vy * dt
+            headings[i] += omega * dt
+
+    def _separate_robots(self):
+        """Push overlapping robots apart, each by half of the overlap."""
+        xs, ys = self.robot_x, self.robot_y
+        min_distance = 2 * ROBOT_RADIUS
+        min_distance_sq = min_distance**2
+        for i in range(self.n_robots - 1):
+            for j in range(i + 1, self.n_robots):
+                dx = xs[i] - xs[j]
+                dy = ys[i] - ys[j]
+                distance_sq = dx * dx + dy * dy
+                if 0 < distance_sq < min_distance_sq:
+                    distance = math.sqrt(distance_sq)
+                    push = (min_distance - distance) / (2 * distance)
+                    xs[i] += dx * push
+                    ys[i] += dy * push
+                    xs[j] -= dx * push
+                    ys[j] -= dy * push
+
+    def _step_ball(self, dt: float):
+        decay = math.exp(-BALL_ROLLING_FRICTION * dt)
+        vx = self.ball_vx * decay
+        vy = self.ball_vy * decay
+        if vx * vx + vy * vy < BALL_STOP_VELOCITY**2:
+            vx = vy = 0.0
+        x = self.ball_x + vx * dt
+        y = self.ball_y + vy * dt
+
+        contact_distance = ROBOT_RADIUS + BALL_RADIUS
+        for i in range(self.n_robots):
+            dx = x - self.robot_x[i]
+            dy = y - self.robot_y[i]
+            distance_sq = dx * dx + dy * dy
+            if not 0 < distance_sq < contact_distance**2:
+                continue
+
+            distance = math.sqrt(distance_sq)
+            nx, ny = dx / distance, dy / distance
+            x += nx * (contact_distance - distance)
+            y += ny * (contact_distance - distance)
+
+            approach = (vx - self.robot_vx[i]) * nx + (
+                vy - self.robot_vy[i]
+            ) * ny
+            if approach < 0:
+                impulse = -(1 + BALL_ROBOT_RESTITUTION) * approach
+                vx += impulse * nx
+                vy += impulse * ny
+
+        x, y, hit_x, hit_y = confine(x, y, BALL_RADIUS)
+        if hit_x:
+            vx *= -BALL_RESTITUTION
+        if hit_y:
+            vy *= -BALL_RESTITUTION
+
+        self.ball_x, self.ball_y = x, y
+        self.ball_vx, self.ball_vy = vx, vy
@@ -0,0 +1,244 @@
+"""Re-referee recorded trajectories without a simulator.
+
+    python -m headless.replay reflog/ --progress-check-threshold 0.4
+
+Feeds the poses of ``.traj`` recordings (``RCJ_SIM_REC_FORMATS=trajectory``)
+into ``RCJSoccerReferee`` and reports the events it emits, e.g. to see the
+effect of different rule parameters on past matches.
+"""
+import argparse
+import json
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from headless.world import HeadlessWorld
+from recorder.trajectory import (
+    HEADING_SCALE,
+    N_TRANSLATION_CHANNELS,
+    TrajectoryReader,
+)
+from referee.base_supervisor import BaseRCJSoccerSupervisor
+from referee.consts import (
+    DISTANCE_AROUND_UNOCCUPIED_NEUTRAL_SPOT,
+    N_OBJECTS,
+    REFEREE_RULES,
+    TIME_STEP,
+)
+from referee.event_handlers import EventHandler
+from referee.events import Event
+from referee.referee import RCJSoccerReferee
+
+# (match time, event type, payload)
+ReplayedEvent = Tuple[float, str, dict]
+
+
+class ReplaySupervisor(BaseRCJSoccerSupervisor, HeadlessWorld):
+    """Read-only supervisor stand-in which plays a recorded trajectory back
+    to ``RCJSoccerReferee``, one recorded tick per step.
+
+    The referee can still move objects (to neutral spots, for kickoffs), but
+    only until the next step: the recording goes on as it was recorded.
+
+    Args:
+        reader (TrajectoryReader): The recording
+        seed (int, optional): Seed of the global ``random`` module, which
+            the referee uses for kickoffs and neutral spots
+        neutral_spot_distance (float): Objects closer than this to a
+            neutral spot occupy it
+    """
+
+    def __init__(
+        self,
+        reader: TrajectoryReader,
+        seed: Optional[int] = None,
+        neutral_spot_distance: float = DISTANCE_AROUND_UNOCCUPIED_NEUTRAL_SPOT,
+    ):
+        if seed is not None:
+            random.seed(seed)
+        super().__init__()
+        self.neutral_spot_distance = neutral_spot_distance
+        self.set_hud_enabled(False)
+
+        # Decoded once up front, each step only copies its rows
+        frames = reader.decode()
+        self.frame_translations = (
+            frames[:, :N_TRANSLATION_CHANNELS].reshape(-1, N_OBJECTS, 3) / 1000
+        )
+        self.frame_rotations = np.zeros(
+            (len(frames), self.rotations.shape[0], 4)
+        )
+        self.frame_rotations[:, :, 2] = 1
+        self.frame_rotations[:, :, 3] = (
+            frames[:, N_TRANSLATION_CHANNELS:] / HEADING_SCALE
+        )
+        self.tick = 0
+
+    def step(self, duration: int = TIME_STEP) -> int:
+        """Move on to the next recorded tick.
+
+        Returns:
+            int: -1 once the recording is over, 0 otherwise
+        """
+        # One step past the recording: the tick which ends the match is
+        # not recorded, as recorders only follow the ticks going on
+        if self.exit_status is not None or self.tick > len(
+            self.frame_translations
+        ):
+            return -1
+        self.tick += 1
+        self.time += duration / 1000.0
+        return 0
+
+    def update_positions(self):
+        # The poses recorded after a tick are the ones that tick saw
+        frame = min(self.tick, len(self.frame_translations)) - 1
+        self.translations[:] = self.frame_translations[frame]
+        self.translation_rows[:] = self.translations.tolist()
+        self.rotations[:] = self.frame_rotations[frame]
+        self._invalidate_neutral_spot_distances()
+
+    def emit_data(self, data):
+        pass
+
+
+class EventCollector(EventHandler):
+    """Handler keeping the events in memory."""
+
+    def __init__(self):
+        super().__init__()
+        self.events: List[ReplayedEvent] = []
+
+    def handle(self, referee, event: Event):
+        self.events.append((event.matchtime, event.type, event.payload))
+
+
+def replay(
+    path: Path,
+    seed: Optional[int] = 0,
+    neutral_spot_distance: float = DISTANCE_AROUND_UNOCCUPIED_NEUTRAL_SPOT,
+    **rules,
+) -> List[ReplayedEvent]:
+    """Re-referee a recorded trajectory.
+
+    Args:
+        path (Path): The ``.traj`` recording
+        seed (int, optional): Seed of the referee's random choices. The
+            same seed gives the same events.
+        neutral_spot_distance (float): Objects closer than this to a
+            neutral spot occupy it
+        **rules: Arguments of ``RCJSoccerReferee`` overriding
+            ``REFEREE_RULES``
+
+    Returns:
+        list: The events the referee emitted
+    """
+    reader = TrajectoryReader(str(path))
+    supervisor = ReplaySupervisor(reader, seed, neutral_spot_distance)
+    referee = RCJSoccerReferee(
+        supervisor=supervisor,
+        match_time=reader.match_time // 1000,
+        match_id=1,
+        half_id=1,
+        team_name_blue="Blue",
+        team_name_yellow="Yellow",
+        initial_score_blue=0,
+        initial_score_yellow=0,
+        **{**REFEREE_RULES, **rules},
+    )
+    collector = EventCollector()
+    referee.add_event_subscriber(collector)
+
+    referee.kickoff()
+    while supervisor.step(TIME_STEP) != -1:
+        if not referee.tick():
+            break
+    referee.eventer.close()
+    return collector.events
+
+
+def _replay_path(args: Tuple[Path, Optional[int], float, dict]):
+    path, seed, neutral_spot_distance, rules = args
+    return path, replay(path, seed, neutral_spot_distance, **rules)
+
+
+def replay_all(
+    paths: List[Path],
+    seed: Optional[int] = 0,
+    neutral_spot_distance: float = DISTANCE_AROUND_UNOCCUPIED_NEUTRAL_SPOT,
+    processes: Optional[int] = None,
+    **rules,
+) -> Dict[Path, List[ReplayedEvent]]:
+    """Re-referee many recordings across a pool of processes.
+
+    Args:
+        paths (list): The ``.traj`` recordings
+        processes (int, optional): Size of the pool, the number of CPUs by
+            default
+
+    See ``replay`` for the other arguments.
+
+    Returns:
+        dict: The events of each recording
+    """
+    jobs = [(path, seed, neutral_spot_distance, rules) for path in paths]
+    with ProcessPoolExecutor(processes) as pool:
+        return dict(pool.map(_replay_path, jobs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "path",
+        type=Path,
+        help="A .traj recording, or a directory of recordings",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument(
+        "--neutral-spot-distance",
+        type=float,
+        default=DISTANCE_AROUND_UNOCCUPIED_NEUTRAL_SPOT,
+    )
+    for rule, default in REFEREE_RULES.items():
+        parser.add_argument(
+            f"--{rule.replace('_', '-')}", type=type(default), default=default
+        )
+    parser.add_argument(
+        "--events",
+        action="store_true",
+        help="Print every event as a JSON line instead of a summary",
+    )
+    args = parser.parse_args()
+
+    rules = {rule: getattr(args, rule) for rule in REFEREE_RULES}
+    if args.path.is_dir():
+        paths = sorted(args.path.glob("*.traj"))
+    else:
+        paths = [args.path]
+    results = replay_all(
+        paths, args.seed, args.neutral_spot_distance, args.processes, **rules
+    )
+
+    for path, events in results.items():
+        if args.events:
+            for matchtime, event, payload in events:
+                line = {
+                    "file": path.name,
+                    "matchtime": matchtime,
+                    "event": event,
+                    "payload": payload,
+                }
+                print(json.dumps(line))
+        else:
+            counts = Counter(event for _, event, _ in events)
+            summary = ", ".join(f"{n} {event}" for event, n in counts.items())
+            print(f"{path.name}: {summary}")
+
+
+if __name__ == "__main__":
+    main()
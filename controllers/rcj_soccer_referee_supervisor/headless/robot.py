@@ -0,0 +1,124 @@
+import math
+import threading
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+from headless.consts import BALL_CHANNEL, SUPERVISOR_CHANNEL, TEAM_CHANNELS
+from headless.devices import (
+    HeadlessCompass,
+    HeadlessDistanceSensor,
+    HeadlessEmitter,
+    HeadlessGPS,
+    HeadlessMotor,
+    HeadlessReceiver,
+)
+from referee.consts import ROBOT_NAMES, TIME_STEP
+
+if TYPE_CHECKING:
+    from headless.world import HeadlessWorld
+
+
+class HeadlessRobot:
+    """Stand-in for the Webots ``Robot`` API of a single robot, so that
+    ``RCJSoccerRobot`` subclasses can be run unchanged on top of the headless
+    world.
+
+    The robot controller runs in its own thread, but only ever one thread is
+    running at a time: ``step`` hands control back to the runner and blocks
+    until the runner has advanced the world and resumes the robot, which
+    keeps everything in lockstep and deterministic.
+
+    Args:
+        world (HeadlessWorld): The world the robot lives in
+        name (str): Name of the robot, e.g. "B1"
+    """
+
+    def __init__(self, world: "HeadlessWorld", name: str):
+        self.world = world
+        self.name = name
+        self.index = ROBOT_NAMES.index(name)
+
+        # Plain locks used as binary semaphores: they may be released by
+        # another thread and are much cheaper than threading.Semaphore
+        self._resume = threading.Lock()
+        self._resume.acquire()
+        self._yielded = threading.Lock()
+        self._yielded.acquire()
+        self._stopped = False
+        self.finished = False
+
+        self.devices = self._create_devices()
+
+    def _create_devices(self) -> Dict[str, Any]:
+        world, i = self.world, self.index
+        team_channel = TEAM_CHANNELS[self.name[0]]
+        return {
+            "supervisor receiver": world.add_receiver(
+                HeadlessReceiver(world, i, SUPERVISOR_CHANNEL)
+            ),
+            "team emitter": world.add_emitter(
+                HeadlessEmitter(world, i, team_channel)
+            ),
+            "team receiver": world.add_receiver(
+                HeadlessReceiver(world, i, team_channel)
+            ),
+            "ball receiver": world.add_receiver(
+                HeadlessReceiver(world, i, BALL_CHANNEL)
+            ),
+            "gps": HeadlessGPS(world, i),
+            "compass": HeadlessCompass(world, i),
+            "distancesensor front": HeadlessDistanceSensor(world, i, 0.0),
+            "distancesensor left": HeadlessDistanceSensor(
+                world, i, math.pi / 2
+            ),
+            "distancesensor back": HeadlessDistanceSensor(world, i, math.pi),
+            "distancesensor right": HeadlessDistanceSensor(
+                world, i, -math.pi / 2
+            ),
+            "left wheel motor": HeadlessMotor(world, i, 0),
+            "right wheel motor": HeadlessMotor(world, i, 1),
+        }
+
+    def getName(self) -> str:
+        return self.name
+
+    def getDevice(self, name: str) -> Optional[Any]:
+        return self.devices.get(name)
+
+    def getTime(self) -> float:
+        return self.world.getTime()
+
+    def getBasicTimeStep(self) -> float:
+        return float(TIME_STEP)
+
+    def step(self, duration: int = TIME_STEP) -> int:
+        """Wait until the runner has advanced the world by one step.
+
+        Returns:
+            int: -1 once the match is over, 0 otherwise
+        """
+        if self._stopped:
+            return -1
+        self._yielded.release()
+        self._resume.acquire()
+        return -1 if self._stopped else 0
+
+    def resume(self):
+        """Let the controller run until its next call to ``step``. Called
+        from the runner thread."""
+        if self.finished:
+            return
+        self._resume.release()
+        self._yielded.acquire()
+
+    def wait_until_yielded(self):
+        self._yielded.acquire()
+
+    def mark_finished(self):
+        self.finished = True
+        self._yielded.release()
+
+    def stop(self):
+        """Make the pending and any further ``step`` call return -1."""
+        self._stopped = True
+        if not self.finished:
+            self._resume.release()
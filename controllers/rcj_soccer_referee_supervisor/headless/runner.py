@@ -0,0 +1,232 @@
+import cProfile
+import importlib
+import logging
+import pstats
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Type
+
+from headless.robot import HeadlessRobot
+from headless.supervisor import HeadlessSupervisor
+from referee.consts import REFEREE_RULES, ROBOT_NAMES, TIME_STEP
+from referee.enums import Team, TickPhase
+from referee.referee import RCJSoccerReferee
+
+CONTROLLERS_DIR = Path(__file__).resolve().parents[2]
+TEAM_BLUE_DIR = CONTROLLERS_DIR / "rcj_soccer_team_blue"
+TEAM_YELLOW_DIR = CONTROLLERS_DIR / "rcj_soccer_team_yellow"
+
+
+def create_referee(
+    supervisor: HeadlessSupervisor, **parameters
+) -> RCJSoccerReferee:
+    """Create the referee of a headless match, with the rule parameters of
+    ``REFEREE_RULES`` as in Webots. The other parameters of
+    ``RCJSoccerReferee`` (match time, team names, ...) are passed on."""
+    return RCJSoccerReferee(
+        supervisor=supervisor, **REFEREE_RULES, **parameters
+    )
+
+
+def load_team_controllers(directory: Path) -> Dict[int, Type]:
+    """Import the ``MyRobot1``-``MyRobot3`` controller classes of a team.
+
+    Both teams use the same module names (``robot1``, ``utils``, ...), so the
+    modules of a team are removed from ``sys.modules`` once its classes are
+    loaded. The classes keep referencing their own copies.
+
+    Args:
+        directory (Path): Directory of the team's controller
+
+    Returns:
+        dict: Controller class for each robot number
+    """
+    directory = Path(directory).resolve()
+    before = dict(sys.modules)
+    sys.path.insert(0, str(directory))
+    try:
+        return {
+            number: getattr(
+                importlib.import_module(f"robot{number}"),
+                f"MyRobot{number}",
+            )
+            for number in (1, 2, 3)
+        }
+    finally:
+        sys.path.remove(str(directory))
+        for name in set(sys.modules) - set(before):
+            del sys.modules[name]
+        sys.modules.update(before)
+
+
+class LockstepRunner:
+    """Runs the referee and all six robot controllers of a match in a
+    single process, on top of the headless world.
+
+    Every step the world is advanced, the referee ticks and then each
+    robot controller runs until its next ``robot.step`` call, in a fixed
+    order. Each robot controller lives in its own thread, but the threads
+    never run concurrently.
+
+    Args:
+        supervisor (HeadlessSupervisor): The headless world
+        referee (RCJSoccerReferee): Referee of the match
+        team_blue_dir (Path): Controller directory of the blue team
+        team_yellow_dir (Path): Controller directory of the yellow team
+        profile (bool): Whether to collect a cProfile profile of the whole
+            match, including the robot controllers
+        recorders (list, optional): Recorders whose ``record`` is called
+            after each tick, e.g. ``TrajectoryRecordAssistant``
+        team_blue_params (dict, optional): Parameters overriding the
+            defaults of the ``Params`` of the blue robots, by robot number
+            (e.g. ``{3: {"heading_gain": 2.0}}``)
+        team_yellow_params (dict, optional): Same for the yellow robots
+    """
+
+    def __init__(
+        self,
+        supervisor: HeadlessSupervisor,
+        referee: RCJSoccerReferee,
+        team_blue_dir: Path = TEAM_BLUE_DIR,
+        team_yellow_dir: Path = TEAM_YELLOW_DIR,
+        profile: bool = False,
+        recorders: Optional[List] = None,
+        team_blue_params: Optional[Dict[int, Dict]] = None,
+        team_yellow_params: Optional[Dict[int, Dict]] = None,
+    ):
+        self.supervisor = supervisor
+        self.referee = referee
+        self.controllers = {
+            Team.BLUE.value: load_team_controllers(team_blue_dir),
+            Team.YELLOW.value: load_team_controllers(team_yellow_dir),
+        }
+        self.params = {
+            Team.BLUE.value: team_blue_params or {},
+            Team.YELLOW.value: team_yellow_params or {},
+        }
+        self.profilers: List[cProfile.Profile] = []
+        self.profile = profile
+        self.recorders = recorders or []
+
+        self.robots: List[HeadlessRobot] = []
+        self.threads: List[threading.Thread] = []
+        self.errors: Dict[str, BaseException] = {}
+
+    def _new_profiler(self) -> Optional[cProfile.Profile]:
+        if not self.profile:
+            return None
+        # Since Python 3.12 a single profiler sees every thread (and only one
+        # can be enabled at a time)
+        if self.profilers and sys.version_info >= (3, 12):
+            return None
+        profiler = cProfile.Profile()
+        self.profilers.append(profiler)
+        return profiler
+
+    def _run_controller(self, robot: HeadlessRobot):
+        team, number = robot.name[0], int(robot.name[1])
+        controller_class = self.controllers[team][number]
+        overrides = self.params[team].get(number)
+        profiler = self._new_profiler()
+        try:
+            if profiler:
+                profiler.enable()
+            if overrides:
+                params = controller_class.Params(**overrides)
+                controller = controller_class(robot, params)
+            else:
+                controller = controller_class(robot)
+            controller.run()
+        except BaseException as e:
+            logging.exception(f"Controller of robot {robot.name} crashed")
+            self.errors[robot.name] = e
+        finally:
+            if profiler:
+                profiler.disable()
+            robot.mark_finished()
+
+    def start(self):
+        """Start the robot controllers and let them run until their first
+        ``robot.step`` call."""
+        for name in ROBOT_NAMES:
+            robot = HeadlessRobot(self.supervisor, name)
+            thread = threading.Thread(
+                target=self._run_controller,
+                args=(robot,),
+                name=f"robot-{name}",
+                daemon=True,
+            )
+            self.robots.append(robot)
+            self.threads.append(thread)
+            thread.start()
+            robot.wait_until_yielded()
+
+    def step(self) -> bool:
+        """Advance the match by one step.
+
+        Returns:
+            bool: False once the match is over
+        """
+        self._lap(None)
+        if self.supervisor.step(TIME_STEP) == -1:
+            return False
+        self._lap(TickPhase.STEP.value)
+        if not self.referee.tick():
+            return False
+        for recorder in self.recorders:
+            recorder.record(self.referee)
+        self._lap(TickPhase.RECORD.value)
+        for robot in self.robots:
+            robot.resume()
+        self._lap(TickPhase.ROBOTS.value)
+        return True
+
+    def _lap(self, phase: Optional[str]):
+        """Time a phase with the profiler of the referee, if any. Without
+        a phase, the timing starts from now."""
+        profiler = self.referee.profiler
+        if profiler is None:
+            return
+        if phase is None:
+            profiler.mark()
+        else:
+            profiler.lap(phase)
+
+    def stop(self):
+        for robot in self.robots:
+            robot.stop()
+        for thread in self.threads:
+            thread.join()
+
+    def run(self) -> int:
+        """Play the whole match.
+
+        Returns:
+            int: Number of steps played
+        """
+        profiler = self._new_profiler()
+        if profiler:
+            profiler.enable()
+
+        steps = 0
+        self.start()
+        try:
+            self.referee.kickoff()
+            while self.step():
+                steps += 1
+        finally:
+            self.stop()
+            if profiler:
+                profiler.disable()
+        return steps
+
+    def profile_stats(self) -> pstats.Stats:
+        """Return the merged profile of the runner and all the robot
+        controllers. Requires ``profile=True``."""
+        if not self.profilers:
+            raise RuntimeError("The match was not profiled")
+        stats = pstats.Stats(self.profilers[0])
+        for profiler in self.profilers[1:]:
+            stats.add(profiler)
+        return stats
@@ -0,0 +1,38 @@
+import random
+from typing import Optional
+
+from headless.world import HeadlessWorld
+from referee.base_supervisor import BaseRCJSoccerSupervisor
+
+
+class HeadlessSupervisor(BaseRCJSoccerSupervisor, HeadlessWorld):
+    """RCJ Soccer supervisor running on top of the headless 2D physics
+    instead of Webots. It can be handed to ``RCJSoccerReferee`` as is.
+
+    Args:
+        seed (int, optional): When set, both the physics noise and the
+            global ``random`` module (used by the referee for kickoffs and
+            neutral spots) are seeded, which makes the runs deterministic.
+        wheel_slip_noise (float, optional): Relative wheel slip noise
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        wheel_slip_noise: Optional[float] = None,
+    ):
+        if seed is not None:
+            random.seed(seed)
+        super().__init__(seed=seed, wheel_slip_noise=wheel_slip_noise)
+        self.seed = seed
+
+    def set_wheel_velocities(self, robot_name: str, left: float, right: float):
+        """Set the wheel velocities of a robot, as its motors would.
+
+        Args:
+            robot_name (str): The robot whose wheels are driven
+            left (float): Velocity of the left wheel in rad/s
+            right (float): Velocity of the right wheel in rad/s
+        """
+        index = self.robot_nodes[robot_name].index
+        self.physics.set_wheel_velocities(index, left, right)
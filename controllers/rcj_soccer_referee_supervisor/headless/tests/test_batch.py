@@ -0,0 +1,177 @@
+from pathlib import Path
+
+import pytest
+
+from headless.batch import BatchSimulator, play_batch
+from headless.batch_physics import BatchPhysics
+from headless.batch_policy import DefaultTeamPolicy, observe
+from headless.batch_referee import BatchReferee, INITIAL_X
+from referee.consts import (
+    KICKOFF_TRANSLATION,
+    NEUTRAL_SPOTS,
+    REFEREE_RULES,
+    TIME_STEP,
+    YELLOW_MIDDLE_NS,
+)
+from referee.enums import GameEvents
+from referee.reflog import read_reflog
+
+
+def create_batch_referee(n_matches: int, **parameters) -> BatchReferee:
+    physics = BatchPhysics(n_matches, seed=1, wheel_slip_noise=0.0)
+    rules = {**REFEREE_RULES, **parameters}
+    return BatchReferee(
+        physics,
+        match_time=10,
+        match_ids=list(range(1, n_matches + 1)),
+        half_id=1,
+        team_name_blue="Blues",
+        team_name_yellow="Yellows",
+        seed=1,
+        **rules,
+    )
+
+
+def event_types(referee: BatchReferee, match: int) -> list:
+    return [event.type for event in referee.events[match]]
+
+
+def test_goal_and_kickoff():
+    referee = create_batch_referee(3)
+    physics = referee.physics
+    physics.ball_x[1] = 0.0
+    physics.ball_y[1] = -0.8
+    assert referee.tick()
+
+    assert referee.score_blue.tolist() == [0, 1, 0]
+    assert referee.score_yellow.tolist() == [0, 0, 0]
+    goal = referee.events[1][1]
+    assert goal.type == GameEvents.GOAL.value
+    assert goal.payload == {
+        "team_name": "Blues",
+        "score_yellow": 0,
+        "score_blue": 1,
+    }
+    assert GameEvents.GOAL.value not in event_types(referee, 0)
+
+    # The yellow team kicks off once the wait after the goal is over
+    for _ in range(round(3 / (TIME_STEP / 1000.0))):
+        referee.tick()
+    kickoff = referee.events[1][-1]
+    assert kickoff.type == GameEvents.KICKOFF.value
+    assert kickoff.payload == {"robot_name": "Y1", "team_name": "Y"}
+    assert physics.robot_x[1, 3] == KICKOFF_TRANSLATION["Y"][0]
+    assert physics.ball_x[1] == 0.0 and physics.ball_y[1] == 0.0
+    assert GameEvents.KICKOFF.value not in event_types(referee, 2)
+
+
+def test_lack_of_progress():
+    referee = create_batch_referee(
+        2, progress_check_steps=5, ball_progress_check_steps=1000
+    )
+    physics = referee.physics
+    for _ in range(7):
+        # Every robot of the first match but its goalkeepers keeps moving
+        physics.robot_x[0, [0, 1, 3, 4]] += 0.2
+        referee.tick()
+
+    robots = [
+        event.robot_name
+        for event in referee.events[0]
+        if event.type == GameEvents.LACK_OF_PROGRESS.value
+    ]
+    assert robots == ["B3", "Y3"]
+    assert len(referee.events[1]) == 1 + 6
+    # Only the goalkeepers are moved back
+    assert physics.robot_x[1, 2] == INITIAL_X[2]
+
+
+def test_ball_lack_of_progress():
+    referee = create_batch_referee(
+        2, progress_check_steps=1000, ball_progress_check_steps=5
+    )
+    physics = referee.physics
+    for _ in range(7):
+        physics.ball_x[1] += 0.2
+        physics.ball_x[1] %= 0.4
+        referee.tick()
+
+    assert event_types(referee, 0)[-1] == GameEvents.LACK_OF_PROGRESS.value
+    assert referee.events[0][-1].payload == {"type": "ball"}
+    # Moved to a neutral spot
+    assert (physics.ball_x[0], physics.ball_y[0]) != (0.0, 0.0)
+    assert GameEvents.LACK_OF_PROGRESS.value not in event_types(referee, 1)
+
+
+def test_penalty_area():
+    referee = create_batch_referee(2, penalty_area_allowed_time=1)
+    physics = referee.physics
+    physics.robot_x[0, 0], physics.robot_y[0, 0] = 0.0, 0.65
+    for _ in range(round(1 / (TIME_STEP / 1000.0)) + 2):
+        referee.tick()
+
+    # Moved to the furthest unoccupied neutral spot, Y1 and Y2 standing
+    # next to the yellow corner ones
+    spot = (physics.robot_x[0, 0], physics.robot_y[0, 0])
+    assert spot == NEUTRAL_SPOTS[YELLOW_MIDDLE_NS]
+    assert physics.robot_x[1, 0] == INITIAL_X[0]
+
+
+def test_match_finish():
+    referee = create_batch_referee(2)
+    ticks = 0
+    while referee.tick():
+        ticks += 1
+
+    assert ticks == round(10 / (TIME_STEP / 1000.0))
+    for match in range(2):
+        assert event_types(referee, match)[0] == GameEvents.MATCH_START.value
+        finish = referee.events[match][-1]
+        assert finish.type == GameEvents.MATCH_FINISH.value
+        assert finish.matchtime == pytest.approx(10, abs=0.1)
+
+
+def test_policy_search_and_chase():
+    physics = BatchPhysics(2, wheel_slip_noise=0.0)
+    physics.robot_x[:] = [-0.3, 0.0, 0.0, 0.5, 0.5, 0.5]
+    physics.ball_x[:] = [0.0, -1.0]
+    observations = observe(physics, 10.0)
+    policy = DefaultTeamPolicy.from_directory(
+        overrides={1: {"search_speed": 3}}
+    )
+    left, right = policy.act(observations, [0, 1, 2])
+
+    # Robot 1 drives to the ball straight ahead, or spins to find it
+    assert (left[0, 0], right[0, 0]) == (10, 10)
+    assert (left[1, 0], right[1, 0]) == (-3, 3)
+
+
+def test_simulator_is_deterministic():
+    def run(seed: int) -> list:
+        policy = DefaultTeamPolicy.from_directory()
+        simulator = BatchSimulator([1, 2, 3], 5, policy, policy, seed=seed)
+        simulator.run()
+        return [event_types(simulator.referee, i) for i in range(3)] + [
+            simulator.physics.robot_x.tolist()
+        ]
+
+    assert run(1) == run(1)
+    assert run(1) != run(2)
+
+
+def test_play_batch(tmp_path: Path):
+    results = play_batch([7, 8], seed=3, match_time=5, output=tmp_path)
+
+    assert [result["match_id"] for result in results] == [7, 8]
+    for result in results:
+        reflog = list(
+            read_reflog(tmp_path / f"batch-{result['match_id']}.jsonl")
+        )
+        # The match kicks off before the first tick, as with LockstepRunner
+        assert reflog[0]["event"] == GameEvents.KICKOFF.value
+        assert reflog[1]["event"] == GameEvents.MATCH_START.value
+        assert reflog[1]["payload"]["match_id"] == result["match_id"]
+        finish = reflog[-1]
+        assert finish["event"] == GameEvents.MATCH_FINISH.value
+        assert finish["payload"]["score_blue"] == result["score_blue"]
+        assert finish["payload"]["score_yellow"] == result["score_yellow"]
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from headless.batch_physics import BatchPhysics, confine_batch
+from headless.consts import BALL_RADIUS, ROBOT_RADIUS
+from headless.physics import confine, SoccerPhysics
+
+
+def test_confine_batch():
+    rng = np.random.default_rng(4)
+    xs = rng.uniform(-1, 1, 50)
+    ys = rng.uniform(-1, 1, 50)
+    x, y, hit_x, hit_y = confine_batch(xs, ys, BALL_RADIUS)
+
+    for i in range(50):
+        expected = confine(xs[i], ys[i], BALL_RADIUS)
+        assert (x[i], y[i], hit_x[i], hit_y[i]) == pytest.approx(expected)
+
+
+def test_matches_soccer_physics():
+    """Matches with two robots and a ball, where at most two objects touch
+    at a time, follow the scalar physics."""
+    rng = np.random.default_rng(5)
+    n_matches = 4
+    batch = BatchPhysics(n_matches, n_robots=2, wheel_slip_noise=0.0)
+    scalars = [
+        SoccerPhysics(n_robots=2, wheel_slip_noise=0.0)
+        for _ in range(n_matches)
+    ]
+    # The robots drive towards the ball from both sides
+    batch.robot_x[:] = [-0.3, 0.3]
+    batch.robot_y[:] = rng.uniform(-0.05, 0.05, (n_matches, 2))
+    batch.robot_heading[:] = [0.0, np.pi]
+    batch.ball_vy[:] = rng.uniform(-0.2, 0.2, n_matches)
+    left = rng.uniform(5, 10, (n_matches, 2))
+    right = rng.uniform(5, 10, (n_matches, 2))
+    batch.set_wheel_velocities(left, right)
+    for i, physics in enumerate(scalars):
+        physics.robot_x = batch.robot_x[i].tolist()
+        physics.robot_y = batch.robot_y[i].tolist()
+        physics.robot_heading = batch.robot_heading[i].tolist()
+        physics.ball_vy = batch.ball_vy[i]
+        for robot in range(2):
+            physics.set_wheel_velocities(
+                robot, left[i, robot], right[i, robot]
+            )
+
+    for _ in range(100):
+        batch.step(0.032)
+        for i, physics in enumerate(scalars):
+            physics.step(0.032)
+            assert batch.robot_x[i] == pytest.approx(physics.robot_x)
+            assert batch.robot_y[i] == pytest.approx(physics.robot_y)
+            assert batch.ball_x[i] == pytest.approx(physics.ball_x)
+            assert batch.ball_y[i] == pytest.approx(physics.ball_y)
+            assert batch.get_headings()[i] == pytest.approx(
+                [physics.get_heading(robot) for robot in range(2)]
+            )
+
+
+def test_robots_do_not_overlap():
+    physics = BatchPhysics(2, wheel_slip_noise=0.0)
+    physics.robot_x[:] = np.linspace(-0.01, 0.01, 6)
+    physics.step(0.032)
+    for _ in range(20):
+        physics.step(0.032)
+
+    dx = physics.robot_x[:, :, np.newaxis] - physics.robot_x[:, np.newaxis]
+    dy = physics.robot_y[:, :, np.newaxis] - physics.robot_y[:, np.newaxis]
+    distance = np.hypot(dx, dy) + np.eye(6)
+    assert distance.min() > 2 * ROBOT_RADIUS * 0.9
+
+
+def test_seeded_noise_is_deterministic():
+    def run(seed: int) -> np.ndarray:
+        physics = BatchPhysics(3, seed=seed)
+        physics.set_wheel_velocities(np.full((3, 6), 10), np.full((3, 6), 8))
+        for _ in range(10):
+            physics.step(0.032)
+        return physics.robot_x
+
+    assert np.array_equal(run(1), run(1))
+    assert not np.array_equal(run(1), run(2))
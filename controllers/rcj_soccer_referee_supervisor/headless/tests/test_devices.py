@@ -0,0 +1,106 @@
+import math
+
+import pytest
+
+from headless.consts import BALL_EMITTER_RANGE, SONAR_MAX_VALUE, WALL_X
+from headless.robot import HeadlessRobot
+from headless.world import HeadlessWorld
+from referee.consts import TIME_STEP
+
+
+@pytest.fixture
+def world() -> HeadlessWorld:
+    world = HeadlessWorld(seed=1, wheel_slip_noise=0.0)
+    # Spread the robots along the X axis
+    for i in range(world.physics.n_robots):
+        world.physics.robot_x[i] = -0.5 + i * 0.2
+        world.physics.robot_y[i] = -0.5
+    return world
+
+
+@pytest.fixture
+def robot(world: HeadlessWorld) -> HeadlessRobot:
+    robot = HeadlessRobot(world, "B1")
+    for device in robot.devices.values():
+        device.enable(TIME_STEP)
+    return robot
+
+
+def test_gps(world: HeadlessWorld, robot: HeadlessRobot):
+    assert robot.getDevice("gps").getValues()[:2] == [-0.5, -0.5]
+
+
+@pytest.mark.parametrize("heading", [0.0, 1.0, -2.0])
+def test_compass(world: HeadlessWorld, robot: HeadlessRobot, heading: float):
+    world.physics.robot_heading[0] = heading
+    north = robot.getDevice("compass").getValues()
+
+    assert math.atan2(north[0], north[1]) == pytest.approx(heading)
+
+
+def test_motors(world: HeadlessWorld, robot: HeadlessRobot):
+    robot.getDevice("left wheel motor").setVelocity(3.0)
+    robot.getDevice("right wheel motor").setVelocity(-2.0)
+
+    assert world.physics.wheel_left[0] == 3.0
+    assert world.physics.wheel_right[0] == -2.0
+
+
+def test_sonar_sees_wall(world: HeadlessWorld, robot: HeadlessRobot):
+    world.physics.robot_heading[0] = math.pi
+    value = robot.getDevice("distancesensor front").getValue()
+
+    expected = (WALL_X - 0.5 - 0.0385) * SONAR_MAX_VALUE
+    assert value == pytest.approx(expected)
+
+
+def test_sonar_sees_robot(world: HeadlessWorld, robot: HeadlessRobot):
+    value = robot.getDevice("distancesensor front").getValue()
+
+    assert value == pytest.approx((0.2 - 0.0385 - 0.0375) * SONAR_MAX_VALUE)
+
+
+def test_supervisor_packets(world: HeadlessWorld, robot: HeadlessRobot):
+    receiver = robot.getDevice("supervisor receiver")
+    world.getDevice("emitter").send('{"waiting_for_kickoff": false}')
+
+    assert receiver.getQueueLength() == 0
+    world.step(TIME_STEP)
+    assert receiver.getQueueLength() == 1
+    assert receiver.getString() == '{"waiting_for_kickoff": false}'
+    receiver.nextPacket()
+    assert receiver.getQueueLength() == 0
+
+
+def test_team_packets(world: HeadlessWorld, robot: HeadlessRobot):
+    teammate = HeadlessRobot(world, "B2")
+    opponent = HeadlessRobot(world, "Y2")
+    for r in (teammate, opponent):
+        r.getDevice("team receiver").enable(TIME_STEP)
+
+    robot.getDevice("team emitter").send("hello")
+    world.step(TIME_STEP)
+
+    assert teammate.getDevice("team receiver").getQueueLength() == 1
+    assert opponent.getDevice("team receiver").getQueueLength() == 0
+    assert robot.getDevice("team receiver").getQueueLength() == 0
+
+
+def test_ball_packets(world: HeadlessWorld, robot: HeadlessRobot):
+    receiver = robot.getDevice("ball receiver")
+    world.physics.ball_x, world.physics.ball_y = -0.5, -0.3
+    world.physics.robot_heading[0] = math.pi / 2
+    world.step(TIME_STEP)
+
+    assert receiver.getQueueLength() == 1
+    direction = receiver.getEmitterDirection()
+    assert direction == pytest.approx([1.0, 0.0, 0.0])
+    assert receiver.getSignalStrength() == pytest.approx(0.2**-2)
+
+
+def test_ball_out_of_range(world: HeadlessWorld, robot: HeadlessRobot):
+    world.physics.ball_x = -0.5 + BALL_EMITTER_RANGE + 0.01
+    world.physics.ball_y = -0.5
+    world.step(TIME_STEP)
+
+    assert robot.getDevice("ball receiver").getQueueLength() == 0
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from headless.__main__ import main
+from referee.enums import GameEvents
+from referee.reflog import read_reflog
+
+
+class Clock(datetime):
+    """Moves a second ahead every time it is read, as if each match took
+    at least that long."""
+
+    current = datetime(2024, 1, 1)
+
+    @classmethod
+    def utcnow(cls) -> datetime:
+        cls.current += timedelta(seconds=1)
+        return cls.current
+
+
+def test_matches_do_not_share_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr("referee.match.datetime", Clock)
+    monkeypatch.setattr("sys.argv", ["headless", "--seed", "3"])
+    monkeypatch.setenv("RCJ_SIM_OUTPUT_PATH", str(tmp_path))
+    monkeypatch.setenv("RCJ_SIM_MATCH_TIME", "1")
+    monkeypatch.setenv("RCJ_SIM_REC_FORMATS", "trajectory")
+    monkeypatch.setenv("RCJ_SIM_NO_HUD", "1")
+
+    main()
+    main()
+
+    reflogs = sorted(tmp_path.glob("*.jsonl"))
+    assert len(reflogs) == 2
+    assert len(list(tmp_path.glob("*.traj"))) == 2
+    for reflog in reflogs:
+        events = [line["event"] for line in read_reflog(reflog)]
+        assert events.count(GameEvents.MATCH_START.value) == 1
+        assert events[-1] == GameEvents.MATCH_FINISH.value
@@ -0,0 +1,105 @@
+import math
+
+import pytest
+
+from headless.consts import (
+    BALL_RADIUS,
+    GOAL_BACK_WALL_Y,
+    ROBOT_RADIUS,
+    WALL_X,
+    WALL_Y,
+)
+from headless.physics import confine, SoccerPhysics
+
+
+@pytest.fixture
+def physics() -> SoccerPhysics:
+    return SoccerPhysics(n_robots=2, seed=1, wheel_slip_noise=0.0)
+
+
+@pytest.mark.parametrize(
+    "x,y,expected",
+    [
+        (0.0, 0.0, (0.0, 0.0, False, False)),
+        (1.0, 0.0, (WALL_X - 0.01, 0.0, True, False)),
+        (0.5, 1.0, (0.5, WALL_Y - 0.01, False, True)),
+        (0.0, -1.0, (0.0, -GOAL_BACK_WALL_Y + 0.01, False, True)),
+    ],
+)
+def test_confine(x: float, y: float, expected: tuple):
+    assert confine(x, y, 0.01) == pytest.approx(expected)
+
+
+def test_drive_forward(physics: SoccerPhysics):
+    physics.set_wheel_velocities(0, 10, 10)
+    physics.step(1.0)
+
+    assert physics.robot_x[0] == pytest.approx(0.2)
+    assert physics.robot_y[0] == pytest.approx(0.0)
+    assert physics.robot_heading[0] == pytest.approx(0.0)
+
+
+def test_faster_left_wheel_turns_counter_clockwise(physics: SoccerPhysics):
+    physics.set_wheel_velocities(0, 5, -5)
+    physics.step(0.1)
+
+    assert physics.robot_heading[0] > 0
+    assert physics.robot_x[0] == pytest.approx(0.0)
+
+
+def test_wheel_velocity_is_limited(physics: SoccerPhysics):
+    physics.set_wheel_velocities(0, 100, 100)
+    physics.step(1.0)
+
+    assert physics.robot_x[0] == pytest.approx(0.2)
+
+
+def test_robots_do_not_overlap(physics: SoccerPhysics):
+    physics.robot_x[1] = 0.01
+    physics.step(0.032)
+
+    distance = physics.robot_x[1] - physics.robot_x[0]
+    assert distance == pytest.approx(2 * ROBOT_RADIUS)
+
+
+def test_robot_pushes_ball(physics: SoccerPhysics):
+    physics.robot_x[1] = -0.5
+    physics.ball_x = ROBOT_RADIUS + BALL_RADIUS + 0.001
+    physics.set_wheel_velocities(0, 10, 10)
+    for _ in range(10):
+        physics.step(0.032)
+
+    assert physics.ball_vx > 0
+    assert physics.ball_x > physics.robot_x[0] + ROBOT_RADIUS
+
+
+def test_ball_bounces_off_wall(physics: SoccerPhysics):
+    physics.robot_x = [-0.5, 0.5]
+    physics.ball_x = WALL_X - BALL_RADIUS - 0.001
+    physics.ball_vx = 1.0
+    physics.step(0.032)
+
+    assert physics.ball_vx < 0
+    assert physics.ball_x <= WALL_X - BALL_RADIUS
+
+
+def test_ball_stops_eventually(physics: SoccerPhysics):
+    physics.robot_x = [-0.5, 0.5]
+    physics.ball_vy = 0.5
+    for _ in range(1000):
+        physics.step(0.032)
+
+    assert physics.ball_vx == physics.ball_vy == 0.0
+
+
+def test_seeded_noise_is_deterministic():
+    def run(seed: int) -> float:
+        physics = SoccerPhysics(n_robots=1, seed=seed)
+        physics.set_wheel_velocities(0, 10, 10)
+        for _ in range(100):
+            physics.step(0.032)
+        return physics.robot_heading[0]
+
+    assert run(1) == run(1)
+    assert run(1) != run(2)
+    assert not math.isnan(run(1))
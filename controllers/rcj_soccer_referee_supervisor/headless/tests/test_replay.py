@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pytest
+
+from headless.replay import replay, replay_all, ReplaySupervisor
+from headless.runner import LockstepRunner
+from headless.supervisor import HeadlessSupervisor
+from headless.tests.test_supervisor import create_referee
+from recorder.trajectory import TrajectoryReader, TrajectoryRecordAssistant
+from referee.consts import TIME_STEP
+
+MATCH_TIME = 20
+
+
+@pytest.fixture(scope="module")
+def recording(tmp_path_factory) -> Path:
+    path = tmp_path_factory.mktemp("replay") / "match.traj"
+    supervisor = HeadlessSupervisor(seed=3)
+    referee = create_referee(supervisor, MATCH_TIME)
+    recorder = TrajectoryRecordAssistant(supervisor, str(path), MATCH_TIME)
+    recorder.start_recording()
+    LockstepRunner(supervisor, referee, recorders=[recorder]).run()
+    recorder.stop_recording()
+    return path
+
+
+def test_supervisor_plays_recording(recording: Path):
+    reader = TrajectoryReader(str(recording))
+    supervisor = ReplaySupervisor(reader)
+
+    steps = 0
+    while supervisor.step(TIME_STEP) != -1:
+        supervisor.update_positions()
+        tick = min(steps, len(reader) - 1)
+        assert supervisor.translations == pytest.approx(
+            reader.translations(tick)
+        )
+        steps += 1
+
+    assert steps == len(reader) + 1
+
+
+def test_replay(recording: Path):
+    events = [event for _, event, _ in replay(recording)]
+
+    assert events[:2] == ["KICKOFF", "MATCH_START"]
+    assert events[-1] == "MATCH_FINISH"
+
+
+def test_replay_is_deterministic(recording: Path):
+    assert replay(recording, seed=7) == replay(recording, seed=7)
+
+
+def test_replay_rules(recording: Path):
+    def lack_of_progress(events):
+        return [e for _, e, _ in events if e == "LACK_OF_PROGRESS"]
+
+    default = replay(recording)
+    strict = replay(recording, progress_check_threshold=100)
+
+    assert len(lack_of_progress(strict)) > len(lack_of_progress(default))
+
+
+def test_replay_all(recording: Path, tmp_path: Path):
+    paths = [tmp_path / "a.traj", tmp_path / "b.traj"]
+    for path in paths:
+        path.write_bytes(recording.read_bytes())
+
+    results = replay_all(paths, processes=2)
+
+    assert list(results) == paths
+    assert all(events == replay(recording) for events in results.values())
@@ -0,0 +1,156 @@
+from pathlib import Path
+
+import pytest
+
+from headless.runner import (
+    load_team_controllers,
+    LockstepRunner,
+    TEAM_BLUE_DIR,
+    TEAM_YELLOW_DIR,
+)
+from headless.supervisor import HeadlessSupervisor
+from headless.tests.test_supervisor import create_referee
+from recorder.trajectory import TrajectoryReader, TrajectoryRecordAssistant
+from referee.consts import ROBOT_INITIAL_TRANSLATION, TIME_STEP
+from referee.enums import PacketFormat, TickPhase
+from referee.profiler import TickProfiler
+
+
+@pytest.fixture
+def runner() -> LockstepRunner:
+    supervisor = HeadlessSupervisor(seed=3)
+    referee = create_referee(supervisor, 5)
+    return LockstepRunner(supervisor, referee)
+
+
+@pytest.mark.parametrize("directory", [TEAM_BLUE_DIR, TEAM_YELLOW_DIR])
+def test_load_team_controllers(directory: Path):
+    controllers = load_team_controllers(directory)
+
+    assert sorted(controllers) == [1, 2, 3]
+    assert controllers[1].__name__ == "MyRobot1"
+    assert "robot1" not in __import__("sys").modules
+
+
+def test_teams_are_isolated():
+    blue = load_team_controllers(TEAM_BLUE_DIR)
+    yellow = load_team_controllers(TEAM_YELLOW_DIR)
+
+    assert blue[1] is not yellow[1]
+    assert blue[1].__mro__[1] is not yellow[1].__mro__[1]
+
+
+def test_run_match(runner: LockstepRunner):
+    steps = runner.run()
+
+    assert steps == 5000 // 32
+    assert runner.errors == {}
+    assert all(robot.finished for robot in runner.robots)
+    assert not any(thread.is_alive() for thread in runner.threads)
+
+    moved = [
+        robot
+        for robot, (x, y, _) in ROBOT_INITIAL_TRANSLATION.items()
+        if runner.supervisor.get_robot_translation(robot)[:2].tolist()
+        != [x, y]
+    ]
+    assert moved
+
+
+def test_crashing_controller(runner: LockstepRunner):
+    class Crashing:
+        def __init__(self, robot):
+            self.robot = robot
+
+        def run(self):
+            self.robot.step(32)
+            raise RuntimeError("boom")
+
+    runner.controllers["B"][2] = Crashing
+    runner.run()
+
+    assert list(runner.errors) == ["B2"]
+    assert isinstance(runner.errors["B2"], RuntimeError)
+
+
+@pytest.mark.parametrize("packet_format", PacketFormat.all())
+def test_robots_decode_supervisor_packets(
+    runner: LockstepRunner, packet_format: str
+):
+    runner.referee.packet_format = packet_format
+    packets = []
+
+    class Reading(runner.controllers["B"][1].__mro__[1]):
+        def run(self):
+            while self.robot.step(TIME_STEP) != -1:
+                while self.is_new_data():
+                    packets.append(self.get_new_data())
+
+    runner.controllers["B"][1] = Reading
+    runner.run()
+
+    assert runner.errors == {}
+    assert packets
+    assert packets[0]["waiting_for_kickoff"] is False
+    binary = packet_format == PacketFormat.BINARY.value
+    assert ("remaining_time" in packets[0]) == binary
+
+
+def test_recorders(runner: LockstepRunner, tmp_path: Path):
+    path = str(tmp_path / "match.traj")
+    recorder = TrajectoryRecordAssistant(runner.supervisor, path, 5)
+    recorder.start_recording()
+    runner.recorders.append(recorder)
+
+    steps = runner.run()
+    recorder.stop_recording()
+
+    reader = TrajectoryReader(path)
+    assert len(reader) == steps
+    assert reader.clock(steps - 1) == pytest.approx(0, abs=TIME_STEP / 1000)
+
+
+def test_profile(runner: LockstepRunner):
+    runner.profile = True
+    runner.run()
+
+    functions = {f[2] for f in runner.profile_stats().stats}
+    assert "tick" in functions
+    assert "run" in functions
+
+
+def test_tick_profiler(runner: LockstepRunner):
+    runner.referee.profiler = TickProfiler()
+    steps = runner.run()
+
+    summary = runner.referee.profiler.summary()
+    assert summary["steps"] == steps + 1
+    assert set(summary["phases"]) >= {
+        TickPhase.STEP.value,
+        TickPhase.UPDATE_POSITIONS.value,
+        TickPhase.CHECK_PROGRESS.value,
+        TickPhase.ROBOTS.value,
+    }
+    assert summary["real_time_factor"] > 0
+
+
+def test_robot_params(runner: LockstepRunner):
+    runner.params["B"] = {1: {"forward_speed": 5, "turn_speed": 5}}
+    params = {}
+    for team, controllers in runner.controllers.items():
+        for number, controller_class in controllers.items():
+
+            class Recording(controller_class):
+                def run(self):
+                    params[self.name] = self.params
+                    super().run()
+
+            controllers[number] = Recording
+
+    runner.run()
+
+    assert runner.errors == {}
+    assert params["B1"].forward_speed == 5
+    assert params["B1"].search_speed == 6
+    assert params["Y1"].forward_speed == 10
+    assert params["B3"].heading_gain == 3.0
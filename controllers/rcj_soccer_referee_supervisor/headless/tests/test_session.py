@@ -0,0 +1,120 @@
+import json
+import socket
+from pathlib import Path
+
+import pytest
+
+from headless.supervisor import HeadlessSupervisor
+from referee.consts import ROBOT_NAMES
+from referee.match import MatchConfig, play_session, RCJSoccerMatch
+from referee.shared_state import SharedStateReader
+
+
+def read_events(path: Path) -> list:
+    with open(path) as f:
+        return [json.loads(line)["event"] for line in f]
+
+
+def test_match(tmp_path: Path):
+    supervisor = HeadlessSupervisor(seed=1)
+    config = MatchConfig(
+        match_time=2,
+        output_directory=tmp_path,
+        rec_formats=["trajectory", "viewer"],
+    )
+
+    result = RCJSoccerMatch(supervisor, config).play()
+
+    assert result.finished
+    assert result.reflog_path.exists()
+    assert result.reflog_path.with_suffix(".traj").exists()
+    assert result.reflog_path.with_suffix(".viewer.html").exists()
+    assert read_events(result.reflog_path)[-1] == "MATCH_FINISH"
+    assert result.recordings[0].result() == str(
+        result.reflog_path.with_suffix(".traj")
+    )
+    manifest = json.loads(
+        result.reflog_path.with_suffix(".manifest.json").read_text()
+    )
+    assert [a["kind"] for a in manifest["artifacts"]] == [
+        "reflog",
+        "traj",
+        "viewer.html",
+    ]
+
+
+def test_match_publisher(tmp_path: Path):
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    host, port = receiver.getsockname()
+    config = MatchConfig(
+        match_time=2,
+        output_directory=tmp_path,
+        publish_address=f"udp://{host}:{port}",
+        publish_rate_divisor=4,
+    )
+
+    match = RCJSoccerMatch(HeadlessSupervisor(seed=1), config)
+    match.play()
+
+    frames = []
+    receiver.settimeout(0.2)
+    try:
+        while True:
+            frames.append(json.loads(receiver.recv(65536)))
+    except socket.timeout:
+        receiver.close()
+    assert match.publisher.counters()["sent"] == len(frames)
+    assert all(frame["tick"] % 4 == 0 for frame in frames[:-1])
+    events = [e["type"] for frame in frames for e in frame["events"]]
+    assert events[:2] == ["KICKOFF", "MATCH_START"]
+    assert events[-1] == "MATCH_FINISH"
+
+
+def test_match_shared_state(tmp_path: Path):
+    supervisor = HeadlessSupervisor(seed=1)
+    config = MatchConfig(
+        match_id="shared-state",
+        match_time=2,
+        output_directory=tmp_path,
+        shared_state=True,
+    )
+
+    RCJSoccerMatch(supervisor, config).play()
+
+    # Removed at the end of the half
+    assert supervisor.shared_state is None
+    with pytest.raises(FileNotFoundError):
+        SharedStateReader("shared-state")
+
+
+def test_session(tmp_path: Path):
+    supervisor = HeadlessSupervisor(seed=1)
+    config = MatchConfig(
+        team_blue="A",
+        team_blue_id="a",
+        team_yellow="B",
+        team_yellow_id="b",
+        match_time=2,
+        output_directory=tmp_path,
+    )
+    fixtures = [
+        {"match_id": "1", "halves": 2, "initial_score_blue": 1},
+        {"match_id": "2", "controller_yellow": "other_team"},
+    ]
+
+    results = play_session(supervisor, config, fixtures)
+
+    assert [r.config.match_id for r in results] == ["1", "1", "2"]
+    assert [r.config.half_id for r in results] == [1, 2, 1]
+    assert len({r.reflog_path for r in results}) == 3
+    assert all(r.finished for r in results)
+
+    first, second, _ = results
+    assert second.config.team_blue == "B"
+    assert second.config.initial_score_yellow == first.score_blue == 1
+    assert "_-_b_vs_a-" in second.reflog_path.name
+    assert supervisor.get_controllers()["Y1"] == "other_team"
+    # Each fixture after the first one restarts the controllers
+    for robot in ROBOT_NAMES:
+        assert supervisor.robot_nodes[robot].controller_restarts == 2
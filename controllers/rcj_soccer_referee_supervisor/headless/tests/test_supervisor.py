@@ -0,0 +1,356 @@
+import math
+import random
+from typing import List, Tuple
+
+import pytest
+
+from headless.supervisor import HeadlessSupervisor
+from referee.base_supervisor import NEUTRAL_SPOT_NAMES
+from referee.consts import (
+    BALL_DEPTH,
+    CENTER_NS,
+    DISTANCE_AROUND_UNOCCUPIED_NEUTRAL_SPOT,
+    N_OBJECTS,
+    NEUTRAL_SPOTS,
+    OBJECT_DEPTH,
+    ROBOT_INITIAL_ROTATION,
+    ROBOT_INITIAL_TRANSLATION,
+    ROBOT_NAMES,
+    TIME_STEP,
+)
+from referee.enums import LabelIDs, NeutralSpotDistanceType
+from referee.referee import RCJSoccerReferee
+from referee.shared_state import SharedStateReader, SharedStateWriter
+
+
+def create_referee(
+    supervisor: HeadlessSupervisor, match_time: int
+) -> RCJSoccerReferee:
+    return RCJSoccerReferee(
+        supervisor=supervisor,
+        match_time=match_time,
+        progress_check_steps=math.ceil(15 / (TIME_STEP / 1000.0)),
+        progress_check_threshold=0.5,
+        ball_progress_check_steps=math.ceil(10 / (TIME_STEP / 1000.0)),
+        ball_progress_check_threshold=0.5,
+        team_name_blue="Blues",
+        team_name_yellow="Yellows",
+        initial_score_blue=0,
+        initial_score_yellow=0,
+        penalty_area_allowed_time=15,
+        penalty_area_reset_after=2,
+        match_id=1,
+        half_id=1,
+        initial_position_noise=0.15,
+    )
+
+
+def play(supervisor: HeadlessSupervisor, referee: RCJSoccerReferee) -> int:
+    referee.kickoff()
+    steps = 0
+    while supervisor.step(TIME_STEP) != -1:
+        steps += 1
+        if not referee.tick():
+            break
+    return steps
+
+
+@pytest.fixture
+def supervisor() -> HeadlessSupervisor:
+    return HeadlessSupervisor(seed=42)
+
+
+def test_pose_buffers(supervisor: HeadlessSupervisor):
+    ball = supervisor.get_ball_translation()
+    b1 = supervisor.get_robot_translation("B1")
+    supervisor.set_wheel_velocities("B1", 5, 5)
+    supervisor.physics.ball_vx = 0.5
+
+    for _ in range(5):
+        supervisor.step(TIME_STEP)
+    supervisor.update_positions()
+
+    # The same views, overwritten in place
+    assert supervisor.get_ball_translation() is ball
+    assert supervisor.get_robot_translation("B1") is b1
+    assert ball[0] == supervisor.physics.ball_x
+    assert b1[0] == supervisor.physics.robot_x[0]
+    assert (supervisor.translations[-1] == ball).all()
+
+    supervisor.set_robot_position("B2", [0.1, 0.2, 0.3])
+    assert supervisor.translations[1].tolist() == [0.1, 0.2, 0.3]
+
+
+def test_initial_positions(supervisor: HeadlessSupervisor):
+    create_referee(supervisor, 10)
+
+    for robot, translation in ROBOT_INITIAL_TRANSLATION.items():
+        x, y, _ = supervisor.get_robot_translation(robot)
+        assert x == pytest.approx(translation[0], abs=0.075)
+        assert y == pytest.approx(translation[1], abs=0.075)
+
+        rotation = supervisor.robot_rotation_fields[robot].getSFRotation()
+        assert rotation[3] == pytest.approx(ROBOT_INITIAL_ROTATION[robot][3])
+
+    assert supervisor.get_ball_translation().tolist() == [0.0, 0.0, BALL_DEPTH]
+
+
+def test_robot_moves(supervisor: HeadlessSupervisor):
+    create_referee(supervisor, 10)
+    x, y, _ = supervisor.get_robot_translation("B3")
+
+    supervisor.set_wheel_velocities("B3", 10, 10)
+    for _ in range(10):
+        supervisor.step(TIME_STEP)
+    supervisor.update_positions()
+
+    assert supervisor.get_robot_translation("B3")[0] > x
+
+
+def test_labels_are_drawn(supervisor: HeadlessSupervisor):
+    create_referee(supervisor, 10)
+
+    assert supervisor.labels[LabelIDs.BLUE_TEAM.value][0] == "Blues"
+    assert supervisor.labels[LabelIDs.YELLOW_SCORE.value][0] == "0"
+
+
+def test_full_match(supervisor: HeadlessSupervisor):
+    referee = create_referee(supervisor, 60)
+
+    steps = play(supervisor, referee)
+
+    assert steps == math.ceil(60 / (TIME_STEP / 1000.0)) + 1
+    assert supervisor.getTime() == pytest.approx(steps * TIME_STEP / 1000)
+
+
+def test_seeded_matches_are_deterministic():
+    def run() -> list:
+        supervisor = HeadlessSupervisor(seed=7)
+        referee = create_referee(supervisor, 30)
+        for robot in ("B1", "Y1"):
+            supervisor.set_wheel_velocities(robot, 10, 9)
+        play(supervisor, referee)
+        return supervisor.get_ball_translation().tolist() + [
+            referee.score_blue,
+            referee.score_yellow,
+        ]
+
+    assert run() == run()
+
+
+def reference_unoccupied_neutral_spots_sorted(
+    supervisor: HeadlessSupervisor, distance_type: str, object_name: str
+) -> List[Tuple[str, float]]:
+    """The original, scalar implementation"""
+    if object_name == "ball":
+        x, y, _ = supervisor.get_ball_translation().tolist()
+    else:
+        x, y, _ = supervisor.get_robot_translation(object_name).tolist()
+    positions = supervisor.get_translations()[:, :2].tolist()
+
+    pairs = []
+    for ns, (ns_x, ns_y) in NEUTRAL_SPOTS.items():
+        occupied = any(
+            math.sqrt((ox - ns_x) ** 2 + (oy - ns_y) ** 2)
+            < DISTANCE_AROUND_UNOCCUPIED_NEUTRAL_SPOT
+            for ox, oy in positions
+        )
+        if not occupied:
+            pairs.append((ns, math.sqrt((x - ns_x) ** 2 + (y - ns_y) ** 2)))
+
+    do_reverse = distance_type == NeutralSpotDistanceType.FURTHEST.value
+    return sorted(pairs, key=lambda pair: pair[1], reverse=do_reverse)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize(
+    "distance_type",
+    [
+        NeutralSpotDistanceType.FURTHEST.value,
+        NeutralSpotDistanceType.NEAREST.value,
+    ],
+)
+def test_unoccupied_neutral_spots_sorted(
+    supervisor: HeadlessSupervisor, seed: int, distance_type: str
+):
+    rng = random.Random(seed)
+    spots = list(NEUTRAL_SPOTS.values())
+    for robot in ROBOT_NAMES:
+        # Park some of the robots on (or next to) the neutral spots
+        x, y = rng.choice(spots)
+        x += rng.uniform(-0.1, 0.1)
+        y += rng.uniform(-0.1, 0.1)
+        supervisor.set_robot_position(robot, [x, y, OBJECT_DEPTH])
+    supervisor.set_ball_position([rng.uniform(-0.5, 0.5), 0.0, BALL_DEPTH])
+
+    for name in ROBOT_NAMES + ["ball"]:
+        spots = supervisor.get_unoccupied_neutral_spots_sorted(
+            distance_type, name
+        )
+        expected = reference_unoccupied_neutral_spots_sorted(
+            supervisor, distance_type, name
+        )
+        assert [spot for spot, _ in spots] == [spot for spot, _ in expected]
+        assert [d for _, d in spots] == pytest.approx([d for _, d in expected])
+
+
+def test_neutral_spot_occupancy_cache(supervisor: HeadlessSupervisor):
+    for robot, translation in ROBOT_INITIAL_TRANSLATION.items():
+        supervisor.set_robot_position(robot, translation)
+    supervisor.set_ball_position([1.0, 1.0, BALL_DEPTH])
+    occupancy = supervisor.get_neutral_spot_occupancy()
+
+    assert supervisor.get_neutral_spot_occupancy() is occupancy
+    assert not occupancy[NEUTRAL_SPOT_NAMES.index(CENTER_NS)]
+
+    # Moving an object invalidates the cache
+    supervisor.move_object_to_neutral_spot("ball", CENTER_NS)
+    occupancy = supervisor.get_neutral_spot_occupancy()
+    assert occupancy[NEUTRAL_SPOT_NAMES.index(CENTER_NS)]
+    assert supervisor.is_neutral_spot_occupied(0, 0)
+
+    spots = supervisor.get_unoccupied_neutral_spots_sorted(
+        NeutralSpotDistanceType.NEAREST.value, "ball"
+    )
+    assert CENTER_NS not in [spot for spot, _ in spots]
+
+
+def test_unchanged_labels_are_skipped(
+    supervisor: HeadlessSupervisor, monkeypatch: pytest.MonkeyPatch
+):
+    calls = []
+    monkeypatch.setattr(supervisor, "setLabel", lambda *a: calls.append(a))
+
+    supervisor.draw_time(10.5)
+    supervisor.draw_time(10.1)
+    assert len(calls) == 1
+    assert calls[0][:2] == (LabelIDs.TIME.value, "00:10")
+
+    supervisor.draw_time(9.9)
+    assert len(calls) == 2
+
+    for _ in range(10):
+        supervisor.draw_goal_sign()
+    supervisor.hide_goal_sign()
+    assert len(calls) == 4
+
+
+def test_hud_disabled(
+    supervisor: HeadlessSupervisor, monkeypatch: pytest.MonkeyPatch
+):
+    calls = []
+    monkeypatch.setattr(supervisor, "setLabel", lambda *a: calls.append(a))
+    supervisor.draw_time(10)
+    supervisor.set_hud_enabled(False)
+
+    referee = create_referee(supervisor, 5)
+    play(supervisor, referee)
+    assert len(calls) == 1
+
+    # Re-enabling redraws the labels, even the unchanged ones
+    supervisor.set_hud_enabled(True)
+    supervisor.draw_time(10)
+    assert len(calls) == 2
+
+
+def test_poses_fetched_on_demand(supervisor: HeadlessSupervisor):
+    supervisor.update_positions()
+    assert supervisor.field_reads == 0
+
+    supervisor.get_ball_translation()
+    supervisor.get_ball_translation()
+    assert supervisor.field_reads == 1
+
+    supervisor.get_translations()
+    supervisor.get_robot_translation("B1")
+    assert supervisor.field_reads == 7
+
+    supervisor.get_robot_rotation("Y3")
+    supervisor.get_rotations()
+    assert supervisor.field_reads == 13
+
+    supervisor.update_positions()
+    supervisor.set_robot_position("B2", [0.1, 0.2, 0.3])
+    assert supervisor.get_robot_translation("B2").tolist() == [0.1, 0.2, 0.3]
+    assert supervisor.field_reads == 13
+    assert supervisor.field_reads_per_step() == 6.5
+
+
+def test_translation_rows(supervisor: HeadlessSupervisor):
+    supervisor.set_wheel_velocities("B1", 5, 5)
+    supervisor.step(TIME_STEP)
+    supervisor.update_positions()
+    rows = supervisor.get_translation_rows()
+    assert supervisor.field_reads == N_OBJECTS
+    assert rows == supervisor.get_translations().tolist()
+    assert supervisor.field_reads == N_OBJECTS
+
+    supervisor.set_ball_position([0.1, 0.2, 0.3])
+    assert rows[-1] == [0.1, 0.2, 0.3]
+    assert supervisor.get_ball_translation().tolist() == [0.1, 0.2, 0.3]
+
+    supervisor.step(TIME_STEP)
+    supervisor.update_positions()
+    # The buffer is filled from the rows fetched for the checks
+    b1 = supervisor.get_translation_rows()[0]
+    assert supervisor.get_robot_translation("B1").tolist() == b1
+
+
+def test_shared_state(supervisor: HeadlessSupervisor):
+    supervisor.shared_state = SharedStateWriter("test-supervisor", slots=4)
+    reader = SharedStateReader("test-supervisor")
+    supervisor.set_wheel_velocities("B1", 5, 5)
+    for _ in range(6):
+        supervisor.step(TIME_STEP)
+        supervisor.update_positions()
+
+    record = reader.snapshot()
+    assert record["tick"] == supervisor.position_updates
+    assert record["time"] == supervisor.getTime()
+    assert (record["translations"] == supervisor.get_translations()).all()
+    assert (record["rotations"] == supervisor.get_rotations()).all()
+    reader.close()
+    supervisor.shared_state.close()
+
+
+def test_field_reads_per_step(supervisor: HeadlessSupervisor):
+    referee = create_referee(supervisor, 10)
+    play(supervisor, referee)
+
+    # The checks read the translations, nothing reads the rotations
+    assert supervisor.field_reads_per_step() <= N_OBJECTS
+
+
+def test_transaction(supervisor: HeadlessSupervisor):
+    field = supervisor.robot_translation_fields["B1"]
+    before = field.getSFVec3f()
+
+    with supervisor.transaction():
+        supervisor.reset_robot_velocity("B1")
+        supervisor.set_robot_position("B1", [0.1, 0.1, OBJECT_DEPTH])
+        with supervisor.transaction():
+            supervisor.set_robot_position("B1", [0.2, 0.2, OBJECT_DEPTH])
+        supervisor.set_robot_rotation("B1", [0, 0, 1, 1.0])
+
+        # Not applied until the outermost transaction ends, but visible
+        assert field.getSFVec3f() == before
+        assert supervisor.get_robot_translation("B1").tolist() == [
+            0.2,
+            0.2,
+            OBJECT_DEPTH,
+        ]
+        assert supervisor.field_writes == 0
+
+    assert field.getSFVec3f()[:2] == [0.2, 0.2]
+    assert supervisor.physics.robot_heading[0] == pytest.approx(1.0)
+    # Position, rotation, velocity reset and physics reset, once each
+    assert supervisor.field_writes == 4
+
+
+def test_physics_reset_repeated_next_tick(supervisor: HeadlessSupervisor):
+    supervisor.set_robot_position("Y2", [0.1, 0.1, OBJECT_DEPTH])
+    assert supervisor.robots_to_reset_physics == {"Y2"}
+
+    supervisor.check_reset_physics_counters()
+    assert supervisor.robots_to_reset_physics == set()
+    assert supervisor.field_writes == 3
@@ -0,0 +1,292 @@
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from headless.consts import (
+    BALL_CHANNEL,
+    BALL_EMITTER_RANGE,
+    BALL_PACKET,
+    SIMULATION_MODE_FAST,
+    SIMULATION_MODE_PAUSE,
+    SIMULATION_MODE_REAL_TIME,
+    SUPERVISOR_CHANNEL,
+)
+from headless.devices import HeadlessEmitter, HeadlessReceiver
+from headless.physics import SoccerPhysics
+from referee.consts import (
+    BALL_DEPTH,
+    OBJECT_DEPTH,
+    ROBOT_NAMES,
+    TEAM_CONTROLLERS,
+    TIME_STEP,
+)
+
+
+def rotation_to_heading(rotation: List[float]) -> float:
+    """Convert a Webots axis-angle rotation to the heading in the XY plane.
+
+    Args:
+        rotation (list): x, y and z of the axis followed by the angle
+
+    Returns:
+        float: Heading in radians
+    """
+    x, y, z, angle = rotation
+    c, s = math.cos(angle), math.sin(angle)
+    t = 1 - c
+    return math.atan2(t * x * y + z * s, t * x * x + c)
+
+
+class HeadlessField:
+    """Stand-in for the Webots ``Field`` of a node."""
+
+    def __init__(self, node: "HeadlessNode", name: str):
+        self.node = node
+        self.name = name
+
+    def getSFVec3f(self) -> List[float]:
+        return self.node.get_translation()
+
+    def setSFVec3f(self, values: List[float]):
+        self.node.set_translation(values)
+
+    def getSFRotation(self) -> List[float]:
+        return self.node.get_rotation()
+
+    def setSFRotation(self, values: List[float]):
+        self.node.set_rotation(values)
+
+    def getSFString(self) -> str:
+        return self.node.controller
+
+    def setSFString(self, value: str):
+        self.node.controller = value
+        self.node.restartController()
+
+
+class HeadlessNode:
+    """Stand-in for the Webots ``Node`` of a robot or of the ball."""
+
+    def __init__(self, physics: SoccerPhysics, depth: float):
+        self.physics = physics
+        self.depth = depth
+        self.fields = {
+            "translation": HeadlessField(self, "translation"),
+            "rotation": HeadlessField(self, "rotation"),
+        }
+
+    def getField(self, name: str) -> HeadlessField:
+        return self.fields[name]
+
+    def resetPhysics(self):
+        self.setVelocity([0, 0, 0, 0, 0, 0])
+
+    def get_translation(self) -> List[float]:
+        raise NotImplementedError
+
+    def set_translation(self, values: List[float]):
+        raise NotImplementedError
+
+    def get_rotation(self) -> List[float]:
+        raise NotImplementedError
+
+    def set_rotation(self, values: List[float]):
+        raise NotImplementedError
+
+    def setVelocity(self, velocity: List[float]):
+        raise NotImplementedError
+
+
+class HeadlessRobotNode(HeadlessNode):
+    def __init__(self, physics: SoccerPhysics, index: int, controller: str):
+        super().__init__(physics, OBJECT_DEPTH)
+        self.index = index
+        self.fields["controller"] = HeadlessField(self, "controller")
+        self.controller = controller
+        # The controllers are run by LockstepRunner, restarting one is only
+        # counted
+        self.controller_restarts = 0
+
+    def restartController(self):
+        self.controller_restarts += 1
+
+    def get_translation(self) -> List[float]:
+        i = self.index
+        return [self.physics.robot_x[i], self.physics.robot_y[i], self.depth]
+
+    def set_translation(self, values: List[float]):
+        self.physics.robot_x[self.index] = float(values[0])
+        self.physics.robot_y[self.index] = float(values[1])
+
+    def get_rotation(self) -> List[float]:
+        return [0.0, 0.0, 1.0, self.physics.get_heading(self.index)]
+
+    def set_rotation(self, values: List[float]):
+        heading = rotation_to_heading(values)
+        self.physics.robot_heading[self.index] = heading
+
+    def setVelocity(self, velocity: List[float]):
+        if not any(velocity):
+            self.physics.stop_robot(self.index)
+
+
+class HeadlessBallNode(HeadlessNode):
+    def __init__(self, physics: SoccerPhysics):
+        super().__init__(physics, BALL_DEPTH)
+
+    def get_translation(self) -> List[float]:
+        return [self.physics.ball_x, self.physics.ball_y, self.depth]
+
+    def set_translation(self, values: List[float]):
+        self.physics.ball_x = float(values[0])
+        self.physics.ball_y = float(values[1])
+
+    def get_rotation(self) -> List[float]:
+        return [0.0, 0.0, 1.0, 0.0]
+
+    def set_rotation(self, values: List[float]):
+        pass
+
+    def setVelocity(self, velocity: List[float]):
+        self.physics.ball_vx = float(velocity[0])
+        self.physics.ball_vy = float(velocity[1])
+
+
+class HeadlessWorld:
+    """Stand-in for the part of the Webots Supervisor API used by the RCJ
+    soccer supervisor, backed by :class:`SoccerPhysics`.
+
+    Args:
+        seed (int, optional): Seed of the physics noise
+        wheel_slip_noise (float, optional): Relative wheel slip noise
+    """
+
+    SIMULATION_MODE_PAUSE = SIMULATION_MODE_PAUSE
+    SIMULATION_MODE_REAL_TIME = SIMULATION_MODE_REAL_TIME
+    SIMULATION_MODE_FAST = SIMULATION_MODE_FAST
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        wheel_slip_noise: Optional[float] = None,
+    ):
+        physics_kwargs = {}
+        if wheel_slip_noise is not None:
+            physics_kwargs["wheel_slip_noise"] = wheel_slip_noise
+        self.physics = SoccerPhysics(seed=seed, **physics_kwargs)
+
+        self.nodes: Dict[str, HeadlessNode] = {
+            "BALL": HeadlessBallNode(self.physics),
+        }
+        self.nodes_by_index: List[HeadlessRobotNode] = []
+        for index, robot in enumerate(ROBOT_NAMES):
+            controller = TEAM_CONTROLLERS[robot[0]]
+            node = HeadlessRobotNode(self.physics, index, controller)
+            self.nodes[robot] = node
+            self.nodes_by_index.append(node)
+
+        self.emitters: List[HeadlessEmitter] = []
+        self.receivers: List[HeadlessReceiver] = []
+        self.devices = {
+            "emitter": self.add_emitter(
+                HeadlessEmitter(self, channel=SUPERVISOR_CHANNEL)
+            ),
+        }
+        self.labels: Dict[int, Tuple] = {}
+
+        self.time = 0.0
+        self.mode = SIMULATION_MODE_REAL_TIME
+        self.exit_status: Optional[int] = None
+
+    def getFromDef(self, name: str) -> Optional[HeadlessNode]:
+        return self.nodes.get(name)
+
+    def getDevice(self, name: str) -> Any:
+        return self.devices[name]
+
+    def getBasicTimeStep(self) -> float:
+        return float(TIME_STEP)
+
+    def getTime(self) -> float:
+        return self.time
+
+    def setLabel(self, id: int, label: str, *args):
+        self.labels[id] = (label,) + args
+
+    def simulationSetMode(self, mode: int):
+        self.mode = mode
+
+    def simulationGetMode(self) -> int:
+        return self.mode
+
+    def simulationReset(self):
+        self.physics.reset()
+        self.time = 0.0
+        for emitter in self.emitters:
+            emitter.packets.clear()
+
+    def simulationQuit(self, status: int):
+        self.exit_status = status
+
+    def step(self, duration: int = TIME_STEP) -> int:
+        """Advance the world by ``duration`` milliseconds.
+
+        Returns:
+            int: -1 once the simulation has been quit, 0 otherwise
+        """
+        if self.exit_status is not None:
+            return -1
+
+        self.deliver_packets()
+        self.physics.step(duration / 1000.0)
+        self.time += duration / 1000.0
+        return 0
+
+    def add_emitter(self, emitter: HeadlessEmitter) -> HeadlessEmitter:
+        self.emitters.append(emitter)
+        return emitter
+
+    def add_receiver(self, receiver: HeadlessReceiver) -> HeadlessReceiver:
+        self.receivers.append(receiver)
+        return receiver
+
+    def deliver_packets(self):
+        """Hand over the packets sent during the last step to the receivers
+        listening on the same channel. Emitters never reach the receivers of
+        their own robot."""
+        for emitter in self.emitters:
+            if not emitter.packets:
+                continue
+            for receiver in self.receivers:
+                if (
+                    receiver.channel == emitter.channel
+                    and receiver.robot != emitter.robot
+                ):
+                    for data in emitter.packets:
+                        receiver.receive(data, [0.0, 0.0, 0.0], 1.0)
+            emitter.packets.clear()
+
+        self.emit_ball_packets()
+
+    def emit_ball_packets(self):
+        """Do the job of the ball's infra-red emitter, which sends a packet
+        every step: robots within its range get the direction to the ball in
+        their own frame and a signal strength of 1 / distance^2."""
+        physics = self.physics
+        for receiver in self.receivers:
+            if receiver.channel != BALL_CHANNEL or receiver.robot is None:
+                continue
+            i = receiver.robot
+            dx = physics.ball_x - physics.robot_x[i]
+            dy = physics.ball_y - physics.robot_y[i]
+            distance = math.hypot(dx, dy)
+            if not 0 < distance <= BALL_EMITTER_RANGE:
+                continue
+
+            heading = physics.robot_heading[i]
+            c, s = math.cos(heading), math.sin(heading)
+            direction = [
+                (dx * c + dy * s) / distance,
+                (dy * c - dx * s) / distance,
+                0.0,
+            ]
+            receiver.receive(BALL_PACKET, direction, distance**-2)
@@ -4,6 +4,8 @@ from enum import Enum
 class RecordingFormat(Enum):
     MP4 = "mp4"
     X3D = "x3d"
+    TRAJECTORY = "trajectory"
+    VIEWER = "viewer"
 
     @classmethod
     def all(cls):
@@ -13,3 +15,18 @@ class RecordingFormat(Enum):
 class RecordingFileSuffix(Enum):
     MP4 = "mp4"
     X3D = "html"
+    TRAJECTORY = "traj"
+    VIEWER = "viewer.html"
+
+
+TRAJECTORY_MAGIC = b"RCJTRAJ\0"
+TRAJECTORY_VERSION = 1
+# Ticks between the periodic keyframes of trajectory files
+KEYFRAME_INTERVAL = 64
+# Delays between the checks of a recording being processed, in seconds: the
+# first one, doubled after each check up to the last one
+FINALIZE_POLL_INITIAL_DELAY = 0.05
+FINALIZE_POLL_MAX_DELAY = 2.0
+# Sizes the viewer draws the robots and the ball at, from worlds/soccer.wbt
+VIEWER_ROBOT_SIZE = 0.075
+VIEWER_BALL_RADIUS = 0.021
@@ -0,0 +1,190 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from recorder.consts import (
+    FINALIZE_POLL_INITIAL_DELAY,
+    FINALIZE_POLL_MAX_DELAY,
+)
+
+
+def poll_with_backoff(
+    is_ready: Callable[[], bool],
+    initial_delay: float = FINALIZE_POLL_INITIAL_DELAY,
+    max_delay: float = FINALIZE_POLL_MAX_DELAY,
+    sleep: Callable[[float], None] = time.sleep,
+):
+    """Wait until ``is_ready`` returns True, sleeping twice as long after
+    each check, up to ``max_delay``."""
+    delay = initial_delay
+    while not is_ready():
+        sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+
+class _Pending:
+    def __init__(self, recorder, future: Future, due: float, delay: float):
+        self.recorder = recorder
+        self.future = future
+        self.due = due
+        self.delay = delay
+
+
+class Finalizer:
+    """Finish recordings without blocking the simulation.
+
+    ``finalize`` stops a recorder and returns a future, resolved with the
+    path of the recording once ``recorder.is_ready()`` says so. Nothing
+    runs in the background, as the Webots API must only be used from the
+    controller thread: ``poll`` checks the recorders due for a check and is
+    meant to be called every step, e.g. while the next match is played, and
+    ``wait`` blocks until all the recordings are done. Each recorder is
+    checked twice as late as the previous time, up to ``max_delay``.
+
+    Args:
+        initial_delay (float): Seconds before the second check of a
+            recorder, the first one is done by ``finalize``
+        max_delay (float): Longest delay between two checks
+        clock (callable): Returns the current time in seconds
+    """
+
+    def __init__(
+        self,
+        initial_delay: float = FINALIZE_POLL_INITIAL_DELAY,
+        max_delay: float = FINALIZE_POLL_MAX_DELAY,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.pending: List[_Pending] = []
+
+    def finalize(self, recorder) -> Future:
+        """Stop the recorder if it is recording and track its processing.
+
+        Returns:
+            Future: Resolved with the path of the recording, or with the
+            exception raised by the recorder
+        """
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        try:
+            if recorder.is_recording():
+                recorder.stop_recording()
+        except Exception as e:
+            future.set_exception(e)
+            return future
+
+        self.pending.append(
+            _Pending(recorder, future, self.clock(), self.initial_delay)
+        )
+        self.poll()
+        return future
+
+    def poll(self) -> int:
+        """Check the recorders whose check is due, without blocking.
+
+        Returns:
+            int: Number of recordings still being processed
+        """
+        if not self.pending:
+            return 0
+        now = self.clock()
+        still_pending = []
+        for pending in self.pending:
+            if pending.due > now:
+                still_pending.append(pending)
+                continue
+            try:
+                ready = pending.recorder.is_ready()
+            except Exception as e:
+                pending.future.set_exception(e)
+                continue
+            if ready:
+                pending.future.set_result(pending.recorder.create_title())
+                continue
+            pending.due = now + pending.delay
+            pending.delay = min(pending.delay * 2, self.max_delay)
+            still_pending.append(pending)
+        self.pending = still_pending
+        return len(still_pending)
+
+    def wait(
+        self,
+        recorder_type: type = object,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Block until the recordings of the given type of recorder, all of
+        them by default, are done."""
+        while self.poll():
+            dues = [
+                pending.due
+                for pending in self.pending
+                if isinstance(pending.recorder, recorder_type)
+            ]
+            if not dues:
+                return
+            sleep(max(min(dues) - self.clock(), 0))
+
+
+class Manifest:
+    """List of the files produced by a match, written as JSON once all the
+    recordings are done.
+
+    Args:
+        path (Path): Path of the manifest
+        artifacts (list): Kind and path of the files already written, e.g.
+            the reflog
+    """
+
+    def __init__(self, path: Path, artifacts: List[Tuple[str, str]]):
+        self.path = path
+        self.artifacts = list(artifacts)
+        self.errors: Dict[str, str] = {}
+        self._pending = 0
+        self._closed = False
+
+    def track(self, kind: str, future: Future):
+        """Add the recording the future resolves to once it is done."""
+        self._pending += 1
+        future.add_done_callback(lambda done: self._done(kind, done))
+
+    def close(self):
+        """No more recordings are tracked, write the manifest once the ones
+        tracked are done."""
+        self._closed = True
+        self._write_if_done()
+
+    def _done(self, kind: str, future: Future):
+        self._pending -= 1
+        error = future.exception()
+        if error is None:
+            self.artifacts.append((kind, future.result()))
+        else:
+            logging.error(f"Processing the {kind} recording failed: {error}")
+            self.errors[kind] = str(error)
+        self._write_if_done()
+
+    def _write_if_done(self):
+        if not self._closed or self._pending:
+            return
+        manifest = {
+            "artifacts": [
+                {"kind": kind, "path": str(path), "bytes": _size(path)}
+                for kind, path in self.artifacts
+            ],
+            "errors": self.errors,
+        }
+        with open(self.path, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+
+def _size(path: str) -> Optional[int]:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
@@ -1,10 +1,10 @@
 import datetime
-import time
 from pathlib import Path
 
 from controller import Supervisor
 
 from recorder.consts import RecordingFileSuffix
+from recorder.finalizer import poll_with_backoff
 
 
 class BaseVideoRecordAssistant:
@@ -55,12 +55,22 @@ class BaseVideoRecordAssistant:
     def stop_recording(self):
         raise NotImplementedError
 
+    def record(self, referee):
+        """Called after each tick of the referee. Webots records the videos
+        on its own."""
+        pass
+
     def is_recording(self):
         return self._is_recording
 
-    def wait_processing(self):
+    def is_ready(self) -> bool:
+        """Whether the recording is done being processed, without
+        blocking."""
         raise NotImplementedError
 
+    def wait_processing(self):
+        poll_with_backoff(self.is_ready)
+
 
 class MP4VideoRecordAssistant(BaseVideoRecordAssistant):
     output_suffix = RecordingFileSuffix.MP4.value
@@ -87,9 +97,10 @@ class MP4VideoRecordAssistant(BaseVideoRecordAssistant):
         self.supervisor.movieStopRecording()
         self._is_recording = False
 
-    def wait_processing(self):
-        while not self.supervisor.movieIsReady():
-            time.sleep(1.0)
+    def is_ready(self) -> bool:
+        if self.supervisor.movieFailed():
+            raise RuntimeError(f"Encoding {self.create_title()} failed")
+        return self.supervisor.movieIsReady()
 
 
 class X3DVideoRecordAssistant(BaseVideoRecordAssistant):
@@ -104,5 +115,5 @@ class X3DVideoRecordAssistant(BaseVideoRecordAssistant):
         self.supervisor.animationStopRecording()
         self._is_recording = False
 
-    def wait_processing(self):
-        pass
+    def is_ready(self) -> bool:
+        return True
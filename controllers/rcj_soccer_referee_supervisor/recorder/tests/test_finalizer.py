@@ -0,0 +1,125 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from recorder.finalizer import Finalizer, Manifest, poll_with_backoff
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+class SlowRecorder:
+    """Ready once the clock reaches ``ready_at``"""
+
+    def __init__(self, clock: Clock, ready_at: float, path: str = "out.mp4"):
+        self.clock = clock
+        self.ready_at = ready_at
+        self.path = path
+        self.recording = True
+        self.checks = []
+
+    def is_recording(self) -> bool:
+        return self.recording
+
+    def stop_recording(self):
+        self.recording = False
+
+    def is_ready(self) -> bool:
+        self.checks.append(self.clock())
+        if self.ready_at is None:
+            raise RuntimeError("Encoding failed")
+        return self.clock() >= self.ready_at
+
+    def create_title(self) -> str:
+        return self.path
+
+
+class OtherRecorder(SlowRecorder):
+    pass
+
+
+def test_poll_with_backoff():
+    clock = Clock()
+    recorder = SlowRecorder(clock, ready_at=1.0)
+
+    poll_with_backoff(
+        recorder.is_ready, initial_delay=0.1, max_delay=0.4, sleep=clock.sleep
+    )
+
+    assert recorder.checks == pytest.approx([0, 0.1, 0.3, 0.7, 1.1])
+
+
+def test_finalize():
+    clock = Clock()
+    finalizer = Finalizer(initial_delay=0.1, max_delay=0.4, clock=clock)
+    recorder = SlowRecorder(clock, ready_at=1.0)
+
+    future = finalizer.finalize(recorder)
+
+    assert not recorder.is_recording()
+    assert not future.done()
+    # Not due yet
+    clock.now = 0.05
+    assert finalizer.poll() == 1
+    assert recorder.checks == [0]
+
+    finalizer.wait(sleep=clock.sleep)
+
+    assert future.result() == "out.mp4"
+    assert recorder.checks == pytest.approx([0, 0.1, 0.3, 0.7, 1.1])
+    assert finalizer.poll() == 0
+
+
+def test_finalize_failure():
+    clock = Clock()
+    finalizer = Finalizer(clock=clock)
+
+    future = finalizer.finalize(SlowRecorder(clock, ready_at=None))
+
+    with pytest.raises(RuntimeError):
+        future.result()
+    assert not finalizer.pending
+
+
+def test_wait_for_type():
+    clock = Clock()
+    finalizer = Finalizer(initial_delay=0.1, clock=clock)
+    slow = finalizer.finalize(SlowRecorder(clock, ready_at=10.0))
+
+    finalizer.wait(OtherRecorder, sleep=clock.sleep)
+
+    assert not slow.done()
+    assert clock.now == 0
+
+
+def test_manifest(tmp_path: Path):
+    clock = Clock()
+    finalizer = Finalizer(clock=clock)
+    reflog = tmp_path / "match.jsonl"
+    reflog.write_text("{}\n")
+    video = tmp_path / "match.mp4"
+    manifest = Manifest(tmp_path / "match.manifest.json", [("reflog", reflog)])
+
+    manifest.track("mp4", finalizer.finalize(SlowRecorder(clock, 1.0, video)))
+    manifest.track("x3d", finalizer.finalize(SlowRecorder(clock, None)))
+    manifest.close()
+    assert not manifest.path.exists()
+
+    video.write_bytes(b"\0" * 10)
+    finalizer.wait(sleep=clock.sleep)
+
+    written = json.loads(manifest.path.read_text())
+    assert written["artifacts"] == [
+        {"kind": "reflog", "path": str(reflog), "bytes": 3},
+        {"kind": "mp4", "path": str(video), "bytes": 10},
+    ]
+    assert written["errors"] == {"x3d": "Encoding failed"}
@@ -0,0 +1,132 @@
+import math
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from recorder.trajectory import (
+    N_CHANNELS,
+    TrajectoryReader,
+    TrajectoryRecordAssistant,
+)
+from referee.consts import N_OBJECTS, N_ROBOTS, TIME_STEP
+
+
+class Poses:
+    """Stands in for the pose buffers of the supervisor"""
+
+    def __init__(self):
+        self.translations = np.zeros((N_OBJECTS, 3))
+        self.rotations = np.zeros((N_ROBOTS, 4))
+        self.rotations[:, 2] = 1
+
+    def get_translations(self) -> np.ndarray:
+        return self.translations
+
+    def get_rotations(self) -> np.ndarray:
+        return self.rotations
+
+
+def record_match(path: Path, ticks: int, move, keyframe_interval: int = 8):
+    poses = Poses()
+    referee = MagicMock(time=60.0)
+    recorder = TrajectoryRecordAssistant(
+        poses, str(path), match_time=60, keyframe_interval=keyframe_interval
+    )
+    recorder.start_recording()
+    expected = []
+    for tick in range(ticks):
+        move(poses, tick)
+        referee.time -= TIME_STEP / 1000
+        recorder.record(referee)
+        expected.append((poses.translations.copy(), poses.rotations.copy()))
+    recorder.stop_recording()
+    return expected
+
+
+def walk(poses: Poses, tick: int):
+    poses.translations[:, 0] = np.linspace(-0.5, 0.5, N_OBJECTS) + tick * 1e-3
+    poses.translations[:, 1] = -0.0042 * tick
+    poses.rotations[:, 3] = 0.1 * tick
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    return tmp_path / "match.traj"
+
+
+def test_round_trip(path: Path):
+    expected = record_match(path, 100, walk)
+    reader = TrajectoryReader(str(path))
+
+    assert len(reader) == 100
+    for tick, (translations, rotations) in enumerate(expected):
+        assert np.abs(reader.translations(tick) - translations).max() <= 5e-4
+        error = reader.headings(tick) - rotations[:, 3]
+        error = (error + math.pi) % (2 * math.pi) - math.pi
+        assert np.abs(error).max() <= math.pi / 4096
+
+
+def test_decode(path: Path):
+    record_match(path, 100, walk)
+    reader = TrajectoryReader(str(path))
+
+    frames = reader.decode()
+
+    assert frames.shape == (100, N_CHANNELS)
+    for tick in (0, 1, 7, 8, 9, 55, 99):
+        assert frames[tick].tolist() == reader.frame(tick).tolist()
+
+
+def test_keyframes(path: Path):
+    def teleport(poses: Poses, tick: int):
+        walk(poses, tick)
+        if tick >= 13:
+            poses.translations[0] = [0.3, 0.3, 0]
+
+    record_match(path, 20, teleport)
+    reader = TrajectoryReader(str(path))
+
+    # Every 8 ticks, and when B1 got moved
+    assert reader.keyframe_ticks.tolist() == [0, 8, 13, 16]
+    assert reader.translations(19)[0].tolist() == [0.3, 0.3, 0]
+
+
+def test_headings_across_pi(path: Path):
+    def spin(poses: Poses, tick: int):
+        poses.rotations[:, 3] = math.pi - 0.05 + 0.02 * tick
+
+    record_match(path, 10, spin, keyframe_interval=64)
+    reader = TrajectoryReader(str(path))
+
+    assert reader.keyframe_ticks.tolist() == [0]
+    assert reader.headings(9)[0] == pytest.approx(-math.pi + 0.13, abs=1e-3)
+
+
+def test_clock_and_seek(path: Path):
+    record_match(path, 100, walk)
+    reader = TrajectoryReader(str(path))
+
+    assert reader.clock(0) == pytest.approx(60 - 0.032)
+    assert reader.clock(50) == pytest.approx(60 - 51 * 0.032)
+    assert reader.tick_at(0) == 0
+    assert reader.tick_at(51 * 0.032) == 50
+    assert reader.tick_at(1000) == 99
+    with pytest.raises(IndexError):
+        reader.frame(100)
+
+
+def test_size(path: Path):
+    record_match(path, 10, walk, keyframe_interval=64)
+
+    # Deltas of int8 for every tick of the match, and the keyframes
+    ticks = math.ceil(60 * 1000 / TIME_STEP) + 2
+    assert ticks * N_CHANNELS < path.stat().st_size < 1.2 * ticks * N_CHANNELS
+
+
+def test_not_a_trajectory(path: Path):
+    path.write_bytes(bytes(128))
+
+    with pytest.raises(ValueError):
+        TrajectoryReader(str(path))
@@ -0,0 +1,61 @@
+import base64
+import gzip
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from recorder.tests.test_trajectory import Poses, walk
+from recorder.trajectory import TrajectoryReader
+from recorder.viewer import DATA_PLACEHOLDER, ViewerRecordAssistant
+from referee.consts import FIELD_X_UPPER_LIMIT, TIME_STEP
+from referee.events import Goal, Kickoff
+
+
+def read_data(path: Path) -> dict:
+    page = path.read_text()
+    assert DATA_PLACEHOLDER not in page
+    data = page.split("const DATA = ", 1)[1].split(";\n", 1)[0]
+    return json.loads(data)
+
+
+def test_viewer(tmp_path: Path):
+    path = tmp_path / "match.viewer.html"
+    poses = Poses()
+    referee = MagicMock(
+        time=60.0,
+        match_time=60,
+        team_name_blue="</script>Blues",
+        team_name_yellow="Yellows",
+    )
+    recorder = ViewerRecordAssistant(poses, str(path), match_time=60)
+    recorder.start_recording()
+
+    kickoff = Kickoff(robot_name="B1", team_name="B")
+    kickoff.stamp(0.0)
+    recorder.handle(referee, kickoff)
+    for tick in range(100):
+        walk(poses, tick)
+        referee.time -= TIME_STEP / 1000
+        recorder.record(referee)
+    goal = Goal(team_name="B", score_blue=1, score_yellow=0)
+    goal.stamp(3.2)
+    recorder.handle(referee, goal)
+    recorder.stop_recording()
+
+    assert "</script>Blues" not in path.read_text()
+    data = read_data(path)
+    assert data["field"]["x"][1] == FIELD_X_UPPER_LIMIT
+    assert data["teams"]["blue"] == "</script>Blues"
+    assert [event["type"] for event in data["events"]] == ["KICKOFF", "GOAL"]
+    assert data["events"][1]["time"] == 3.2
+    assert data["events"][1]["payload"]["score_blue"] == 1
+    assert data["events"][0]["message"] == "Robot B1 is kicking off."
+
+    # The embedded trajectory is a trajectory file
+    trajectory = tmp_path / "match.traj"
+    trajectory.write_bytes(
+        gzip.decompress(base64.b64decode(data["trajectory"]))
+    )
+    reader = TrajectoryReader(str(trajectory))
+    assert len(reader) == 100
+    assert abs(reader.translations(99)[0, 1] - poses.translations[0, 1]) < 1e-3
@@ -0,0 +1,359 @@
+import datetime
+import logging
+import math
+import struct
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from recorder.consts import (
+    KEYFRAME_INTERVAL,
+    RecordingFileSuffix,
+    TRAJECTORY_MAGIC,
+    TRAJECTORY_VERSION,
+)
+from referee.consts import DEFAULT_MATCH_TIME, N_OBJECTS, N_ROBOTS, TIME_STEP
+
+# Every tick is a row of channels: x, y and z of the objects (the robots in
+# the order of ROBOT_NAMES, then the ball) in millimetres, followed by the
+# heading of each robot (rotation about the vertical axis) in 1/4096 of a
+# turn, which keeps the fastest turn of a robot within a delta
+N_TRANSLATION_CHANNELS = N_OBJECTS * 3
+N_CHANNELS = N_TRANSLATION_CHANNELS + N_ROBOTS
+HEADING_UNITS = 4096
+
+# magic, version, channels, keyframe interval, time step (ms), match time
+# (ms), capacity (ticks), capacity (keyframes), ticks, keyframes
+HEADER = struct.Struct("<8sHHHHIIIII")
+HEADER_SIZE = 64
+
+HEADING_SCALE = HEADING_UNITS / (2 * math.pi)
+
+DELTA_LIMIT = np.iinfo(np.int8).max
+
+
+def _wrap_heading(value: int) -> int:
+    return (value + HEADING_UNITS // 2) % HEADING_UNITS - HEADING_UNITS // 2
+
+
+def _clip_delta(value: int) -> int:
+    return min(max(value, -DELTA_LIMIT), DELTA_LIMIT)
+
+
+def _wrap_headings(values: np.ndarray):
+    """Wrap the headings of rows of channels into [-pi, pi), in place."""
+    headings = values[..., N_TRANSLATION_CHANNELS:]
+    headings += HEADING_UNITS // 2
+    headings %= HEADING_UNITS
+    headings -= HEADING_UNITS // 2
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) // 8 * 8
+
+
+def _layout(capacity: int, max_keyframes: int) -> Tuple[int, int, int, int]:
+    """Return the offsets of the keyframes, the seek index and the deltas,
+    and the size of the file."""
+    keyframes = HEADER_SIZE
+    index = _align(keyframes + max_keyframes * N_CHANNELS * 2)
+    deltas = _align(index + max_keyframes * 2 * 4)
+    return keyframes, index, deltas, _align(deltas + capacity * N_CHANNELS)
+
+
+def _section(
+    buffer: np.ndarray, offset: int, dtype, shape: Tuple[int, int]
+) -> np.ndarray:
+    """Return a view of a section of the file, without copying it."""
+    count = shape[0] * shape[1]
+    section = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+    return section.reshape(shape)
+
+
+class TrajectoryRecordAssistant:
+    """Record the poses of the robots and the ball, and the referee clock,
+    every tick into a preallocated memory-mapped file.
+
+    The values are quantised to int16 millimetres (1/4096 of a turn for the
+    headings). Every ``keyframe_interval`` ticks, or whenever an object
+    moved too far for a delta (e.g. when it was moved to a neutral spot),
+    a keyframe with the absolute values is stored; the other ticks store the
+    int8 difference to the previous tick. Each keyframe goes along with its
+    tick and referee clock into the seek index. Use ``TrajectoryReader`` to
+    read the file.
+
+    Unlike the video recorders, the recording is not done by Webots:
+    ``record`` has to be called after each tick of the referee.
+
+    Args:
+        supervisor (BaseRCJSoccerSupervisor): Supervisor holding the poses
+        output_path (str): Path of the file
+        match_time (int): Duration of the match in seconds, which
+            determines the size of the file
+        keyframe_interval (int): Ticks between the periodic keyframes
+    """
+
+    output_suffix = RecordingFileSuffix.TRAJECTORY.value
+
+    def __init__(
+        self,
+        supervisor,
+        output_path: str = "",
+        match_time: int = DEFAULT_MATCH_TIME,
+        keyframe_interval: int = KEYFRAME_INTERVAL,
+    ):
+        self.supervisor = supervisor
+        self.output_path = output_path
+        self.match_time = match_time
+        self.keyframe_interval = keyframe_interval
+
+        # The referee ticks once more after the clock went below zero
+        self.capacity = math.ceil(match_time * 1000 / TIME_STEP) + 2
+        # Periodic keyframes, and as many again for objects being moved
+        self.max_keyframes = 2 * (self.capacity // keyframe_interval + 1)
+
+        self._is_recording = False
+        self.n_ticks = 0
+        self.n_keyframes = 0
+        self.previous = [0] * N_CHANNELS
+
+    def create_title(self):
+        if self.output_path == "":
+            # When output path is not specified
+            time_str = datetime.datetime.now().strftime("%Y-%m-%d-%H:%M:%S")
+            return "{}/{}.{}".format(
+                str(Path.home()), time_str, self.output_suffix
+            )
+
+        return self.output_path
+
+    def start_recording(self):
+        keyframes, index, deltas, size = _layout(
+            self.capacity, self.max_keyframes
+        )
+        self.file = self._open_file(size)
+        self.keyframes = _section(
+            self.file, keyframes, "<i2", (self.max_keyframes, N_CHANNELS)
+        )
+        self.index = _section(self.file, index, "<i4", (self.max_keyframes, 2))
+        self.deltas = _section(
+            self.file, deltas, np.int8, (self.capacity, N_CHANNELS)
+        )
+
+        self.n_ticks = 0
+        self.n_keyframes = 0
+        self._write_header()
+        self._is_recording = True
+
+    def record(self, referee):
+        """Append the current poses and the clock of the referee.
+
+        Args:
+            referee (RCJSoccerReferee): Referee of the match
+        """
+        if not self._is_recording:
+            return
+        if self.n_ticks == self.capacity:
+            logging.warning("Trajectory file is full, ticks are dropped")
+            return
+
+        # The handful of channels is handled as Python ints, which is
+        # quicker than a dozen tiny NumPy calls
+        current = self._quantise()
+        previous = self.previous
+        delta = [value - before for value, before in zip(current, previous)]
+        for i in range(N_TRANSLATION_CHANNELS, N_CHANNELS):
+            # Turning across +-pi is a small step too
+            delta[i] = _wrap_heading(delta[i])
+
+        tick = self.n_ticks
+        keyframe = (
+            tick % self.keyframe_interval == 0
+            or max(delta) > DELTA_LIMIT
+            or min(delta) < -DELTA_LIMIT
+        ) and self.n_keyframes < self.max_keyframes
+        if keyframe:
+            self.keyframes[self.n_keyframes] = current
+            self.index[self.n_keyframes] = tick, round(referee.time * 1000)
+            self.n_keyframes += 1
+        else:
+            if max(delta) > DELTA_LIMIT or min(delta) < -DELTA_LIMIT:
+                # Only once all the keyframes are used up, which moving
+                # objects every few ticks for a whole match takes
+                delta = [_clip_delta(value) for value in delta]
+                current = [
+                    before + value for before, value in zip(previous, delta)
+                ]
+                for i in range(N_TRANSLATION_CHANNELS, N_CHANNELS):
+                    current[i] = _wrap_heading(current[i])
+            self.deltas[tick] = delta
+
+        self.previous = current
+        self.n_ticks += 1
+        if keyframe:
+            # Keeps the file readable if the simulation is killed
+            self._write_header()
+
+    def stop_recording(self):
+        self._write_header()
+        self._close_file()
+        del self.file, self.keyframes, self.index, self.deltas
+        self._is_recording = False
+
+    def _open_file(self, size: int) -> np.ndarray:
+        return np.memmap(
+            self.create_title(), dtype=np.uint8, mode="w+", shape=(size,)
+        )
+
+    def _close_file(self):
+        self.file.flush()
+
+    def is_recording(self):
+        return self._is_recording
+
+    def is_ready(self) -> bool:
+        # The file is complete once stop_recording returns
+        return True
+
+    def wait_processing(self):
+        pass
+
+    def _quantise(self) -> List[int]:
+        values = [
+            round(value * 1000)
+            for value in self.supervisor.get_translations().ravel().tolist()
+        ]
+        # The robots only turn about the vertical axis, along +z or -z
+        for _, _, z, angle in self.supervisor.get_rotations().tolist():
+            heading = round(math.copysign(angle, z) * HEADING_SCALE)
+            values.append(_wrap_heading(heading))
+        return values
+
+    def _write_header(self):
+        HEADER.pack_into(
+            self.file,
+            0,
+            TRAJECTORY_MAGIC,
+            TRAJECTORY_VERSION,
+            N_CHANNELS,
+            self.keyframe_interval,
+            TIME_STEP,
+            self.match_time * 1000,
+            self.capacity,
+            self.max_keyframes,
+            self.n_ticks,
+            self.n_keyframes,
+        )
+
+
+class TrajectoryReader:
+    """Read a file written by ``TrajectoryRecordAssistant``.
+
+    The keyframes, the seek index and the deltas are memory-mapped, nothing
+    is read until it is accessed.
+
+    Args:
+        path (str): Path of the file
+    """
+
+    def __init__(self, path: str):
+        self.file = np.memmap(path, dtype=np.uint8, mode="r")
+        (
+            magic,
+            version,
+            channels,
+            self.keyframe_interval,
+            self.time_step,
+            self.match_time,
+            capacity,
+            max_keyframes,
+            self.n_ticks,
+            self.n_keyframes,
+        ) = HEADER.unpack_from(self.file)
+        if magic != TRAJECTORY_MAGIC or version != TRAJECTORY_VERSION:
+            raise ValueError(f"{path} is not a trajectory file")
+        if channels != N_CHANNELS:
+            raise ValueError(f"Unexpected number of channels {channels}")
+
+        keyframes, index, deltas, _ = _layout(capacity, max_keyframes)
+        self.keyframes = _section(
+            self.file, keyframes, "<i2", (self.n_keyframes, N_CHANNELS)
+        )
+        self.index = _section(self.file, index, "<i4", (self.n_keyframes, 2))
+        self.deltas = _section(
+            self.file, deltas, np.int8, (self.n_ticks, N_CHANNELS)
+        )
+
+        self.keyframe_ticks = self.index[:, 0]
+        # Match time (ms) elapsed at each keyframe
+        self.keyframe_times = self.match_time - self.index[:, 1]
+
+    def __len__(self) -> int:
+        return self.n_ticks
+
+    def tick_at(self, matchtime: float) -> int:
+        """Return the tick recorded at the given match time.
+
+        Args:
+            matchtime (float): Time elapsed since the start of the match in
+                seconds
+
+        Returns:
+            int: The last tick recorded at or before the time
+        """
+        elapsed = round(matchtime * 1000)
+        keyframe = max(
+            np.searchsorted(self.keyframe_times, elapsed, side="right") - 1,
+            0,
+        )
+        tick = self.keyframe_ticks[keyframe]
+        tick += max(elapsed - self.keyframe_times[keyframe], 0) // (
+            self.time_step
+        )
+        if keyframe + 1 < self.n_keyframes:
+            tick = min(tick, self.keyframe_ticks[keyframe + 1] - 1)
+        return int(min(tick, self.n_ticks - 1))
+
+    def clock(self, tick: int) -> float:
+        """Return the referee clock (remaining time in seconds) of a tick."""
+        keyframe = self._keyframe_of(tick)
+        ticks_after = tick - self.keyframe_ticks[keyframe]
+        clock = self.index[keyframe, 1] - ticks_after * self.time_step
+        return clock / 1000
+
+    def frame(self, tick: int) -> np.ndarray:
+        """Return the quantised channels of a tick."""
+        keyframe = self._keyframe_of(tick)
+        start = self.keyframe_ticks[keyframe]
+        values = self.keyframes[keyframe].astype(np.int32)
+        values += self.deltas[start + 1 : tick + 1].sum(  # noqa: E203
+            axis=0, dtype=np.int32
+        )
+        _wrap_headings(values)
+        return values
+
+    def translations(self, tick: int) -> np.ndarray:
+        """Return the positions (N_OBJECTS, 3) of a tick in metres, with
+        the rows ordered as in ``BaseRCJSoccerSupervisor.translations``."""
+        frame = self.frame(tick)[:N_TRANSLATION_CHANNELS]
+        return frame.reshape(N_OBJECTS, 3) / 1000
+
+    def headings(self, tick: int) -> np.ndarray:
+        """Return the headings of the robots of a tick in radians."""
+        return self.frame(tick)[N_TRANSLATION_CHANNELS:] / HEADING_SCALE
+
+    def decode(self) -> np.ndarray:
+        """Return the quantised channels of all the ticks."""
+        ticks = np.arange(self.n_ticks)
+        keyframes = np.searchsorted(self.keyframe_ticks, ticks, "right") - 1
+        totals = self.deltas.cumsum(axis=0, dtype=np.int32)
+        since_keyframe = totals - totals[self.keyframe_ticks[keyframes]]
+        values = self.keyframes[keyframes] + since_keyframe
+        _wrap_headings(values)
+        return values
+
+    def _keyframe_of(self, tick: int) -> int:
+        if not 0 <= tick < self.n_ticks:
+            raise IndexError(f"Tick {tick} out of range")
+        return np.searchsorted(self.keyframe_ticks, tick, side="right") - 1
@@ -0,0 +1,121 @@
+import base64
+import gzip
+import json
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from recorder.consts import (
+    RecordingFileSuffix,
+    VIEWER_BALL_RADIUS,
+    VIEWER_ROBOT_SIZE,
+)
+from recorder.trajectory import TrajectoryRecordAssistant
+from referee.consts import (
+    BLUE_PENALTY_AREA,
+    DEFAULT_MATCH_TIME,
+    FIELD_X_LOWER_LIMIT,
+    FIELD_X_UPPER_LIMIT,
+    FIELD_Y_LOWER_LIMIT,
+    FIELD_Y_UPPER_LIMIT,
+    GOAL_BLUE_BACK_WALL_Y_LIMIT,
+    GOAL_BLUE_Y_LIMIT,
+    GOAL_X_LOWER_LIMIT,
+    GOAL_X_UPPER_LIMIT,
+    GOAL_YELLOW_BACK_WALL_Y_LIMIT,
+    GOAL_YELLOW_Y_LIMIT,
+    NEUTRAL_SPOTS,
+    ROBOT_NAMES,
+    YELLOW_PENALTY_AREA,
+)
+from referee.event_handlers import DrawMessageHandler, EventHandler
+from referee.events import Event
+
+TEMPLATE_PATH = Path(__file__).with_name("viewer.html")
+# Replaced with the data of the match in the template
+DATA_PLACEHOLDER = "/*RCJ_VIEWER_DATA*/null"
+
+
+def field_geometry() -> Dict:
+    """Return the dimensions of the field the viewer draws, in metres."""
+    return {
+        "x": [FIELD_X_LOWER_LIMIT, FIELD_X_UPPER_LIMIT],
+        "y": [FIELD_Y_LOWER_LIMIT, FIELD_Y_UPPER_LIMIT],
+        "goal_x": [GOAL_X_LOWER_LIMIT, GOAL_X_UPPER_LIMIT],
+        "goal_blue_y": [GOAL_BLUE_Y_LIMIT, GOAL_BLUE_BACK_WALL_Y_LIMIT],
+        "goal_yellow_y": [
+            GOAL_YELLOW_Y_LIMIT,
+            GOAL_YELLOW_BACK_WALL_Y_LIMIT,
+        ],
+        "penalty_area_blue": list(BLUE_PENALTY_AREA),
+        "penalty_area_yellow": list(YELLOW_PENALTY_AREA),
+        "neutral_spots": [list(spot) for spot in NEUTRAL_SPOTS.values()],
+        "robot_size": VIEWER_ROBOT_SIZE,
+        "ball_radius": VIEWER_BALL_RADIUS,
+    }
+
+
+class ViewerRecordAssistant(TrajectoryRecordAssistant, EventHandler):
+    """Record the match into a self-contained HTML page which plays it on a
+    canvas, with seeking.
+
+    The poses and the clock are recorded as by
+    ``TrajectoryRecordAssistant``, but in memory. The page embeds that
+    trajectory, gzipped (the unused part of the preallocated buffer
+    compresses to next to nothing), along with the timeline of the referee
+    events and the dimensions of the field. The page decodes the whole
+    trajectory when it is opened, so seeking is only an index lookup.
+
+    The recorder also has to be subscribed to the referee to see the
+    events, ``RCJSoccerMatch`` does it.
+    """
+
+    output_suffix = RecordingFileSuffix.VIEWER.value
+
+    def __init__(
+        self,
+        supervisor,
+        output_path: str = "",
+        match_time: int = DEFAULT_MATCH_TIME,
+        **kwargs,
+    ):
+        TrajectoryRecordAssistant.__init__(
+            self, supervisor, output_path, match_time, **kwargs
+        )
+        EventHandler.__init__(self)
+        self.events: List[Dict] = []
+        self.teams = {"blue": "", "yellow": ""}
+        self.messages = DrawMessageHandler().formatters
+
+    def handle(self, referee, event: Event):
+        self.teams = {
+            "blue": referee.team_name_blue,
+            "yellow": referee.team_name_yellow,
+        }
+        self.events.append(
+            {
+                "time": event.matchtime,
+                "type": event.type,
+                "message": self.messages[event.type](event),
+                "payload": event.payload,
+            }
+        )
+
+    def _open_file(self, size: int) -> np.ndarray:
+        return np.zeros(size, dtype=np.uint8)
+
+    def _close_file(self):
+        trajectory = gzip.compress(self.file.tobytes(), mtime=0)
+        data = {
+            "field": field_geometry(),
+            "robots": ROBOT_NAMES,
+            "teams": self.teams,
+            "events": self.events,
+            "trajectory": base64.b64encode(trajectory).decode(),
+        }
+        # Keeps "</script>" in a team name from ending the data block
+        data_json = json.dumps(data).replace("</", "<\\/")
+        page = TEMPLATE_PATH.read_text().replace(DATA_PLACEHOLDER, data_json)
+        with open(self.create_title(), "w") as f:
+            f.write(page)
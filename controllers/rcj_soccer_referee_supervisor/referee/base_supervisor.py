@@ -0,0 +1,667 @@
+import math
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from referee.consts import (
+    BALL_DEPTH,
+    BALL_INDEX,
+    DISTANCE_AROUND_UNOCCUPIED_NEUTRAL_SPOT,
+    N_OBJECTS,
+    N_ROBOTS,
+    NEUTRAL_SPOTS,
+    OBJECT_DEPTH,
+    ROBOT_INITIAL_ROTATION,
+    ROBOT_NAMES,
+    TIME_STEP,
+)
+from referee.enums import LabelIDs, NeutralSpotDistanceType
+from referee.shared_state import SharedStateWriter
+from referee.utils import time_to_string
+
+NEUTRAL_SPOT_NAMES = list(NEUTRAL_SPOTS)
+# (number of spots, 2) array of the x and y coordinates of the spots
+NEUTRAL_SPOT_POSITIONS = np.array(list(NEUTRAL_SPOTS.values()), dtype=float)
+
+
+class BaseRCJSoccerSupervisor:
+    """Soccer-specific supervisor logic built on top of the Webots
+    Supervisor API.
+
+    The class does not depend on Webots itself: it only calls Supervisor
+    methods (``getFromDef``, ``getDevice``, ``setLabel``, ...) on ``self``,
+    so it has to be mixed with a class that provides them -- either
+    ``controller.Supervisor`` or a stand-in such as the headless backend.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.emitter = self.getDevice("emitter")
+
+        # Poses of all the robots and the ball, preallocated once and
+        # overwritten in place every tick. The rows of translations follow
+        # ROBOT_NAMES and end with the ball, the rows of rotations follow
+        # ROBOT_NAMES.
+        self.translations = np.zeros((N_OBJECTS, 3))
+        self.rotations = np.zeros((N_ROBOTS, 4))
+
+        self.ball = self.getFromDef("BALL")
+        self.ball_translation_field = self.ball.getField("translation")
+        # Views into the pose buffers
+        self.ball_translation = self.translations[BALL_INDEX]
+        self.ball_translation[:] = self.ball_translation_field.getSFVec3f()
+
+        self.robot_nodes = {}
+        self.robot_translation_fields = {}
+        self.robot_rotation_fields = {}
+        self.robot_translation = {}
+        self.robot_rotation = {}
+        for i, robot in enumerate(ROBOT_NAMES):
+            robot_node = self.getFromDef(robot)
+            self.robot_nodes[robot] = robot_node
+
+            field = robot_node.getField("translation")
+            self.robot_translation_fields[robot] = field
+            self.robot_translation[robot] = self.translations[i]
+            self.translations[i] = field.getSFVec3f()
+
+            field = robot_node.getField("rotation")
+            self.robot_rotation_fields[robot] = field
+            self.robot_rotation[robot] = self.rotations[i]
+            self.rotations[i] = field.getSFRotation()
+
+        # Fields in the order of the rows of the pose buffers
+        self._translation_fields = [
+            self.robot_translation_fields[robot] for robot in ROBOT_NAMES
+        ] + [self.ball_translation_field]
+        self._rotation_fields = [
+            self.robot_rotation_fields[robot] for robot in ROBOT_NAMES
+        ]
+        # Row of each object in the pose buffers
+        self._object_rows = {robot: i for i, robot in enumerate(ROBOT_NAMES)}
+        self._object_rows["ball"] = BALL_INDEX
+        # Node and translation field of each object
+        self._nodes = {**self.robot_nodes, "ball": self.ball}
+        self._object_translation_fields = {
+            **self.robot_translation_fields,
+            "ball": self.ball_translation_field,
+        }
+
+        # Writes collected by a transaction, applied when it ends
+        self._transaction_depth = 0
+        self._pending_translations: Dict[str, List[float]] = {}
+        self._pending_rotations: Dict[str, List[float]] = {}
+        self._pending_velocity_resets: Set[str] = set()
+        self._pending_physics_resets: Set[str] = set()
+        # Robots whose physics is reset again at the start of the next tick
+        self.robots_to_reset_physics: Set[str] = set()
+        # Number of writes to the nodes and their fields
+        self.field_writes = 0
+
+        # Rows of the pose buffers not fetched from the fields yet in this
+        # step, see update_positions
+        self._stale_translations = [False] * N_OBJECTS
+        self._stale_rotations = [False] * N_ROBOTS
+        # The positions as read from the fields, which the rule checks of
+        # every tick read, and the rows of the translation buffer they are
+        # not copied to yet: the buffer is only filled when asked for
+        self.translation_rows: List[List[float]] = self.translations.tolist()
+        self._unbuffered_translations = [False] * N_OBJECTS
+        # Number of field reads and of steps, to tell the reads per step
+        self.field_reads = 0
+        self.position_updates = 0
+        # Ring buffer the poses of every step are written to, if any
+        self.shared_state: Optional[SharedStateWriter] = None
+
+        # Objects closer than this to a neutral spot occupy it
+        self.neutral_spot_distance = DISTANCE_AROUND_UNOCCUPIED_NEUTRAL_SPOT
+        self._invalidate_neutral_spot_distances()
+
+        self.hud_enabled = True
+        # Arguments of the last setLabel call of each label
+        self.label_cache: Dict[LabelIDs, tuple] = {}
+
+    def check_reset_physics_counters(self):
+        # HACK(Richo): Workaround for the following issue
+        # https://github.com/RoboCupJuniorTC/rcj-soccersim/issues/130
+        if not self.robots_to_reset_physics:
+            return
+        for robot in self.robots_to_reset_physics:
+            self.robot_nodes[robot].resetPhysics()
+            self.field_writes += 1
+        self.robots_to_reset_physics.clear()
+
+    @contextmanager
+    def transaction(self) -> Iterator["BaseRCJSoccerSupervisor"]:
+        """Collect the writes to the scene (positions, rotations, velocity
+        and physics resets) and apply them at once when the outermost
+        transaction ends. Only the last position and rotation written to
+        a node are applied, and each of its resets only once.
+
+        Webots applies the writes of a step at the next ``step`` anyway, so
+        this changes nothing to the simulation. The pose getters see the
+        written poses right away.
+        """
+        self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.commit()
+
+    def commit(self):
+        """Apply the writes collected by the transaction."""
+        for name, position in self._pending_translations.items():
+            self._object_translation_fields[name].setSFVec3f(position)
+        for robot, rotation in self._pending_rotations.items():
+            self.robot_rotation_fields[robot].setSFRotation(rotation)
+        for name in self._pending_velocity_resets:
+            self._nodes[name].setVelocity([0, 0, 0, 0, 0, 0])
+        for name in self._pending_physics_resets:
+            self._nodes[name].resetPhysics()
+        self.field_writes += (
+            len(self._pending_translations)
+            + len(self._pending_rotations)
+            + len(self._pending_velocity_resets)
+            + len(self._pending_physics_resets)
+        )
+
+        self._pending_translations.clear()
+        self._pending_rotations.clear()
+        self._pending_velocity_resets.clear()
+        self._pending_physics_resets.clear()
+
+    def get_controllers(self) -> Dict[str, str]:
+        """Return the controller of each robot."""
+        return {
+            robot: node.getField("controller").getSFString()
+            for robot, node in self.robot_nodes.items()
+        }
+
+    def reset_world(self, controllers: Optional[Dict[str, str]] = None):
+        """Put the world back in its initial state, e.g. between two matches
+        played in the same simulation, and restart the robot controllers.
+
+        Args:
+            controllers (dict, optional): Controller each robot is switched
+                to; Webots restarts the controllers it changes on its own
+        """
+        controllers = controllers or {}
+        self._pending_translations.clear()
+        self._pending_rotations.clear()
+        self._pending_velocity_resets.clear()
+        self._pending_physics_resets.clear()
+        self.robots_to_reset_physics.clear()
+
+        self.simulationReset()
+        for robot, node in self.robot_nodes.items():
+            field = node.getField("controller")
+            controller = controllers.get(robot)
+            if controller is not None and field.getSFString() != controller:
+                field.setSFString(controller)
+            else:
+                node.restartController()
+
+        # The reset takes effect with the next step
+        self.step(TIME_STEP)
+        self.update_positions()
+
+    def _write_translation(self, name: str, position: List[float]):
+        if self._transaction_depth:
+            self._pending_translations[name] = list(position)
+        else:
+            self._object_translation_fields[name].setSFVec3f(position)
+            self.field_writes += 1
+
+    def _reset_velocity(self, name: str):
+        if self._transaction_depth:
+            self._pending_velocity_resets.add(name)
+        else:
+            self._nodes[name].setVelocity([0, 0, 0, 0, 0, 0])
+            self.field_writes += 1
+
+    def _reset_physics(self, name: str):
+        if self._transaction_depth:
+            self._pending_physics_resets.add(name)
+        else:
+            self._nodes[name].resetPhysics()
+            self.field_writes += 1
+
+    def update_positions(self):
+        """Start a new step: the poses of the robots and the ball are fetched
+        again, each one the first time it is asked for in the step. Poses
+        nobody asks for, e.g. the rotations or all of them while the
+        referee waits for a kickoff, are not read at all."""
+        self._stale_translations = [True] * N_OBJECTS
+        self._stale_rotations = [True] * N_ROBOTS
+        self.position_updates += 1
+        self._invalidate_neutral_spot_distances()
+
+        if self.shared_state:
+            # Reads all the poses
+            self.shared_state.write(
+                self.position_updates,
+                self.getTime(),
+                self.get_translations(),
+                self.get_rotations(),
+            )
+
+    def _fetch_translation(self, row: int):
+        if self._stale_translations[row]:
+            field = self._translation_fields[row]
+            self.translation_rows[row] = field.getSFVec3f()
+            self._stale_translations[row] = False
+            self._unbuffered_translations[row] = True
+            self.field_reads += 1
+
+    def _buffer_translation(self, row: int):
+        self._fetch_translation(row)
+        if self._unbuffered_translations[row]:
+            self.translations[row] = self.translation_rows[row]
+            self._unbuffered_translations[row] = False
+
+    def _fetch_rotation(self, row: int):
+        if self._stale_rotations[row]:
+            self.rotations[row] = self._rotation_fields[row].getSFRotation()
+            self._stale_rotations[row] = False
+            self.field_reads += 1
+
+    def field_reads_per_step(self) -> float:
+        """Return the mean number of pose field reads per step."""
+        return self.field_reads / max(self.position_updates, 1)
+
+    def _store_translation(self, row: int, position: List[float]):
+        """Keep the position an object was moved to as its current one."""
+        self.translations[row] = position
+        self.translation_rows[row] = list(position)
+        self._stale_translations[row] = False
+        self._unbuffered_translations[row] = False
+
+    def get_translations(self) -> np.ndarray:
+        """Return the positions of all the robots and the ball.
+
+        Returns:
+            np.ndarray: (N_OBJECTS, 3) buffer of x, y and z coordinates, one
+                row per robot in the order of ROBOT_NAMES followed by the
+                ball. The buffer gets overwritten as the poses are fetched
+                in later steps.
+        """
+        if True in self._stale_translations:
+            for row in range(N_OBJECTS):
+                self._fetch_translation(row)
+        if True in self._unbuffered_translations:
+            self.translations[:] = self.translation_rows
+            self._unbuffered_translations = [False] * N_OBJECTS
+        return self.translations
+
+    def get_translation_rows(self) -> List[List[float]]:
+        """Return the positions of all the robots and the ball as plain
+        floats, which are cheaper to compare one by one than the elements
+        of ``get_translations``.
+
+        Returns:
+            list: x, y and z coordinates of each object, in the order of the
+                rows of ``get_translations``. The list is updated as the
+                poses are fetched in later steps, its rows are replaced
+                rather than modified and must not be modified.
+        """
+        if True in self._stale_translations:
+            for row in range(N_OBJECTS):
+                self._fetch_translation(row)
+        return self.translation_rows
+
+    def get_rotations(self) -> np.ndarray:
+        """Return the rotations of all the robots.
+
+        Returns:
+            np.ndarray: (N_ROBOTS, 4) buffer of Webots axis-angle rotations,
+                one row per robot in the order of ROBOT_NAMES. The buffer
+                gets overwritten as the poses are fetched in later steps.
+        """
+        if True in self._stale_rotations:
+            for row in range(N_ROBOTS):
+                self._fetch_rotation(row)
+        return self.rotations
+
+    def get_robot_translation(self, robot: str) -> np.ndarray:
+        """Return the position of the robot.
+
+        Args:
+            robot (str): The robot whose position is returned
+
+        Returns:
+            np.ndarray: x, y and z coordinates. The array is a view into the
+                pose buffer, so it gets overwritten as the poses are
+                fetched in later steps.
+        """
+        self._buffer_translation(self._object_rows[robot])
+        return self.robot_translation[robot]
+
+    def get_robot_rotation(self, robot: str) -> np.ndarray:
+        """Return the rotation of the robot.
+
+        Args:
+            robot (str): The robot whose rotation is returned
+
+        Returns:
+            np.ndarray: Webots axis-angle rotation, a view into the pose
+                buffer like ``get_robot_translation``
+        """
+        self._fetch_rotation(self._object_rows[robot])
+        return self.robot_rotation[robot]
+
+    def get_ball_translation(self) -> np.ndarray:
+        """Return the position of the ball.
+
+        Returns:
+            np.ndarray: x, y and z coordinates. The array is a view into the
+                pose buffer, so it gets overwritten as the poses are
+                fetched in later steps.
+        """
+        self._buffer_translation(BALL_INDEX)
+        return self.ball_translation
+
+    def set_robot_position(self, robot_name: str, position: List[float]):
+        """Set the position of a robot.
+
+        Args:
+            robot_name (str): The robot we are moving
+            position (list of floats): The actual position
+        """
+        self._write_translation(robot_name, position)
+        self._reset_physics(robot_name)
+        self.robots_to_reset_physics.add(robot_name)
+        self._store_translation(self._object_rows[robot_name], position)
+        self._invalidate_neutral_spot_distances()
+
+    def set_robot_rotation(self, robot_name: str, rotation: List[float]):
+        """Set the rotation of a robot.
+
+        Args:
+            robot_name (str): The robot we are rotating
+            rotation (list of floats): The actual rotation
+        """
+        if self._transaction_depth:
+            self._pending_rotations[robot_name] = list(rotation)
+        else:
+            self.robot_rotation_fields[robot_name].setSFRotation(rotation)
+            self.field_writes += 1
+        self.robot_rotation[robot_name][:] = rotation
+        self._stale_rotations[self._object_rows[robot_name]] = False
+
+    def set_ball_position(self, position: List[float]):
+        """Set the position of the ball.
+
+        Args:
+            position (list of floats): The actual position
+        """
+        self._write_translation("ball", position)
+        self.reset_ball_velocity()
+        self._reset_physics("ball")
+        self._store_translation(BALL_INDEX, position)
+        self._invalidate_neutral_spot_distances()
+
+    def reset_robot_velocity(self, robot_name: str):
+        """Reset the robot's velocity.
+
+        Args:
+            robot_name (str): The robot we set the velocity for
+        """
+        self._reset_velocity(robot_name)
+
+    def reset_ball_velocity(self):
+        """Reset the ball's velocity."""
+        self._reset_velocity("ball")
+
+    def _invalidate_neutral_spot_distances(self):
+        self._neutral_spot_distances_sq = None
+        self._neutral_spot_occupancy = None
+
+    def _compute_neutral_spot_distances(self):
+        """Compute the squared distances from every object to every neutral
+        spot and which spots are occupied, in a single vectorized pass. The
+        result is cached until the poses change."""
+        offsets = (
+            self.get_translations()[:, np.newaxis, :2]
+            - NEUTRAL_SPOT_POSITIONS[np.newaxis, :, :]
+        )
+        distances_sq = (offsets**2).sum(axis=2)
+        self._neutral_spot_distances_sq = distances_sq
+        self._neutral_spot_occupancy = (
+            distances_sq < self.neutral_spot_distance**2
+        ).any(axis=0)
+
+    def get_neutral_spot_occupancy(self) -> np.ndarray:
+        """Return which neutral spots are occupied by a robot or the ball.
+
+        Returns:
+            np.ndarray: Boolean mask in the order of NEUTRAL_SPOT_NAMES
+        """
+        if self._neutral_spot_occupancy is None:
+            self._compute_neutral_spot_distances()
+        return self._neutral_spot_occupancy
+
+    def is_neutral_spot_occupied(self, ns_x: float, ns_y: float) -> bool:
+        """Check whether the specific neutral spot is occupied
+
+        Args:
+            ns_x (float): x position of the neutral spot
+            ns_y (float): y position of the neutral spot
+
+        Returns:
+            bool: Whether the neutral spot is occupied
+        """
+        offsets = self.get_translations()[:, :2] - (ns_x, ns_y)
+        distances_sq = (offsets**2).sum(axis=1)
+        limit_sq = self.neutral_spot_distance**2
+        return bool((distances_sq < limit_sq).any())
+
+    def get_unoccupied_neutral_spots_sorted(
+        self,
+        distance_type: NeutralSpotDistanceType,
+        object_name: str,
+    ) -> List[Tuple[str, float]]:
+        """Get sorted pairs of (neutral_spot, distance)
+        sorted according to distance_type.
+        Furthest distance type -> descending order
+        Nearest distance type -> ascending order
+
+        Args:
+            distance_type (NeutralSpotDistanceType): Either nearest or furthest
+            object_name (str): Get the spot for this object
+
+        Returns:
+            list: sorted pairs of neutral spots and their distances
+        """
+        occupancy = self.get_neutral_spot_occupancy()
+        row = self._object_rows[object_name]
+        distances_sq = self._neutral_spot_distances_sq[row]
+
+        # Stable sorts keep the order of NEUTRAL_SPOTS among equally distant
+        # spots, for both directions
+        if distance_type == NeutralSpotDistanceType.FURTHEST.value:
+            order = np.argsort(-distances_sq, kind="stable")
+        else:
+            order = np.argsort(distances_sq, kind="stable")
+        order = order[~occupancy[order]]
+
+        return [
+            (NEUTRAL_SPOT_NAMES[i], math.sqrt(distances_sq[i]))
+            for i in order.tolist()
+        ]
+
+    def move_object_to_neutral_spot(self, object_name: str, neutral_spot: str):
+        """Move the robot to the specified neutral spot.
+
+        Args:
+            object_name (str): Name of the object (Ball or robot's name)
+            neutral_spot (str): The spot the robot will be moved to
+        """
+        x, y = NEUTRAL_SPOTS[neutral_spot]
+        if object_name == "ball":
+            self.set_ball_position([x, y, BALL_DEPTH])
+        else:
+            self.set_robot_position(object_name, [x, y, OBJECT_DEPTH])
+            self.set_robot_rotation(
+                object_name, ROBOT_INITIAL_ROTATION[object_name]
+            )
+
+    def emit_data(self, data: Union[str, bytes]):
+        """Send packet via emitter
+
+        Args:
+            data (str or bytes): the data to be sent
+        """
+        self.emitter.send(data)
+
+    def set_hud_enabled(self, enabled: bool):
+        """Turn all the drawing of labels on or off, e.g. off for fast runs
+        nobody watches.
+
+        Args:
+            enabled (bool): Whether the labels are drawn
+        """
+        self.hud_enabled = enabled
+        self.label_cache.clear()
+
+    def draw_label(self, label_id: LabelIDs, *args):
+        """Draw a label with ``setLabel``, unless it is already drawn with the
+        very same text, position, size, color, transparency and font.
+
+        Args:
+            label_id (LabelIDs): The label to draw
+            args: The remaining arguments of ``setLabel``
+        """
+        if not self.hud_enabled or self.label_cache.get(label_id) == args:
+            return
+        self.label_cache[label_id] = args
+        self.setLabel(label_id.value, *args)
+
+    def draw_team_names(self, team_name_blue: str, team_name_yellow: str):
+        """Visualize (draw) the names of the teams.
+
+        Args:
+            team_name_blue (str): name of the blue team
+            team_name_yellow (str): name of the yellow team
+        """
+        self.draw_label(
+            LabelIDs.BLUE_TEAM,
+            team_name_blue,
+            0.92 - (len(team_name_blue) * 0.01),  # X position
+            0.05,  # Y position
+            0.1,  # Size
+            0x0000FF,  # Color
+            0.0,  # Transparency
+            "Tahoma",  # Font
+        )
+
+        self.draw_label(
+            LabelIDs.YELLOW_TEAM,
+            team_name_yellow,
+            0.05,  # X position
+            0.05,  # Y position
+            0.1,  # Size
+            0xFFFF00,  # Color
+            0.0,  # Transparency
+            "Tahoma",  # Font
+        )
+
+    def draw_scores(self, blue: int, yellow: int):
+        """Visualize (draw) the provide scores for both the blue and
+        the yellow teams.
+
+        Args:
+            blue (int): score of the blue team
+            yellow (int): score of the yellow team
+        """
+        self.draw_label(
+            LabelIDs.BLUE_SCORE,
+            str(blue),
+            0.92,  # X position
+            0.01,  # Y position
+            0.1,  # Size
+            0x0000FF,  # Color
+            0.0,  # Transparency
+            "Tahoma",  # Font
+        )
+
+        self.draw_label(
+            LabelIDs.YELLOW_SCORE,
+            str(yellow),
+            0.05,  # X position
+            0.01,  # Y position
+            0.1,  # Size
+            0xFFFF00,  # Color
+            0.0,  # Transparency
+            "Tahoma",  # Font
+        )
+
+    def draw_time(self, time: int):
+        """Visualize (draw) the current match time
+
+        Args:
+            time (int): the current match time
+        """
+        self.draw_label(
+            LabelIDs.TIME,
+            time_to_string(time),
+            0.45,
+            0.01,
+            0.1,
+            0x000000,
+            0.0,
+            "Arial",
+        )
+
+    def draw_event_messages(self, messages: List[str]):
+        """Visualize (draw) the event messages from queue
+
+        Args:
+            messages: List of string messages to be drawn
+        """
+        if messages:
+            self.draw_label(
+                LabelIDs.EVENT_MESSAGES,
+                "\n".join(messages),
+                0.01,
+                0.95 - ((len(messages) - 1) * 0.025),
+                0.05,
+                0xFFFFFF,
+                0.0,
+                "Tahoma",
+            )
+
+    def draw_goal_sign(self, transparency: float = 0.0):
+        """Visualize (draw) a GOAL! sign after goal gets scored.
+
+        Args:
+            transparency (float): the transparecny of the text, with 0 meaning
+                no transparency and 1 meaning total transparency (the text will
+                not be visible).
+        """
+        self.draw_label(
+            LabelIDs.GOAL,
+            "GOAL!",
+            0.30,
+            0.40,
+            0.4,
+            0xFF0000,
+            transparency,
+            "Verdana",
+        )
+
+    def hide_goal_sign(self):
+        """Hide the GOAL! once the game is again in progress."""
+        self.draw_label(
+            LabelIDs.GOAL,
+            "",
+            0.30,
+            0.40,
+            0.4,
+            0xFF0000,
+            1.0,
+            "Verdana",
+        )
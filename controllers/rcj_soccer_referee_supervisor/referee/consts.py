@@ -1,3 +1,5 @@
+from math import ceil
+
 from referee.enums import Team
 
 DEFAULT_MATCH_TIME = 10 * 60  # 10 minutes
@@ -17,6 +19,15 @@ FIELD_X_LOWER_LIMIT = -0.655
 TIME_STEP = 32
 ROBOT_NAMES = ["B1", "B2", "B3", "Y1", "Y2", "Y3"]
 N_ROBOTS = len(ROBOT_NAMES)
+# Controllers the robots of each team run in soccer.wbt
+TEAM_CONTROLLERS = {
+    "B": "rcj_soccer_team_blue",
+    "Y": "rcj_soccer_team_yellow",
+}
+# Rows of the pose buffers: the robots in the order of ROBOT_NAMES followed
+# by the ball
+N_OBJECTS = N_ROBOTS + 1
+BALL_INDEX = N_ROBOTS
 
 BALL_DEPTH = 0
 BALL_INITIAL_TRANSLATION = [0, 0, BALL_DEPTH]
@@ -83,7 +94,32 @@ YELLOW_PENALTY_AREA = (-0.59, -0.35, 0.35)
 BLUE_PENALTY_AREA = (0.59, -0.35, 0.35)
 
 MAX_EVENT_MESSAGES_IN_QUEUE = 10
+# Events waiting for the asynchronous event handlers, firing blocks when full
+EVENT_QUEUE_SIZE = 1024
+# Buffered reflog lines are written once they reach this size or age
+REFLOG_BATCH_BYTES = 64 * 1024
+REFLOG_FLUSH_INTERVAL = 5.0
+# Frames of the state publisher waiting to be sent, the oldest ones are
+# dropped when full
+PUBLISHER_QUEUE_SIZE = 64
+# Ticks kept in the shared memory ring buffer, about 8 seconds
+SHARED_STATE_SLOTS = 256
+
+# Durations of up to 2**39 ns (9 minutes), longer ones share the last bucket
+PROFILER_HISTOGRAM_BUCKETS = 40
 
 DISTANCE_AROUND_UNOCCUPIED_NEUTRAL_SPOT = 0.08
 
-LACK_OF_PROGRESS_NUMBER_OF_NEUTRAL_SPOTS = 3
\ No newline at end of file
+LACK_OF_PROGRESS_NUMBER_OF_NEUTRAL_SPOTS = 3
+
+# Rule parameters of RCJSoccerReferee other than the match ones, shared by
+# the Webots, headless, replayed and batched matches
+REFEREE_RULES = {
+    "progress_check_steps": ceil(15 / (TIME_STEP / 1000.0)),
+    "progress_check_threshold": 0.5,
+    "ball_progress_check_steps": ceil(10 / (TIME_STEP / 1000.0)),
+    "ball_progress_check_threshold": 0.5,
+    "penalty_area_allowed_time": 15,
+    "penalty_area_reset_after": 2,
+    "initial_position_noise": 0.0,
+}
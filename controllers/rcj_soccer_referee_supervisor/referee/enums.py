@@ -30,3 +30,80 @@ class GameEvents(Enum):
 class NeutralSpotDistanceType(Enum):
     FURTHEST = "FURTHEST"
     NEAREST = "NEAREST"
+
+
+class ProgressCheckMode(Enum):
+    """How ProgressChecker measures the progress of an object."""
+
+    # Total distance travelled
+    DISTANCE = "distance"
+    # Diagonal of the bounding box of the recent positions
+    DISPLACEMENT = "displacement"
+
+    @classmethod
+    def all(cls):
+        return list(map(lambda member: member.value, cls))
+
+
+class PacketFormat(Enum):
+    """Format of the packets the referee sends to the robots."""
+
+    # Compact struct record, see referee.packet_codec
+    BINARY = "binary"
+    # {"waiting_for_kickoff": ...}, for team code parsing it with json
+    JSON = "json"
+
+    @classmethod
+    def all(cls):
+        return list(map(lambda member: member.value, cls))
+
+
+class ReflogCompression(Enum):
+    NONE = "none"
+    GZIP = "gzip"
+    # Needs the zstandard package
+    ZSTD = "zstd"
+
+    @classmethod
+    def all(cls):
+        return list(map(lambda member: member.value, cls))
+
+
+class FsyncPolicy(Enum):
+    """When the lines of the reflog are synced to the disk."""
+
+    # Left to the operating system
+    NONE = "none"
+    # After each batch of lines
+    BATCH = "batch"
+    # After each line, which also disables batching
+    EVENT = "event"
+
+    @classmethod
+    def all(cls):
+        return list(map(lambda member: member.value, cls))
+
+
+class TickPhase(Enum):
+    """Phases of the referee loop timed by TickProfiler."""
+
+    # supervisor.step, i.e. the simulation itself
+    STEP = "step"
+    RESET_PHYSICS = "reset_physics"
+    UPDATE_POSITIONS = "update_positions"
+    EMIT_DATA = "emit_data"
+    # Clock and event messages
+    HUD = "hud"
+    CHECK_GOAL = "check_goal"
+    CHECK_PROGRESS = "check_progress"
+    CHECK_PENALTY_AREA = "check_penalty_area"
+    # Waiting for the kickoff after a goal
+    GOAL_RESET = "goal_reset"
+    RECORD = "record"
+    PUBLISH = "publish"
+    # Robot controllers, only run in-process by the headless runner
+    ROBOTS = "robots"
+
+    @classmethod
+    def all(cls):
+        return list(map(lambda member: member.value, cls))
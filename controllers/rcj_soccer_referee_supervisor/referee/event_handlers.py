@@ -1,87 +1,127 @@
 import json
-from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Optional
+
+from referee.enums import FsyncPolicy, GameEvents, ReflogCompression
+from referee.events import (
+    Event,
+    Goal,
+    InsidePenaltyForTooLong,
+    Kickoff,
+    LackOfProgress,
+    MatchFinish,
+    MatchStart,
+)
+from referee.reflog import DatetimeFormatter, ReflogWriter
 
 
 class EventHandler:
+    # Asynchronous handlers are called off the tick, on the worker thread of
+    # the Eventer. They must not touch the referee, only read the event.
+    asynchronous = False
+
     def __init__(self):
         pass
 
     def handle(
         self,
         referee,  # Referee from referee.py
-        type: str,
-        payload: Optional[dict] = None,
+        event: Event,
     ):
         """Handle the incoming event
 
         Args:
             referee (RCJSoccerReferee): Instance of Referee
-            type (str): Event type
-            payload (dict, optional): More information about the event
+            event (Event): The event
         """
         raise NotImplementedError
 
+    def close(self):
+        """Release the resources of the handler once the match is over"""
+        pass
+
 
 class JSONLoggerHandler(EventHandler):
-    """Handler for writing data to json file."""
+    """Handler for writing data to json file.
 
-    def __init__(self, logfile: Path):
+    See ``ReflogWriter`` for the arguments other than ``logfile``. The
+    lines are written in batches and at the end of the match.
+    """
+
+    asynchronous = True
+
+    def __init__(
+        self,
+        logfile: Path,
+        compression: str = ReflogCompression.NONE.value,
+        fsync: str = FsyncPolicy.NONE.value,
+        max_bytes: Optional[int] = None,
+    ):
         super().__init__()
         self.logfile = logfile
+        self.writer = ReflogWriter(logfile, compression, fsync, max_bytes)
+        self.datetime_formatter = DatetimeFormatter()
 
-    def handle(self, referee, type: str, payload: Optional[dict] = None):
-        matchtime = referee.match_time - referee.time
+    def handle(self, referee, event: Event):
         data = {
-            "datetime": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
-            "matchtime": matchtime,
-            "event": type,
+            "datetime": self.datetime_formatter.format(event.datetime),
+            "matchtime": event.matchtime,
+            "event": event.type,
         }
 
-        if payload is not None:
+        payload = event.payload
+        if payload:
             data["payload"] = payload
 
-        with self.logfile.open("a") as outfile:
-            json.dump(data, outfile)
-            outfile.write("\n")
+        self.writer.write(json.dumps(data) + "\n")
+        if event.type == GameEvents.MATCH_FINISH.value:
+            self.writer.flush()
+
+    def close(self):
+        self.writer.close()
 
 
 class DrawMessageHandler(EventHandler):
     """Handler for creating the message which is drawn onto world window."""
 
+    def __init__(self):
+        super().__init__()
+        self.formatters: Dict[str, Callable[[Event], str]] = {
+            GameEvents.INSIDE_PENALTY_FOR_TOO_LONG.value: (
+                self.create_inside_penalty_for_too_long_msg
+            ),
+            GameEvents.LACK_OF_PROGRESS.value: (
+                self.create_lack_of_progress_msg
+            ),
+            GameEvents.GOAL.value: self.create_goal_msg,
+            GameEvents.KICKOFF.value: self.create_kickoff_msg,
+            GameEvents.MATCH_START.value: self.create_match_start_msg,
+            GameEvents.MATCH_FINISH.value: self.create_match_finish_msg,
+        }
+
     def create_inside_penalty_for_too_long_msg(
         self,
-        robot_name: str,
-        **kwargs,
+        event: InsidePenaltyForTooLong,
     ) -> str:
-        return f"Robot {robot_name}: Inside penalty for too long."
+        return f"Robot {event.robot_name}: Inside penalty for too long."
 
-    def create_lack_of_progress_msg(
-        self,
-        type: str,
-        robot_name: Optional[str] = None,
-        **kwargs,
-    ) -> str:
-        if type == "ball":
+    def create_lack_of_progress_msg(self, event: LackOfProgress) -> str:
+        if event.object_type == "ball":
             return "Ball: Lack of progress."
-        return f"Robot {robot_name}: Lack of progress."
+        return f"Robot {event.robot_name}: Lack of progress."
 
-    def create_goal_msg(self, team_name: str, **kwargs) -> str:
-        return f"A goal was scored by {team_name}."
+    def create_goal_msg(self, event: Goal) -> str:
+        return f"A goal was scored by {event.team_name}."
 
-    def create_kickoff_msg(self, robot_name: str, **kwargs) -> str:
-        return f"Robot {robot_name} is kicking off."
+    def create_kickoff_msg(self, event: Kickoff) -> str:
+        return f"Robot {event.robot_name} is kicking off."
 
-    def create_match_start_msg(self, total_match_time: int, **kwargs) -> str:
-        return f"The match ({total_match_time}s) has started."
+    def create_match_start_msg(self, event: MatchStart) -> str:
+        return f"The match ({event.total_match_time}s) has started."
 
-    def create_match_finish_msg(self, total_match_time: int, **kwargs) -> str:
-        return f"The match time {total_match_time}s is over."
+    def create_match_finish_msg(self, event: MatchFinish) -> str:
+        return f"The match time {event.total_match_time}s is over."
 
-    def handle(self, referee, type: str, payload: Optional[dict] = None):
-        # Call formatter based on event type.
-        msg_formatter = getattr(self, f"create_{type.lower()}_msg")
-        data = payload if payload is not None else {}
-        message = msg_formatter(**data)
+    def handle(self, referee, event: Event):
+        message = self.formatters[event.type](event)
         referee.add_event_message_to_queue(message)
@@ -1,13 +1,93 @@
+from queue import Queue
+from threading import Thread
+from typing import List, Optional
+
+from referee.consts import EVENT_QUEUE_SIZE
+from referee.enums import GameEvents
 from referee.event_handlers import EventHandler
+from referee.events import Event
 
 
 class Eventer:
-    def __init__(self):
-        self.subscribers = []
+    """Fire the game events to the subscribed event handlers.
+
+    Synchronous handlers, e.g. the ones changing the state of the referee,
+    are called right away, inside the tick. Asynchronous handlers get the
+    events through a bounded queue consumed by a worker thread, so that a
+    slow handler (disk I/O) does not stall the simulation step. The queue
+    is flushed when the match finishes.
+
+    Args:
+        asynchronous (bool): Whether asynchronous handlers are called on
+            the worker thread. If False, every handler is called inside the
+            tick.
+        queue_size (int): Capacity of the queue. Firing an event blocks
+            while the queue is full.
+    """
+
+    def __init__(
+        self,
+        asynchronous: bool = True,
+        queue_size: int = EVENT_QUEUE_SIZE,
+    ):
+        self.subscribers: List[EventHandler] = []
+        self.asynchronous = asynchronous
+        self.queue: Queue = Queue(maxsize=queue_size)
+        self.worker: Optional[Thread] = None
+        self.errors: List[Exception] = []
 
     def subscribe(self, subscriber: EventHandler):
         self.subscribers.append(subscriber)
+        if self.asynchronous and subscriber.asynchronous and not self.worker:
+            self.worker = Thread(target=self._work, name="eventer")
+            self.worker.daemon = True
+            self.worker.start()
 
-    def event(self, *args, **kwargs):
+    def event(self, referee, event: Event):
+        event.stamp(referee.match_time - referee.time)
         for subscriber in self.subscribers:
-            subscriber.handle(*args, **kwargs)
+            if subscriber.asynchronous and self.worker:
+                self.queue.put((subscriber, referee, event))
+            else:
+                subscriber.handle(referee, event)
+
+        if event.type == GameEvents.MATCH_FINISH.value:
+            self.flush()
+
+    def flush(self):
+        """Wait until the asynchronous handlers have handled every event
+        fired so far.
+
+        Raises:
+            Exception: The first error raised by an asynchronous handler
+                since the last flush
+        """
+        self.queue.join()
+        if self.errors:
+            error = self.errors[0]
+            self.errors.clear()
+            raise error
+
+    def close(self):
+        """Flush the queue, stop the worker thread and close the handlers."""
+        if self.worker:
+            self.queue.put(None)
+            self.worker.join()
+            self.worker = None
+
+        for subscriber in self.subscribers:
+            subscriber.close()
+        self.flush()
+
+    def _work(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                subscriber, referee, event = item
+                subscriber.handle(referee, event)
+            except Exception as error:
+                self.errors.append(error)
+            finally:
+                self.queue.task_done()
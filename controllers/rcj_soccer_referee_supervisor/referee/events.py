@@ -0,0 +1,142 @@
+"""Game events, one slotted class per ``GameEvents`` member."""
+from datetime import datetime
+from typing import Dict, Optional, Type
+
+from referee.enums import GameEvents
+
+
+class Event:
+    """Base class of the game events.
+
+    ``matchtime`` and ``datetime`` are stamped by the ``Eventer`` when the
+    event is fired, so that handlers running after the tick still know when
+    it happened.
+    """
+
+    __slots__ = ("matchtime", "datetime")
+    type: str
+
+    def stamp(self, matchtime: float):
+        self.matchtime = matchtime
+        self.datetime = datetime.utcnow()
+
+    @property
+    def payload(self) -> Dict:
+        """More information about the event, as written into the reflog"""
+        return {name: getattr(self, name) for name in type(self).__slots__}
+
+
+class MatchStart(Event):
+    __slots__ = (
+        "score_yellow",
+        "score_blue",
+        "total_match_time",
+        "team_name_yellow",
+        "team_name_blue",
+        "match_id",
+        "halftime",
+    )
+    type = GameEvents.MATCH_START.value
+
+    def __init__(
+        self,
+        score_yellow: int,
+        score_blue: int,
+        total_match_time: int,
+        team_name_yellow: str,
+        team_name_blue: str,
+        match_id: int,
+        halftime: int,
+    ):
+        self.score_yellow = score_yellow
+        self.score_blue = score_blue
+        self.total_match_time = total_match_time
+        self.team_name_yellow = team_name_yellow
+        self.team_name_blue = team_name_blue
+        self.match_id = match_id
+        self.halftime = halftime
+
+
+class MatchFinish(Event):
+    __slots__ = (
+        "total_match_time",
+        "score_yellow",
+        "score_blue",
+        "team_name_yellow",
+        "team_name_blue",
+    )
+    type = GameEvents.MATCH_FINISH.value
+
+    def __init__(
+        self,
+        total_match_time: int,
+        score_yellow: int,
+        score_blue: int,
+        team_name_yellow: str,
+        team_name_blue: str,
+    ):
+        self.total_match_time = total_match_time
+        self.score_yellow = score_yellow
+        self.score_blue = score_blue
+        self.team_name_yellow = team_name_yellow
+        self.team_name_blue = team_name_blue
+
+
+class LackOfProgress(Event):
+    __slots__ = ("object_type", "robot_name")
+    type = GameEvents.LACK_OF_PROGRESS.value
+
+    def __init__(self, object_type: str, robot_name: Optional[str] = None):
+        """
+        Args:
+            object_type (str): "robot" or "ball"
+            robot_name (str, optional): Name of the robot, if any
+        """
+        self.object_type = object_type
+        self.robot_name = robot_name
+
+    @property
+    def payload(self) -> Dict:
+        if self.robot_name is None:
+            return {"type": self.object_type}
+        return {"type": self.object_type, "robot_name": self.robot_name}
+
+
+class InsidePenaltyForTooLong(Event):
+    __slots__ = ("robot_name",)
+    type = GameEvents.INSIDE_PENALTY_FOR_TOO_LONG.value
+
+    def __init__(self, robot_name: str):
+        self.robot_name = robot_name
+
+
+class Kickoff(Event):
+    __slots__ = ("robot_name", "team_name")
+    type = GameEvents.KICKOFF.value
+
+    def __init__(self, robot_name: str, team_name: str):
+        self.robot_name = robot_name
+        self.team_name = team_name
+
+
+class Goal(Event):
+    __slots__ = ("team_name", "score_yellow", "score_blue")
+    type = GameEvents.GOAL.value
+
+    def __init__(self, team_name: str, score_yellow: int, score_blue: int):
+        self.team_name = team_name
+        self.score_yellow = score_yellow
+        self.score_blue = score_blue
+
+
+EVENT_CLASSES: Dict[str, Type[Event]] = {
+    event_class.type: event_class
+    for event_class in (
+        MatchStart,
+        MatchFinish,
+        LackOfProgress,
+        InsidePenaltyForTooLong,
+        Kickoff,
+        Goal,
+    )
+}
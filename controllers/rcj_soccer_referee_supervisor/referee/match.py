@@ -0,0 +1,535 @@
+import cProfile
+import json
+import logging
+import os
+import pstats
+from concurrent.futures import Future
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime
+from pathlib import Path
+from typing import List, Mapping, Optional, Tuple
+
+from recorder.consts import RecordingFormat
+from recorder.finalizer import Finalizer, Manifest
+from recorder.trajectory import TrajectoryRecordAssistant
+from recorder.viewer import ViewerRecordAssistant
+from referee.consts import (
+    DEFAULT_MATCH_TIME,
+    REFEREE_RULES,
+    ROBOT_NAMES,
+    TEAM_CONTROLLERS,
+    TIME_STEP,
+)
+from referee.enums import (
+    FsyncPolicy,
+    PacketFormat,
+    ProgressCheckMode,
+    ReflogCompression,
+    Team,
+    TickPhase,
+)
+from referee.event_handlers import (
+    DrawMessageHandler,
+    EventHandler,
+    JSONLoggerHandler,
+)
+from referee.profiler import dump_profile, TickProfiler
+from referee.publisher import StatePublisher
+from referee.referee import RCJSoccerReferee
+from referee.shared_state import SharedStateWriter
+
+# Recorders recording the poses themselves, in Webots and headless alike
+POSE_RECORDERS = {
+    RecordingFormat.TRAJECTORY.value: TrajectoryRecordAssistant,
+    RecordingFormat.VIEWER.value: ViewerRecordAssistant,
+}
+
+
+def output_path(
+    directory: Path,
+    team_blue_id: str,
+    team_yellow_id: str,
+    match_id: int,
+    half_id: int,
+) -> Path:
+    now_str = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    team_blue = team_blue_id.replace(" ", "_")
+    team_yellow = team_yellow_id.replace(" ", "_")
+
+    # Ensure the directory exists
+    if not directory.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+
+    name = f"{match_id}_-_{half_id}_-_{team_blue}_vs_{team_yellow}-{now_str}"
+    filename = Path(name)
+    return directory / filename
+
+
+@dataclass
+class MatchConfig:
+    """Parameters of a half, see ``from_env`` for the environment variables
+    setting them."""
+
+    team_blue: str = "The Blues"
+    team_blue_id: str = "The Blues"
+    team_yellow: str = "The Yellows"
+    team_yellow_id: str = "The Yellows"
+    initial_score_blue: int = 0
+    initial_score_yellow: int = 0
+    match_id: str = "1"
+    half_id: int = 1
+    match_time: int = DEFAULT_MATCH_TIME
+    rec_formats: List[str] = field(default_factory=list)
+    progress_check_mode: str = ProgressCheckMode.DISTANCE.value
+    packet_format: str = PacketFormat.JSON.value
+    reflog_compression: str = ReflogCompression.NONE.value
+    reflog_fsync: str = FsyncPolicy.NONE.value
+    reflog_max_bytes: Optional[int] = None
+    automatic_mode: bool = False
+    hud_enabled: bool = True
+    tick_profile: bool = False
+    cprofile: bool = False
+    output_directory: Path = Path("reflog")
+    # Where the state of the match is streamed to, see StatePublisher
+    publish_address: Optional[str] = None
+    publish_rate_divisor: int = 1
+    # Whether the poses are written to shared memory, see SharedStateWriter
+    shared_state: bool = False
+    # Controllers of the robots of each side
+    controller_blue: str = TEAM_CONTROLLERS[Team.BLUE.value]
+    controller_yellow: str = TEAM_CONTROLLERS[Team.YELLOW.value]
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ):
+        """Read the ``RCJ_SIM_*`` environment variables."""
+        rec_formats = environ.get("RCJ_SIM_REC_FORMATS", "").split(",")
+        return cls(
+            team_blue=environ.get("RCJ_SIM_TEAM_BLUE_NAME", "The Blues"),
+            team_blue_id=environ.get("RCJ_SIM_TEAM_BLUE_ID", "The Blues"),
+            team_yellow=environ.get("RCJ_SIM_TEAM_YELLOW_NAME", "The Yellows"),
+            team_yellow_id=environ.get(
+                "RCJ_SIM_TEAM_YELLOW_ID", "The Yellows"
+            ),
+            initial_score_blue=int(
+                environ.get("RCJ_SIM_TEAM_B_INITIAL_SCORE") or "0"
+            ),
+            initial_score_yellow=int(
+                environ.get("RCJ_SIM_TEAM_Y_INITIAL_SCORE") or "0"
+            ),
+            match_id=environ.get("RCJ_SIM_MATCH_ID", "1"),
+            half_id=int(environ.get("RCJ_SIM_HALF_ID", 1)),
+            match_time=int(
+                environ.get("RCJ_SIM_MATCH_TIME", DEFAULT_MATCH_TIME)
+            ),
+            rec_formats=[f for f in rec_formats if f],
+            progress_check_mode=environ.get(
+                "RCJ_SIM_PROGRESS_CHECK_MODE", ProgressCheckMode.DISTANCE.value
+            ),
+            packet_format=environ.get(
+                "RCJ_SIM_PACKET_FORMAT", PacketFormat.JSON.value
+            ),
+            reflog_compression=environ.get(
+                "RCJ_SIM_REFLOG_COMPRESSION", ReflogCompression.NONE.value
+            ),
+            reflog_fsync=environ.get(
+                "RCJ_SIM_REFLOG_FSYNC", FsyncPolicy.NONE.value
+            ),
+            reflog_max_bytes=int(environ.get("RCJ_SIM_REFLOG_MAX_BYTES", 0))
+            or None,
+            automatic_mode="RCJ_SIM_AUTO_MODE" in environ,
+            hud_enabled="RCJ_SIM_NO_HUD" not in environ,
+            tick_profile="RCJ_SIM_TICK_PROFILE" in environ,
+            cprofile="RCJ_SIM_PROFILE" in environ,
+            output_directory=Path(
+                environ.get("RCJ_SIM_OUTPUT_PATH", "reflog")
+            ),
+            publish_address=environ.get("RCJ_SIM_PUBLISH"),
+            publish_rate_divisor=int(
+                environ.get("RCJ_SIM_PUBLISH_RATE_DIVISOR", 1)
+            ),
+            shared_state="RCJ_SIM_SHARED_STATE" in environ,
+        )
+
+    def second_half(self, score_blue: int, score_yellow: int) -> "MatchConfig":
+        """Return the configuration of the next half: the teams swap sides,
+        taking their names, controllers and scores along."""
+        return replace(
+            self,
+            team_blue=self.team_yellow,
+            team_blue_id=self.team_yellow_id,
+            team_yellow=self.team_blue,
+            team_yellow_id=self.team_blue_id,
+            initial_score_blue=score_yellow,
+            initial_score_yellow=score_blue,
+            half_id=self.half_id + 1,
+            controller_blue=self.controller_yellow,
+            controller_yellow=self.controller_blue,
+        )
+
+    def controllers(self) -> dict:
+        """Return the controller of each robot."""
+        return {
+            robot: (
+                self.controller_blue
+                if robot.startswith(Team.BLUE.value)
+                else self.controller_yellow
+            )
+            for robot in ROBOT_NAMES
+        }
+
+
+@dataclass
+class MatchResult:
+    config: MatchConfig
+    score_blue: int
+    score_yellow: int
+    reflog_path: Path
+    # False if the simulation was stopped before the end of the half
+    finished: bool
+    # Resolved with the path of each recording once it is processed
+    recordings: List[Future] = field(default_factory=list)
+
+
+class RCJSoccerMatch:
+    """A half played on a supervisor: the referee along with its event
+    handlers, recorders and profilers.
+
+    Once the half is over, the recordings are processed in the background
+    by the finalizer, which writes ``<reflog name>.manifest.json`` listing
+    the reflog, the recordings and the profiles once they are all done.
+    Without a finalizer, ``play`` waits for them.
+
+    Args:
+        supervisor (BaseRCJSoccerSupervisor): Supervisor of the world
+        config (MatchConfig): Parameters of the half
+        finalizer (Finalizer, optional): Finalizer shared by the halves of
+            a session, polled every step
+    """
+
+    def __init__(
+        self,
+        supervisor,
+        config: MatchConfig,
+        finalizer: Optional[Finalizer] = None,
+    ):
+        self.supervisor = supervisor
+        self.config = config
+        self.owns_finalizer = finalizer is None
+        self.finalizer = finalizer or Finalizer()
+        # Kind and path of the files written, besides the recordings
+        self.artifacts: List[Tuple[str, str]] = []
+
+        self.output_prefix = output_path(
+            config.output_directory,
+            config.team_blue_id,
+            config.team_yellow_id,
+            config.match_id,
+            config.half_id,
+        )
+        self.reflog_path = self.output_prefix.with_suffix(".jsonl")
+
+        supervisor.set_hud_enabled(config.hud_enabled)
+        self.referee = RCJSoccerReferee(
+            supervisor=supervisor,
+            match_time=config.match_time,
+            team_name_blue=config.team_blue,
+            team_name_yellow=config.team_yellow,
+            initial_score_blue=config.initial_score_blue,
+            initial_score_yellow=config.initial_score_yellow,
+            match_id=config.match_id,
+            half_id=config.half_id,
+            progress_check_mode=config.progress_check_mode,
+            packet_format=config.packet_format,
+            **REFEREE_RULES,
+        )
+        self.recorders = self._create_recorders()
+
+    def _create_recorders(self) -> list:
+        recorders = []
+        available_recording_formats = RecordingFormat.all()
+        for rec_format in self.config.rec_formats:
+            if rec_format not in available_recording_formats:
+                raise ValueError(f"Unexpected video format {rec_format}")
+
+            if rec_format in POSE_RECORDERS:
+                recorder_class = POSE_RECORDERS[rec_format]
+                rec_suffix = recorder_class.output_suffix
+                recorders.append(
+                    recorder_class(
+                        supervisor=self.supervisor,
+                        output_path=str(
+                            self.output_prefix.with_suffix(f".{rec_suffix}")
+                        ),
+                        match_time=self.config.match_time,
+                    )
+                )
+                continue
+
+            # Videos are recorded by Webots
+            from recorder.recorder import (
+                MP4VideoRecordAssistant,
+                X3DVideoRecordAssistant,
+            )
+
+            recorder_class = {
+                RecordingFormat.MP4.value: MP4VideoRecordAssistant,
+                RecordingFormat.X3D.value: X3DVideoRecordAssistant,
+            }[rec_format]
+            rec_suffix = recorder_class.output_suffix
+
+            recorders.append(
+                recorder_class(
+                    supervisor=self.supervisor,
+                    output_path=str(
+                        self.output_prefix.with_suffix(f".{rec_suffix}")
+                    ),
+                    resolution="720p",
+                )
+            )
+        return recorders
+
+    def play(self) -> MatchResult:
+        """Play the half until its end, or until the simulation stops."""
+        config, supervisor, referee = (
+            self.config,
+            self.supervisor,
+            self.referee,
+        )
+        self._start()
+
+        if config.cprofile:
+            match_profiler = cProfile.Profile()
+            match_profiler.enable()
+        referee.kickoff()
+        finished = self._loop()
+        if config.cprofile:
+            match_profiler.disable()
+            dump_profile(pstats.Stats(match_profiler), self.output_prefix)
+            for suffix in (".prof", ".collapsed"):
+                path = self.output_prefix.with_suffix(suffix)
+                self.artifacts.append(("cprofile", str(path)))
+        if referee.profiler:
+            path = self.output_prefix.with_suffix(".profile.json")
+            referee.profiler.write_summary(path)
+            self.artifacts.append(("tick_profile", str(path)))
+
+        # When end of match, pause simulator immediately
+        supervisor.simulationSetMode(supervisor.SIMULATION_MODE_PAUSE)
+        logging.info(
+            "Pose field reads per step: "
+            f"{supervisor.field_reads_per_step():.2f}"
+        )
+        recordings = self._finish()
+
+        return MatchResult(
+            config=config,
+            score_blue=referee.score_blue,
+            score_yellow=referee.score_yellow,
+            reflog_path=self.reflog_path,
+            finished=finished,
+            recordings=recordings,
+        )
+
+    def _start(self):
+        config, supervisor, referee = (
+            self.config,
+            self.supervisor,
+            self.referee,
+        )
+        if config.automatic_mode:
+            supervisor.simulationSetMode(supervisor.SIMULATION_MODE_FAST)
+
+        for recorder in self.recorders:
+            # Videos are only recorded in automatic mode, trajectories always
+            if isinstance(recorder, TrajectoryRecordAssistant):
+                recorder.start_recording()
+                # The viewer also keeps the timeline of the events
+                if isinstance(recorder, EventHandler):
+                    referee.add_event_subscriber(recorder)
+            elif config.automatic_mode:
+                # Webots records one video of a kind at a time
+                self.finalizer.wait(type(recorder))
+                recorder.start_recording()
+
+        self.logger = JSONLoggerHandler(
+            self.reflog_path,
+            compression=config.reflog_compression,
+            fsync=config.reflog_fsync,
+            max_bytes=config.reflog_max_bytes,
+        )
+        referee.add_event_subscriber(self.logger)
+        referee.add_event_subscriber(DrawMessageHandler())
+        referee.profiler = TickProfiler() if config.tick_profile else None
+
+        self.publisher = None
+        if config.publish_address:
+            self.publisher = StatePublisher(
+                supervisor,
+                config.publish_address,
+                rate_divisor=config.publish_rate_divisor,
+            )
+            referee.add_event_subscriber(self.publisher)
+        if config.shared_state:
+            supervisor.shared_state = SharedStateWriter(
+                config.match_id, config.half_id
+            )
+
+    def _loop(self) -> bool:
+        """The "event" loop for the referee.
+
+        Returns:
+            bool: False if the simulation stopped before the end of the half
+        """
+        supervisor, referee = self.supervisor, self.referee
+        finalizer = self.finalizer
+        profiler = referee.profiler
+        if profiler:
+            profiler.mark()
+        while supervisor.step(TIME_STEP) != -1:
+            if profiler:
+                profiler.lap(TickPhase.STEP.value)
+            # Recordings of the previous halves
+            if finalizer.pending:
+                finalizer.poll()
+
+            # If the tick does not return True, the match has ended and the
+            # event loop can stop
+            if not referee.tick():
+                return True
+
+            self._record(profiler)
+        return False
+
+    def _record(self, profiler: Optional[TickProfiler]):
+        """Hand the state of the tick to the recorders and the
+        publisher."""
+        referee = self.referee
+        for recorder in self.recorders:
+            recorder.record(referee)
+        if profiler:
+            profiler.lap(TickPhase.RECORD.value)
+        if self.publisher:
+            self.publisher.publish(referee)
+            if profiler:
+                profiler.lap(TickPhase.PUBLISH.value)
+
+    def _finish(self) -> List[Future]:
+        # Write out the events still queued if the simulation stopped
+        # mid-match
+        self.referee.eventer.close()
+        if self.supervisor.shared_state:
+            self.supervisor.shared_state.close()
+            self.supervisor.shared_state = None
+        artifacts = [
+            ("reflog", str(path)) for path in self.logger.writer.paths
+        ]
+
+        manifest = Manifest(
+            self.output_prefix.with_suffix(".manifest.json"),
+            artifacts + self.artifacts,
+        )
+        recordings = []
+        for recorder in self.recorders:
+            if not recorder.is_recording():
+                continue
+            logging.info(f"Processing {recorder.output_suffix} video...")
+            future = self.finalizer.finalize(recorder)
+            manifest.track(recorder.output_suffix, future)
+            recordings.append(future)
+        manifest.close()
+
+        if self.owns_finalizer:
+            self.finalizer.wait()
+        return recordings
+
+
+def load_session(path: Path) -> List[dict]:
+    """Read the fixtures of a session from a JSON file.
+
+    The file holds a list of fixtures, each one a dict of ``MatchConfig``
+    fields overriding the configuration of the session, plus optionally
+    ``"halves"``: the number of halves to play, the teams swapping sides
+    in between.
+    """
+    with open(path) as f:
+        fixtures = json.load(f)
+
+    names = {f.name for f in fields(MatchConfig)} | {"halves"}
+    for fixture in fixtures:
+        unknown = set(fixture) - names
+        if unknown:
+            raise ValueError(f"Unexpected fixture keys {sorted(unknown)}")
+    return fixtures
+
+
+def play_session(
+    supervisor,
+    config: MatchConfig,
+    fixtures: List[dict],
+    finalizer: Optional[Finalizer] = None,
+) -> List[MatchResult]:
+    """Play fixtures back to back in the same simulation.
+
+    Before each half but the first, the world is reset and the robot
+    controllers are restarted (with the controllers of the teams, which
+    swap sides between the halves of a fixture). Each half gets its own
+    reflog and recordings, the recordings of a half being processed while
+    the next one is played.
+
+    Args:
+        supervisor (BaseRCJSoccerSupervisor): Supervisor of the world
+        config (MatchConfig): Configuration the fixtures start from
+        fixtures (list): See ``load_session``
+        finalizer (Finalizer, optional): Processes the recordings
+
+    Returns:
+        list: Result of each half played, once all the recordings are
+        processed. The session stops early if the simulation does.
+    """
+    finalizer = finalizer or Finalizer()
+    results: List[MatchResult] = []
+    for fixture in fixtures:
+        if not _play_fixture(supervisor, config, fixture, finalizer, results):
+            break
+    finalizer.wait()
+    return results
+
+
+def _play_fixture(
+    supervisor,
+    config: MatchConfig,
+    fixture: dict,
+    finalizer: Finalizer,
+    results: List[MatchResult],
+) -> bool:
+    """Play the halves of a fixture, appending their results.
+
+    Returns:
+        bool: False if the simulation stopped
+    """
+    fixture = dict(fixture)
+    halves = fixture.pop("halves", 1)
+    if "output_directory" in fixture:
+        fixture["output_directory"] = Path(fixture["output_directory"])
+    half_config = replace(config, **fixture)
+
+    for _ in range(halves):
+        controllers = half_config.controllers()
+        if results or controllers != supervisor.get_controllers():
+            # The previous half paused the simulation, which has to run for
+            # the reset to happen
+            if config.automatic_mode:
+                mode = supervisor.SIMULATION_MODE_FAST
+            else:
+                mode = supervisor.SIMULATION_MODE_REAL_TIME
+            supervisor.simulationSetMode(mode)
+            supervisor.reset_world(controllers)
+
+        result = RCJSoccerMatch(supervisor, half_config, finalizer).play()
+        results.append(result)
+        if not result.finished:
+            return False
+        half_config = half_config.second_half(
+            result.score_blue, result.score_yellow
+        )
+    return True
@@ -1,4 +1,6 @@
-from typing import List
+from typing import List, Optional
+
+import numpy as np
 
 from referee.consts import BLUE_PENALTY_AREA, YELLOW_PENALTY_AREA
 
@@ -46,10 +48,22 @@ class PenaltyAreaChecker:
             position (list): Current position of the object
             time (int): Current game time
         """
-        self.time = time
         x, y = position[0], position[1]
+        in_blue = self.is_in_blue_penalty(x, y)
+        self.update(in_blue or self.is_in_yellow_penalty(x, y), time)
+
+    def update(self, inside: bool, time: int):
+        """Make PenaltyAreaChecker react to whether the object is inside a
+        penalty area, e.g. as computed for all the robots at once by
+        ``referee.utils.is_in_penalty_area_mask``.
 
-        if self.is_in_blue_penalty(x, y) or self.is_in_yellow_penalty(x, y):
+        Args:
+            inside (bool): Whether the object is inside a penalty area
+            time (int): Current game time
+        """
+        self.time = time
+
+        if inside:
             # the robot enters the penalty area for the first time
             if not self.has_entered:
                 self.time_entered_penalty = self.time
@@ -76,3 +90,80 @@ class PenaltyAreaChecker:
                 return True
 
         return False
+
+
+class BatchPenaltyAreaChecker:
+    """``PenaltyAreaChecker`` of the same objects in many matches at once.
+    The times of entering and leaving the penalty area are kept in arrays
+    of shape ``(n_matches, n_objects)``, NaN standing for None.
+
+    Args:
+        n_matches (int): Number of matches
+        n_objects (int): Number of objects checked in each match
+        time_allowed (int): Seconds an object may stay inside
+        reset_after (int): Seconds outside after which it may stay inside
+            for ``time_allowed`` again
+    """
+
+    def __init__(
+        self,
+        n_matches: int,
+        n_objects: int,
+        time_allowed: int,
+        reset_after: int,
+    ):
+        self.time_allowed = time_allowed
+        self.reset_after = reset_after
+        self.time = None
+        self.time_entered_penalty = np.full((n_matches, n_objects), np.nan)
+        self.time_left_penalty = np.full((n_matches, n_objects), np.nan)
+
+    def reset(self, mask: Optional[np.ndarray] = None):
+        """Reset the objects of the mask, all of them by default."""
+        if mask is None:
+            mask = np.ones(self.time_entered_penalty.shape, dtype=bool)
+        self.time_entered_penalty[mask] = np.nan
+        self.time_left_penalty[mask] = np.nan
+
+    def update(
+        self,
+        inside: np.ndarray,
+        time: float,
+        mask: Optional[np.ndarray] = None,
+    ):
+        """Make the checkers react to whether the objects are inside a
+        penalty area, see ``PenaltyAreaChecker.update``.
+
+        Args:
+            inside (np.ndarray): Whether each object is inside
+            time (float): Current game time
+            mask (np.ndarray, optional): Objects which are updated, all of
+                them by default
+        """
+        self.time = time
+        if mask is not None:
+            inside = inside & mask
+            outside = ~inside & mask
+        else:
+            outside = ~inside
+        has_entered = ~np.isnan(self.time_entered_penalty)
+        has_left = ~np.isnan(self.time_left_penalty)
+
+        self.time_entered_penalty[inside & ~has_entered] = time
+        self.time_left_penalty[inside & has_left] = np.nan
+        self.time_left_penalty[outside & has_entered & ~has_left] = time
+        # Outside for longer than reset_after
+        self.reset(
+            outside
+            & has_left
+            & (time < self.time_left_penalty - self.reset_after)
+        )
+
+    def is_violating(self) -> np.ndarray:
+        """Return which objects stayed inside a penalty area for too long."""
+        if self.time is None:
+            return np.zeros(self.time_entered_penalty.shape, dtype=bool)
+        # Comparisons with NaN are False
+        return np.isnan(self.time_left_penalty) & (
+            self.time < self.time_entered_penalty - self.time_allowed
+        )
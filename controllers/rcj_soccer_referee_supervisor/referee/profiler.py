@@ -0,0 +1,202 @@
+import json
+import pstats
+from array import array
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Dict, List, Tuple
+
+from referee.consts import PROFILER_HISTOGRAM_BUCKETS, TIME_STEP
+from referee.enums import TickPhase
+
+
+class Histogram:
+    """Fixed-size histogram of durations in nanoseconds.
+
+    Bucket ``i`` counts the durations of ``i`` bits, i.e. from ``2**(i-1)``
+    up to ``2**i`` nanoseconds, so recording one is a handful of integer
+    operations and the memory used does not grow with the match.
+
+    Args:
+        buckets (int): Number of buckets, the last one takes everything
+            longer
+    """
+
+    def __init__(self, buckets: int = PROFILER_HISTOGRAM_BUCKETS):
+        self.counts = array("q", bytes(8 * buckets))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, duration: int):
+        counts = self.counts
+        counts[min(duration.bit_length(), len(counts) - 1)] += 1
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def percentile(self, percent: float) -> int:
+        """Return the upper bound of the bucket holding the percentile, in
+        nanoseconds."""
+        rank = self.count * percent / 100
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(2**bucket, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total / 1e6,
+            "mean_us": self.total / self.count / 1e3 if self.count else 0,
+            "p50_us": self.percentile(50) / 1e3,
+            "p90_us": self.percentile(90) / 1e3,
+            "p99_us": self.percentile(99) / 1e3,
+            "max_us": self.max / 1e3,
+            # Upper bound of each non-empty bucket in microseconds: count
+            "histogram": {
+                str(2**bucket / 1e3): count
+                for bucket, count in enumerate(self.counts)
+                if count
+            },
+        }
+
+
+class TickProfiler:
+    """Time the phases of the referee loop.
+
+    ``lap`` adds the time elapsed since the previous lap (or ``mark``) to
+    the histogram of a phase, so the phases of a loop iteration are timed
+    back to back. ``RCJSoccerReferee.tick`` laps its own phases when the
+    profiler is set as its ``profiler``, the main loop laps ``STEP`` after
+    ``supervisor.step`` and ``RECORD`` after the recorders.
+
+    Args:
+        time_step (int): Simulated milliseconds per ``STEP`` lap, for the
+            real-time factor
+    """
+
+    def __init__(self, time_step: int = TIME_STEP):
+        self.time_step = time_step
+        self.histograms: Dict[str, Histogram] = {
+            phase: Histogram() for phase in TickPhase.all()
+        }
+        self.last = perf_counter_ns()
+
+    def mark(self):
+        """Start timing the next phase from now."""
+        self.last = perf_counter_ns()
+
+    def lap(self, phase: str):
+        """Add the time since the last lap to the phase."""
+        now = perf_counter_ns()
+        self.histograms[phase].add(now - self.last)
+        self.last = now
+
+    def real_time_factor(self) -> float:
+        """Return the simulated seconds per second of wall time spent in all
+        the phases."""
+        steps = self.histograms[TickPhase.STEP.value].count
+        wall = sum(histogram.total for histogram in self.histograms.values())
+        return steps * self.time_step * 1e6 / wall if wall else 0.0
+
+    def summary(self) -> dict:
+        steps = self.histograms[TickPhase.STEP.value].count
+        return {
+            "steps": steps,
+            "simulated_time": steps * self.time_step / 1000,
+            "wall_time": sum(h.total for h in self.histograms.values()) / 1e9,
+            "real_time_factor": self.real_time_factor(),
+            "phases": {
+                phase: histogram.summary()
+                for phase, histogram in self.histograms.items()
+                if histogram.count
+            },
+        }
+
+    def write_summary(self, path: Path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+def _function_name(function: Tuple[str, int, str]) -> str:
+    filename, line, name = function
+    if filename == "~":
+        # Built-ins, e.g. "<built-in method time.sleep>"
+        return name
+    return f"{Path(filename).name}:{line}:{name}"
+
+
+def _call_graph(
+    stats: pstats.Stats,
+) -> Tuple[List[tuple], Dict[tuple, List[Tuple[tuple, float]]]]:
+    """Return the functions nobody called, and the callees of each function
+    along with the time spent in them on its behalf."""
+    roots = []
+    callees: Dict[tuple, List[Tuple[tuple, float]]] = {}
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        if not callers:
+            roots.append(function)
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, []).append((function, cumulative))
+    return roots, callees
+
+
+def collapsed_stacks(
+    stats: pstats.Stats, max_depth: int = 64
+) -> Dict[str, int]:
+    """Turn a cProfile profile into collapsed stacks for flame graphs.
+
+    cProfile only keeps caller and callee pairs, not whole stacks: the time
+    of a function is split among its callers in proportion to the time
+    spent in it on behalf of each of them, which is exact for functions
+    with a single caller and an estimate otherwise. Recursion and stacks
+    taking less than a microsecond are cut off.
+
+    Args:
+        stats (pstats.Stats): The profile
+        max_depth (int): Stacks deeper than this are cut off
+
+    Returns:
+        dict: Microseconds spent in each stack, keyed by the functions of
+        the stack from the outermost one, joined with ``;``
+    """
+    roots, callees = _call_graph(stats)
+    stacks: Dict[str, int] = {}
+
+    def walk(function: tuple, stack: List[str], share: float):
+        _, _, own, cumulative, _ = stats.stats[function]
+        if cumulative * share < 1e-6:
+            # Keeps the walk short on large profiles
+            return
+        stack.append(_function_name(function))
+        key = ";".join(stack)
+        stacks[key] = stacks.get(key, 0) + round(own * share * 1e6)
+        if len(stack) < max_depth:
+            for callee, time in callees.get(function, []):
+                callee_cumulative = stats.stats[callee][3]
+                name = _function_name(callee)
+                if name in stack or not callee_cumulative:
+                    continue
+                walk(callee, stack, share * time / callee_cumulative)
+        stack.pop()
+
+    for root in roots:
+        walk(root, [], 1.0)
+    return {stack: time for stack, time in stacks.items() if time > 0}
+
+
+def write_collapsed_stacks(stats: pstats.Stats, path: Path):
+    """Write the collapsed stacks of a profile, one ``stack microseconds``
+    line each, as read by flamegraph.pl, speedscope or inferno."""
+    with open(path, "w") as f:
+        for stack, time in collapsed_stacks(stats).items():
+            f.write(f"{stack} {time}\n")
+
+
+def dump_profile(stats: pstats.Stats, prefix: Path):
+    """Dump a profile as ``<prefix>.prof`` and ``<prefix>.collapsed``."""
+    stats.dump_stats(str(prefix.with_suffix(".prof")))
+    write_collapsed_stacks(stats, prefix.with_suffix(".collapsed"))
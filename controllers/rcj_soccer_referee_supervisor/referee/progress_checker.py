@@ -1,18 +1,105 @@
 import math
-from typing import List
+from array import array
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from referee.enums import ProgressCheckMode
+
+
+class SlidingExtremum:
+    """Maximum (or minimum) of the values pushed during the last ``size``
+    pushes, kept in a monotonic deque so that every push is amortized O(1).
+
+    Args:
+        size (int): Number of the most recent values the extremum is taken of
+        maximum (bool): Track the maximum if True, the minimum otherwise
+    """
+
+    def __init__(self, size: int, maximum: bool):
+        self.size = size
+        self.maximum = maximum
+        # (push index, value) pairs, the extremum of the window on the left
+        self.queue: Deque[Tuple[int, float]] = deque(maxlen=size)
+
+    def clear(self):
+        self.queue.clear()
+
+    def push(self, index: int, value: float):
+        """Add the value pushed as the ``index``-th one."""
+        queue = self.queue
+        if self.maximum:
+            while queue and queue[-1][1] <= value:
+                queue.pop()
+        else:
+            while queue and queue[-1][1] >= value:
+                queue.pop()
+        queue.append((index, value))
+        if queue[0][0] <= index - self.size:
+            queue.popleft()
+
+    @property
+    def value(self) -> float:
+        return self.queue[0][1]
 
 
 class ProgressChecker:
-    def __init__(self, steps: int, threshold: float):
+    """Decide whether an object has made enough progress during the last
+    ``steps`` tracked positions.
+
+    In the ``DISTANCE`` mode the object has to travel at least ``threshold``
+    meters in total, which is kept as a running sum of the per-step deltas
+    so that ``is_progress`` is O(1) whatever the length of the window. In
+    the ``DISPLACEMENT`` mode the diagonal of the bounding box of the recent
+    positions has to be at least ``threshold`` meters, so jittering in place
+    does not count as progress.
+
+    Args:
+        steps (int): Length of the window, in tracked positions
+        threshold (float): Required distance in meters
+        mode (str): One of the ``ProgressCheckMode`` values
+        samples (memoryview, optional): Storage for the ``steps`` delta
+            samples, e.g. a slice of a block shared by several checkers (see
+            ``create_progress_checkers``). Allocated if not given.
+    """
+
+    def __init__(
+        self,
+        steps: int,
+        threshold: float,
+        mode: str = ProgressCheckMode.DISTANCE.value,
+        samples: Optional[memoryview] = None,
+    ):
+        if mode not in ProgressCheckMode.all():
+            raise ValueError(f"Unexpected progress check mode {mode}")
+        if samples is None:
+            samples = memoryview(array("d", bytes(8 * steps)))
+        if len(samples) != steps:
+            raise ValueError("The sample storage does not match the steps")
+
         self.steps = steps
         self.threshold = threshold
+        self.mode = mode
+        self.samples = samples
+
+        self.min_x = SlidingExtremum(steps + 1, maximum=False)
+        self.max_x = SlidingExtremum(steps + 1, maximum=True)
+        self.min_y = SlidingExtremum(steps + 1, maximum=False)
+        self.max_y = SlidingExtremum(steps + 1, maximum=True)
+        self.extrema = (self.min_x, self.max_x, self.min_y, self.max_y)
+
         self.reset()
 
     def reset(self):
-        # The array which holds all the samples of deltas for each tick
-        self.samples = [0 for _ in range(self.steps)]
+        """Forget the tracked positions. The storage is reused: samples
+        left over from before the reset are never read again, as the first
+        window after it overwrites all of them before they count."""
         self.iterator = 0
+        self.total = 0.0
         self.prev_position = None
+        for extremum in self.extrema:
+            extremum.clear()
 
     def track(self, position: List[float]):
         """Make ProgressChecker react to a new position. Internally, it
@@ -26,22 +113,59 @@ class ProgressChecker:
         # If the track function gets called for the first time (i.e. we do not
         # remember the previous position), store the current position as the
         # previous one
-        if not self.prev_position:
-            self.prev_position = position
+        if self.prev_position is None:
+            # Keep a copy, the position may be a view into a buffer which
+            # gets overwritten in place
+            self.prev_position = list(position)
+            if self.mode == ProgressCheckMode.DISPLACEMENT.value:
+                self._push_position(0, position)
             return
 
         prev_position = self.prev_position
+        iterator = self.iterator
 
-        delta = math.sqrt(
-            (prev_position[0] - position[0]) ** 2
-            + (prev_position[1] - position[1]) ** 2
-        )
+        if self.mode == ProgressCheckMode.DISPLACEMENT.value:
+            self._push_position(iterator + 1, position)
+        else:
+            delta = math.sqrt(
+                (prev_position[0] - position[0]) ** 2
+                + (prev_position[1] - position[1]) ** 2
+            )
+            self._add_sample(iterator % self.steps, delta)
 
-        # store the currently computed delta sample
-        self.samples[self.iterator % self.steps] = delta
-        self.iterator += 1
+        self.iterator = iterator + 1
+        self.prev_position[:] = position
 
-        self.prev_position = position
+    def _add_sample(self, index: int, delta: float):
+        samples = self.samples
+        # The sample being overwritten only counts once the first window
+        # after a reset is full
+        if self.iterator >= self.steps:
+            self.total -= samples[index]
+        samples[index] = delta
+        self.total += delta
+
+        # Recompute the sum once per window so that rounding errors of the
+        # running sum cannot pile up
+        if index == self.steps - 1:
+            self.total = math.fsum(samples)
+
+    def _push_position(self, index: int, position: List[float]):
+        x, y = position[0], position[1]
+        self.min_x.push(index, x)
+        self.max_x.push(index, x)
+        self.min_y.push(index, y)
+        self.max_y.push(index, y)
+
+    def displacement(self) -> float:
+        """Return the diagonal of the bounding box of the positions tracked
+        in the current window (``DISPLACEMENT`` mode only)."""
+        if not self.max_x.queue:
+            return 0.0
+        return math.hypot(
+            self.max_x.value - self.min_x.value,
+            self.max_y.value - self.min_y.value,
+        )
 
     def is_progress(self) -> bool:
         """Detect whether the object which is being tracked has made some
@@ -51,12 +175,115 @@ class ProgressChecker:
         Returns:
             bool: Whether the object has made some "progress"
         """
-        s = sum(self.samples)
-
         # We we haven't tracked at least as many samples as the number of
         # steps, our default position is "benefit of doubt": we assume enough
         # progress has been made.
         if self.iterator < self.steps:
             return True
 
-        return s >= self.threshold
+        if self.mode == ProgressCheckMode.DISPLACEMENT.value:
+            return self.displacement() >= self.threshold
+        return self.total >= self.threshold
+
+
+def create_progress_checkers(
+    windows: Dict[str, Tuple[int, float]],
+    mode: str = ProgressCheckMode.DISTANCE.value,
+) -> Dict[str, ProgressChecker]:
+    """Create ProgressCheckers whose samples live in one shared block.
+
+    Args:
+        windows (dict): Steps and threshold of the checker of each object
+        mode (str): One of the ``ProgressCheckMode`` values
+
+    Returns:
+        dict: ProgressChecker of each object
+    """
+    total_steps = sum(steps for steps, _ in windows.values())
+    block = memoryview(array("d", bytes(8 * total_steps)))
+
+    checkers = {}
+    offset = 0
+    for name, (steps, threshold) in windows.items():
+        end = offset + steps
+        checkers[name] = ProgressChecker(
+            steps, threshold, mode, block[offset:end]
+        )
+        offset = end
+    return checkers
+
+
+class BatchProgressChecker:
+    """``ProgressChecker`` in the ``DISTANCE`` mode of the same objects in
+    many matches at once. The state is kept in arrays of shape
+    ``(n_matches, n_objects)``, the samples having a third dimension of
+    ``steps``.
+
+    Args:
+        n_matches (int): Number of matches
+        n_objects (int): Number of objects tracked in each match
+        steps (int): Length of the window, in tracked positions
+        threshold (float): Required distance in meters
+    """
+
+    def __init__(
+        self, n_matches: int, n_objects: int, steps: int, threshold: float
+    ):
+        self.steps = steps
+        self.threshold = threshold
+        shape = (n_matches, n_objects)
+        self.samples = np.zeros(shape + (steps,))
+        self.iterator = np.zeros(shape, dtype=np.int64)
+        self.total = np.zeros(shape)
+        self.prev_x = np.zeros(shape)
+        self.prev_y = np.zeros(shape)
+        self.has_prev = np.zeros(shape, dtype=bool)
+        # Indices of the rows and the columns, to pick a sample of each
+        self._rows, self._columns = np.indices(shape)
+
+    def reset(self, mask: Optional[np.ndarray] = None):
+        """Forget the tracked positions of the objects of the mask, all of
+        them by default."""
+        if mask is None:
+            mask = np.ones(self.iterator.shape, dtype=bool)
+        self.iterator[mask] = 0
+        self.total[mask] = 0.0
+        self.has_prev[mask] = False
+
+    def track(
+        self, xs: np.ndarray, ys: np.ndarray, mask: Optional[np.ndarray] = None
+    ):
+        """Make the checkers react to new positions.
+
+        Args:
+            xs (np.ndarray): X positions of the objects
+            ys (np.ndarray): Y positions of the objects
+            mask (np.ndarray, optional): Objects whose positions are
+                tracked, all of them by default
+        """
+        if mask is None:
+            mask = np.ones(self.iterator.shape, dtype=bool)
+        # The first position of an object is only remembered
+        sampled = mask & self.has_prev
+        index = self.iterator % self.steps
+        rows, columns = self._rows, self._columns
+        old = self.samples[rows, columns, index]
+        delta = np.hypot(self.prev_x - xs, self.prev_y - ys)
+        full = self.iterator >= self.steps
+        self.total += np.where(sampled, delta - np.where(full, old, 0.0), 0.0)
+        self.samples[rows, columns, index] = np.where(sampled, delta, old)
+
+        # Recompute the sums once per window, as ProgressChecker does
+        recompute = sampled & (index == self.steps - 1)
+        if recompute.any():
+            self.total[recompute] = self.samples[recompute].sum(axis=-1)
+
+        self.iterator += sampled
+        self.prev_x = np.where(mask, xs, self.prev_x)
+        self.prev_y = np.where(mask, ys, self.prev_y)
+        self.has_prev |= mask
+
+    def is_progress(self) -> np.ndarray:
+        """Return which objects have made enough progress, or were not
+        tracked for a whole window yet."""
+        return (self.iterator < self.steps) | (self.total >= self.threshold)
@@ -0,0 +1,160 @@
+import json
+import logging
+import socket
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Tuple, Union
+from urllib.parse import urlparse
+
+from referee.consts import PUBLISHER_QUEUE_SIZE
+from referee.event_handlers import EventHandler
+from referee.events import Event
+
+Address = Union[str, Tuple[str, int]]
+
+
+def parse_address(address: str) -> Tuple[int, Address]:
+    """Parse ``udp://host:port`` or ``unix:///path/to/socket``.
+
+    Returns:
+        tuple: Address family of the socket and address to send to
+    """
+    url = urlparse(address)
+    if url.scheme == "udp":
+        if not url.hostname or not url.port:
+            raise ValueError(f"Expected udp://host:port, got {address}")
+        return socket.AF_INET, (url.hostname, url.port)
+    if url.scheme == "unix":
+        if not url.path:
+            raise ValueError(f"Expected unix:///path, got {address}")
+        return socket.AF_UNIX, url.path
+    raise ValueError(f"Unexpected publisher address {address}")
+
+
+class StatePublisher(EventHandler):
+    """Stream the state of the match (poses, score, clock and the events
+    since the previous frame) as JSON datagrams over UDP or a Unix socket.
+
+    The tick only copies the state into a bounded queue, a worker thread
+    encodes and sends it. When the queue is full, e.g. because the socket
+    buffer of a slow subscriber is full, the oldest frame is dropped so
+    that the tick never waits. Datagrams nobody listens to are lost.
+
+    Besides being subscribed to the events of the referee, ``publish`` has
+    to be called after each tick.
+
+    Args:
+        supervisor (BaseRCJSoccerSupervisor): Supervisor holding the poses
+        address (str): ``udp://host:port`` or ``unix:///path``
+        rate_divisor (int): Publish every ``rate_divisor``-th tick
+        queue_size (int): Frames waiting to be sent at most
+    """
+
+    def __init__(
+        self,
+        supervisor,
+        address: str,
+        rate_divisor: int = 1,
+        queue_size: int = PUBLISHER_QUEUE_SIZE,
+    ):
+        super().__init__()
+        if rate_divisor < 1:
+            raise ValueError("The rate divisor must be at least 1")
+        family, self.address = parse_address(address)
+        self.supervisor = supervisor
+        self.rate_divisor = rate_divisor
+
+        self.socket = socket.socket(family, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+
+        self.tick = 0
+        self.events: List[Dict] = []
+        self.queue: Deque[Dict] = deque(maxlen=queue_size)
+        self.condition = threading.Condition()
+        self.closed = False
+
+        # Frames sent, dropped from the queue and failed to be sent
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+
+        self.worker = threading.Thread(target=self._work, name="publisher")
+        self.worker.daemon = True
+        self.worker.start()
+
+    def handle(self, referee, event: Event):
+        self.events.append(
+            {
+                "time": event.matchtime,
+                "type": event.type,
+                "payload": event.payload,
+            }
+        )
+
+    def publish(self, referee):
+        """Queue the state of the tick, if it is one to publish."""
+        tick = self.tick
+        self.tick += 1
+        if tick % self.rate_divisor:
+            return
+
+        supervisor = self.supervisor
+        frame = {
+            "tick": tick,
+            "time": referee.time,
+            "score": [referee.score_blue, referee.score_yellow],
+            # Converted to lists by the worker
+            "translations": supervisor.get_translations().copy(),
+            "rotations": supervisor.get_rotations().copy(),
+            "events": self.events,
+        }
+        self.events = []
+        with self.condition:
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1
+            self.queue.append(frame)
+            self.condition.notify()
+
+    def _work(self):
+        while True:
+            with self.condition:
+                while not self.queue and not self.closed:
+                    self.condition.wait()
+                if not self.queue:
+                    return
+                frame = self.queue.popleft()
+            self._send(frame)
+
+    def _send(self, frame: Dict):
+        for name in ("translations", "rotations"):
+            if name in frame:
+                frame[name] = frame[name].round(4).tolist()
+        data = json.dumps(frame).encode()
+        try:
+            self.socket.sendto(data, self.address)
+            self.sent += 1
+        except OSError:
+            # Nobody listening, or the buffer of the subscriber is full
+            self.failed += 1
+
+    def counters(self) -> Dict[str, int]:
+        return {
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def close(self):
+        """Send the frames still queued, along with the events since the
+        last one, and stop the worker."""
+        with self.condition:
+            if self.closed:
+                return
+            if self.events:
+                self.queue.append({"tick": self.tick, "events": self.events})
+                self.events = []
+            self.closed = True
+            self.condition.notify()
+        self.worker.join()
+        self.socket.close()
+        logging.info(f"State publisher: {self.counters()}")
@@ -1,10 +1,9 @@
-import json
 import random
-from typing import List, Optional, Tuple
-
-from controller import Supervisor
+from collections import deque
+from typing import Deque, List, Optional, Tuple, TYPE_CHECKING, Union
 
 from referee.consts import (
+    BALL_INDEX,
     BALL_INITIAL_TRANSLATION,
     KICKOFF_TRANSLATION,
     LACK_OF_PROGRESS_NUMBER_OF_NEUTRAL_SPOTS,
@@ -14,11 +13,26 @@ from referee.consts import (
     ROBOT_NAMES,
     TIME_STEP,
 )
-from referee.enums import GameEvents, NeutralSpotDistanceType, Team
+from referee.enums import (
+    NeutralSpotDistanceType,
+    PacketFormat,
+    ProgressCheckMode,
+    Team,
+    TickPhase,
+)
 from referee.event_handlers import EventHandler
 from referee.eventer import Eventer
+from referee.events import (
+    Goal,
+    Kickoff,
+    LackOfProgress,
+    MatchFinish,
+    MatchStart,
+)
+from referee.packet_codec import encode_binary_packet, encode_json_packet
 from referee.penalty_area_checker import PenaltyAreaChecker
-from referee.progress_checker import ProgressChecker
+from referee.profiler import TickProfiler
+from referee.progress_checker import create_progress_checkers
 from referee.utils import (
     is_in_blue_goal,
     is_in_yellow_goal,
@@ -26,11 +40,14 @@ from referee.utils import (
     time_to_string,
 )
 
+if TYPE_CHECKING:
+    from referee.base_supervisor import BaseRCJSoccerSupervisor
+
 
 class RCJSoccerReferee:
     def __init__(
         self,
-        supervisor: Supervisor,
+        supervisor: "BaseRCJSoccerSupervisor",
         match_time: int,
         match_id: int,
         half_id: int,
@@ -46,7 +63,12 @@ class RCJSoccerReferee:
         penalty_area_reset_after: int,
         post_goal_wait_time: int = 3,
         initial_position_noise: float = 0.15,
+        progress_check_mode: str = ProgressCheckMode.DISTANCE.value,
+        packet_format: str = PacketFormat.JSON.value,
     ):
+        if packet_format not in PacketFormat.all():
+            raise ValueError(f"Unexpected packet format {packet_format}")
+
         self.sv = supervisor
         self.match_time = match_time
         self.time = match_time
@@ -58,16 +80,19 @@ class RCJSoccerReferee:
         self.score_yellow = initial_score_yellow
         self.post_goal_wait_time = post_goal_wait_time
         self.initial_position_noise = initial_position_noise
+        self.packet_format = packet_format
 
         self.ball_reset_timer = 0
         self.ball_stop = 2
+        self.team_to_kickoff = None
 
         self.robot_in_penalty_counter = {}
-        self.progress_check = {}
         self.penalty_area_check = {}
+        progress_check_windows = {}
         for robot in ROBOT_NAMES:
-            self.progress_check[robot] = ProgressChecker(
-                progress_check_steps, progress_check_threshold
+            progress_check_windows[robot] = (
+                progress_check_steps,
+                progress_check_threshold,
             )
 
             self.penalty_area_check[robot] = PenaltyAreaChecker(
@@ -77,22 +102,42 @@ class RCJSoccerReferee:
 
             self.robot_in_penalty_counter[robot] = 0
 
-        self.progress_check["ball"] = ProgressChecker(
-            ball_progress_check_steps, ball_progress_check_threshold
+        progress_check_windows["ball"] = (
+            ball_progress_check_steps,
+            ball_progress_check_threshold,
+        )
+        # The samples of all the checkers live in a single shared block
+        self.progress_check = create_progress_checkers(
+            progress_check_windows, progress_check_mode
         )
 
         self.eventer = Eventer()
-        self.event_messages_to_draw: List[Tuple[int, str]] = []
+        self.event_messages_to_draw: Deque[Tuple[int, str]] = deque(
+            maxlen=MAX_EVENT_MESSAGES_IN_QUEUE
+        )
+        self.event_messages_changed = False
+
+        # Times the phases of each tick when set
+        self.profiler: Optional[TickProfiler] = None
 
         self.reset_positions()
         self.sv.update_positions()
         self.sv.draw_team_names(self.team_name_blue, self.team_name_yellow)
         self.sv.draw_scores(self.score_blue, self.score_yellow)
 
-    def _pack_data(self) -> str:
+    def _pack_data(self) -> Union[str, bytes]:
         waiting_for_kickoff = self.ball_reset_timer > 0
-        data = {"waiting_for_kickoff": waiting_for_kickoff}
-        return json.dumps(data)
+        if self.packet_format == PacketFormat.JSON.value:
+            return encode_json_packet(waiting_for_kickoff)
+
+        # Only the first tick of each distinct state is actually packed
+        return encode_binary_packet(
+            waiting_for_kickoff,
+            int(self.time),
+            self.score_blue,
+            self.score_yellow,
+            self.team_to_kickoff,
+        )
 
     def _add_initial_position_noise(self, translation: List[float]) -> List[float]:
         level = self.initial_position_noise
@@ -106,11 +151,15 @@ class RCJSoccerReferee:
         self.eventer.subscribe(subscriber)
 
     def add_event_message_to_queue(self, message: str):
-        if len(self.event_messages_to_draw) >= MAX_EVENT_MESSAGES_IN_QUEUE:
-            self.event_messages_to_draw.pop(0)
+        # The oldest message gets dropped once the queue is full
         self.event_messages_to_draw.append((self.time, message))
+        self.event_messages_changed = True
 
     def process_and_draw_event_messages(self):
+        if not self.event_messages_changed:
+            return
+        self.event_messages_changed = False
+
         messages = []
         for time, msg in self.event_messages_to_draw:
             messages.append(f"{time_to_string(time)} - {msg}")
@@ -146,10 +195,11 @@ class RCJSoccerReferee:
         return robot
 
     def check_robots_in_penalty_area(self):
-        for robot in ROBOT_NAMES:
+        # The checks below are cheaper on plain floats than on NumPy scalars
+        translations = self.sv.get_translation_rows()
+        for robot, pos in zip(ROBOT_NAMES, translations):
             if robot == "B3" or robot == "Y3":
                 continue
-            pos = self.sv.get_robot_translation(robot)
             self.penalty_area_check[robot].track(pos, self.time)
 
             if self.penalty_area_check[robot].is_violating():
@@ -166,8 +216,8 @@ class RCJSoccerReferee:
         """
         Check that the robots, as well as the ball, have made enough progress.
         """
-        for robot in ROBOT_NAMES:
-            pos = self.sv.get_robot_translation(robot)
+        translations = self.sv.get_translation_rows()
+        for robot, pos in zip(ROBOT_NAMES, translations):
             self.progress_check[robot].track(pos)
 
             # 1. Jika Keluar Lapangan -> RESET (Wajib)
@@ -178,11 +228,7 @@ class RCJSoccerReferee:
 
             # 2. Jika Lack of Progress (Macet)
             if not self.progress_check[robot].is_progress():
-                self.eventer.event(
-                    referee=self,
-                    type=GameEvents.LACK_OF_PROGRESS.value,
-                    payload={"type": "robot", "robot_name": robot},
-                )
+                self.eventer.event(self, LackOfProgress("robot", robot))
                 
                 # --- LOGIKA REVISI: BIARKAN ROBOT MUNDUR SENDIRI ---
                 
@@ -199,10 +245,10 @@ class RCJSoccerReferee:
                 self.reset_checkers(robot)
 
         # Cek Bola
-        bpos = self.sv.get_ball_translation()
+        bpos = translations[BALL_INDEX]
         self.progress_check["ball"].track(bpos)
         if is_outside(bpos[0], bpos[1]) or not self.progress_check["ball"].is_progress():
-            self.eventer.event(referee=self, type=GameEvents.LACK_OF_PROGRESS.value, payload={"type": "ball"})
+            self.eventer.event(self, LackOfProgress("ball"))
             nearest_spots = self.sv.get_unoccupied_neutral_spots_sorted(NeutralSpotDistanceType.NEAREST.value, "ball")
             if nearest_spots:
                 neutral_spot = random.choice(nearest_spots[:LACK_OF_PROGRESS_NUMBER_OF_NEUTRAL_SPOTS])
@@ -213,7 +259,7 @@ class RCJSoccerReferee:
     def check_goal(self):
         team_goal = None
         team_kickoff = None
-        ball_translation = self.sv.get_ball_translation()
+        ball_translation = self.sv.get_translation_rows()[BALL_INDEX]
         ball_x, ball_y = ball_translation[0], ball_translation[1]
 
         if is_in_blue_goal(ball_x, ball_y):
@@ -228,7 +274,7 @@ class RCJSoccerReferee:
         if team_goal and team_kickoff:
             self.sv.draw_scores(self.score_blue, self.score_yellow)
             self.ball_reset_timer = self.post_goal_wait_time
-            self.eventer.event(referee=self, type=GameEvents.GOAL.value, payload={"team_name": team_goal, "score_yellow": self.score_yellow, "score_blue": self.score_blue})
+            self.eventer.event(self, Goal(team_name=team_goal, score_yellow=self.score_yellow, score_blue=self.score_blue))
             self.team_to_kickoff = team_kickoff
 
     def kickoff(self, team: Optional[str] = None):
@@ -238,36 +284,65 @@ class RCJSoccerReferee:
         if not team:
             team = Team.BLUE.value if seed > 0.5 else Team.YELLOW.value
         robot_name = self.reset_team_for_kickoff(team)
-        self.eventer.event(referee=self, type=GameEvents.KICKOFF.value, payload={"robot_name": robot_name, "team_name": team})
+        self.eventer.event(self, Kickoff(robot_name=robot_name, team_name=team))
 
     def tick(self) -> bool:
+        # The scene writes of the tick are applied at once when it ends,
+        # right before the next step
+        with self.sv.transaction():
+            return self._tick()
+
+    def _lap(self, phase: TickPhase):
+        if self.profiler:
+            self.profiler.lap(phase.value)
+
+    def check_rules(self):
+        self.check_goal()
+        self._lap(TickPhase.CHECK_GOAL)
+        self.check_progress()
+        self._lap(TickPhase.CHECK_PROGRESS)
+        self.check_robots_in_penalty_area()
+        self._lap(TickPhase.CHECK_PENALTY_AREA)
+
+    def count_down_ball_reset(self):
+        """Wait after a goal, then reset the positions and kick off."""
+        self.ball_reset_timer -= TIME_STEP / 1000.0
+        self.sv.draw_goal_sign()
+        if self.ball_reset_timer <= 0:
+            self.reset_positions()
+            self.ball_reset_timer = 0
+            self.sv.hide_goal_sign()
+            self.kickoff(self.team_to_kickoff)
+        self._lap(TickPhase.GOAL_RESET)
+
+    def _tick(self) -> bool:
+        if self.profiler:
+            self.profiler.mark()
+
         self.sv.check_reset_physics_counters()
         if self.time == self.match_time:
-            self.eventer.event(referee=self, type=GameEvents.MATCH_START.value, payload={"score_yellow": self.score_yellow, "score_blue": self.score_blue, "total_match_time": self.match_time, "team_name_yellow": self.team_name_yellow, "team_name_blue": self.team_name_blue, "match_id": self.match_id, "halftime": self.half_id})
+            self.eventer.event(self, MatchStart(score_yellow=self.score_yellow, score_blue=self.score_blue, total_match_time=self.match_time, team_name_yellow=self.team_name_yellow, team_name_blue=self.team_name_blue, match_id=self.match_id, halftime=self.half_id))
+        self._lap(TickPhase.RESET_PHYSICS)
 
         self.sv.update_positions()
+        self._lap(TickPhase.UPDATE_POSITIONS)
         self.sv.emit_data(self._pack_data())
+        self._lap(TickPhase.EMIT_DATA)
         self.time -= TIME_STEP / 1000.0
 
         if self.time < 0:
-            self.eventer.event(referee=self, type=GameEvents.MATCH_FINISH.value, payload={"total_match_time": self.match_time, "score_yellow": self.score_yellow, "score_blue": self.score_blue, "team_name_yellow": self.team_name_yellow, "team_name_blue": self.team_name_blue})
+            self.eventer.event(self, MatchFinish(total_match_time=self.match_time, score_yellow=self.score_yellow, score_blue=self.score_blue, team_name_yellow=self.team_name_yellow, team_name_blue=self.team_name_blue))
             return False
 
-        self.sv.draw_time(self.time)
-        self.process_and_draw_event_messages()
+        if self.sv.hud_enabled:
+            self.sv.draw_time(self.time)
+            self.process_and_draw_event_messages()
+            self._lap(TickPhase.HUD)
 
         if self.ball_reset_timer == 0:
-            self.check_goal()
-            self.check_progress()
-            self.check_robots_in_penalty_area()
+            self.check_rules()
         else:
-            self.ball_reset_timer -= TIME_STEP / 1000.0
-            self.sv.draw_goal_sign()
-            if self.ball_reset_timer <= 0:
-                self.reset_positions()
-                self.ball_reset_timer = 0
-                self.sv.hide_goal_sign()
-                self.kickoff(self.team_to_kickoff)
+            self.count_down_ball_reset()
 
         if self.ball_stop > 0:
             if self.ball_stop == 1:
@@ -0,0 +1,192 @@
+import gzip
+import io
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+from referee.consts import REFLOG_BATCH_BYTES, REFLOG_FLUSH_INTERVAL
+from referee.enums import FsyncPolicy, ReflogCompression
+
+try:
+    import zstandard
+except ImportError:  # Only needed for zstd compressed reflogs
+    zstandard = None
+
+COMPRESSION_SUFFIXES = {
+    ReflogCompression.NONE.value: "",
+    ReflogCompression.GZIP.value: ".gz",
+    ReflogCompression.ZSTD.value: ".zst",
+}
+
+
+class DatetimeFormatter:
+    """Format datetimes as ``%Y-%m-%dT%H:%M:%S.%fZ``, running ``strftime``
+    only once per second."""
+
+    def __init__(self):
+        self.second: Optional[datetime] = None
+        self.prefix = ""
+
+    def format(self, moment: datetime) -> str:
+        second = moment.replace(microsecond=0)
+        if second != self.second:
+            self.second = second
+            self.prefix = second.strftime("%Y-%m-%dT%H:%M:%S")
+        return f"{self.prefix}.{moment.microsecond:06d}Z"
+
+
+class ReflogWriter:
+    """Write the lines of a reflog through a single open file handle.
+
+    Lines are buffered and written in batches, once the batch reaches
+    ``batch_bytes`` or ``flush_interval`` seconds have passed since the
+    last write, and whenever ``flush`` is called. Without compression, the
+    output is byte for byte the same as writing each line on its own.
+
+    Args:
+        path (Path): Path of the reflog. The suffix of the compression, if
+            any, is appended to it.
+        compression (str): "none", "gzip" or "zstd" (needs the
+            ``zstandard`` package)
+        fsync (str): When the written lines are synced to the disk: "none"
+            (left to the OS), "batch" (after each batch) or "event" (after
+            each line, which also disables batching)
+        max_bytes (int, optional): Size of the uncompressed lines after
+            which the reflog is continued in a new file, ``<stem>.1.jsonl``,
+            ``<stem>.2.jsonl`` and so on. A line is never split.
+        batch_bytes (int): Size of the buffered lines which triggers a write
+        flush_interval (float): Time since the last write in seconds which
+            triggers a write
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        compression: str = ReflogCompression.NONE.value,
+        fsync: str = FsyncPolicy.NONE.value,
+        max_bytes: Optional[int] = None,
+        batch_bytes: int = REFLOG_BATCH_BYTES,
+        flush_interval: float = REFLOG_FLUSH_INTERVAL,
+    ):
+        if compression not in ReflogCompression.all():
+            raise ValueError(f"Unexpected reflog compression {compression}")
+        if fsync not in FsyncPolicy.all():
+            raise ValueError(f"Unexpected fsync policy {fsync}")
+        if compression == ReflogCompression.ZSTD.value and not zstandard:
+            raise ValueError("zstd compression needs the zstandard package")
+
+        self.path = Path(path)
+        self.compression = compression
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.batch_bytes = batch_bytes
+        self.flush_interval = flush_interval
+
+        self.paths: List[Path] = []
+        self.file: Optional[BinaryIO] = None
+        self.raw_file: Optional[BinaryIO] = None
+        self.file_bytes = 0
+
+        self.buffer: List[bytes] = []
+        self.buffer_bytes = 0
+        self.last_flush = time.monotonic()
+
+    def write(self, line: str):
+        """Buffer a line, which has to end with a newline."""
+        data = line.encode()
+        if (
+            self.max_bytes is not None
+            and self.file_bytes > 0
+            and self.file_bytes + len(data) > self.max_bytes
+        ):
+            self.flush()
+            self._close_file()
+
+        self.buffer.append(data)
+        self.buffer_bytes += len(data)
+        self.file_bytes += len(data)
+
+        if (
+            self.fsync == FsyncPolicy.EVENT.value
+            or self.buffer_bytes >= self.batch_bytes
+            or time.monotonic() - self.last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Write the buffered lines to the file."""
+        self.last_flush = time.monotonic()
+        if not self.buffer:
+            return
+
+        if self.file is None:
+            self._open_file()
+
+        self.file.write(b"".join(self.buffer))
+        self.buffer.clear()
+        self.buffer_bytes = 0
+
+        # Compressors emit everything written so far on flush
+        self.file.flush()
+        if self.fsync != FsyncPolicy.NONE.value:
+            os.fsync(self.raw_file.fileno())
+
+    def close(self):
+        """Write the buffered lines and close the file."""
+        self.flush()
+        self._close_file()
+
+    def _open_file(self):
+        index = len(self.paths)
+        path = self.path
+        if index:
+            path = path.with_name(f"{path.stem}.{index}{path.suffix}")
+        path = path.with_name(
+            path.name + COMPRESSION_SUFFIXES[self.compression]
+        )
+        self.paths.append(path)
+
+        # Appending, as the logger used to: compressed reflogs then hold
+        # several frames, which the decompressors read as one stream
+        self.raw_file = path.open("ab")
+        if self.compression == ReflogCompression.GZIP.value:
+            self.file = gzip.GzipFile(fileobj=self.raw_file, mode="ab")
+        elif self.compression == ReflogCompression.ZSTD.value:
+            compressor = zstandard.ZstdCompressor()
+            self.file = compressor.stream_writer(self.raw_file)
+        else:
+            self.file = self.raw_file
+
+    def _close_file(self):
+        if self.file is None:
+            return
+
+        if self.file is not self.raw_file:
+            self.file.close()
+        self.raw_file.close()
+        self.file = None
+        self.raw_file = None
+        self.file_bytes = 0
+
+
+def read_reflog(path: Path) -> Iterator[Dict]:
+    """Yield the lines of a reflog written by ``ReflogWriter``, decoded,
+    the compression being told by the suffix of the file."""
+    path = Path(path)
+    if path.suffix == COMPRESSION_SUFFIXES[ReflogCompression.GZIP.value]:
+        f = gzip.open(path, "rt")
+    elif path.suffix == COMPRESSION_SUFFIXES[ReflogCompression.ZSTD.value]:
+        if not zstandard:
+            raise ValueError("zstd compression needs the zstandard package")
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            path.open("rb"), read_across_frames=True, closefd=True
+        )
+        f = io.TextIOWrapper(reader)
+    else:
+        f = path.open()
+    with f:
+        for line in f:
+            yield json.loads(line)
@@ -0,0 +1,186 @@
+import re
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional
+
+import numpy as np
+
+from referee.consts import N_OBJECTS, N_ROBOTS, SHARED_STATE_SLOTS
+
+SHARED_STATE_MAGIC = b"RCJSTATE"
+SHARED_STATE_VERSION = 1
+
+HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u4"),
+        ("slots", "<u4"),
+        ("half_id", "<u4"),
+        ("padding", "<u4"),
+        # Last tick written, -1 before the first one
+        ("latest", "<i8"),
+    ]
+)
+HEADER_SIZE = 64
+# A slot holds the poses of a tick, as in BaseRCJSoccerSupervisor. Its
+# sequence is odd while the slot is being written.
+SLOT_DTYPE = np.dtype(
+    [
+        ("sequence", "<u8"),
+        ("tick", "<u8"),
+        # Simulation time in seconds
+        ("time", "<f8"),
+        ("translations", "<f8", (N_OBJECTS, 3)),
+        ("rotations", "<f8", (N_ROBOTS, 4)),
+    ]
+)
+
+
+def shared_state_name(match_id: str) -> str:
+    """Return the name of the shared memory block of a match."""
+    return "rcj_soccer_" + re.sub(r"[^A-Za-z0-9]", "_", str(match_id))
+
+
+def _map(buffer, slots: int):
+    header = np.ndarray((), HEADER_DTYPE, buffer=buffer)
+    ring = np.ndarray((slots,), SLOT_DTYPE, buffer=buffer, offset=HEADER_SIZE)
+    return header, ring
+
+
+class SharedStateWriter:
+    """Ring buffer of the poses of the last ``slots`` ticks in shared
+    memory, for analysis processes on the same host to read with
+    ``SharedStateReader``.
+
+    Each slot is written under a seqlock: its sequence number is odd while
+    it is being written, readers retry when it is odd or changed while
+    they copied the slot. The writer never waits for the readers and does
+    not know about them.
+
+    Args:
+        match_id (str): Readers attach to the block by this ID
+        half_id (int): Half being played, for the readers to tell
+        slots (int): Ticks kept in the ring
+    """
+
+    def __init__(
+        self, match_id: str, half_id: int = 1, slots: int = SHARED_STATE_SLOTS
+    ):
+        self.match_id = match_id
+        self.name = shared_state_name(match_id)
+        size = HEADER_SIZE + slots * SLOT_DTYPE.itemsize
+        try:
+            self.memory = shared_memory.SharedMemory(
+                self.name, create=True, size=size
+            )
+        except FileExistsError:
+            # Left behind by a simulation which was killed, or the
+            # previous half of the match
+            stale = shared_memory.SharedMemory(self.name)
+            stale.close()
+            stale.unlink()
+            self.memory = shared_memory.SharedMemory(
+                self.name, create=True, size=size
+            )
+
+        self.header, self.ring = _map(self.memory.buf, slots)
+        self.slots = slots
+        self.ring[:] = np.zeros((), SLOT_DTYPE)
+        self.header["magic"] = SHARED_STATE_MAGIC
+        self.header["version"] = SHARED_STATE_VERSION
+        self.header["slots"] = slots
+        self.header["half_id"] = half_id
+        self.header["latest"] = -1
+        # Views of the fields, quicker to write to than the records
+        self.sequences = self.ring["sequence"]
+        self.ticks = self.ring["tick"]
+        self.times = self.ring["time"]
+        self.translations = self.ring["translations"]
+        self.rotations = self.ring["rotations"]
+
+    def write(
+        self,
+        tick: int,
+        time: float,
+        translations: np.ndarray,
+        rotations: np.ndarray,
+    ):
+        """Write the poses of a tick over the oldest slot."""
+        slot = tick % self.slots
+        self.sequences[slot] += 1
+        self.ticks[slot] = tick
+        self.times[slot] = time
+        self.translations[slot] = translations
+        self.rotations[slot] = rotations
+        self.sequences[slot] += 1
+        self.header["latest"] = tick
+
+    def close(self):
+        """Release and remove the block. Readers still attached keep their
+        mapping."""
+        del self.header, self.ring, self.sequences, self.ticks, self.times
+        del self.translations, self.rotations
+        self.memory.close()
+        self.memory.unlink()
+
+
+class SharedStateReader:
+    """Read the ring buffer of ``SharedStateWriter``.
+
+    ``ring`` maps the slots directly, ``snapshot`` returns a consistent
+    copy of a single tick.
+
+    Args:
+        match_id (str): ID of the match the writer was created with
+    """
+
+    def __init__(self, match_id: str):
+        self.memory = shared_memory.SharedMemory(shared_state_name(match_id))
+        # Attaching registers the block too, which would remove it when
+        # this process exits (https://bugs.python.org/issue39959)
+        resource_tracker.unregister(self.memory._name, "shared_memory")
+
+        header = np.ndarray((), HEADER_DTYPE, buffer=self.memory.buf)
+        if (
+            header["magic"] != SHARED_STATE_MAGIC
+            or header["version"] != SHARED_STATE_VERSION
+        ):
+            raise ValueError(f"{self.memory.name} is not an RCJ state block")
+        self.slots = int(header["slots"])
+        self.header, self.ring = _map(self.memory.buf, self.slots)
+
+    @property
+    def half_id(self) -> int:
+        return int(self.header["half_id"])
+
+    @property
+    def latest(self) -> int:
+        """Return the last tick written, -1 if none was."""
+        return int(self.header["latest"])
+
+    def snapshot(self, tick: Optional[int] = None, retries: int = 100):
+        """Copy the slot of a tick, the last one by default.
+
+        Returns:
+            np.void: Record of SLOT_DTYPE, or None if the tick is not in the
+            ring (not written yet or overwritten)
+        """
+        for _ in range(retries):
+            latest = self.latest
+            wanted = latest if tick is None else tick
+            if wanted < 0 or wanted > latest or latest - wanted >= self.slots:
+                return None
+            slot = wanted % self.slots
+            sequence = int(self.ring["sequence"][slot])
+            if sequence % 2:
+                continue
+            record = self.ring[slot].copy()
+            if (
+                int(self.ring["sequence"][slot]) == sequence
+                and int(record["tick"]) == wanted
+            ):
+                return record
+        return None
+
+    def close(self):
+        del self.header, self.ring
+        self.memory.close()
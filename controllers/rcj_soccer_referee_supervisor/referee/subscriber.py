@@ -0,0 +1,71 @@
+"""Print the state of a match streamed by the referee, see
+``referee.publisher.StatePublisher``.
+
+    RCJ_SIM_PUBLISH=udp://127.0.0.1:5005 webots worlds/soccer.wbt
+    python -m referee.subscriber udp://127.0.0.1:5005
+"""
+import argparse
+import json
+import os
+import socket
+from typing import Dict, Iterator, Optional
+
+from referee.consts import BALL_INDEX
+from referee.publisher import parse_address
+from referee.utils import time_to_string
+
+
+def subscribe(address: str, timeout: Optional[float] = None) -> Iterator[Dict]:
+    """Yield the frames published to the address, which is bound to.
+
+    Args:
+        address (str): ``udp://host:port`` or ``unix:///path``
+        timeout (float, optional): Stop after this many seconds without a
+            frame
+    """
+    family, bind_address = parse_address(address)
+    with socket.socket(family, socket.SOCK_DGRAM) as sock:
+        sock.bind(bind_address)
+        sock.settimeout(timeout)
+        try:
+            while True:
+                yield json.loads(sock.recv(65536))
+        except socket.timeout:
+            return
+        finally:
+            if family == socket.AF_UNIX:
+                os.unlink(bind_address)
+
+
+def format_frame(frame: Dict) -> str:
+    lines = [
+        f"[{frame['tick']}] {event['type']} {json.dumps(event['payload'])}"
+        for event in frame["events"]
+    ]
+    if "translations" in frame:
+        blue, yellow = frame["score"]
+        x, y, _ = frame["translations"][BALL_INDEX]
+        lines.append(
+            f"[{frame['tick']}] {time_to_string(frame['time'])} "
+            f"{blue}:{yellow} ball ({x:+.3f}, {y:+.3f})"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("address", help="udp://host:port or unix:///path")
+    parser.add_argument(
+        "--raw", action="store_true", help="Print the frames as JSON lines"
+    )
+    args = parser.parse_args()
+
+    try:
+        for frame in subscribe(args.address):
+            print(json.dumps(frame) if args.raw else format_frame(frame))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,32 @@
+import json
+import threading
+from pathlib import Path
+from typing import Iterator
 from unittest.mock import MagicMock
 
 import pytest
 
-from referee.event_handlers import EventHandler
+from referee.enums import GameEvents
+from referee.event_handlers import (
+    DrawMessageHandler,
+    EventHandler,
+    JSONLoggerHandler,
+)
 from referee.eventer import Eventer
+from referee.events import (
+    EVENT_CLASSES,
+    Goal,
+    Kickoff,
+    LackOfProgress,
+    MatchFinish,
+)
 
 
 @pytest.fixture
-def eventer() -> Eventer:
-    return Eventer()
+def eventer() -> Iterator[Eventer]:
+    eventer = Eventer()
+    yield eventer
+    eventer.close()
 
 
 def test_no_subscribers(eventer: Eventer):
@@ -32,7 +50,143 @@ def test_event(eventer: Eventer):
     eventer.subscribe(subscriber1)
     eventer.subscribe(subscriber2)
 
-    eventer.event("arg", kwarg="test")
+    referee = MagicMock(match_time=600, time=590)
+    event = Kickoff(robot_name="B1", team_name="B")
+    eventer.event(referee, event)
 
-    subscriber1.handle.assert_called_with("arg", kwarg="test")
-    subscriber2.handle.assert_called_with("arg", kwarg="test")
+    subscriber1.handle.assert_called_with(referee, event)
+    subscriber2.handle.assert_called_with(referee, event)
+    assert event.matchtime == 10
+
+
+class RecordingHandler(EventHandler):
+    asynchronous = True
+
+    def __init__(self):
+        super().__init__()
+        self.events = []
+        self.threads = set()
+
+    def handle(self, referee, event):
+        self.events.append(event.type)
+        self.threads.add(threading.current_thread())
+
+
+def test_asynchronous_handler(eventer: Eventer):
+    handler = RecordingHandler()
+    eventer.subscribe(handler)
+    referee = MagicMock(match_time=600, time=600)
+
+    eventer.event(referee, Kickoff(robot_name="B1", team_name="B"))
+    eventer.event(referee, Goal(team_name="B", score_yellow=0, score_blue=1))
+    eventer.flush()
+
+    assert handler.events == ["KICKOFF", "GOAL"]
+    assert handler.threads == {eventer.worker}
+
+
+def test_flush_at_match_finish(eventer: Eventer):
+    handler = RecordingHandler()
+    eventer.subscribe(handler)
+    referee = MagicMock(match_time=600, time=0)
+
+    eventer.event(referee, MatchFinish(600, 1, 2, "Yellows", "Blues"))
+
+    # No flush() needed, the event is handled once event() returns
+    assert handler.events == ["MATCH_FINISH"]
+
+
+def test_asynchronous_handler_in_synchronous_mode():
+    eventer = Eventer(asynchronous=False)
+    handler = RecordingHandler()
+    eventer.subscribe(handler)
+
+    eventer.event(MagicMock(match_time=1, time=1), LackOfProgress("ball"))
+
+    assert eventer.worker is None
+    assert handler.threads == {threading.current_thread()}
+
+
+def test_asynchronous_handler_error(eventer: Eventer):
+    handler = RecordingHandler()
+    handler.handle = MagicMock(side_effect=OSError("disk full"))
+    eventer.subscribe(handler)
+
+    eventer.event(MagicMock(match_time=1, time=1), LackOfProgress("ball"))
+
+    with pytest.raises(OSError):
+        eventer.flush()
+    eventer.flush()
+
+
+def test_close(eventer: Eventer):
+    handler = RecordingHandler()
+    handler.close = MagicMock()
+    eventer.subscribe(handler)
+    worker = eventer.worker
+
+    eventer.event(MagicMock(match_time=1, time=1), LackOfProgress("ball"))
+    eventer.close()
+
+    assert handler.events == ["LACK_OF_PROGRESS"]
+    assert eventer.worker is None
+    assert not worker.is_alive()
+    handler.close.assert_called()
+
+
+def test_event_classes():
+    assert sorted(EVENT_CLASSES) == sorted(event.value for event in GameEvents)
+    assert not hasattr(Kickoff("B1", "B"), "__dict__")
+
+
+@pytest.mark.parametrize(
+    "event, payload",
+    [
+        (LackOfProgress("ball"), {"type": "ball"}),
+        (
+            LackOfProgress("robot", "Y2"),
+            {"type": "robot", "robot_name": "Y2"},
+        ),
+        (
+            Goal(team_name="Blues", score_yellow=0, score_blue=1),
+            {"team_name": "Blues", "score_yellow": 0, "score_blue": 1},
+        ),
+    ],
+)
+def test_event_payload(event, payload: dict):
+    assert event.payload == payload
+
+
+@pytest.mark.parametrize(
+    "event, message",
+    [
+        (LackOfProgress("ball"), "Ball: Lack of progress."),
+        (LackOfProgress("robot", "B2"), "Robot B2: Lack of progress."),
+        (Kickoff("Y1", "Y"), "Robot Y1 is kicking off."),
+        (
+            MatchFinish(600, 1, 2, "Yellows", "Blues"),
+            "The match time 600s is over.",
+        ),
+    ],
+)
+def test_draw_message_handler(event, message: str):
+    referee = MagicMock()
+
+    DrawMessageHandler().handle(referee, event)
+
+    referee.add_event_message_to_queue.assert_called_once_with(message)
+
+
+def test_json_logger_handler(eventer: Eventer, tmp_path: Path):
+    logfile = tmp_path / "reflog.jsonl"
+    eventer.subscribe(JSONLoggerHandler(logfile))
+    referee = MagicMock(match_time=600, time=600)
+
+    eventer.event(referee, Kickoff("B1", "B"))
+    referee.time = 0
+    eventer.event(referee, MatchFinish(600, 1, 2, "Yellows", "Blues"))
+
+    lines = [json.loads(line) for line in logfile.read_text().splitlines()]
+    assert [line["event"] for line in lines] == ["KICKOFF", "MATCH_FINISH"]
+    assert [line["matchtime"] for line in lines] == [0, 600]
+    assert lines[0]["payload"] == {"robot_name": "B1", "team_name": "B"}
@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from referee.match import load_session, MatchConfig
+
+
+def test_config_defaults():
+    config = MatchConfig.from_env({})
+
+    assert config == MatchConfig()
+    assert config.controllers()["B1"] == "rcj_soccer_team_blue"
+    assert config.controllers()["Y3"] == "rcj_soccer_team_yellow"
+
+
+def test_config_from_env():
+    config = MatchConfig.from_env(
+        {
+            "RCJ_SIM_TEAM_BLUE_NAME": "Blue",
+            "RCJ_SIM_TEAM_Y_INITIAL_SCORE": "2",
+            "RCJ_SIM_HALF_ID": "2",
+            "RCJ_SIM_REC_FORMATS": "trajectory,",
+            "RCJ_SIM_REFLOG_MAX_BYTES": "100",
+            "RCJ_SIM_AUTO_MODE": "True",
+            "RCJ_SIM_NO_HUD": "True",
+            "RCJ_SIM_OUTPUT_PATH": "/tmp/out",
+        }
+    )
+
+    assert config.team_blue == "Blue"
+    assert config.initial_score_yellow == 2
+    assert config.half_id == 2
+    assert config.rec_formats == ["trajectory"]
+    assert config.reflog_max_bytes == 100
+    assert config.automatic_mode
+    assert not config.hud_enabled
+    assert config.output_directory == Path("/tmp/out")
+
+
+def test_second_half():
+    config = MatchConfig(
+        team_blue="A",
+        team_blue_id="a",
+        team_yellow="B",
+        team_yellow_id="b",
+        controller_blue="team_a",
+        controller_yellow="team_b",
+    )
+
+    second = config.second_half(score_blue=3, score_yellow=1)
+
+    assert (second.team_blue, second.team_blue_id) == ("B", "b")
+    assert (second.team_yellow, second.team_yellow_id) == ("A", "a")
+    assert second.initial_score_blue == 1
+    assert second.initial_score_yellow == 3
+    assert second.half_id == 2
+    assert second.controllers()["B1"] == "team_b"
+    assert second.controllers()["Y1"] == "team_a"
+
+
+def test_load_session(tmp_path: Path):
+    path = tmp_path / "session.json"
+    path.write_text(json.dumps([{"match_id": "2", "halves": 2}]))
+
+    assert load_session(path) == [{"match_id": "2", "halves": 2}]
+
+    path.write_text(json.dumps([{"team_green": "G"}]))
+    with pytest.raises(ValueError):
+        load_session(path)
@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from referee.packet_codec import (
+    decode_packet,
+    encode_binary_packet,
+    encode_json_packet,
+    PACKET_V1,
+)
+
+CONTROLLERS_DIR = Path(__file__).resolve().parents[3]
+
+
+def test_binary_round_trip():
+    data = encode_binary_packet(True, 421, 2, 1, "Y")
+
+    assert len(data) == PACKET_V1.size
+    assert decode_packet(data) == {
+        "waiting_for_kickoff": True,
+        "remaining_time": 421,
+        "score_blue": 2,
+        "score_yellow": 1,
+        "kickoff_team": "Y",
+    }
+
+
+def test_binary_without_kickoff_team():
+    packet = decode_packet(encode_binary_packet(False))
+
+    assert packet["waiting_for_kickoff"] is False
+    assert packet["kickoff_team"] is None
+
+
+def test_binary_clamps_out_of_range_values():
+    packet = decode_packet(encode_binary_packet(False, -0.5, 300, 0))
+
+    assert packet["remaining_time"] == 0
+    assert packet["score_blue"] == 255
+
+
+def test_binary_is_cached_per_state():
+    assert encode_binary_packet(False, 10) is encode_binary_packet(False, 10)
+    assert encode_binary_packet(False, 10) != encode_binary_packet(False, 9)
+
+
+def test_newer_versions_are_decoded_up_to_known_fields():
+    data = encode_binary_packet(True, 5, 0, 3, "B")
+    newer = bytes([2]) + data[1:] + b"\x01\x02"
+
+    assert decode_packet(newer) == decode_packet(data)
+
+
+def test_unsupported_version():
+    with pytest.raises(ValueError):
+        decode_packet(bytes(PACKET_V1.size))
+
+
+@pytest.mark.parametrize("waiting_for_kickoff", [True, False])
+def test_json_compatibility(waiting_for_kickoff: bool):
+    data = encode_json_packet(waiting_for_kickoff)
+
+    assert json.loads(data) == {"waiting_for_kickoff": waiting_for_kickoff}
+    assert decode_packet(data) == json.loads(data)
+    assert decode_packet(data.encode()) == json.loads(data)
+
+
+@pytest.mark.parametrize(
+    "team_dir", ["rcj_soccer_team_blue", "rcj_soccer_team_yellow"]
+)
+def test_robot_copies_are_identical(team_dir: str):
+    supervisor_copy = CONTROLLERS_DIR / "rcj_soccer_referee_supervisor"
+    supervisor_copy = supervisor_copy / "referee" / "packet_codec.py"
+    robot_copy = CONTROLLERS_DIR / team_dir / "packet_codec.py"
+
+    assert robot_copy.read_text() == supervisor_copy.read_text()
@@ -1,9 +1,13 @@
 from typing import List
 
+import numpy as np
 import pytest
 
 from referee.consts import BLUE_PENALTY_AREA, YELLOW_PENALTY_AREA
-from referee.penalty_area_checker import PenaltyAreaChecker
+from referee.penalty_area_checker import (
+    BatchPenaltyAreaChecker,
+    PenaltyAreaChecker,
+)
 
 
 @pytest.fixture
@@ -144,3 +148,43 @@ def test_violating(
     checker.track(in_yellow_penalty_pos, 40)
 
     assert checker.is_violating()
+
+
+def test_update(checker: PenaltyAreaChecker):
+    checker.update(True, 60)
+    checker.update(False, 59)
+    checker.update(True, 57)
+    checker.update(True, 46)
+
+    assert not checker.is_violating()
+
+    checker.update(True, 44)
+
+    assert checker.is_violating()
+
+
+def test_batch_checker():
+    rng = np.random.default_rng(3)
+    batch = BatchPenaltyAreaChecker(4, 2, time_allowed=5, reset_after=2)
+    checkers = [
+        [PenaltyAreaChecker(time_allowed=5, reset_after=2) for _ in range(2)]
+        for _ in range(4)
+    ]
+
+    assert not batch.is_violating().any()
+    for time in np.arange(60, 0, -0.5):
+        inside = rng.random((4, 2)) > 0.3
+        mask = rng.random((4, 2)) > 0.1
+        batch.update(inside, time, mask)
+
+        # The clock of a checker only moves when it is updated
+        violating = batch.is_violating() & mask
+        for i, row in enumerate(checkers):
+            for j, checker in enumerate(row):
+                if not mask[i, j]:
+                    continue
+                checker.update(bool(inside[i, j]), time)
+                assert violating[i, j] == checker.is_violating()
+                if violating[i, j]:
+                    checker.reset()
+        batch.reset(violating)
@@ -0,0 +1,114 @@
+import cProfile
+import json
+import pstats
+import time
+from pathlib import Path
+
+import pytest
+
+from referee.enums import TickPhase
+from referee.profiler import (
+    collapsed_stacks,
+    dump_profile,
+    Histogram,
+    TickProfiler,
+)
+
+
+def test_histogram():
+    histogram = Histogram(buckets=8)
+    for duration in [1, 2, 3, 100, 1000]:
+        histogram.add(duration)
+
+    assert list(histogram.counts) == [0, 1, 2, 0, 0, 0, 0, 2]
+    assert histogram.count == 5
+    assert histogram.total == 1106
+    assert histogram.max == 1000
+
+
+def test_histogram_percentile():
+    histogram = Histogram()
+    for _ in range(99):
+        histogram.add(1000)
+    histogram.add(5000)
+
+    # Upper bound of the bucket
+    assert histogram.percentile(50) == 1024
+    assert histogram.percentile(99) == 1024
+    assert histogram.percentile(100) == 5000
+
+
+def test_tick_profiler():
+    profiler = TickProfiler(time_step=32)
+    for _ in range(3):
+        time.sleep(0.002)
+        profiler.lap(TickPhase.STEP.value)
+        profiler.lap(TickPhase.HUD.value)
+
+    summary = profiler.summary()
+    assert summary["steps"] == 3
+    assert summary["simulated_time"] == pytest.approx(0.096)
+    assert 0 < summary["real_time_factor"] <= 16
+    assert list(summary["phases"]) == ["step", "hud"]
+    assert summary["phases"]["step"]["mean_us"] >= 2000
+
+
+def test_mark():
+    profiler = TickProfiler()
+    time.sleep(0.002)
+    profiler.mark()
+    profiler.lap(TickPhase.HUD.value)
+
+    assert profiler.histograms[TickPhase.HUD.value].max < 2_000_000
+
+
+def test_write_summary(tmp_path: Path):
+    profiler = TickProfiler()
+    profiler.lap(TickPhase.STEP.value)
+    profiler.write_summary(tmp_path / "profile.json")
+
+    summary = json.loads((tmp_path / "profile.json").read_text())
+    assert summary["phases"]["step"]["count"] == 1
+
+
+def busy(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def inner():
+    busy(0.01)
+
+
+def outer():
+    busy(0.01)
+    inner()
+
+
+def profile_outer() -> pstats.Stats:
+    profiler = cProfile.Profile()
+    profiler.enable()
+    outer()
+    profiler.disable()
+    return pstats.Stats(profiler)
+
+
+def test_collapsed_stacks():
+    stacks = collapsed_stacks(profile_outer())
+
+    outer_stack = next(s for s in stacks if s.endswith(":outer"))
+    inner_stack = next(s for s in stacks if s.endswith(":inner"))
+    assert inner_stack.startswith(outer_stack + ";")
+    assert any(s.startswith(f"{inner_stack};") for s in stacks)
+
+    busy_time = sum(t for s, t in stacks.items() if s.endswith(":busy"))
+    assert busy_time == pytest.approx(20000, rel=0.5)
+
+
+def test_dump_profile(tmp_path: Path):
+    dump_profile(profile_outer(), tmp_path / "match")
+
+    assert pstats.Stats(str(tmp_path / "match.prof")).stats
+    lines = (tmp_path / "match.collapsed").read_text().splitlines()
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines)
@@ -1,6 +1,13 @@
+import numpy as np
 import pytest
 
-from referee.progress_checker import ProgressChecker
+from referee.enums import ProgressCheckMode
+from referee.progress_checker import (
+    BatchProgressChecker,
+    create_progress_checkers,
+    ProgressChecker,
+    SlidingExtremum,
+)
 
 
 @pytest.fixture
@@ -69,3 +76,131 @@ def test_progress_ok(checker: ProgressChecker):
 
     checker.track([0.5, 0.0, 0.0])
     assert checker.is_progress()
+
+
+def test_track_buffer_overwritten_in_place(checker: ProgressChecker):
+    position = np.zeros(3)
+    checker.track(position)
+    position[0] = 0.01
+    checker.track(position)
+    position[0] = 0.03
+    checker.track(position)
+
+    assert checker.iterator == 2
+    assert checker.samples[0] == pytest.approx(0.01)
+    assert checker.samples[1] == pytest.approx(0.02)
+    assert checker.prev_position == [0.03, 0.0, 0.0]
+
+
+def test_running_sum_matches_window(checker: ProgressChecker):
+    rng = np.random.default_rng(0)
+    positions = np.cumsum(rng.uniform(-0.003, 0.003, (1000, 2)), axis=0)
+    deltas = np.hypot(*np.diff(positions, axis=0).T)
+
+    for position in positions.tolist():
+        checker.track(position)
+
+    assert checker.total == pytest.approx(deltas[-235:].sum())
+    assert checker.is_progress() == (deltas[-235:].sum() >= 0.5)
+
+
+def test_reset_in_place(checker: ProgressChecker):
+    samples = checker.samples
+    for i in range(300):
+        checker.track([i * 0.01, 0.0, 0.0])
+    checker.reset()
+
+    assert checker.samples is samples
+    assert checker.iterator == 0
+    assert checker.total == 0
+    assert checker.prev_position is None
+
+    # The samples left over from before the reset do not count
+    for _ in range(236):
+        checker.track([0.0, 0.0, 0.0])
+    assert not checker.is_progress()
+
+
+def test_shared_sample_block():
+    checkers = create_progress_checkers({"a": (3, 0.5), "b": (2, 0.5)})
+
+    assert checkers["a"].samples.obj is checkers["b"].samples.obj
+    for i in range(4):
+        checkers["a"].track([i * 0.1, 0.0, 0.0])
+        checkers["b"].track([i * 0.2, 0.0, 0.0])
+
+    assert list(checkers["a"].samples) == pytest.approx([0.1, 0.1, 0.1])
+    assert list(checkers["b"].samples) == pytest.approx([0.2, 0.2])
+    assert not checkers["a"].is_progress()
+    assert not checkers["b"].is_progress()
+
+
+def test_unexpected_mode():
+    with pytest.raises(ValueError):
+        ProgressChecker(steps=10, threshold=0.5, mode="teleport")
+
+
+@pytest.fixture
+def displacement_checker() -> ProgressChecker:
+    return ProgressChecker(
+        steps=10, threshold=0.5, mode=ProgressCheckMode.DISPLACEMENT.value
+    )
+
+
+def test_displacement_jitter(displacement_checker: ProgressChecker):
+    # Plenty of distance travelled, but always around the same spot
+    for i in range(100):
+        displacement_checker.track([0.2 * (i % 2), 0.0, 0.0])
+        assert displacement_checker.displacement() <= 0.2
+
+    assert not displacement_checker.is_progress()
+
+
+def test_displacement_progress(displacement_checker: ProgressChecker):
+    for i in range(11):
+        displacement_checker.track([0.03 * i, 0.04 * i, 0.0])
+
+    assert displacement_checker.displacement() == pytest.approx(0.5)
+    assert displacement_checker.is_progress()
+
+    # The first position drops out of the window
+    displacement_checker.track([0.3, 0.4, 0.0])
+    assert not displacement_checker.is_progress()
+
+
+@pytest.mark.parametrize("maximum", [True, False])
+def test_sliding_extremum(maximum: bool):
+    rng = np.random.default_rng(1)
+    values = rng.uniform(-1, 1, 200).tolist()
+    extremum = SlidingExtremum(size=7, maximum=maximum)
+    function = max if maximum else min
+
+    for index, value in enumerate(values):
+        extremum.push(index, value)
+        window = values[max(0, index - 6) : index + 1]  # noqa: E203
+        assert extremum.value == function(window)
+
+
+def test_batch_progress_checker():
+    rng = np.random.default_rng(2)
+    n_matches, n_objects, steps = 3, 2, 10
+    batch = BatchProgressChecker(n_matches, n_objects, steps, threshold=0.5)
+    checkers = [
+        [ProgressChecker(steps=steps, threshold=0.5) for _ in range(n_objects)]
+        for _ in range(n_matches)
+    ]
+
+    for step in range(60):
+        xs = rng.uniform(-0.05, 0.05, (n_matches, n_objects)).cumsum(axis=0)
+        ys = rng.uniform(-0.05, 0.05, (n_matches, n_objects))
+        mask = rng.random((n_matches, n_objects)) > 0.2
+        batch.track(xs, ys, mask)
+        if step % 25 == 24:
+            batch.reset(mask)
+
+        for (i, j), checker in np.ndenumerate(np.array(checkers)):
+            if mask[i, j]:
+                checker.track([xs[i, j], ys[i, j], 0.0])
+                if step % 25 == 24:
+                    checker.reset()
+            assert batch.is_progress()[i, j] == checker.is_progress()
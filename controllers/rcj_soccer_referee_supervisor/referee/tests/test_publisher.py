@@ -0,0 +1,130 @@
+import json
+import socket
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from referee.consts import N_OBJECTS, N_ROBOTS
+from referee.events import Goal
+from referee.publisher import parse_address, StatePublisher
+from referee.subscriber import format_frame
+
+
+class Poses:
+    def get_translations(self) -> np.ndarray:
+        return np.full((N_OBJECTS, 3), 0.5)
+
+    def get_rotations(self) -> np.ndarray:
+        return np.zeros((N_ROBOTS, 4))
+
+
+def receive_all(sock: socket.socket) -> list:
+    frames = []
+    sock.settimeout(0.2)
+    try:
+        while True:
+            frames.append(json.loads(sock.recv(65536)))
+    except socket.timeout:
+        return frames
+
+
+@pytest.fixture
+def receiver():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    yield sock
+    sock.close()
+
+
+def udp_address(sock: socket.socket) -> str:
+    host, port = sock.getsockname()
+    return f"udp://{host}:{port}"
+
+
+def test_parse_address():
+    assert parse_address("udp://localhost:5005") == (
+        socket.AF_INET,
+        ("localhost", 5005),
+    )
+    assert parse_address("unix:///tmp/rcj.sock") == (
+        socket.AF_UNIX,
+        "/tmp/rcj.sock",
+    )
+    for address in ("udp://localhost", "tcp://localhost:1", "unix://"):
+        with pytest.raises(ValueError):
+            parse_address(address)
+
+
+def test_publish(receiver: socket.socket):
+    referee = MagicMock(time=10.0, score_blue=1, score_yellow=0)
+    publisher = StatePublisher(Poses(), udp_address(receiver), rate_divisor=2)
+    goal = Goal(team_name="B", score_blue=1, score_yellow=0)
+    goal.stamp(0.5)
+
+    publisher.handle(referee, goal)
+    for _ in range(4):
+        publisher.publish(referee)
+    publisher.handle(referee, goal)
+    publisher.close()
+
+    frames = receive_all(receiver)
+    assert [frame["tick"] for frame in frames] == [0, 2, 4]
+    assert frames[0]["score"] == [1, 0]
+    assert frames[0]["translations"][0] == [0.5, 0.5, 0.5]
+    assert [event["type"] for event in frames[0]["events"]] == ["GOAL"]
+    assert frames[1]["events"] == []
+    # The events after the last frame are sent on close
+    assert "translations" not in frames[2]
+    assert len(frames[2]["events"]) == 1
+    assert publisher.counters() == {"sent": 3, "dropped": 0, "failed": 0}
+    assert "GOAL" in format_frame(frames[0])
+
+
+def test_drop_oldest(receiver: socket.socket):
+    referee = MagicMock(time=10.0, score_blue=0, score_yellow=0)
+    publisher = StatePublisher(Poses(), udp_address(receiver), queue_size=2)
+    # Hold the worker in the first send
+    sending, release = threading.Event(), threading.Event()
+    send = publisher._send
+
+    def slow_send(frame):
+        sending.set()
+        release.wait()
+        send(frame)
+
+    publisher._send = slow_send
+    publisher.publish(referee)
+    sending.wait()
+    for _ in range(5):
+        publisher.publish(referee)
+    release.set()
+    publisher.close()
+
+    frames = receive_all(receiver)
+    assert [frame["tick"] for frame in frames] == [0, 4, 5]
+    assert publisher.counters() == {"sent": 3, "dropped": 3, "failed": 0}
+
+
+def test_unix_socket(tmp_path: Path):
+    path = tmp_path / "state.sock"
+    referee = MagicMock(time=10.0, score_blue=0, score_yellow=0)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as receiver:
+        receiver.bind(str(path))
+        publisher = StatePublisher(Poses(), f"unix://{path}")
+        publisher.publish(referee)
+        publisher.close()
+
+        assert len(receive_all(receiver)) == 1
+
+
+def test_nobody_listening(tmp_path: Path):
+    referee = MagicMock(time=10.0, score_blue=0, score_yellow=0)
+    publisher = StatePublisher(Poses(), f"unix://{tmp_path / 'none.sock'}")
+
+    publisher.publish(referee)
+    publisher.close()
+
+    assert publisher.counters() == {"sent": 0, "dropped": 0, "failed": 1}
@@ -6,6 +6,8 @@ sys.modules["controller"] = MagicMock()
 import pytest
 
 from referee.consts import MAX_EVENT_MESSAGES_IN_QUEUE
+from referee.enums import PacketFormat
+from referee.packet_codec import decode_packet
 from referee.referee import RCJSoccerReferee
 
 
@@ -35,6 +37,21 @@ def test_pack_packet(referee: RCJSoccerReferee):
     assert referee._pack_data() == '{"waiting_for_kickoff": false}'
 
 
+def test_pack_binary_packet(referee: RCJSoccerReferee):
+    referee.packet_format = PacketFormat.BINARY.value
+    referee.ball_reset_timer = 3
+    referee.score_blue = 1
+    referee.team_to_kickoff = "Y"
+
+    assert decode_packet(referee._pack_data()) == {
+        "waiting_for_kickoff": True,
+        "remaining_time": 600,
+        "score_blue": 1,
+        "score_yellow": 0,
+        "kickoff_team": "Y",
+    }
+
+
 def test_add_initial_position_noise(referee: RCJSoccerReferee):
     position = [0.0, 0.0, 0.0]
     new_position = referee._add_initial_position_noise(position)
@@ -45,7 +62,7 @@ def test_add_initial_position_noise(referee: RCJSoccerReferee):
 
 
 def test_add_event_message_to_queue(referee: RCJSoccerReferee):
-    assert referee.event_messages_to_draw == []
+    assert list(referee.event_messages_to_draw) == []
 
     for i in range(1, MAX_EVENT_MESSAGES_IN_QUEUE + 1):
         referee.add_event_message_to_queue(str(i))
@@ -59,3 +76,14 @@ def test_add_event_message_to_queue(referee: RCJSoccerReferee):
         str(MAX_EVENT_MESSAGES_IN_QUEUE + 1),
     )
     assert referee.event_messages_to_draw[0] == (referee.time, "2")
+
+
+def test_event_messages_drawn_on_change(referee: RCJSoccerReferee):
+    referee.process_and_draw_event_messages()
+    referee.sv.draw_event_messages.assert_not_called()
+
+    referee.add_event_message_to_queue("Hello")
+    referee.process_and_draw_event_messages()
+    referee.process_and_draw_event_messages()
+
+    referee.sv.draw_event_messages.assert_called_once_with(["10:00 - Hello"])
@@ -0,0 +1,178 @@
+import gzip
+import json
+import zlib
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from referee.enums import FsyncPolicy, ReflogCompression
+from referee.reflog import DatetimeFormatter, read_reflog, ReflogWriter
+
+LINES = [
+    json.dumps({"event": "KICKOFF", "matchtime": i}) + "\n" for i in range(5)
+]
+
+
+def write_unbatched(path: Path, lines):
+    for line in lines:
+        with path.open("a") as outfile:
+            outfile.write(line)
+
+
+def test_byte_compatible_with_unbatched_writes(tmp_path: Path):
+    writer = ReflogWriter(tmp_path / "reflog.jsonl")
+    for line in LINES:
+        writer.write(line)
+    writer.close()
+    write_unbatched(tmp_path / "expected.jsonl", LINES)
+
+    assert (tmp_path / "reflog.jsonl").read_bytes() == (
+        tmp_path / "expected.jsonl"
+    ).read_bytes()
+
+
+def test_batching(tmp_path: Path):
+    path = tmp_path / "reflog.jsonl"
+    writer = ReflogWriter(path, batch_bytes=2 * len(LINES[0]))
+
+    writer.write(LINES[0])
+    assert not path.exists()
+
+    writer.write(LINES[1])
+    assert path.read_text() == "".join(LINES[:2])
+
+    writer.write(LINES[2])
+    writer.flush()
+    assert path.read_text() == "".join(LINES[:3])
+    writer.close()
+
+
+def test_flush_interval(tmp_path: Path):
+    path = tmp_path / "reflog.jsonl"
+    writer = ReflogWriter(path, flush_interval=10)
+
+    with patch("referee.reflog.time.monotonic", return_value=0):
+        writer.last_flush = 0
+        writer.write(LINES[0])
+    assert not path.exists()
+
+    with patch("referee.reflog.time.monotonic", return_value=10):
+        writer.write(LINES[1])
+    assert path.read_text() == "".join(LINES[:2])
+    writer.close()
+
+
+@pytest.mark.parametrize(
+    "fsync, syncs",
+    [
+        (FsyncPolicy.NONE.value, 0),
+        (FsyncPolicy.BATCH.value, 1),
+        (FsyncPolicy.EVENT.value, len(LINES)),
+    ],
+)
+def test_fsync(tmp_path: Path, fsync: str, syncs: int):
+    writer = ReflogWriter(tmp_path / "reflog.jsonl", fsync=fsync)
+    with patch("referee.reflog.os.fsync") as os_fsync:
+        for line in LINES:
+            writer.write(line)
+        writer.close()
+
+    assert os_fsync.call_count == syncs
+
+
+def test_rotation(tmp_path: Path):
+    writer = ReflogWriter(
+        tmp_path / "reflog.jsonl", max_bytes=2 * len(LINES[0])
+    )
+    for line in LINES:
+        writer.write(line)
+    writer.close()
+
+    assert [path.name for path in writer.paths] == [
+        "reflog.jsonl",
+        "reflog.1.jsonl",
+        "reflog.2.jsonl",
+    ]
+    contents = [path.read_text() for path in writer.paths]
+    assert contents == ["".join(LINES[0:2]), "".join(LINES[2:4]), LINES[4]]
+
+
+def test_gzip(tmp_path: Path):
+    writer = ReflogWriter(
+        tmp_path / "reflog.jsonl",
+        compression=ReflogCompression.GZIP.value,
+        batch_bytes=1,
+    )
+    for line in LINES:
+        writer.write(line)
+    writer.close()
+
+    assert writer.paths == [tmp_path / "reflog.jsonl.gz"]
+    with gzip.open(writer.paths[0], "rt") as infile:
+        assert infile.read() == "".join(LINES)
+
+
+def test_gzip_readable_before_close(tmp_path: Path):
+    writer = ReflogWriter(
+        tmp_path / "reflog.jsonl", compression=ReflogCompression.GZIP.value
+    )
+    writer.write(LINES[0])
+    writer.flush()
+
+    data = zlib.decompressobj(wbits=31).decompress(
+        writer.paths[0].read_bytes()
+    )
+    assert data.decode() == LINES[0]
+    writer.close()
+
+
+def test_zstd(tmp_path: Path):
+    zstandard = pytest.importorskip("zstandard")
+    writer = ReflogWriter(
+        tmp_path / "reflog.jsonl", compression=ReflogCompression.ZSTD.value
+    )
+    for line in LINES:
+        writer.write(line)
+    writer.close()
+
+    with zstandard.open(writer.paths[0], "rt") as infile:
+        assert infile.read() == "".join(LINES)
+
+
+@pytest.mark.parametrize("compression", ReflogCompression.all())
+def test_read_reflog(tmp_path: Path, compression: str):
+    if compression == ReflogCompression.ZSTD.value:
+        pytest.importorskip("zstandard")
+    # Reopened, as by the halves appending to the same reflog
+    for lines in (LINES[:2], LINES[2:]):
+        writer = ReflogWriter(tmp_path / "reflog.jsonl", compression)
+        for line in lines:
+            writer.write(line)
+        writer.close()
+
+    events = list(read_reflog(writer.paths[0]))
+    assert events == [json.loads(line) for line in LINES]
+
+
+def test_invalid_arguments(tmp_path: Path):
+    with pytest.raises(ValueError):
+        ReflogWriter(tmp_path / "reflog.jsonl", compression="lzma")
+    with pytest.raises(ValueError):
+        ReflogWriter(tmp_path / "reflog.jsonl", fsync="always")
+
+
+@pytest.mark.parametrize(
+    "moment",
+    [
+        datetime(2024, 7, 1, 12, 30, 5, 123),
+        datetime(2024, 7, 1, 12, 30, 5, 999999),
+        datetime(2024, 7, 1, 12, 30, 6),
+    ],
+)
+def test_datetime_formatter(moment: datetime):
+    formatter = DatetimeFormatter()
+    formatter.format(datetime(2024, 7, 1, 12, 30, 5))
+
+    assert formatter.format(moment) == moment.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
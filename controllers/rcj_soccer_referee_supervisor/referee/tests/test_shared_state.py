@@ -0,0 +1,107 @@
+import multiprocessing
+import uuid
+
+import numpy as np
+import pytest
+
+from referee.consts import N_OBJECTS, N_ROBOTS
+from referee.shared_state import SharedStateReader, SharedStateWriter
+
+
+def poses(tick: int):
+    translations = np.full((N_OBJECTS, 3), float(tick))
+    rotations = np.full((N_ROBOTS, 4), -float(tick))
+    return translations, rotations
+
+
+@pytest.fixture
+def writer():
+    writer = SharedStateWriter(f"test-{uuid.uuid4().hex[:8]}", 2, slots=4)
+    yield writer
+    writer.close()
+
+
+def read_latest(name: str, queue):
+    reader = SharedStateReader(name)
+    record = reader.snapshot()
+    queue.put((reader.half_id, int(record["tick"]), record["time"]))
+    reader.close()
+
+
+def test_round_trip(writer: SharedStateWriter):
+    reader = SharedStateReader(writer.match_id)
+    assert reader.half_id == 2
+    assert reader.latest == -1
+    assert reader.snapshot() is None
+
+    for tick in range(1, 4):
+        writer.write(tick, tick * 0.032, *poses(tick))
+    record = reader.snapshot()
+    assert record["tick"] == 3
+    assert record["time"] == pytest.approx(0.096)
+    translations, rotations = poses(3)
+    np.testing.assert_array_equal(record["translations"], translations)
+    np.testing.assert_array_equal(record["rotations"], rotations)
+    assert record["sequence"] % 2 == 0
+    assert reader.snapshot(1)["tick"] == 1
+    assert reader.snapshot(4) is None
+    reader.close()
+
+
+def test_overwritten(writer: SharedStateWriter):
+    reader = SharedStateReader(writer.match_id)
+    for tick in range(1, 11):
+        writer.write(tick, 0.0, *poses(tick))
+    # Only the last 4 ticks are kept
+    assert reader.snapshot(6) is None
+    assert [int(reader.snapshot(t)["tick"]) for t in range(7, 11)] == [
+        7,
+        8,
+        9,
+        10,
+    ]
+    reader.close()
+
+
+def test_torn_slot(writer: SharedStateWriter):
+    reader = SharedStateReader(writer.match_id)
+    writer.write(1, 0.0, *poses(1))
+    # As seen by a reader while the writer is in the middle of the slot
+    writer.sequences[1] += 1
+    assert reader.snapshot(retries=3) is None
+    writer.sequences[1] += 1
+    assert reader.snapshot()["tick"] == 1
+    reader.close()
+
+
+def test_other_process(writer: SharedStateWriter):
+    match_id = writer.match_id
+    writer.write(5, 0.16, *poses(5))
+    queue = multiprocessing.get_context("spawn").Queue()
+    process = multiprocessing.get_context("spawn").Process(
+        target=read_latest, args=(match_id, queue)
+    )
+    process.start()
+    assert queue.get(timeout=30) == (2, 5, pytest.approx(0.16))
+    process.join()
+    # The reader exiting leaves the block to the writer
+    writer.write(6, 0.192, *poses(6))
+    reader = SharedStateReader(match_id)
+    assert reader.latest == 6
+    reader.close()
+
+
+def test_unknown_match():
+    with pytest.raises(FileNotFoundError):
+        SharedStateReader(f"missing-{uuid.uuid4().hex[:8]}")
+
+
+def test_stale_block():
+    match_id = f"test-{uuid.uuid4().hex[:8]}"
+    stale = SharedStateWriter(match_id, 1)
+    stale.write(3, 0.0, *poses(3))
+    writer = SharedStateWriter(match_id, 2)
+    reader = SharedStateReader(match_id)
+    assert (reader.half_id, reader.latest) == (2, -1)
+    reader.close()
+    writer.close()
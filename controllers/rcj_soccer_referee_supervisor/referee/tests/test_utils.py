@@ -1,5 +1,6 @@
 from typing import Any
 
+import numpy as np
 import pytest
 
 from referee.consts import (
@@ -14,13 +15,45 @@ from referee.consts import (
     GOAL_YELLOW_BACK_WALL_Y_LIMIT,
     GOAL_YELLOW_Y_LIMIT,
 )
+from referee.penalty_area_checker import PenaltyAreaChecker
 from referee.utils import (
     is_in_blue_goal,
+    is_in_blue_goal_mask,
+    is_in_penalty_area_mask,
     is_in_yellow_goal,
+    is_in_yellow_goal_mask,
     is_outside,
+    is_outside_mask,
     time_to_string,
 )
 
+# Grid of positions covering the field, the goals, the surroundings and the
+# exact limits used by the predicates
+GRID_X = np.concatenate(
+    [
+        np.linspace(-0.8, 0.8, 33),
+        [
+            FIELD_X_LOWER_LIMIT,
+            FIELD_X_UPPER_LIMIT,
+            GOAL_X_LOWER_LIMIT,
+            GOAL_X_UPPER_LIMIT,
+        ],
+    ]
+)
+GRID_Y = np.concatenate(
+    [
+        np.linspace(-0.9, 0.9, 37),
+        [
+            FIELD_Y_LOWER_LIMIT,
+            FIELD_Y_UPPER_LIMIT,
+            GOAL_BLUE_Y_LIMIT,
+            GOAL_YELLOW_Y_LIMIT,
+            GOAL_BLUE_BACK_WALL_Y_LIMIT,
+            GOAL_YELLOW_BACK_WALL_Y_LIMIT,
+        ],
+    ]
+)
+
 
 @pytest.mark.parametrize(
     "time,expected",
@@ -95,3 +128,68 @@ def test_is_in_blue_goal(x: float, y: float, expected: bool):
 )
 def test_is_outside(x: float, y: float, expected: bool):
     assert is_outside(x, y) == expected
+
+
+@pytest.mark.parametrize(
+    "mask_function,function",
+    [
+        (is_in_yellow_goal_mask, is_in_yellow_goal),
+        (is_in_blue_goal_mask, is_in_blue_goal),
+        (is_outside_mask, is_outside),
+    ],
+)
+def test_masks_match_scalar_predicates(mask_function, function):
+    xs, ys = np.meshgrid(GRID_X, GRID_Y)
+    mask = mask_function(xs, ys)
+
+    assert mask.shape == xs.shape
+    assert mask.dtype == bool
+    expected = [
+        [function(x, y) for x, y in zip(row_x, row_y)]
+        for row_x, row_y in zip(xs.tolist(), ys.tolist())
+    ]
+    assert mask.tolist() == expected
+
+
+def test_penalty_area_mask_matches_checker():
+    checker = PenaltyAreaChecker(time_allowed=15, reset_after=2)
+    xs, ys = np.meshgrid(GRID_X, GRID_Y)
+    mask = is_in_penalty_area_mask(xs, ys)
+
+    expected = [
+        [
+            checker.is_in_blue_penalty(x, y)
+            or checker.is_in_yellow_penalty(x, y)
+            for x, y in zip(row_x, row_y)
+        ]
+        for row_x, row_y in zip(xs.tolist(), ys.tolist())
+    ]
+    assert mask.tolist() == expected
+
+
+def test_outside_mask_of_pose_buffer():
+    translations = np.array(
+        [
+            [0.0, 0.0, 0.0],
+            [FIELD_X_UPPER_LIMIT + 0.0001, 0.0, 0.0],
+            [0.0, 0.8, 0.0],
+            [0.3, 0.8, 0.0],
+        ]
+    )
+    mask = is_outside_mask(translations[:, 0], translations[:, 1])
+
+    assert mask.tolist() == [False, True, False, True]
+
+
+@pytest.mark.parametrize(
+    "time,expected",
+    [
+        (599.968, "09:59"),
+        (0.5, "00:00"),
+        (3599, "59:59"),
+        (3600, "60:00"),
+        (5000.5, "83:20"),
+    ],
+)
+def test_time_to_string_table(time: float, expected: str):
+    assert time_to_string(time) == expected
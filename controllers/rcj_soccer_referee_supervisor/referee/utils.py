@@ -1,4 +1,7 @@
+import numpy as np
+
 from referee.consts import (
+    BLUE_PENALTY_AREA,
     FIELD_X_LOWER_LIMIT,
     FIELD_X_UPPER_LIMIT,
     FIELD_Y_LOWER_LIMIT,
@@ -9,8 +12,13 @@ from referee.consts import (
     GOAL_X_UPPER_LIMIT,
     GOAL_YELLOW_BACK_WALL_Y_LIMIT,
     GOAL_YELLOW_Y_LIMIT,
+    YELLOW_PENALTY_AREA,
 )
 
+# The string of every whole second of the first hour: the clock and the
+# event messages are formatted every tick
+TIME_STRINGS = ["%02d:%02d" % (t // 60, t % 60) for t in range(60 * 60)]
+
 
 def time_to_string(time: int) -> str:
     """Convert time to string representation
@@ -23,6 +31,8 @@ def time_to_string(time: int) -> str:
     """
     if time < 0:
         raise ValueError("Negative integer not supported")
+    if time < len(TIME_STRINGS):
+        return TIME_STRINGS[int(time)]
     return "%02d:%02d" % (time // 60, time % 60)
 
 
@@ -75,3 +85,74 @@ def is_outside(x: float, y: float) -> bool:
         return not (is_in_blue_goal(x, y) or is_in_yellow_goal(x, y))
 
     return False
+
+
+def is_in_yellow_goal_mask(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Batched variant of :func:`is_in_yellow_goal`.
+
+    Args:
+        xs (np.ndarray): X positions of any shape
+        ys (np.ndarray): Y positions of the same shape
+
+    Returns:
+        np.ndarray: Boolean mask, True for the objects in the yellow goal
+    """
+    return (
+        (GOAL_X_LOWER_LIMIT < xs)
+        & (xs < GOAL_X_UPPER_LIMIT)
+        & (GOAL_YELLOW_BACK_WALL_Y_LIMIT < ys)
+        & (ys < GOAL_YELLOW_Y_LIMIT)
+    )
+
+
+def is_in_blue_goal_mask(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Batched variant of :func:`is_in_blue_goal`.
+
+    Args:
+        xs (np.ndarray): X positions of any shape
+        ys (np.ndarray): Y positions of the same shape
+
+    Returns:
+        np.ndarray: Boolean mask, True for the objects in the blue goal
+    """
+    return (
+        (GOAL_X_LOWER_LIMIT < xs)
+        & (xs < GOAL_X_UPPER_LIMIT)
+        & (GOAL_BLUE_Y_LIMIT < ys)
+        & (ys < GOAL_BLUE_BACK_WALL_Y_LIMIT)
+    )
+
+
+def is_outside_mask(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Batched variant of :func:`is_outside`.
+
+    Args:
+        xs (np.ndarray): X positions of any shape
+        ys (np.ndarray): Y positions of the same shape
+
+    Returns:
+        np.ndarray: Boolean mask, True for the objects outside the field
+    """
+    outside_y = (ys < FIELD_Y_LOWER_LIMIT) | (ys > FIELD_Y_UPPER_LIMIT)
+    outside_y &= ~(
+        is_in_blue_goal_mask(xs, ys) | is_in_yellow_goal_mask(xs, ys)
+    )
+    outside_y |= (xs > FIELD_X_UPPER_LIMIT) | (xs < FIELD_X_LOWER_LIMIT)
+    return outside_y
+
+
+def is_in_penalty_area_mask(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Return whether objects are located in either of the penalty areas.
+
+    Args:
+        xs (np.ndarray): X positions of any shape
+        ys (np.ndarray): Y positions of the same shape
+
+    Returns:
+        np.ndarray: Boolean mask, True for the objects in a penalty area
+    """
+    y_vertical, y_lower, y_upper = YELLOW_PENALTY_AREA
+    b_vertical, b_lower, b_upper = BLUE_PENALTY_AREA
+    in_yellow = (ys < y_vertical) & (y_lower < xs) & (xs < y_upper)
+    in_blue = (ys > b_vertical) & (b_lower < xs) & (xs < b_upper)
+    return in_yellow | in_blue
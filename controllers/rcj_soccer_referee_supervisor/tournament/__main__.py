@@ -0,0 +1,116 @@
+"""Play a tournament, resuming it if its state file exists.
+
+    python -m tournament --teams teams.json --bracket knockout \
+        --backend headless --workers 4 --state tournament/state.json
+
+The teams file lists the teams in seeding order, each one either a name or
+a dict of the fields of ``tournament.bracket.Team``. The other
+``RCJ_SIM_*`` environment variables, such as ``RCJ_SIM_MATCH_TIME``, are
+passed on to the halves.
+"""
+import argparse
+import json
+import logging
+from pathlib import Path
+
+from tournament.bracket import Team
+from tournament.cache import ResultCache
+from tournament.consts import (
+    Backend,
+    Bracket,
+    RESULT_CACHE_MAX_BYTES,
+    WORLD_PATH,
+)
+from tournament.scheduler import (
+    HeadlessLauncher,
+    TournamentScheduler,
+    TournamentState,
+    WebotsLauncher,
+)
+
+
+def load_state(args: argparse.Namespace) -> TournamentState:
+    if args.state.exists():
+        logging.info(f"Resuming the tournament of {args.state}")
+        return TournamentState.load(args.state)
+    if args.teams is None:
+        raise SystemExit("--teams is needed to start a tournament")
+    with open(args.teams) as f:
+        teams = [Team.from_dict(team) for team in json.load(f)]
+    return TournamentState(args.state, args.bracket, teams)
+
+
+def print_standings(state: TournamentState):
+    print(f"{'Team':24} {'P':>3} {'W':>3} {'D':>3} {'L':>3} {'GD':>4} Pts")
+    for row in state.standings():
+        name = state.teams[row["team"]].name
+        goal_difference = row["goals_for"] - row["goals_against"]
+        print(
+            f"{name[:24]:24} {row['played']:3} {row['won']:3} "
+            f"{row['drawn']:3} {row['lost']:3} {goal_difference:4} "
+            f"{row['points']:3}"
+        )
+    champion = state.champion()
+    if champion:
+        print(f"Winner: {state.teams[champion].name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--teams", type=Path, default=None)
+    parser.add_argument(
+        "--bracket",
+        choices=[Bracket.ROUND_ROBIN.value, Bracket.KNOCKOUT.value],
+        default=Bracket.ROUND_ROBIN.value,
+    )
+    parser.add_argument(
+        "--backend", choices=Backend.all(), default=Backend.HEADLESS.value
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--state", type=Path, default=Path("tournament") / "state.json"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed of the first headless half, the next ones are numbered "
+        "from it",
+    )
+    parser.add_argument("--webots", default="webots")
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=None,
+        help="Reuse the results of the halves played with the same "
+        "controllers, world, variables and seed from this directory",
+    )
+    parser.add_argument(
+        "--cache-max-bytes", type=int, default=RESULT_CACHE_MAX_BYTES
+    )
+    parser.add_argument("--cache-max-entries", type=int, default=None)
+    parser.add_argument("--world", type=Path, default=WORLD_PATH)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    state = load_state(args)
+    if args.backend == Backend.WEBOTS.value:
+        launcher = WebotsLauncher(args.webots, args.world)
+    else:
+        launcher = HeadlessLauncher(args.seed)
+    cache = None
+    if args.cache:
+        cache = ResultCache(
+            args.cache, args.cache_max_bytes, args.cache_max_entries
+        )
+    scheduler = TournamentScheduler(state, launcher, args.workers, cache)
+    finished = scheduler.run()
+    print_standings(state)
+    if cache:
+        cache.log_report()
+    if not finished:
+        raise SystemExit("Some fixtures could not be played, run again")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from headless.runner import CONTROLLERS_DIR
+from referee.consts import TEAM_CONTROLLERS
+from referee.enums import Team as Side
+from tournament.consts import HALVES, POINTS_DRAW, POINTS_WIN
+
+
+@dataclass
+class Team:
+    """A team of the tournament.
+
+    ``controller`` is the Webots controller of its robots, ``directory``
+    the directory the headless runner loads them from, that controller's
+    by default.
+    """
+
+    name: str
+    id: str = ""
+    controller: str = TEAM_CONTROLLERS[Side.BLUE.value]
+    directory: str = ""
+
+    def __post_init__(self):
+        self.id = self.id or self.name
+        self.directory = self.directory or str(
+            CONTROLLERS_DIR / self.controller
+        )
+
+    @classmethod
+    def from_dict(cls, data) -> "Team":
+        """Read a team from a dict of its fields, or from its name."""
+        if isinstance(data, str):
+            return cls(name=data)
+        return cls(**data)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass
+class Fixture:
+    """A match between two teams, ``blue`` playing in blue in the first
+    half. ``halves`` holds the ``MATCH_FINISH`` scores of the halves played
+    so far, the teams swapping sides in between: the scores are those of
+    the side each team played on in that half, and include the goals of
+    the previous halves."""
+
+    match_id: str
+    round: int
+    blue: str
+    yellow: str
+    halves: List[Dict] = field(default_factory=list)
+
+    @property
+    def finished(self) -> bool:
+        return len(self.halves) == HALVES
+
+    @property
+    def next_half(self) -> int:
+        return len(self.halves) + 1
+
+    def teams(self, half_id: int) -> Tuple[str, str]:
+        """Return the IDs of the blue and yellow teams in a half."""
+        if half_id % 2:
+            return self.blue, self.yellow
+        return self.yellow, self.blue
+
+    def score(self) -> Tuple[int, int]:
+        """Return the goals of ``blue`` and ``yellow`` so far."""
+        if not self.halves:
+            return 0, 0
+        last = self.halves[-1]
+        if len(self.halves) % 2:
+            return last["score_blue"], last["score_yellow"]
+        return last["score_yellow"], last["score_blue"]
+
+    def winner(self) -> Optional[str]:
+        """Return the ID of the winner of a finished fixture, None for a
+        draw."""
+        goals_blue, goals_yellow = self.score()
+        if goals_blue == goals_yellow:
+            return None
+        return self.blue if goals_blue > goals_yellow else self.yellow
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Fixture":
+        return cls(**data)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def round_robin(team_ids: List[str]) -> List[List[Tuple[str, str]]]:
+    """Pair every team with every other one, with the circle method.
+
+    Returns:
+        list: The rounds, each a list of pairs of team IDs. With an odd
+        number of teams, a different team sits out each round.
+    """
+    teams: List[Optional[str]] = list(team_ids)
+    if len(teams) % 2:
+        teams.append(None)
+    half = len(teams) // 2
+
+    rounds = []
+    for number in range(len(teams) - 1):
+        pairs = zip(teams[:half], reversed(teams[half:]))
+        pairs = [pair for pair in pairs if None not in pair]
+        # Alternate the side of the fixed team
+        if number % 2 and pairs:
+            pairs[0] = pairs[0][::-1]
+        rounds.append(pairs)
+        teams.insert(1, teams.pop())
+    return rounds
+
+
+def knockout_round(team_ids: List[str]) -> List[Tuple[str, str]]:
+    """Pair the remaining teams of a knockout, given in seeding order: the
+    first one against the last one and so on.
+
+    Unless the number of teams is a power of two, the first seeds get a bye
+    so that the next round has one.
+
+    Returns:
+        list: The pairs of team IDs
+    """
+    size = 1
+    while size < len(team_ids):
+        size *= 2
+    byes = size - len(team_ids)
+    teams = team_ids[byes:]
+    half = len(teams) // 2
+    return list(zip(teams[:half], reversed(teams[half:])))
+
+
+def standings(team_ids: List[str], fixtures: List[Fixture]) -> List[Dict]:
+    """Rank the teams by points, then goal difference, then goals scored,
+    over the finished fixtures.
+
+    Returns:
+        list: A row per team: its ID, and its number of fixtures played,
+        won, drawn and lost, goals for and against and points
+    """
+    rows = {
+        team: dict(
+            team=team,
+            played=0,
+            won=0,
+            drawn=0,
+            lost=0,
+            goals_for=0,
+            goals_against=0,
+            points=0,
+        )
+        for team in team_ids
+    }
+    for fixture in fixtures:
+        if not fixture.finished:
+            continue
+        goals = dict(zip((fixture.blue, fixture.yellow), fixture.score()))
+        winner = fixture.winner()
+        for team, opponent in (
+            (fixture.blue, fixture.yellow),
+            (fixture.yellow, fixture.blue),
+        ):
+            row = rows[team]
+            row["played"] += 1
+            row["goals_for"] += goals[team]
+            row["goals_against"] += goals[opponent]
+            if winner is None:
+                row["drawn"] += 1
+                row["points"] += POINTS_DRAW
+            elif winner == team:
+                row["won"] += 1
+                row["points"] += POINTS_WIN
+            else:
+                row["lost"] += 1
+
+    return sorted(
+        rows.values(),
+        key=lambda row: (
+            -row["points"],
+            row["goals_against"] - row["goals_for"],
+            -row["goals_for"],
+        ),
+    )
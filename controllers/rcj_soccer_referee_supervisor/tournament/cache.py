@@ -0,0 +1,169 @@
+import hashlib
+import json
+import logging
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tournament.consts import RESULT_CACHE_MAX_BYTES, RESULT_CACHE_VERSION
+from tournament.utils import write_atomically
+
+# Never part of the key: where the half is written to
+UNKEYED_VARIABLES = ("RCJ_SIM_OUTPUT_PATH", "RCJ_SIM_SESSION")
+
+
+def hash_path(digest, path: Path):
+    """Feed the relative paths and the contents of the files of a directory
+    (or a single file) to a hashlib digest, in a stable order. Bytecode is
+    skipped."""
+    path = Path(path)
+    files = sorted(path.rglob("*")) if path.is_dir() else [path]
+    for file in files:
+        if not file.is_file() or "__pycache__" in file.parts:
+            continue
+        digest.update(str(file.relative_to(path.parent)).encode() + b"\0")
+        digest.update(file.read_bytes())
+        digest.update(b"\0")
+
+
+def result_key(
+    paths: List[Path], parameters: Dict[str, str], seed: Optional[int]
+) -> str:
+    """Return the key of the result of a half.
+
+    Args:
+        paths (list): Directories and files the outcome depends on: the
+            robot controllers, the world, the simulator
+        parameters (dict): ``RCJ_SIM_*`` variables the half is played with,
+            which set the parameters of ``RCJSoccerReferee``
+        seed (int, optional): Seed of the simulation
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        hash_path(digest, path)
+    variables = {
+        name: value
+        for name, value in parameters.items()
+        if name.startswith("RCJ_SIM_") and name not in UNKEYED_VARIABLES
+    }
+    digest.update(json.dumps([variables, seed], sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def directory_size(directory: Path) -> int:
+    return sum(f.stat().st_size for f in directory.rglob("*") if f.is_file())
+
+
+class ResultCache:
+    """Reflogs, recordings and summaries of halves already played, by the
+    key of their inputs (see ``result_key``).
+
+    Each entry is a ``<key>`` directory holding the files of the half.
+    ``index.json`` records the summary, size and last use of each entry,
+    the least recently used ones being evicted once the cache outgrows its
+    limits. The cache is safe to use from several threads.
+
+    Args:
+        directory (Path): Where the entries are stored
+        max_bytes (int): Size of the files of the entries after which the
+            least recently used ones are evicted
+        max_entries (int, optional): Number of entries after which the
+            least recently used ones are evicted
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = RESULT_CACHE_MAX_BYTES,
+        max_entries: Optional[int] = None,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.index_path = self.directory / "index.json"
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.entries: Dict[str, Dict] = {}
+        if self.index_path.exists():
+            with open(self.index_path) as f:
+                index = json.load(f)
+            if index["version"] == RESULT_CACHE_VERSION:
+                self.entries = index["entries"]
+
+    def get(self, key: str, destination: Path) -> Optional[Dict]:
+        """Copy the files of an entry to ``destination``.
+
+        Returns:
+            dict: Summary the entry was stored with, None on a miss
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or not (self.directory / key).is_dir():
+                self.misses += 1
+                return None
+            shutil.copytree(
+                self.directory / key, destination, dirs_exist_ok=True
+            )
+            entry["last_used"] = time.time()
+            self.hits += 1
+            self._save()
+            return entry["summary"]
+
+    def put(self, key: str, source: Path, summary: Dict):
+        """Store a copy of the files of ``source`` with their summary."""
+        with self.lock:
+            entry_dir = self.directory / key
+            temp_dir = self.directory / f".{key}"
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            shutil.copytree(source, temp_dir)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            temp_dir.rename(entry_dir)
+            self.entries[key] = {
+                "summary": summary,
+                "bytes": directory_size(entry_dir),
+                "last_used": time.time(),
+            }
+            self._evict()
+            self._save()
+
+    def _evict(self):
+        by_use = sorted(
+            self.entries, key=lambda k: self.entries[k]["last_used"]
+        )
+        total = sum(entry["bytes"] for entry in self.entries.values())
+        for key in by_use:
+            if total <= self.max_bytes and (
+                self.max_entries is None
+                or len(self.entries) <= self.max_entries
+            ):
+                break
+            total -= self.entries.pop(key)["bytes"]
+            shutil.rmtree(self.directory / key, ignore_errors=True)
+
+    def _save(self):
+        index = {"version": RESULT_CACHE_VERSION, "entries": self.entries}
+        write_atomically(self.index_path, json.dumps(index))
+
+    def report(self) -> Dict:
+        """Return the lookups of this run and the contents of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "bytes": sum(entry["bytes"] for entry in self.entries.values()),
+        }
+
+    def log_report(self):
+        report = self.report()
+        logging.info(
+            f"Result cache: {report['hits']} hits, {report['misses']} misses "
+            f"({report['hit_rate']:.0%}), {report['entries']} entries, "
+            f"{report['bytes'] / 1e6:.1f} MB"
+        )
@@ -0,0 +1,296 @@
+"""Compare two versions of a team with paired fixtures, until a sequential
+test tells which is stronger.
+
+    python -m tournament.compare --candidate path/to/new_team \
+        --baseline path/to/old_team --workers 4 --state compare/state.json
+
+The directories hold the robot controllers (``robot1.py``...), the name of
+a directory being the Webots controller of the team. Each pair is two
+fixtures with the same seeds, the teams starting on opposite sides, and
+the test is updated from their ``MATCH_FINISH`` results, see ``SPRT``.
+"""
+import argparse
+import logging
+from math import log10
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from tournament.bracket import Fixture, Team
+from tournament.cache import ResultCache
+from tournament.consts import (
+    Backend,
+    Bracket,
+    HALVES,
+    RESULT_CACHE_MAX_BYTES,
+    SPRT_ALPHA,
+    SPRT_BETA,
+    SPRT_ELO0,
+    SPRT_ELO1,
+    WORLD_PATH,
+)
+from tournament.scheduler import (
+    HeadlessLauncher,
+    TournamentScheduler,
+    TournamentState,
+    WebotsLauncher,
+)
+from tournament.sprt import mean_interval, SPRT
+
+# Fixtures played at most, in pairs, if the test does not stop earlier
+DEFAULT_MAX_PAIRS = 200
+
+
+def score_to_elo(score: float) -> float:
+    """Return the Elo difference giving an expected score, clipped away
+    from 0 and 1."""
+    score = min(max(score, 0.001), 0.999)
+    # Adding 0 turns -0.0 into 0.0
+    return -400 * log10(1 / score - 1) + 0.0
+
+
+class ComparisonState(TournamentState):
+    """Pairs of fixtures between a candidate and a baseline team, added as
+    the previous ones finish until the ``SPRT`` accepts a hypothesis or
+    ``max_pairs`` are played.
+
+    The two fixtures of a pair are played with the same seeds, the
+    candidate in blue in the first half of the first one and the baseline
+    in the second one, so that the luck of the draw and the side favour
+    neither team.
+
+    Args:
+        path (Path): State file
+        candidate (Team): Team under test
+        baseline (Team): Team it is compared with
+        sprt (SPRT): Test to run, whose results are recomputed from the
+            fixtures
+        max_pairs (int): Pairs played at most
+        pairs_in_flight (int): Pairs played at the same time, enough to
+            keep the workers busy
+        fixtures (list): Fixtures generated so far
+        decision (str, optional): Hypothesis accepted so far, if any
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        candidate: Team,
+        baseline: Team,
+        sprt: SPRT,
+        max_pairs: int = DEFAULT_MAX_PAIRS,
+        pairs_in_flight: int = 1,
+        fixtures: Optional[List[Fixture]] = None,
+        decision: Optional[str] = None,
+    ):
+        self.sprt = sprt
+        self.max_pairs = max_pairs
+        self.pairs_in_flight = pairs_in_flight
+        self.decision = decision
+        super().__init__(
+            path, Bracket.COMPARISON.value, [candidate, baseline], fixtures
+        )
+        self.candidate, self.baseline = list(self.teams)
+        self._update()
+
+    @classmethod
+    def from_dict(cls, path: Path, data: Dict) -> "ComparisonState":
+        candidate, baseline = map(Team.from_dict, data["teams"])
+        return cls(
+            path,
+            candidate,
+            baseline,
+            SPRT(**data["sprt"]),
+            data["max_pairs"],
+            data["pairs_in_flight"],
+            [Fixture.from_dict(fixture) for fixture in data["fixtures"]],
+            data["decision"],
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            **super().to_dict(),
+            "sprt": self.sprt.to_dict(),
+            "max_pairs": self.max_pairs,
+            "pairs_in_flight": self.pairs_in_flight,
+            "decision": self.decision,
+        }
+
+    def _generate(self):
+        for _ in range(min(self.pairs_in_flight, self.max_pairs)):
+            self._add_pair()
+
+    def _add_pair(self):
+        candidate, baseline = list(self.teams)
+        number = len(self.fixtures) // 2 + 1
+        self._add_round(number, [(candidate, baseline), (baseline, candidate)])
+
+    def pairs(self) -> List[Tuple[Fixture, Fixture]]:
+        return list(zip(self.fixtures[::2], self.fixtures[1::2]))
+
+    def pair_results(self) -> List[Tuple[float, int]]:
+        """Return the score of the candidate and its goal difference in
+        each finished pair."""
+        results = []
+        for pair in self.pairs():
+            if not all(fixture.finished for fixture in pair):
+                continue
+            score = 0.0
+            goal_difference = 0
+            for fixture in pair:
+                goals = dict(
+                    zip((fixture.blue, fixture.yellow), fixture.score())
+                )
+                difference = goals[self.candidate] - goals[self.baseline]
+                score += 0.5 if difference == 0 else float(difference > 0)
+                goal_difference += difference
+            results.append((score / 2, goal_difference))
+        return results
+
+    def _update(self):
+        self.sprt.scores = [score for score, _ in self.pair_results()]
+        if self.decision is None:
+            self.decision = self.sprt.decision()
+
+    def advance(self):
+        """Update the test, and add pairs if it has not stopped yet."""
+        self._update()
+        if self.decision is not None:
+            return
+        pairs = self.pairs()
+        unfinished = sum(
+            not (first.finished and second.finished) for first, second in pairs
+        )
+        for _ in range(self.pairs_in_flight - unfinished):
+            if len(self.pairs()) >= self.max_pairs:
+                break
+            self._add_pair()
+
+    @property
+    def finished(self) -> bool:
+        """Whether the test stopped and its fixtures were played."""
+        stopped = self.decision or len(self.pairs()) >= self.max_pairs
+        return bool(stopped) and super().finished
+
+    def half_number(self, fixture: Fixture, half_id: int) -> int:
+        # The fixtures of a pair share their seeds
+        return (int(fixture.match_id) - 1) // 2 * HALVES + half_id - 1
+
+    def summary(self) -> Dict:
+        results = self.pair_results()
+        score, score_interval = mean_interval([s for s, _ in results])
+        goals, goals_interval = mean_interval([g for _, g in results])
+        return {
+            "pairs": len(results),
+            "decision": self.decision,
+            "llr": self.sprt.llr(),
+            "llr_bounds": [self.sprt.lower, self.sprt.upper],
+            "score": score,
+            "score_interval": score_interval,
+            "elo": score_to_elo(score) if results else 0.0,
+            "goal_difference": goals,
+            "goal_difference_interval": goals_interval,
+        }
+
+
+def print_summary(state: ComparisonState):
+    summary = state.summary()
+    decision = {
+        "H1": f"H1 accepted: the candidate is {state.sprt.elo1:g} Elo "
+        "stronger",
+        "H0": f"H0 accepted: the candidate is {state.sprt.elo0:g} Elo "
+        "stronger",
+        None: "No decision",
+    }[summary["decision"]]
+    print(
+        f"{decision}, after {summary['pairs']} pairs "
+        f"({summary['pairs'] * 2 * HALVES} halves)"
+    )
+    print(
+        f"LLR {summary['llr']:.2f} in "
+        f"[{summary['llr_bounds'][0]:.2f}, {summary['llr_bounds'][1]:.2f}]"
+    )
+    print(
+        f"Score {summary['score']:.3f} ± {summary['score_interval']:.3f} "
+        f"(Elo {summary['elo']:+.0f}), goal difference per pair "
+        f"{summary['goal_difference']:+.2f} ± "
+        f"{summary['goal_difference_interval']:.2f}"
+    )
+
+
+def load_state(args: argparse.Namespace) -> ComparisonState:
+    if args.state.exists():
+        logging.info(f"Resuming the comparison of {args.state}")
+        state = ComparisonState.load(args.state)
+        state.pairs_in_flight = args.pairs_in_flight
+        return state
+    if not (args.candidate and args.baseline):
+        raise SystemExit("--candidate and --baseline are needed to start")
+    teams = [
+        Team(
+            name=f"{name} ({directory.name})",
+            id=name,
+            controller=directory.name,
+            directory=str(directory.resolve()),
+        )
+        for name, directory in (
+            ("candidate", args.candidate),
+            ("baseline", args.baseline),
+        )
+    ]
+    sprt = SPRT(args.elo0, args.elo1, args.alpha, args.beta)
+    return ComparisonState(
+        args.state, *teams, sprt, args.max_pairs, args.pairs_in_flight
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--candidate", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument(
+        "--backend", choices=Backend.all(), default=Backend.HEADLESS.value
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--state", type=Path, default=Path("compare") / "state.json"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-pairs", type=int, default=DEFAULT_MAX_PAIRS)
+    parser.add_argument("--elo0", type=float, default=SPRT_ELO0)
+    parser.add_argument("--elo1", type=float, default=SPRT_ELO1)
+    parser.add_argument("--alpha", type=float, default=SPRT_ALPHA)
+    parser.add_argument("--beta", type=float, default=SPRT_BETA)
+    parser.add_argument("--webots", default="webots")
+    parser.add_argument("--world", type=Path, default=WORLD_PATH)
+    parser.add_argument("--cache", type=Path, default=None)
+    parser.add_argument(
+        "--cache-max-bytes", type=int, default=RESULT_CACHE_MAX_BYTES
+    )
+    args = parser.parse_args()
+    # Both fixtures of a pair are played at the same time
+    args.pairs_in_flight = max(1, (args.workers + 1) // 2)
+    return args
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    state = load_state(args)
+    if args.backend == Backend.WEBOTS.value:
+        launcher = WebotsLauncher(args.webots, args.world)
+    else:
+        launcher = HeadlessLauncher(args.seed)
+    cache = None
+    if args.cache:
+        cache = ResultCache(args.cache, args.cache_max_bytes)
+    finished = TournamentScheduler(state, launcher, args.workers, cache).run()
+    print_summary(state)
+    if cache:
+        cache.log_report()
+    if not finished:
+        raise SystemExit("Some fixtures could not be played, run again")
+
+
+if __name__ == "__main__":
+    main()
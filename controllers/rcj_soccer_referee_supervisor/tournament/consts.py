@@ -0,0 +1,71 @@
+from enum import Enum
+from pathlib import Path
+
+
+class Bracket(Enum):
+    ROUND_ROBIN = "round_robin"
+    KNOCKOUT = "knockout"
+    # Two teams compared with paired fixtures, see tournament.compare
+    COMPARISON = "comparison"
+
+    @classmethod
+    def all(cls):
+        return list(map(lambda member: member.value, cls))
+
+
+class Search(Enum):
+    GRID = "grid"
+    RANDOM = "random"
+    # Successive halving, see tournament.sweep
+    HALVING = "halving"
+
+    @classmethod
+    def all(cls):
+        return list(map(lambda member: member.value, cls))
+
+
+class Backend(Enum):
+    WEBOTS = "webots"
+    HEADLESS = "headless"
+
+    @classmethod
+    def all(cls):
+        return list(map(lambda member: member.value, cls))
+
+
+# Directory of the referee, which ``python -m headless`` runs from
+SUPERVISOR_DIR = Path(__file__).resolve().parents[1]
+WORLD_PATH = SUPERVISOR_DIR.parents[1] / "worlds" / "soccer.wbt"
+
+TOURNAMENT_STATE_VERSION = 1
+HALVES = 2
+POINTS_WIN = 3
+POINTS_DRAW = 1
+
+RESULT_CACHE_VERSION = 1
+# Size of the cached halves after which the least recently used ones are
+# evicted
+RESULT_CACHE_MAX_BYTES = 1024**3
+
+# Bounds of the sequential probability ratio test of tournament.compare:
+# the Elo difference of the null and the alternative hypotheses, and their
+# error rates
+SPRT_ELO0 = 0.0
+SPRT_ELO1 = 100.0
+SPRT_ALPHA = 0.05
+SPRT_BETA = 0.05
+# Pairs of fixtures played before the test may stop. The variance of their
+# scores is taken to be at least SPRT_MIN_VARIANCE, or a few identical
+# results (e.g. goalless draws) would stop it straight away.
+SPRT_MIN_PAIRS = 5
+SPRT_MIN_VARIANCE = 0.01
+
+# Parameter sweeps of tournament.sweep: halves played by each configuration
+# of a grid or random search, configurations drawn by a random search, and
+# for successive halving the halves played by every configuration in the
+# first rung and the factor by which the survivors shrink (and their halves
+# grow) from one rung to the next
+SWEEP_HALVES = 4
+SWEEP_SAMPLES = 16
+HALVING_MIN_HALVES = 2
+HALVING_ETA = 3
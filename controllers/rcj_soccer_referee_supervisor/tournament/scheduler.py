@@ -0,0 +1,460 @@
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from headless.runner import CONTROLLERS_DIR
+from referee.enums import GameEvents
+from referee.reflog import read_reflog
+from tournament.bracket import (
+    Fixture,
+    knockout_round,
+    round_robin,
+    standings,
+    Team,
+)
+from tournament.cache import result_key, ResultCache
+from tournament.consts import (
+    Bracket,
+    HALVES,
+    SUPERVISOR_DIR,
+    TOURNAMENT_STATE_VERSION,
+    WORLD_PATH,
+)
+from tournament.utils import write_atomically
+
+
+class TournamentState:
+    """Teams and fixtures of a tournament, with the results of the halves
+    played, saved to a JSON file after each half.
+
+    The halves of a fixture are played in a ``<match ID>/half-<n>``
+    directory next to the state file.
+
+    Args:
+        path (Path): State file
+        bracket (str): See ``Bracket``
+        teams (list): Teams in seeding order
+        fixtures (list): Fixtures generated so far
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        bracket: str,
+        teams: List[Team],
+        fixtures: Optional[List[Fixture]] = None,
+    ):
+        if bracket not in Bracket.all():
+            raise ValueError(f"Unexpected bracket {bracket}")
+        ids = [team.id for team in teams]
+        if len(set(ids)) != len(ids) or len(ids) < 2:
+            raise ValueError("A tournament needs at least two distinct teams")
+
+        self.path = Path(path)
+        self.bracket = bracket
+        self.teams = {team.id: team for team in teams}
+        self.fixtures = fixtures if fixtures is not None else []
+        if not self.fixtures:
+            self._generate()
+
+    @classmethod
+    def load(cls, path: Path) -> "TournamentState":
+        with open(path) as f:
+            data = json.load(f)
+        if data["version"] != TOURNAMENT_STATE_VERSION:
+            raise ValueError(f"Unexpected tournament state in {path}")
+        return cls.from_dict(path, data)
+
+    @classmethod
+    def from_dict(cls, path: Path, data: Dict) -> "TournamentState":
+        return cls(
+            path,
+            data["bracket"],
+            [Team.from_dict(team) for team in data["teams"]],
+            [Fixture.from_dict(fixture) for fixture in data["fixtures"]],
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": TOURNAMENT_STATE_VERSION,
+            "bracket": self.bracket,
+            "teams": [team.to_dict() for team in self.teams.values()],
+            "fixtures": [fixture.to_dict() for fixture in self.fixtures],
+        }
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomically(self.path, json.dumps(self.to_dict(), indent=2))
+
+    def _generate(self):
+        """Add the fixtures of the first round, or of all the rounds for a
+        round robin."""
+        if self.bracket == Bracket.ROUND_ROBIN.value:
+            for number, pairs in enumerate(round_robin(list(self.teams)), 1):
+                self._add_round(number, pairs)
+        else:
+            self._add_round(1, knockout_round(list(self.teams)))
+
+    def _add_round(self, number: int, pairs: list):
+        for blue, yellow in pairs:
+            match_id = str(len(self.fixtures) + 1)
+            self.fixtures.append(Fixture(match_id, number, blue, yellow))
+
+    def remaining_teams(self) -> List[str]:
+        """Return the teams still in a knockout, in seeding order."""
+        eliminated = set()
+        for fixture in self.fixtures:
+            if not fixture.finished:
+                continue
+            if self._winner(fixture) == fixture.blue:
+                eliminated.add(fixture.yellow)
+            else:
+                eliminated.add(fixture.blue)
+        return [team for team in self.teams if team not in eliminated]
+
+    def _winner(self, fixture: Fixture) -> str:
+        """Return the team a knockout fixture advances. A draw is decided
+        in favour of the higher seed, penalty shootouts not being
+        simulated."""
+        winner = fixture.winner()
+        if winner is None:
+            seeds = list(self.teams)
+            winner = min(fixture.blue, fixture.yellow, key=seeds.index)
+        return winner
+
+    def advance(self):
+        """Add the next round of a knockout once the current one is over."""
+        if self.bracket != Bracket.KNOCKOUT.value or not self.finished:
+            return
+        remaining = self.remaining_teams()
+        if len(remaining) > 1:
+            pairs = knockout_round(remaining)
+            self._add_round(self.fixtures[-1].round + 1, pairs)
+
+    @property
+    def finished(self) -> bool:
+        """Whether all the fixtures generated so far are finished."""
+        return all(fixture.finished for fixture in self.fixtures)
+
+    def champion(self) -> Optional[str]:
+        """Return the winner of a finished knockout."""
+        if self.bracket != Bracket.KNOCKOUT.value or not self.finished:
+            return None
+        remaining = self.remaining_teams()
+        return remaining[0] if len(remaining) == 1 else None
+
+    def standings(self) -> List[Dict]:
+        return standings(list(self.teams), self.fixtures)
+
+    def half_number(self, fixture: Fixture, half_id: int) -> int:
+        """Return the number of a half, from 0, which the seed of a
+        headless half is derived from."""
+        return (int(fixture.match_id) - 1) * HALVES + half_id - 1
+
+    def half_directory(self, fixture: Fixture, half_id: int) -> Path:
+        return self.path.parent / fixture.match_id / f"half-{half_id}"
+
+
+def match_finish(directory: Path) -> Optional[Dict]:
+    """Return the payload of the ``MATCH_FINISH`` event of the reflogs in a
+    directory, if any."""
+    payload = None
+    for path in sorted(directory.glob("*.jsonl*")):
+        for event in read_reflog(path):
+            if event["event"] == GameEvents.MATCH_FINISH.value:
+                payload = event["payload"]
+    return payload
+
+
+class HeadlessLauncher:
+    """Play halves with ``python -m headless``.
+
+    Args:
+        seed (int, optional): Seed of the first half, the following ones
+            using the next seeds
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed
+
+    def command(self, blue: Team, yellow: Team, number: int) -> List[str]:
+        command = [
+            sys.executable,
+            "-m",
+            "headless",
+            "--team-blue-dir",
+            blue.directory,
+            "--team-yellow-dir",
+            yellow.directory,
+        ]
+        if self.seed is not None:
+            command += ["--seed", str(self.seed + number)]
+        return command
+
+    def cache_inputs(
+        self, blue: Team, yellow: Team, number: int
+    ) -> Optional[Tuple[List[Path], Optional[int]]]:
+        """Return what the outcome of a half depends on besides its
+        variables, for ``result_key``: None as it is not reproducible
+        without a seed."""
+        if self.seed is None:
+            return None
+        paths = [
+            Path(blue.directory),
+            Path(yellow.directory),
+            SUPERVISOR_DIR / "headless",
+            SUPERVISOR_DIR / "referee",
+        ]
+        return paths, self.seed + number
+
+    def launch(
+        self,
+        blue: Team,
+        yellow: Team,
+        number: int,
+        env: Dict[str, str],
+        log,
+    ):
+        subprocess.run(
+            self.command(blue, yellow, number),
+            cwd=SUPERVISOR_DIR,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            check=True,
+        )
+
+
+class WebotsLauncher:
+    """Play halves with Webots, in fast mode without rendering.
+
+    The controllers of the teams are set by a single fixture session (see
+    ``RCJ_SIM_SESSION``) written next to the reflog.
+
+    Args:
+        executable (str): Webots executable
+        world (Path): World to open
+    """
+
+    def __init__(self, executable: str = "webots", world: Path = WORLD_PATH):
+        self.executable = executable
+        self.world = world
+
+    def cache_inputs(
+        self, blue: Team, yellow: Team, number: int
+    ) -> Optional[Tuple[List[Path], Optional[int]]]:
+        """Return what the outcome of a half depends on besides its
+        variables, for ``result_key``. The seed of Webots is set by the
+        world."""
+        paths = [
+            CONTROLLERS_DIR / blue.controller,
+            CONTROLLERS_DIR / yellow.controller,
+            self.world,
+            SUPERVISOR_DIR / "referee",
+        ]
+        return paths, None
+
+    def launch(
+        self,
+        blue: Team,
+        yellow: Team,
+        number: int,
+        env: Dict[str, str],
+        log,
+    ):
+        session = Path(env["RCJ_SIM_OUTPUT_PATH"]) / "session.json"
+        session.write_text(
+            json.dumps(
+                [
+                    {
+                        "controller_blue": blue.controller,
+                        "controller_yellow": yellow.controller,
+                    }
+                ]
+            )
+        )
+        subprocess.run(
+            [
+                self.executable,
+                "--batch",
+                "--mode=fast",
+                "--no-rendering",
+                "--minimize",
+                "--stdout",
+                "--stderr",
+                str(self.world),
+            ],
+            env={**env, "RCJ_SIM_SESSION": str(session)},
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            check=True,
+        )
+
+
+class TournamentScheduler:
+    """Play the fixtures of a tournament on a pool of workers.
+
+    Each worker launches a half at a time, in its own process, with the
+    ``RCJ_SIM_*`` variables of the half; the other ``RCJ_SIM_*`` variables
+    (match time, recording formats...) are passed on from this process. The
+    two halves of a fixture are played one after the other, the score of
+    the first one carried over to the second one through
+    ``RCJ_SIM_TEAM_*_INITIAL_SCORE``. Its result is read from the
+    ``MATCH_FINISH`` event of its reflog.
+
+    The state is saved after each half, so that an interrupted tournament
+    resumes where it stopped. A half whose reflog has its ``MATCH_FINISH``
+    is not played again, even if the state was not saved.
+
+    With a cache, the files and the result of a half whose inputs were
+    already played are copied from it instead.
+
+    Args:
+        state (TournamentState): Tournament to play
+        launcher: ``HeadlessLauncher`` or ``WebotsLauncher``
+        workers (int): Halves played at the same time
+        cache (ResultCache, optional): Results of the halves played before
+    """
+
+    def __init__(
+        self,
+        state: TournamentState,
+        launcher,
+        workers: int = 1,
+        cache: Optional[ResultCache] = None,
+    ):
+        self.state = state
+        self.launcher = launcher
+        self.workers = workers
+        self.cache = cache
+        # Fixtures whose half failed, not retried until the next run
+        self.failed: List[str] = []
+
+    def run(self) -> bool:
+        """Play the fixtures until all are finished or none can be played.
+
+        Returns:
+            bool: Whether the tournament is over
+        """
+        self.state.save()
+        running = {}
+        with ThreadPoolExecutor(self.workers) as pool:
+            while True:
+                for fixture in self._ready(running.values()):
+                    future = pool.submit(self.play_half, fixture)
+                    running[future] = fixture
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._record(running.pop(future), future)
+        return self.state.finished and not self.failed
+
+    def _ready(self, running) -> List[Fixture]:
+        busy = {fixture.match_id for fixture in running}
+        return [
+            fixture
+            for fixture in self.state.fixtures
+            if not fixture.finished
+            and fixture.match_id not in busy
+            and fixture.match_id not in self.failed
+        ]
+
+    def _record(self, fixture: Fixture, future):
+        try:
+            fixture.halves.append(future.result())
+        except Exception:
+            logging.exception(
+                f"Half {fixture.next_half} of match {fixture.match_id} failed"
+            )
+            self.failed.append(fixture.match_id)
+            return
+        self.state.advance()
+        self.state.save()
+
+    def half_env(self, fixture: Fixture, directory: Path) -> Dict[str, str]:
+        """Return the environment of the next half of a fixture."""
+        half_id = fixture.next_half
+        blue, yellow = (
+            self.state.teams[team] for team in fixture.teams(half_id)
+        )
+        score_blue, score_yellow = fixture.score()
+        if half_id % 2 == 0:
+            score_blue, score_yellow = score_yellow, score_blue
+        return {
+            **os.environ,
+            "RCJ_SIM_TEAM_BLUE_NAME": blue.name,
+            "RCJ_SIM_TEAM_BLUE_ID": blue.id,
+            "RCJ_SIM_TEAM_YELLOW_NAME": yellow.name,
+            "RCJ_SIM_TEAM_YELLOW_ID": yellow.id,
+            "RCJ_SIM_TEAM_B_INITIAL_SCORE": str(score_blue),
+            "RCJ_SIM_TEAM_Y_INITIAL_SCORE": str(score_yellow),
+            "RCJ_SIM_MATCH_ID": fixture.match_id,
+            "RCJ_SIM_HALF_ID": str(half_id),
+            "RCJ_SIM_OUTPUT_PATH": str(directory),
+            "RCJ_SIM_AUTO_MODE": "1",
+        }
+
+    def play_half(self, fixture: Fixture) -> Dict:
+        """Play the next half of a fixture, or reuse the reflog of a
+        previous run which played it to the end.
+
+        Returns:
+            dict: Scores of the half and path of its reflog directory
+        """
+        half_id = fixture.next_half
+        directory = self.state.half_directory(fixture, half_id)
+        payload = match_finish(directory) if directory.exists() else None
+        if payload is None:
+            # Leftovers of an interrupted half
+            shutil.rmtree(directory, ignore_errors=True)
+            directory.mkdir(parents=True)
+            payload = self._launch(fixture, directory)
+            if payload is None:
+                raise RuntimeError(f"No MATCH_FINISH event in {directory}")
+        return {
+            "score_blue": payload["score_blue"],
+            "score_yellow": payload["score_yellow"],
+            "directory": str(directory),
+        }
+
+    def _launch(self, fixture: Fixture, directory: Path) -> Optional[Dict]:
+        """Play the next half of a fixture in ``directory``, unless it is
+        in the cache.
+
+        Returns:
+            dict: Payload of its ``MATCH_FINISH`` event, if any
+        """
+        half_id = fixture.next_half
+        blue, yellow = (
+            self.state.teams[team] for team in fixture.teams(half_id)
+        )
+        number = self.state.half_number(fixture, half_id)
+        env = self.half_env(fixture, directory)
+
+        key = None
+        inputs = None
+        if self.cache:
+            inputs = self.launcher.cache_inputs(blue, yellow, number)
+        if inputs:
+            paths, seed = inputs
+            key = result_key(paths, env, seed)
+            payload = self.cache.get(key, directory)
+            if payload is not None:
+                logging.info(
+                    f"Half {half_id} of match {fixture.match_id} is cached"
+                )
+                return payload
+
+        with open(directory / "output.log", "w") as log:
+            self.launcher.launch(blue, yellow, number, env, log)
+        payload = match_finish(directory)
+        if key and payload is not None:
+            self.cache.put(key, directory, payload)
+        return payload
@@ -0,0 +1,111 @@
+from math import log, sqrt
+from typing import List, Optional
+
+from tournament.consts import (
+    SPRT_ALPHA,
+    SPRT_BETA,
+    SPRT_ELO0,
+    SPRT_ELO1,
+    SPRT_MIN_PAIRS,
+    SPRT_MIN_VARIANCE,
+)
+
+# Quantile of the normal distribution of the 95% confidence intervals
+Z_95 = 1.96
+
+
+def elo_to_score(elo: float) -> float:
+    """Return the expected score of a team that many Elo points stronger
+    than its opponent."""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def mean_interval(samples: List[float]) -> tuple:
+    """Return the mean of the samples and the half width of its 95%
+    confidence interval, under the normal approximation."""
+    n = len(samples)
+    if n == 0:
+        return 0.0, float("inf")
+    mean = sum(samples) / n
+    if n == 1:
+        return mean, float("inf")
+    variance = sum((x - mean) ** 2 for x in samples) / (n - 1)
+    return mean, Z_95 * sqrt(variance / n)
+
+
+class SPRT:
+    """Sequential probability ratio test of the score of a team against
+    another one, over pairs of fixtures.
+
+    The score of a pair is the mean of the scores of its two fixtures (1
+    for a win, 0.5 for a draw, 0 for a loss), so it is one of 0, 0.25,
+    0.5, 0.75 and 1. The log-likelihood ratio of H1 (the team is ``elo1``
+    stronger) against H0 (``elo0``) is that of the generalized SPRT under
+    the normal approximation:
+
+        LLR = n (s1 - s0) (2 mean - s0 - s1) / (2 variance)
+
+    where s0 and s1 are the expected scores under H0 and H1. The test
+    stops once the LLR leaves ``[log(beta / (1 - alpha)), log((1 - beta) /
+    alpha)]``, which bounds the false positive rate by ``alpha`` and the
+    false negative rate by ``beta``.
+
+    Args:
+        elo0 (float): Elo difference under H0
+        elo1 (float): Elo difference under H1
+        alpha (float): Probability of accepting H1 when H0 is true
+        beta (float): Probability of accepting H0 when H1 is true
+        min_pairs (int): Pairs needed before the test may stop
+    """
+
+    def __init__(
+        self,
+        elo0: float = SPRT_ELO0,
+        elo1: float = SPRT_ELO1,
+        alpha: float = SPRT_ALPHA,
+        beta: float = SPRT_BETA,
+        min_pairs: int = SPRT_MIN_PAIRS,
+    ):
+        if elo1 <= elo0:
+            raise ValueError("elo1 has to be greater than elo0")
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        self.min_pairs = min_pairs
+        self.lower = log(beta / (1 - alpha))
+        self.upper = log((1 - beta) / alpha)
+        self.scores: List[float] = []
+
+    def add(self, score: float):
+        self.scores.append(score)
+
+    def llr(self) -> float:
+        n = len(self.scores)
+        if n == 0:
+            return 0.0
+        mean = sum(self.scores) / n
+        variance = sum((x - mean) ** 2 for x in self.scores) / n
+        variance = max(variance, SPRT_MIN_VARIANCE)
+        s0, s1 = elo_to_score(self.elo0), elo_to_score(self.elo1)
+        return n * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance)
+
+    def decision(self) -> Optional[str]:
+        """Return "H1" or "H0" once either is accepted, None before."""
+        if len(self.scores) < self.min_pairs:
+            return None
+        llr = self.llr()
+        if llr >= self.upper:
+            return "H1"
+        if llr <= self.lower:
+            return "H0"
+        return None
+
+    def to_dict(self) -> dict:
+        return dict(
+            elo0=self.elo0,
+            elo1=self.elo1,
+            alpha=self.alpha,
+            beta=self.beta,
+            min_pairs=self.min_pairs,
+        )
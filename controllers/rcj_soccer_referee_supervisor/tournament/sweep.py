@@ -0,0 +1,500 @@
+"""Tune the constants of the robots of a team (their ``Params``) by playing
+them against the team with its defaults.
+
+    python -m tournament.sweep --space space.json --search halving \
+        --workers 4 --results sweep/results.jsonl
+
+The space maps ``robot<N>.<parameter>`` to a list of values, or for random
+search to a ``{"low": ..., "high": ...}`` range:
+
+    {"robot3.heading_gain": [1.5, 3.0, 6.0],
+     "robot1.forward_speed": {"low": 6, "high": 10}}
+
+Every configuration plays the same seeded headless halves, on alternate
+sides, and is ranked by its mean goal difference. The halves are recorded
+to the results file as they finish, so an interrupted sweep only plays the
+missing ones when run again. The file also records the controllers of both
+teams and the length of the halves, and is not resumed once they change.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import os
+import random
+from concurrent.futures import as_completed, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from headless.runner import (
+    create_referee,
+    load_team_controllers,
+    LockstepRunner,
+    TEAM_BLUE_DIR,
+)
+from headless.supervisor import HeadlessSupervisor
+from referee.consts import DEFAULT_MATCH_TIME, REFEREE_RULES
+from tournament.cache import hash_path
+from tournament.consts import (
+    HALVING_ETA,
+    HALVING_MIN_HALVES,
+    Search,
+    SWEEP_HALVES,
+    SWEEP_SAMPLES,
+)
+from tournament.sprt import mean_interval
+
+
+def split_name(name: str) -> Tuple[int, str]:
+    """Split ``robot3.heading_gain`` into the robot number and the name of
+    the parameter."""
+    robot, _, parameter = name.partition(".")
+    prefix, _, number = robot.partition("robot")
+    if prefix or not number.isdigit() or not parameter:
+        raise ValueError(f"Expected robot<N>.<parameter>, got {name}")
+    return int(number), parameter
+
+
+def check_space(space: Dict, team: Path):
+    """Raise a ValueError if the space has parameters the robots of the
+    team do not have."""
+    controllers = load_team_controllers(team)
+    for name in space:
+        number, parameter = split_name(name)
+        params = getattr(controllers.get(number), "Params", None)
+        if parameter not in getattr(params, "__dataclass_fields__", {}):
+            raise ValueError(f"Robot {number} has no parameter {parameter}")
+
+
+def grid(space: Dict) -> List[Dict]:
+    """Return every combination of the values of the space."""
+    for name, values in space.items():
+        if not isinstance(values, list):
+            raise ValueError(f"Grid search needs a list of values for {name}")
+    names = list(space)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*space.values())
+    ]
+
+
+def sample(space: Dict, n: int, rng: random.Random) -> List[Dict]:
+    """Draw configurations from the space: a value of each list, or a
+    uniform one in each range (an integer if both its bounds are)."""
+    configs = []
+    for _ in range(n):
+        config = {}
+        for name, values in space.items():
+            if isinstance(values, list):
+                config[name] = rng.choice(values)
+            elif isinstance(values["low"], int) and isinstance(
+                values["high"], int
+            ):
+                config[name] = rng.randint(values["low"], values["high"])
+            else:
+                config[name] = rng.uniform(values["low"], values["high"])
+        configs.append(config)
+    return configs
+
+
+def robot_params(config: Dict) -> Dict[int, Dict]:
+    """Return the parameters of a configuration by robot number, as taken
+    by ``LockstepRunner``."""
+    params: Dict[int, Dict] = {}
+    for name, value in config.items():
+        number, parameter = split_name(name)
+        params.setdefault(number, {})[parameter] = value
+    return params
+
+
+def config_key(config: Dict) -> str:
+    return json.dumps(config, sort_keys=True)
+
+
+def sweep_setup(team: Path, opponent: Path, match_time: int) -> Dict:
+    """Return what the halves of a sweep depend on besides their
+    configuration and seed: digests of the controllers of both teams, the
+    length of the halves and the rules of the referee."""
+    setup: Dict = {}
+    for name, path in (("team", team), ("opponent", opponent)):
+        digest = hashlib.sha256()
+        hash_path(digest, path)
+        setup[name] = digest.hexdigest()
+    setup["match_time"] = match_time
+    setup["rules"] = REFEREE_RULES
+    return setup
+
+
+def play_half(
+    team: Path,
+    opponent: Path,
+    config: Dict,
+    seed: int,
+    blue: bool,
+    match_time: int,
+) -> Dict[str, int]:
+    """Play a headless half of the team with the parameters of the
+    configuration against the opponent with its defaults. Runs in the
+    workers of the pool.
+
+    Returns:
+        dict: Goals for and against the team
+    """
+    supervisor = HeadlessSupervisor(seed=seed)
+    referee = create_referee(
+        supervisor,
+        match_time=match_time,
+        team_name_blue="Sweep" if blue else "Baseline",
+        team_name_yellow="Baseline" if blue else "Sweep",
+        initial_score_blue=0,
+        initial_score_yellow=0,
+        match_id=1,
+        half_id=1,
+    )
+    params = robot_params(config)
+    runner = LockstepRunner(
+        supervisor,
+        referee,
+        team_blue_dir=team if blue else opponent,
+        team_yellow_dir=opponent if blue else team,
+        team_blue_params=params if blue else None,
+        team_yellow_params=None if blue else params,
+    )
+    runner.run()
+    if runner.errors:
+        raise RuntimeError(f"Controllers crashed: {sorted(runner.errors)}")
+    goals = (referee.score_blue, referee.score_yellow)
+    goals_for, goals_against = goals if blue else goals[::-1]
+    return {"goals_for": goals_for, "goals_against": goals_against}
+
+
+class ResultStore:
+    """Halves played by the configurations of a sweep, one JSON line each,
+    appended as they finish.
+
+    The first line records the setup of the sweep (see ``sweep_setup``), so
+    that halves played against another opponent or for another length are
+    never mixed into the ranking.
+
+    Args:
+        path (Path): Results file, created if missing
+        setup (dict): What the halves depend on besides their configuration
+            and seed
+
+    Raises:
+        ValueError: If the file was written with another setup
+    """
+
+    def __init__(self, path: Path, setup: Dict):
+        self.path = Path(path)
+        self.setup = setup
+        # Results by configuration and seed
+        self.results: Dict[str, Dict[int, Dict]] = {}
+        self._has_header = False
+        if self.path.exists():
+            self._load()
+
+    def _load(self):
+        data = self.path.read_bytes()
+        # The last line may have been cut short by a kill, the next ones
+        # are appended in its place
+        complete = data[: data.rfind(b"\n") + 1]
+        if len(complete) < len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(len(complete))
+        lines = complete.decode().splitlines()
+        if not lines:
+            return
+        setup = json.loads(lines[0]).get("setup") or {}
+        if setup != self.setup:
+            changed = sorted(
+                name
+                for name in {**setup, **self.setup}
+                if setup.get(name) != self.setup.get(name)
+            )
+            raise ValueError(
+                f"{self.path} holds halves played with another "
+                f"{', '.join(changed)}, remove it or pick another file"
+            )
+        self._has_header = True
+        for line in lines[1:]:
+            self._index(json.loads(line))
+
+    def _index(self, result: Dict):
+        key = config_key(result["config"])
+        self.results.setdefault(key, {})[result["seed"]] = result
+
+    def of(self, config: Dict) -> Dict[int, Dict]:
+        """Return the halves of a configuration, by seed."""
+        return self.results.get(config_key(config), {})
+
+    def get(self, config: Dict, seed: int) -> Optional[Dict]:
+        return self.of(config).get(seed)
+
+    def add(self, config: Dict, seed: int, blue: bool, goals: Dict):
+        result = {"config": config, "seed": seed, "blue": blue, **goals}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            if not self._has_header:
+                f.write(json.dumps({"setup": self.setup}) + "\n")
+                self._has_header = True
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._index(result)
+
+
+class ParameterSweep:
+    """Play configurations of the parameters of a team over a process pool.
+
+    The i-th half of every configuration is played with seed ``seed + i``,
+    the team being blue in the even ones, so that all configurations are
+    compared on the same halves.
+
+    Args:
+        store (ResultStore): Where the halves are recorded, and looked up
+            before being played, with the ``sweep_setup`` of this sweep
+        team (Path): Controller directory of the tuned team
+        opponent (Path): Controller directory of the opponent, with its
+            defaults
+        seed (int): Seed of the first half
+        match_time (int): Length of the halves, in seconds
+        workers (int): Processes playing halves at the same time
+        play (callable): Plays a half, see ``play_half``
+    """
+
+    def __init__(
+        self,
+        store: ResultStore,
+        team: Path = TEAM_BLUE_DIR,
+        opponent: Optional[Path] = None,
+        seed: int = 0,
+        match_time: int = DEFAULT_MATCH_TIME,
+        workers: int = 1,
+        play: Callable = play_half,
+    ):
+        self.store = store
+        self.team = Path(team)
+        self.opponent = Path(opponent or team)
+        self.seed = seed
+        self.match_time = match_time
+        self.workers = workers
+        self.play = play
+
+    def evaluate(self, configs: List[Dict], halves: int) -> int:
+        """Play the first ``halves`` halves of the configurations which are
+        not in the store yet.
+
+        Returns:
+            int: Number of halves which failed
+        """
+        missing = [
+            (config, self.seed + i, i % 2 == 0)
+            for config in configs
+            for i in range(halves)
+            if self.store.get(config, self.seed + i) is None
+        ]
+        if not missing:
+            return 0
+        logging.info(
+            f"Playing {len(missing)} halves of {len(configs)} configurations"
+        )
+        failed = 0
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                pool.submit(
+                    self.play,
+                    self.team,
+                    self.opponent,
+                    config,
+                    seed,
+                    blue,
+                    self.match_time,
+                ): (config, seed, blue)
+                for config, seed, blue in missing
+            }
+            for future in as_completed(futures):
+                config, seed, blue = futures[future]
+                try:
+                    self.store.add(config, seed, blue, future.result())
+                except Exception:
+                    logging.exception(f"Half {seed} of {config} failed")
+                    failed += 1
+        return failed
+
+    def goal_differences(
+        self, config: Dict, halves: Optional[int] = None
+    ) -> List[int]:
+        """Return the goal differences of the team in the first ``halves``
+        halves of a configuration (all of them by default) in the store."""
+        results = self.store.of(config)
+        if halves is None:
+            seeds = sorted(seed for seed in results if seed >= self.seed)
+        else:
+            seeds = range(self.seed, self.seed + halves)
+        return [
+            results[seed]["goals_for"] - results[seed]["goals_against"]
+            for seed in seeds
+            if seed in results
+        ]
+
+    def ranking(
+        self, configs: List[Dict], halves: Optional[int] = None
+    ) -> List[Dict]:
+        """Return the configurations, the most halves played first and then
+        by their mean goal difference, best first."""
+
+        def rank(config: Dict) -> tuple:
+            differences = self.goal_differences(config, halves)
+            mean, _ = mean_interval(differences)
+            return len(differences), mean
+
+        return sorted(configs, key=rank, reverse=True)
+
+    def run(self, configs: List[Dict], halves: int) -> Tuple[List, int]:
+        """Play every configuration for ``halves`` halves (grid and random
+        search).
+
+        Returns:
+            tuple: The ranked configurations and the number of failed
+                halves
+        """
+        failed = self.evaluate(configs, halves)
+        return self.ranking(configs, halves), failed
+
+    def successive_halving(
+        self,
+        configs: List[Dict],
+        min_halves: int = HALVING_MIN_HALVES,
+        eta: int = HALVING_ETA,
+    ) -> Tuple[List, int]:
+        """Play every configuration for ``min_halves`` halves, keep the best
+        ``1 / eta`` of them and play those ``eta`` times as many halves, and
+        so on until one is left.
+
+        Bad configurations are dropped after a few halves, so the whole
+        sweep takes about ``min_halves * len(configs)`` halves per rung,
+        over ``log(len(configs), eta)`` rungs.
+
+        Returns:
+            tuple: The configurations ranked by the rung they reached and
+                their mean goal difference in it, and the number of failed
+                halves
+        """
+        if eta < 2:
+            raise ValueError("eta has to be at least 2")
+        survivors = list(configs)
+        halves = min_halves
+        failed = 0
+        while True:
+            failed += self.evaluate(survivors, halves)
+            survivors = self.ranking(survivors, halves)
+            if len(survivors) <= 1:
+                break
+            survivors = survivors[: max(1, len(survivors) // eta)]
+            logging.info(
+                f"{len(survivors)} configurations left after {halves} "
+                "halves"
+            )
+            if len(survivors) == 1:
+                break
+            halves *= eta
+        return self.ranking(configs), failed
+
+
+def print_ranking(sweep: ParameterSweep, configs: List[Dict], top: int):
+    print(f"{'#':>3} {'Halves':>6} {'Goal difference':>17}  Parameters")
+    for rank, config in enumerate(configs[:top], 1):
+        differences = sweep.goal_differences(config)
+        mean, interval = mean_interval(differences)
+        print(
+            f"{rank:>3} {len(differences):>6} {mean:>+8.2f} ± "
+            f"{interval:<6.2f}  {config_key(config)}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--space", type=Path, required=True)
+    parser.add_argument(
+        "--search", choices=Search.all(), default=Search.HALVING.value
+    )
+    parser.add_argument("--team", type=Path, default=TEAM_BLUE_DIR)
+    parser.add_argument(
+        "--opponent",
+        type=Path,
+        default=None,
+        help="Controller directory of the opponent, the team by default",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--results", type=Path, default=Path("sweep") / "results.jsonl"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--match-time",
+        type=int,
+        default=int(os.environ.get("RCJ_SIM_MATCH_TIME", DEFAULT_MATCH_TIME)),
+    )
+    parser.add_argument(
+        "--halves",
+        type=int,
+        default=SWEEP_HALVES,
+        help="Halves of each configuration of a grid or random search",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=SWEEP_SAMPLES,
+        help="Configurations of a random search, or of successive halving "
+        "over ranges",
+    )
+    parser.add_argument("--min-halves", type=int, default=HALVING_MIN_HALVES)
+    parser.add_argument("--eta", type=int, default=HALVING_ETA)
+    parser.add_argument("--top", type=int, default=10)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    with open(args.space) as f:
+        space = json.load(f)
+    check_space(space, args.team)
+    is_grid = all(isinstance(values, list) for values in space.values())
+    if args.search == Search.GRID.value and not is_grid:
+        raise SystemExit("Grid search needs a list of values per parameter")
+    if args.search == Search.RANDOM.value or not is_grid:
+        # The same configurations are drawn when the sweep is resumed
+        configs = sample(space, args.samples, random.Random(args.seed))
+    else:
+        configs = grid(space)
+
+    setup = sweep_setup(args.team, args.opponent or args.team, args.match_time)
+    try:
+        store = ResultStore(args.results, setup)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    sweep = ParameterSweep(
+        store,
+        args.team,
+        args.opponent,
+        args.seed,
+        args.match_time,
+        args.workers,
+    )
+    if args.search == Search.HALVING.value:
+        ranking, failed = sweep.successive_halving(
+            configs, args.min_halves, args.eta
+        )
+    else:
+        ranking, failed = sweep.run(configs, args.halves)
+    print_ranking(sweep, ranking, args.top)
+    if failed:
+        raise SystemExit(f"{failed} halves failed, run again")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+from itertools import combinations
+
+import pytest
+
+from tournament.bracket import (
+    Fixture,
+    knockout_round,
+    round_robin,
+    standings,
+    Team,
+)
+
+
+@pytest.mark.parametrize("n_teams", [2, 3, 4, 7, 8])
+def test_round_robin(n_teams: int):
+    teams = [str(i) for i in range(n_teams)]
+
+    rounds = round_robin(teams)
+
+    pairs = [frozenset(pair) for pairs in rounds for pair in pairs]
+    assert sorted(map(sorted, pairs)) == sorted(
+        map(sorted, combinations(teams, 2))
+    )
+    for pairs in rounds:
+        playing = [team for pair in pairs for team in pair]
+        assert len(playing) == len(set(playing)) == n_teams // 2 * 2
+
+
+def test_knockout_round():
+    assert knockout_round(["1", "2", "3", "4"]) == [("1", "4"), ("2", "3")]
+    # 1 to 3 go straight to the next round
+    assert knockout_round(["1", "2", "3", "4", "5"]) == [("4", "5")]
+    assert knockout_round(["1", "2", "3"]) == [("2", "3")]
+
+
+def test_fixture_score():
+    fixture = Fixture("1", 1, "A", "B")
+    assert fixture.teams(1) == ("A", "B")
+    assert fixture.teams(2) == ("B", "A")
+
+    fixture.halves.append({"score_blue": 2, "score_yellow": 1})
+    assert fixture.score() == (2, 1)
+    assert not fixture.finished
+    # B plays in blue in the second half, and scores twice
+    fixture.halves.append({"score_blue": 3, "score_yellow": 2})
+    assert fixture.score() == (2, 3)
+    assert fixture.finished
+    assert fixture.winner() == "B"
+
+
+def test_standings():
+    fixtures = [
+        Fixture("1", 1, "A", "B", [{}, {"score_blue": 0, "score_yellow": 3}]),
+        Fixture("2", 1, "B", "C", [{}, {"score_blue": 1, "score_yellow": 1}]),
+        Fixture("3", 1, "A", "C", [{"score_blue": 1, "score_yellow": 0}]),
+    ]
+
+    rows = standings(["A", "B", "C"], fixtures)
+
+    assert [row["team"] for row in rows] == ["A", "C", "B"]
+    assert rows[0] == dict(
+        team="A",
+        played=1,
+        won=1,
+        drawn=0,
+        lost=0,
+        goals_for=3,
+        goals_against=0,
+        points=3,
+    )
+    assert (rows[1]["points"], rows[2]["points"]) == (1, 1)
+
+
+def test_team_from_dict():
+    team = Team.from_dict("Blues")
+    assert (team.name, team.id) == ("Blues", "Blues")
+    assert team.directory.endswith("rcj_soccer_team_blue")
+
+    team = Team.from_dict({"name": "Y", "controller": "rcj_soccer_team_y"})
+    assert team.directory.endswith("rcj_soccer_team_y")
+    assert Team.from_dict(team.to_dict()) == team
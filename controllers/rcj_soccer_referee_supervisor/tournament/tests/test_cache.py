@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import pytest
+
+from tournament.bracket import Team
+from tournament.cache import result_key, ResultCache
+from tournament.consts import Bracket
+from tournament.scheduler import TournamentScheduler
+from tournament.tests.test_scheduler import create_state, FakeLauncher
+
+
+@pytest.fixture
+def controllers(tmp_path: Path) -> Path:
+    directory = tmp_path / "team"
+    directory.mkdir()
+    (directory / "robot1.py").write_text("SPEED = 1\n")
+    return directory
+
+
+def half(directory: Path, content: str = "reflog") -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "half.jsonl").write_text(content)
+    return directory
+
+
+def test_result_key(controllers: Path):
+    env = {"RCJ_SIM_MATCH_TIME": "600", "RCJ_SIM_OUTPUT_PATH": "a", "X": "1"}
+    key = result_key([controllers], env, 1)
+
+    # Where the half is written to and other variables do not matter
+    assert key == result_key(
+        [controllers], {**env, "RCJ_SIM_OUTPUT_PATH": "b", "X": "2"}, 1
+    )
+    (controllers / "__pycache__").mkdir()
+    (controllers / "__pycache__" / "robot1.pyc").write_bytes(b"\0")
+    assert key == result_key([controllers], env, 1)
+
+    assert key != result_key([controllers], env, 2)
+    assert key != result_key(
+        [controllers], {**env, "RCJ_SIM_MATCH_TIME": "300"}, 1
+    )
+    (controllers / "robot1.py").write_text("SPEED = 2\n")
+    assert key != result_key([controllers], env, 1)
+
+
+def test_get_put(tmp_path: Path):
+    cache = ResultCache(tmp_path / "cache")
+    assert cache.get("a", tmp_path / "out") is None
+
+    cache.put("a", half(tmp_path / "half"), {"score_blue": 1})
+
+    assert cache.get("a", tmp_path / "out") == {"score_blue": 1}
+    assert (tmp_path / "out" / "half.jsonl").read_text() == "reflog"
+    assert cache.report() == {
+        "hits": 1,
+        "misses": 1,
+        "hit_rate": 0.5,
+        "entries": 1,
+        "bytes": len("reflog"),
+    }
+    # Kept across runs
+    assert ResultCache(tmp_path / "cache").get("a", tmp_path / "again")
+
+
+def test_eviction(tmp_path: Path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=25, max_entries=2)
+    cache.put("a", half(tmp_path / "a", "x" * 10), {})
+    cache.put("b", half(tmp_path / "b", "x" * 10), {})
+    cache.get("a", tmp_path / "out")
+
+    # Over the number of entries: b is the least recently used
+    cache.put("c", half(tmp_path / "c", "x" * 10), {})
+    assert sorted(cache.entries) == ["a", "c"]
+    assert not (tmp_path / "cache" / "b").exists()
+
+    # Over the size
+    cache.put("d", half(tmp_path / "d", "x" * 20), {})
+    assert sorted(cache.entries) == ["d"]
+    assert sorted(ResultCache(tmp_path / "cache").entries) == ["d"]
+
+
+class CachedLauncher(FakeLauncher):
+    def cache_inputs(self, blue: Team, yellow: Team, number: int):
+        return [], number
+
+
+def test_scheduler(tmp_path: Path):
+    cache = ResultCache(tmp_path / "cache")
+    goals = {"1": 2, "2": 1, "3": 0}
+    state = create_state(tmp_path / "1", Bracket.ROUND_ROBIN.value, 3)
+    TournamentScheduler(state, CachedLauncher(goals), cache=cache).run()
+    assert cache.report()["misses"] == 6
+
+    again = create_state(tmp_path / "2", Bracket.ROUND_ROBIN.value, 3)
+    launcher = CachedLauncher(goals)
+    assert TournamentScheduler(again, launcher, 2, cache).run()
+
+    assert launcher.halves == []
+    assert cache.report()["hits"] == 6
+    assert again.standings() == state.standings()
+    reflog = Path(again.fixtures[0].halves[0]["directory"]) / "half.jsonl"
+    assert reflog.exists()
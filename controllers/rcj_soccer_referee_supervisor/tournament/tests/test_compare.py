@@ -0,0 +1,118 @@
+import json
+import random
+from pathlib import Path
+
+from tournament.bracket import Team
+from tournament.compare import ComparisonState, score_to_elo
+from tournament.scheduler import TournamentScheduler
+from tournament.sprt import SPRT
+
+
+class SeededLauncher:
+    """Write the reflog of a half in which each team scores a goal with
+    its probability, drawn from the seed of the half."""
+
+    def __init__(self, chances: dict):
+        self.chances = chances
+        self.halves = []
+
+    def launch(self, blue: Team, yellow: Team, number: int, env, log):
+        self.halves.append((number, blue.id, yellow.id))
+        rng = random.Random(number)
+        # The same draws whatever the side, as with the same seed
+        draws = [rng.random(), rng.random()]
+        payload = {
+            "score_blue": int(env["RCJ_SIM_TEAM_B_INITIAL_SCORE"])
+            + (draws[0] < self.chances[blue.id]),
+            "score_yellow": int(env["RCJ_SIM_TEAM_Y_INITIAL_SCORE"])
+            + (draws[1] < self.chances[yellow.id]),
+        }
+        reflog = Path(env["RCJ_SIM_OUTPUT_PATH"]) / "half.jsonl"
+        reflog.write_text(
+            json.dumps({"event": "MATCH_FINISH", "payload": payload}) + "\n"
+        )
+
+
+def create_state(tmp_path: Path, **kwargs) -> ComparisonState:
+    return ComparisonState(
+        tmp_path / "state.json",
+        Team(name="New", id="candidate"),
+        Team(name="Old", id="baseline"),
+        SPRT(),
+        **kwargs,
+    )
+
+
+def test_pairs_share_seeds(tmp_path: Path):
+    state = create_state(tmp_path, max_pairs=2, pairs_in_flight=2)
+    launcher = SeededLauncher({"candidate": 0.5, "baseline": 0.5})
+
+    assert TournamentScheduler(state, launcher, workers=4).run()
+
+    assert [(f.match_id, f.blue) for f in state.fixtures] == [
+        ("1", "candidate"),
+        ("2", "baseline"),
+        ("3", "candidate"),
+        ("4", "baseline"),
+    ]
+    numbers = sorted(number for number, _, _ in launcher.halves)
+    assert numbers == [0, 0, 1, 1, 2, 2, 3, 3]
+    # Same draws with the sides swapped: both fixtures of a pair end the
+    # same way for the sides, so the pairs are drawn
+    assert [score for score, _ in state.pair_results()] == [0.5, 0.5]
+
+
+def test_stops_early(tmp_path: Path):
+    state = create_state(tmp_path, pairs_in_flight=2)
+    launcher = SeededLauncher({"candidate": 0.6, "baseline": 0.1})
+
+    assert TournamentScheduler(state, launcher, workers=4).run()
+
+    summary = state.summary()
+    assert summary["decision"] == "H1"
+    assert summary["llr"] >= summary["llr_bounds"][1]
+    assert summary["pairs"] < 20
+    assert summary["goal_difference"] > 0
+    assert summary["elo"] > 0
+
+
+def test_equal_teams(tmp_path: Path):
+    state = create_state(tmp_path, max_pairs=100)
+    launcher = SeededLauncher({"candidate": 0.4, "baseline": 0.4})
+
+    assert TournamentScheduler(state, launcher).run()
+
+    assert state.decision == "H0"
+    assert len(state.pairs()) < 100
+
+
+def test_max_pairs(tmp_path: Path):
+    state = create_state(tmp_path, max_pairs=3)
+    # Too few pairs for the test to stop
+    state.sprt.min_pairs = 10
+    launcher = SeededLauncher({"candidate": 0.9, "baseline": 0.0})
+
+    assert TournamentScheduler(state, launcher).run()
+
+    assert state.decision is None
+    assert len(state.pairs()) == 3
+
+
+def test_resume(tmp_path: Path):
+    state = create_state(tmp_path, max_pairs=3)
+    state.sprt.min_pairs = 10
+    TournamentScheduler(
+        state, SeededLauncher({"candidate": 0.5, "baseline": 0.5})
+    ).run()
+
+    loaded = ComparisonState.load(state.path)
+
+    assert loaded.to_dict() == state.to_dict()
+    assert loaded.sprt.scores == state.sprt.scores
+    assert loaded.finished
+
+
+def test_score_to_elo():
+    assert score_to_elo(0.5) == 0
+    assert score_to_elo(1.0) > 1000
+    assert score_to_elo(0.25) < 0
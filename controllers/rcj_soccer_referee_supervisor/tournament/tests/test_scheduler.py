@@ -0,0 +1,141 @@
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+from tournament.bracket import Team
+from tournament.consts import Bracket
+from tournament.scheduler import (
+    HeadlessLauncher,
+    TournamentScheduler,
+    TournamentState,
+)
+
+
+class FakeLauncher:
+    """Write the reflog of a half in which the blue team scores
+    ``goals[<its ID>]`` goals and the yellow team none."""
+
+    def __init__(self, goals: Dict[str, int], fail: str = ""):
+        self.goals = goals
+        self.fail = fail
+        self.halves: List[tuple] = []
+        self.lock = threading.Lock()
+
+    def launch(self, blue: Team, yellow: Team, number: int, env, log):
+        with self.lock:
+            self.halves.append((env["RCJ_SIM_MATCH_ID"], blue.id, yellow.id))
+        if blue.id == self.fail:
+            raise RuntimeError("Crashed")
+        payload = {
+            "score_blue": int(env["RCJ_SIM_TEAM_B_INITIAL_SCORE"])
+            + self.goals[blue.id],
+            "score_yellow": int(env["RCJ_SIM_TEAM_Y_INITIAL_SCORE"]),
+        }
+        reflog = Path(env["RCJ_SIM_OUTPUT_PATH"]) / "half.jsonl"
+        reflog.write_text(
+            json.dumps({"event": "KICKOFF"})
+            + "\n"
+            + json.dumps({"event": "MATCH_FINISH", "payload": payload})
+            + "\n"
+        )
+
+
+def create_state(tmp_path: Path, bracket: str, n_teams: int):
+    teams = [Team(name=f"Team {i}", id=str(i)) for i in range(1, n_teams + 1)]
+    return TournamentState(tmp_path / "state.json", bracket, teams)
+
+
+def test_round_robin(tmp_path: Path):
+    state = create_state(tmp_path, Bracket.ROUND_ROBIN.value, 4)
+    launcher = FakeLauncher({"1": 3, "2": 2, "3": 1, "4": 0})
+
+    assert TournamentScheduler(state, launcher, workers=3).run()
+
+    assert len(launcher.halves) == 6 * 2
+    rows = state.standings()
+    assert [row["team"] for row in rows] == ["1", "2", "3", "4"]
+    # 3 goals in the half of each fixture it plays in blue
+    assert rows[0]["goals_for"] == 3 * 3
+    assert rows[0]["points"] == 9
+    saved = TournamentState.load(state.path)
+    assert saved.standings() == rows
+
+
+def test_scores_carried_over(tmp_path: Path):
+    state = create_state(tmp_path, Bracket.ROUND_ROBIN.value, 2)
+    launcher = FakeLauncher({"1": 1, "2": 2})
+
+    TournamentScheduler(state, launcher).run()
+
+    fixture = state.fixtures[0]
+    assert launcher.halves == [("1", "1", "2"), ("1", "2", "1")]
+    # Team 2 plays in blue in the second half, starting from 0:1
+    assert fixture.halves[1]["score_blue"] == 2
+    assert fixture.halves[1]["score_yellow"] == 1
+    assert fixture.score() == (1, 2)
+    assert fixture.winner() == "2"
+
+
+def test_knockout(tmp_path: Path):
+    state = create_state(tmp_path, Bracket.KNOCKOUT.value, 5)
+    # Team 4 beats every other team
+    launcher = FakeLauncher({"1": 1, "2": 1, "3": 0, "4": 2, "5": 0})
+
+    assert TournamentScheduler(state, launcher, workers=2).run()
+
+    rounds = [(f.round, f.blue, f.yellow) for f in state.fixtures]
+    assert rounds == [
+        (1, "4", "5"),
+        (2, "1", "4"),
+        (2, "2", "3"),
+        (3, "2", "4"),
+    ]
+    assert state.champion() == "4"
+
+    state = create_state(tmp_path / "draw", Bracket.KNOCKOUT.value, 2)
+    TournamentScheduler(state, FakeLauncher({"1": 0, "2": 0})).run()
+    # Draws go to the higher seed
+    assert state.champion() == "1"
+
+
+def test_resume(tmp_path: Path):
+    state = create_state(tmp_path, Bracket.ROUND_ROBIN.value, 3)
+    launcher = FakeLauncher({"1": 1, "2": 1, "3": 1}, fail="3")
+
+    assert not TournamentScheduler(state, launcher).run()
+
+    # The fixtures with team 3 playing in blue in the first half failed
+    state = TournamentState.load(state.path)
+    finished = [f.match_id for f in state.fixtures if f.finished]
+    assert len(finished) == 1
+    launcher = FakeLauncher({"1": 1, "2": 1, "3": 1})
+    assert TournamentScheduler(state, launcher).run()
+    assert {match_id for match_id, _, _ in launcher.halves} == {
+        f.match_id for f in state.fixtures
+    } - set(finished)
+
+
+def test_finished_half_not_replayed(tmp_path: Path):
+    state = create_state(tmp_path, Bracket.ROUND_ROBIN.value, 2)
+    fixture = state.fixtures[0]
+    launcher = FakeLauncher({"1": 1, "2": 0})
+    scheduler = TournamentScheduler(state, launcher)
+    # As if the process was killed right after the half
+    fixture.halves.append(scheduler.play_half(fixture))
+    fixture.halves.clear()
+
+    assert scheduler.run()
+    assert len(launcher.halves) == 2
+    assert fixture.score() == (1, 0)
+
+
+def test_headless(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("RCJ_SIM_MATCH_TIME", "2")
+    state = create_state(tmp_path, Bracket.ROUND_ROBIN.value, 2)
+
+    assert TournamentScheduler(state, HeadlessLauncher(seed=1)).run()
+
+    fixture = state.fixtures[0]
+    assert fixture.finished
+    assert (Path(fixture.halves[1]["directory"]) / "output.log").exists()
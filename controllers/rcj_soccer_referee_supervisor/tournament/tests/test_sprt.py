@@ -0,0 +1,58 @@
+import random
+from math import log
+
+import pytest
+
+from tournament.sprt import elo_to_score, mean_interval, SPRT
+
+
+def test_elo_to_score():
+    assert elo_to_score(0) == 0.5
+    assert elo_to_score(400) == pytest.approx(10 / 11)
+    assert elo_to_score(-100) == pytest.approx(1 - elo_to_score(100))
+
+
+def test_bounds():
+    sprt = SPRT(alpha=0.05, beta=0.1)
+    assert sprt.lower == pytest.approx(log(0.1 / 0.95))
+    assert sprt.upper == pytest.approx(log(0.9 / 0.05))
+    with pytest.raises(ValueError):
+        SPRT(elo0=10, elo1=10)
+
+
+def test_decision():
+    sprt = SPRT(min_pairs=3)
+    for _ in range(2):
+        sprt.add(1.0)
+    # Not before min_pairs, however clear the results
+    assert sprt.decision() is None
+    sprt.add(1.0)
+    assert sprt.decision() == "H1"
+
+    sprt = SPRT(min_pairs=3)
+    for score in (0.5, 0.5, 0.25):
+        sprt.add(score)
+    assert sprt.decision() == "H0"
+
+
+@pytest.mark.parametrize("elo, expected", [(0, "H0"), (200, "H1")])
+def test_simulated(elo: float, expected: str):
+    # Pairs of fixtures won, drawn or lost with the expected score
+    rng = random.Random(1)
+    win = elo_to_score(elo) - 0.15
+    sprt = SPRT()
+    while sprt.decision() is None:
+        outcomes = [
+            1.0 if x < win else 0.5 if x < win + 0.3 else 0.0
+            for x in (rng.random(), rng.random())
+        ]
+        sprt.add(sum(outcomes) / 2)
+    assert sprt.decision() == expected
+    assert len(sprt.scores) < 100
+
+
+def test_mean_interval():
+    assert mean_interval([]) == (0.0, float("inf"))
+    mean, half_width = mean_interval([1.0, 2.0, 3.0])
+    assert mean == 2.0
+    assert half_width == pytest.approx(1.96 * (1 / 3) ** 0.5)
@@ -0,0 +1,163 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from headless.runner import TEAM_BLUE_DIR, TEAM_YELLOW_DIR
+from referee.consts import DEFAULT_MATCH_TIME
+from tournament.sweep import (
+    check_space,
+    grid,
+    ParameterSweep,
+    ResultStore,
+    robot_params,
+    sample,
+    split_name,
+    sweep_setup,
+)
+
+SETUP = sweep_setup(TEAM_BLUE_DIR, TEAM_BLUE_DIR, DEFAULT_MATCH_TIME)
+
+
+def fake_play(team, opponent, config, seed, blue, match_time):
+    """The goal difference of a configuration is its ``robot1.skill``, plus
+    one in the halves it plays in blue."""
+    skill = config["robot1.skill"]
+    return {"goals_for": skill + int(blue), "goals_against": 0}
+
+
+def test_split_name():
+    assert split_name("robot3.heading_gain") == (3, "heading_gain")
+    for name in ("robot3", "goalie.heading_gain", "xrobot1.speed"):
+        with pytest.raises(ValueError):
+            split_name(name)
+
+
+def test_check_space():
+    check_space({"robot3.heading_gain": [1.0]}, TEAM_BLUE_DIR)
+    with pytest.raises(ValueError):
+        check_space({"robot1.heading_gain": [1.0]}, TEAM_BLUE_DIR)
+
+
+def test_grid():
+    configs = grid({"robot1.a": [1, 2], "robot2.b": [3, 4, 5]})
+
+    assert len(configs) == 6
+    assert {"robot1.a": 2, "robot2.b": 3} in configs
+    with pytest.raises(ValueError):
+        grid({"robot1.a": {"low": 1, "high": 2}})
+
+
+def test_sample():
+    space = {
+        "robot1.a": [1, 2],
+        "robot1.b": {"low": 0.5, "high": 1.5},
+        "robot2.c": {"low": 1, "high": 3},
+    }
+
+    configs = sample(space, 20, random.Random(1))
+
+    assert configs == sample(space, 20, random.Random(1))
+    for config in configs:
+        assert config["robot1.a"] in (1, 2)
+        assert 0.5 <= config["robot1.b"] <= 1.5
+        assert config["robot2.c"] in (1, 2, 3)
+    assert robot_params(configs[0]) == {
+        1: {"a": configs[0]["robot1.a"], "b": configs[0]["robot1.b"]},
+        2: {"c": configs[0]["robot2.c"]},
+    }
+
+
+def test_result_store(tmp_path: Path):
+    path = tmp_path / "results.jsonl"
+    store = ResultStore(path, SETUP)
+    store.add({"robot1.a": 1}, 3, True, {"goals_for": 1, "goals_against": 0})
+    # A line cut short by a kill is skipped
+    with open(path, "a") as f:
+        f.write('{"config": ')
+
+    store = ResultStore(path, SETUP)
+
+    assert store.get({"robot1.a": 1}, 3)["goals_for"] == 1
+    assert store.get({"robot1.a": 1}, 4) is None
+    # The cut line is replaced by the next half
+    store.add({"robot1.a": 1}, 4, False, {"goals_for": 0, "goals_against": 2})
+    assert ResultStore(path, SETUP).get({"robot1.a": 1}, 4) is not None
+
+
+def test_result_store_setup(tmp_path: Path):
+    path = tmp_path / "results.jsonl"
+    ResultStore(path, SETUP).add(
+        {"robot1.a": 1}, 3, True, {"goals_for": 1, "goals_against": 0}
+    )
+    other = sweep_setup(TEAM_BLUE_DIR, TEAM_YELLOW_DIR, 60)
+
+    assert json.loads(path.read_text().split("\n")[0]) == {"setup": SETUP}
+    with pytest.raises(ValueError, match="match_time, opponent"):
+        ResultStore(path, other)
+    # Halves recorded before the setup was
+    with open(tmp_path / "old.jsonl", "w") as f:
+        f.write(path.read_text().split("\n", 1)[1])
+    with pytest.raises(ValueError):
+        ResultStore(tmp_path / "old.jsonl", SETUP)
+
+
+def test_run(tmp_path: Path):
+    store = ResultStore(tmp_path / "results.jsonl", SETUP)
+    sweep = ParameterSweep(store, seed=10, workers=2, play=fake_play)
+    configs = grid({"robot1.skill": [0, 2, 1]})
+
+    ranking, failed = sweep.run(configs, 4)
+
+    assert failed == 0
+    assert [config["robot1.skill"] for config in ranking] == [2, 1, 0]
+    # Blue in the halves of seeds 10 and 12
+    assert sweep.goal_differences(ranking[0]) == [3, 2, 3, 2]
+    assert sorted(store.of(ranking[0])) == [10, 11, 12, 13]
+
+    # Nothing is played again
+    assert ParameterSweep(store, seed=10, play=None).run(configs, 4)[1] == 0
+
+
+def test_successive_halving(tmp_path: Path):
+    store = ResultStore(tmp_path / "results.jsonl", SETUP)
+    sweep = ParameterSweep(store, workers=2, play=fake_play)
+    configs = grid({"robot1.skill": list(range(9))})
+
+    ranking, failed = sweep.successive_halving(configs, 2, 3)
+
+    assert failed == 0
+    assert ranking[0] == {"robot1.skill": 8}
+    halves = {
+        config["robot1.skill"]: len(store.of(config)) for config in configs
+    }
+    # 9 configurations play 2 halves, 3 play 6 and the best one is left
+    assert halves == {8: 6, 7: 6, 6: 6, **{skill: 2 for skill in range(6)}}
+    assert [config["robot1.skill"] for config in ranking[:3]] == [8, 7, 6]
+
+
+def test_failed_half(tmp_path: Path):
+    store = ResultStore(tmp_path / "results.jsonl", SETUP)
+    sweep = ParameterSweep(store, play=fake_play)
+
+    ranking, failed = sweep.run([{"robot1.skill": 1}, {"robot1.a": 1}], 2)
+
+    assert failed == 2
+    assert ranking[0] == {"robot1.skill": 1}
+
+
+def test_play_half(tmp_path: Path):
+    setup = sweep_setup(TEAM_BLUE_DIR, TEAM_BLUE_DIR, 2)
+    store = ResultStore(tmp_path / "results.jsonl", setup)
+    sweep = ParameterSweep(store, match_time=2, workers=2)
+    config = {"robot3.heading_gain": 2.0, "robot1.forward_speed": 8}
+
+    ranking, failed = sweep.run([config], 2)
+
+    assert failed == 0
+    results = [json.loads(line) for line in store.path.open()][1:]
+    assert sorted((r["seed"], r["blue"]) for r in results) == [
+        (0, True),
+        (1, False),
+    ]
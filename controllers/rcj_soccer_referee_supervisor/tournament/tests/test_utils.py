@@ -0,0 +1,16 @@
+from pathlib import Path
+
+import pytest
+
+from tournament.utils import write_atomically
+
+
+def test_write_atomically(tmp_path: Path):
+    path = tmp_path / "state.json"
+    write_atomically(path, "old")
+
+    with pytest.raises(TypeError):
+        write_atomically(path, None)
+
+    assert path.read_text() == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
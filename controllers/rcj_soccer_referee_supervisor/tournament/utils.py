@@ -0,0 +1,25 @@
+import os
+import tempfile
+from pathlib import Path
+
+
+def write_atomically(path: Path, data: str):
+    """Replace the file at ``path`` with ``data``, so that it holds either
+    the previous or the new contents even if the process is killed
+    meanwhile."""
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    # Persist the rename itself
+    directory = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
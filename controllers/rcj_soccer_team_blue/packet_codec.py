@@ -0,0 +1,118 @@
+"""Codec of the packets the referee supervisor sends to the robots.
+
+The module has no dependencies on the rest of the referee: the very same
+file is shipped with the robot controllers (``packet_codec.py`` in the team
+directories), which cannot import the referee package. Keep the copies
+identical.
+
+Two formats are supported:
+
+* binary -- a ``struct`` packed record whose first byte is the version of
+  the format. Newer versions may only append fields, so older decoders keep
+  reading the fields they know about.
+* JSON -- ``{"waiting_for_kickoff": false}``, as sent by older versions of
+  the referee, for team code which parses the packets with ``json.loads``.
+"""
+import json
+import struct
+from functools import lru_cache
+from typing import Optional, Union
+
+PACKET_VERSION = 1
+
+# Version 1: version, flags, remaining match time in seconds, score of the
+# blue team, score of the yellow team and the team kicking off after the
+# last goal (b"B", b"Y" or b"-" before the first goal)
+PACKET_V1 = struct.Struct("<BBHBBc")
+FLAG_WAITING_FOR_KICKOFF = 0x01
+NO_TEAM = b"-"
+
+# Distinct states seen in a match: every second of the clock, times the
+# handful of scores and kickoff states of that second
+CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def encode_binary_packet(
+    waiting_for_kickoff: bool,
+    remaining_time: int = 0,
+    score_blue: int = 0,
+    score_yellow: int = 0,
+    kickoff_team: Optional[str] = None,
+) -> bytes:
+    """Encode the state of the match into a binary packet. The bytes of each
+    distinct state are only packed once.
+
+    Args:
+        waiting_for_kickoff (bool): Whether the robots wait for the kickoff
+        remaining_time (int): Remaining match time in seconds
+        score_blue (int): Score of the blue team
+        score_yellow (int): Score of the yellow team
+        kickoff_team (str, optional): "B" or "Y", the team kicking off
+            after the last goal
+
+    Returns:
+        bytes: The packet
+    """
+    flags = FLAG_WAITING_FOR_KICKOFF if waiting_for_kickoff else 0
+    return PACKET_V1.pack(
+        PACKET_VERSION,
+        flags,
+        min(max(int(remaining_time), 0), 0xFFFF),
+        min(max(score_blue, 0), 0xFF),
+        min(max(score_yellow, 0), 0xFF),
+        kickoff_team.encode() if kickoff_team else NO_TEAM,
+    )
+
+
+@lru_cache(maxsize=2)
+def encode_json_packet(waiting_for_kickoff: bool) -> str:
+    """Encode the state of the match the way older referees did.
+
+    Args:
+        waiting_for_kickoff (bool): Whether the robots wait for the kickoff
+
+    Returns:
+        str: The packet
+    """
+    return json.dumps({"waiting_for_kickoff": waiting_for_kickoff})
+
+
+def decode_packet(data: Union[bytes, str]) -> dict:
+    """Decode a packet sent by the referee, in either format.
+
+    Args:
+        data (bytes or str): The packet
+
+    Returns:
+        dict: The fields of the packet. JSON packets only carry
+            ``waiting_for_kickoff``.
+    """
+    if isinstance(data, str) or data[:1] == b"{":
+        return json.loads(data)
+
+    version = data[0]
+    if version < 1:
+        raise ValueError(f"Unsupported packet version {version}")
+
+    # Newer versions only append fields to the ones of version 1
+    (
+        _,
+        flags,
+        remaining_time,
+        score_blue,
+        score_yellow,
+        kickoff_team,
+    ) = PACKET_V1.unpack_from(data)
+    if kickoff_team == NO_TEAM:
+        kickoff_team = None
+    else:
+        kickoff_team = kickoff_team.decode()
+
+    return {
+        "waiting_for_kickoff": bool(flags & FLAG_WAITING_FOR_KICKOFF),
+        "remaining_time": remaining_time,
+        "score_blue": score_blue,
+        "score_yellow": score_yellow,
+        "kickoff_team": kickoff_team,
+    }
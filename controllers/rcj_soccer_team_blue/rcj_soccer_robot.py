@@ -1,14 +1,23 @@
 import json
 import math
 
+from packet_codec import decode_packet
+
 TIME_STEP = 32
 ROBOT_NAMES = ["B1", "B2", "B3", "Y1", "Y2", "Y3"]
 N_ROBOTS = len(ROBOT_NAMES)
 
 
 class RCJSoccerRobot:
-    def __init__(self, robot):
+    # Dataclass of the tuning constants of the robot, see robot1.py
+    Params = None
+
+    def __init__(self, robot, params=None):
         self.robot = robot
+        # Defaults of the robot unless overridden, e.g. by a parameter sweep
+        if params is None and self.Params is not None:
+            params = self.Params()
+        self.params = params
         self.name = self.robot.getName()
         self.team = self.name[0]
         self.player_id = int(self.name[1])
@@ -47,11 +56,12 @@ class RCJSoccerRobot:
         self.left_motor.setVelocity(0.0)
         self.right_motor.setVelocity(0.0)
 
-    def parse_supervisor_msg(self, data: str) -> dict:
-        return json.loads(data)
+    def parse_supervisor_msg(self, data: bytes) -> dict:
+        # Binary or JSON, depending on RCJ_SIM_PACKET_FORMAT of the referee
+        return decode_packet(data)
 
     def get_new_data(self) -> dict:
-        data = self.receiver.getString()
+        data = self.receiver.getBytes()
         self.receiver.nextPacket()
         return self.parse_supervisor_msg(data)
 
@@ -1,11 +1,33 @@
+from dataclasses import dataclass
+
 import utils
 from rcj_soccer_robot import RCJSoccerRobot, TIME_STEP
 
+
+@dataclass
+class Robot2Params:
+    # Bola dianggap lurus di depan jika |arah y| <= deadband
+    deadband: float = 0.13
+    # Slow start setelah kickoff (detik)
+    kickoff_duration: float = 2.0
+    kickoff_speed: float = 4
+    max_speed: float = 8
+    turn_factor: float = 0.8
+    # Jarak sonar depan yang dianggap macet
+    blocked_distance: float = 60
+    # Kekuatan sinyal bola minimal untuk dikejar
+    chase_strength: float = 0.05
+    search_speed: float = 4
+
+
 class MyRobot2(RCJSoccerRobot):
+    Params = Robot2Params
+
     def run(self):
+        params = self.params
         # Setup kickoff timer...
         kickoff_start_time = None
-        kickoff_duration = 2.0
+        kickoff_duration = params.kickoff_duration
 
         while self.robot.step(TIME_STEP) != -1:
             if self.is_new_data():
@@ -17,7 +39,7 @@ class MyRobot2(RCJSoccerRobot):
                 
                 # Baca Sonar
                 sonar = self.get_sonar_values()
-                is_blocked_front = 0 < sonar['front'] < 60 # Jarak bahaya
+                is_blocked_front = 0 < sonar['front'] < params.blocked_distance # Jarak bahaya
 
                 # Komunikasi Tim
                 striker_has_ball = False
@@ -37,22 +59,28 @@ class MyRobot2(RCJSoccerRobot):
                         left_speed = -6
                         right_speed = -8
                         
-                    elif ball_data["strength"] > 0.05:
+                    elif ball_data["strength"] > params.chase_strength:
                         # ... (Logika Kejar Bola Normal & Slow Start) ...
                         # Copy logika normal Robot 2 Anda di sini
                         # Pastikan memasukkan logika kickoff delay
                         
-                        direction = utils.get_direction(ball_data["direction"])
+                        direction = utils.get_direction(
+                            ball_data["direction"], params.deadband
+                        )
                         
                         # Speed Control
                         time_since_start = current_time - kickoff_start_time
-                        current_max_speed = 4 if time_since_start < kickoff_duration else 8
+                        current_max_speed = (
+                            params.kickoff_speed
+                            if time_since_start < kickoff_duration
+                            else params.max_speed
+                        )
                         
                         if direction == 0:
                             left_speed = current_max_speed
                             right_speed = current_max_speed
                         else:
-                            turn_speed = current_max_speed * 0.8
+                            turn_speed = current_max_speed * params.turn_factor
                             left_speed = direction * turn_speed
                             right_speed = direction * -turn_speed
                             
@@ -61,8 +89,8 @@ class MyRobot2(RCJSoccerRobot):
                         right_speed = 0
 
                 else:
-                    left_speed = -4
-                    right_speed = 4
+                    left_speed = -params.search_speed
+                    right_speed = params.search_speed
 
                 self.left_motor.setVelocity(left_speed)
                 self.right_motor.setVelocity(right_speed)
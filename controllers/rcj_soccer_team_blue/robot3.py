@@ -1,16 +1,39 @@
 # File: robot3.py (Kiper Smooth - Anti Jitter & Anti Spin)
 import math
+from dataclasses import dataclass
+
 import utils
 from rcj_soccer_robot import RCJSoccerRobot, TIME_STEP
 
+
+@dataclass
+class Robot3Params:
+    # Batas gawang (GPS X)
+    limit_x: float = 0.22
+    # Gain koreksi heading
+    heading_gain: float = 3.0
+    # Toleransi sudut (rad)
+    heading_tolerance: float = 0.05
+    # Deadzone bola (arah x)
+    ball_deadzone: float = 0.05
+    # Kecepatan proporsional terhadap sudut bola
+    tracking_gain: float = 60.0
+    max_speed: float = 10
+    # Miring lebih dari ini (rad): stop sliding, putar dulu
+    max_tilt: float = 0.5
+
+
 class MyRobot3(RCJSoccerRobot):
+    Params = Robot3Params
+
     def run(self):
+        params = self.params
         self.left_motor.setVelocity(0)
         self.right_motor.setVelocity(0)
         
         # --- KONFIGURASI HALUS ---
         # 1. Batas Gawang (GPS X)
-        LIMIT_X = 0.22  
+        LIMIT_X = params.limit_x
         
         # 2. Target Heading (Wajib 0 / Menghadap Timur)
         TARGET_HEADING = 0.0
@@ -18,12 +41,12 @@ class MyRobot3(RCJSoccerRobot):
         # 3. Anti-Keder (Gain Koreksi)
         # TURUNKAN ANGKA INI. 
         # Jika 15.0 bikin getar, kita pakai 2.0 atau 3.0 saja.
-        HEADING_GAIN = 3.0 
+        HEADING_GAIN = params.heading_gain
         
         # 4. Toleransi Sudut (Deadzone)
         # Jika miring kurang dari 3 derajat (0.05 rad), anggap lurus.
         # Ini mencegah robot "gelisah" membetulkan hal kecil.
-        HEADING_TOLERANCE = 0.05
+        HEADING_TOLERANCE = params.heading_tolerance
 
         while self.robot.step(TIME_STEP) != -1:
             if self.is_new_data():
@@ -66,14 +89,14 @@ class MyRobot3(RCJSoccerRobot):
                     ball_angle = ball_data['direction'][0]
                     
                     # Deadzone bola (biar ga gerak kalau bola diem didepan muka)
-                    if abs(ball_angle) > 0.05:
+                    if abs(ball_angle) > params.ball_deadzone:
                         # Kecepatan Proporsional (Makin jauh bola, makin cepat)
                         # Kita batasi max speed tracking biar ga liar
-                        base_speed = ball_angle * 60.0 
+                        base_speed = ball_angle * params.tracking_gain
                 
                 # Clamp base_speed (Max 10)
-                if base_speed > 10: base_speed = 10
-                if base_speed < -10: base_speed = -10
+                max_speed = params.max_speed
+                base_speed = max(min(base_speed, max_speed), -max_speed)
 
                 # ==========================================================
                 # 3. SAFETY GPS (MISTAR GAWANG)
@@ -92,15 +115,15 @@ class MyRobot3(RCJSoccerRobot):
                 # ==========================================================
                 # Prioritas Utama: LURUSKAN BADAN DULU
                 # Jika robot miring parah (> 30 derajat/0.5 rad), stop sliding, putar dulu.
-                if abs(heading_error) > 0.5:
+                if abs(heading_error) > params.max_tilt:
                     base_speed = 0
                 
                 left_speed = base_speed - correction
                 right_speed = base_speed + correction
                 
                 # Final Clamp
-                left_speed = max(min(left_speed, 10), -10)
-                right_speed = max(min(right_speed, 10), -10)
+                left_speed = max(min(left_speed, max_speed), -max_speed)
+                right_speed = max(min(right_speed, max_speed), -max_speed)
 
                 self.left_motor.setVelocity(left_speed)
                 self.right_motor.setVelocity(right_speed)
@@ -1,8 +1,23 @@
+from dataclasses import dataclass
+
 import utils
 from rcj_soccer_robot import RCJSoccerRobot, TIME_STEP
 
+
+@dataclass
+class Robot1Params:
+    # Bola dianggap lurus di depan jika |arah y| <= deadband
+    deadband: float = 0.13
+    forward_speed: float = 10
+    turn_speed: float = 9
+    search_speed: float = 6
+
+
 class MyRobot1(RCJSoccerRobot):
+    Params = Robot1Params
+
     def run(self):
+        params = self.params
         while self.robot.step(TIME_STEP) != -1:
             if self.is_new_data():
                 left_speed = 0
@@ -10,20 +25,22 @@ class MyRobot1(RCJSoccerRobot):
                 
                 if self.is_new_ball_data():
                     ball_data = self.get_new_ball_data()
-                    direction = utils.get_direction(ball_data["direction"])
+                    direction = utils.get_direction(
+                        ball_data["direction"], params.deadband
+                    )
                     
                     # LOGIKA BRASIL: GAS POL!
                     if direction == 0:
-                        left_speed = 10
-                        right_speed = 10
+                        left_speed = params.forward_speed
+                        right_speed = params.forward_speed
                     else:
                         # Belok tajam dan cepat
-                        left_speed = direction * 9
-                        right_speed = direction * -9
+                        left_speed = direction * params.turn_speed
+                        right_speed = direction * -params.turn_speed
                 else:
                     # Jika bola hilang, putar cepat cari bola
-                    left_speed = -6
-                    right_speed = 6
+                    left_speed = -params.search_speed
+                    right_speed = params.search_speed
 
                 self.left_motor.setVelocity(left_speed)
                 self.right_motor.setVelocity(right_speed)
@@ -1,4 +1,4 @@
-def get_direction(ball_vector: list) -> int:
-    if -0.13 <= ball_vector[1] <= 0.13:
+def get_direction(ball_vector: list, deadband: float = 0.13) -> int:
+    if -deadband <= ball_vector[1] <= deadband:
         return 0
     return -1 if ball_vector[1] < 0 else 1